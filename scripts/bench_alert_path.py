@@ -0,0 +1,124 @@
+"""
+Alert Path Micro-Benchmark
+Per-alert CPU of the webhook ingest path: the previous path (debug dump,
+Alert built twice, linear duplicate scan re-parsing timestamps) against the
+current parse-once path (AlertProcessor.validate_alert -> same Alert object)
+
+Usage: python scripts/bench_alert_path.py [--alerts 2000] [--repeat 5] [--spacing 0.2]
+"""
+import sys
+import os
+import io
+import json
+import time
+import argparse
+import contextlib
+from datetime import datetime, timedelta
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.models import Alert
+from src.processors.alert_processor import AlertProcessor
+
+SYMBOLS = ['XAUUSD', 'EURUSD', 'GBPUSD', 'USDJPY', 'USDCAD',
+           'AUDUSD', 'NZDUSD', 'EURJPY', 'GBPJPY', 'AUDJPY']
+TIMEFRAMES = ['5m', '15m', '1h', '1d']
+
+
+def make_alerts(count: int, spacing_seconds: float):
+    """Replayed bridge traffic: entry alerts spacing_seconds apart, ending now"""
+    base = datetime.now() - timedelta(seconds=count * spacing_seconds)
+    alerts = []
+    for i in range(count):
+        alerts.append({
+            "type": "entry",
+            "symbol": SYMBOLS[i % len(SYMBOLS)],
+            "tf": TIMEFRAMES[(i // len(SYMBOLS)) % len(TIMEFRAMES)],
+            "signal": "buy" if (i // 40) % 2 == 0 else "sell",
+            "price": 2650.0 + i * 0.01,
+            "strategy": "ZepixPremium",
+            "timestamp": (base + timedelta(seconds=i * spacing_seconds)).isoformat()
+        })
+    return alerts
+
+
+class LegacyAlertPath:
+    """The previous ingest path, reproduced for comparison"""
+
+    def __init__(self):
+        self.recent_alerts = []
+        self.alert_window = timedelta(minutes=5)
+
+    def handle(self, data):
+        print(f"Webhook received: {json.dumps(data, indent=2)}")
+        print(f"ALERT: Received alert: {data}")
+        alert = Alert(**data, raw_data=data)
+
+        # clean_old_alerts - re-parse every stored timestamp
+        now = datetime.now()
+        self.recent_alerts = [
+            a for a in self.recent_alerts
+            if now - datetime.fromisoformat(a.raw_data['timestamp']) < self.alert_window
+        ]
+
+        # is_duplicate_alert - linear scan re-parsing timestamps
+        incoming = datetime.fromisoformat(data['timestamp'])
+        for recent in self.recent_alerts:
+            if incoming - datetime.fromisoformat(recent.raw_data['timestamp']) >= self.alert_window:
+                continue
+            if (recent.type, recent.symbol, recent.tf, recent.signal) == (alert.type, alert.symbol, alert.tf, alert.signal):
+                return None
+        self.recent_alerts.append(alert)
+
+        # process_alert built the model a second time
+        return Alert(**data)
+
+
+def run_legacy(alerts):
+    path = LegacyAlertPath()
+    for data in alerts:
+        path.handle(dict(data))
+
+
+def run_current(alerts):
+    processor = AlertProcessor({})
+    for data in alerts:
+        processor.validate_alert(dict(data))
+
+
+def measure(fn, alerts, repeat):
+    """Best-of-repeat CPU time per alert in microseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.process_time()
+            fn(alerts)
+            elapsed = time.process_time() - start
+        best = min(best, elapsed)
+    return best / len(alerts) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alert path micro-benchmark")
+    parser.add_argument("--alerts", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--spacing", type=float, default=0.2, help="Seconds between replayed alerts")
+    args = parser.parse_args()
+
+    alerts = make_alerts(args.alerts, args.spacing)
+    legacy_us = measure(run_legacy, alerts, args.repeat)
+    current_us = measure(run_current, alerts, args.repeat)
+
+    print("=" * 60)
+    print(f"ALERT PATH BENCHMARK ({args.alerts} alerts, best of {args.repeat})")
+    print("=" * 60)
+    print(f"Previous path:   {legacy_us:8.1f} us CPU/alert")
+    print(f"Parse-once path: {current_us:8.1f} us CPU/alert")
+    print(f"Speedup:         {legacy_us / current_us:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
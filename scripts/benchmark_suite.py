@@ -0,0 +1,425 @@
+"""
+Component Micro-Benchmark Suite
+Offline timings of the engine's hot paths in simulation mode - no server,
+no MT5 terminal, state files in a temp directory
+
+Benchmarks:
+- alert_validation        AlertProcessor.validate_alert
+- trend_alignment         TimeframeTrendManager.check_logic_alignment (cached)
+- trend_alignment_cold    ... recomputed after every trend update
+- sl_price                PipCalculator.calculate_sl_price
+- open_trade_sweep        one manage_open_trades iteration (sweep_open_trades) with N trades
+- profit_chain_checks     ProfitBookingManager validate + target checks over M chains
+- db_insert / db_query    TradeDatabase write-behind inserts, history and rollup report queries
+- reentry_check           ReEntryManager.check_reentry_opportunity
+- event_journal_append    EventJournal.record_trade into a memory-mapped segment
+
+Usage: python scripts/benchmark_suite.py [--calls 2000] [--trades 10,100,1000] [--chains 10,100]
+           [--db-rows 1000] [--repeat 5] [--only sl_price,db_insert] [--out bench.json]
+           [--compare previous.json]
+"""
+import sys
+import os
+import io
+import copy
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import platform
+import statistics
+import tempfile
+import subprocess
+import contextlib
+from datetime import datetime, timedelta
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.config import Config
+from src.models import Trade
+from src.database import TradeDatabase
+from src.services.analytics_engine import AnalyticsEngine
+from src.clients.mt5_client import MT5Client, SIMULATED_PRICES
+from src.processors.alert_processor import AlertProcessor
+from src.managers.risk_manager import RiskManager
+from src.managers.reentry_manager import ReEntryManager
+from src.managers.timeframe_trend_manager import TimeframeTrendManager
+from src.core.trading_engine import TradingEngine
+from src.core.event_journal import EventJournal, EventType
+from src.utils.pip_calculator import PipCalculator
+from src.utils.json_state_writer import flush_all_state_writers
+from src.backtest.replay import RecordingNotifier
+
+SYMBOLS = ["XAUUSD", "EURUSD", "GBPUSD", "USDJPY", "USDCAD"]
+TIMEFRAMES = ["5m", "15m", "1h", "1d"]
+LOGICS = ["LOGIC1", "LOGIC2", "LOGIC3"]
+
+
+def make_config(work_dir):
+    """Simulation config whose state files all live in work_dir"""
+    config = Config()
+    config.config = copy.deepcopy(config.config)
+    config.config_file = os.path.join(work_dir, "config.json")
+    config.writer = None
+    config.config["simulate_orders"] = True
+    config.config.setdefault("database_config", {})["path"] = os.path.join(work_dir, "bench.db")
+    state_config = config.config.setdefault("state_writer_config", {})
+    state_config["trends_file"] = os.path.join(work_dir, "timeframe_trends.json")
+    state_config["stats_file"] = os.path.join(work_dir, "stats.json")
+    config.config.setdefault("tick_pump_config", {})["enabled"] = False
+    config.config.setdefault("event_journal_config", {})["directory"] = os.path.join(work_dir, "events")
+    return config
+
+
+def make_trade(rng, symbol, **fields):
+    """Open trade around the simulated price with SL/TP out of reach"""
+    price = SIMULATED_PRICES[symbol]
+    direction = rng.choice(["buy", "sell"])
+    offset = price * 0.05
+    return Trade(
+        symbol=symbol, entry=price * (1 + rng.uniform(-0.001, 0.001)),
+        sl=price - offset if direction == "buy" else price + offset,
+        tp=price + offset if direction == "buy" else price - offset,
+        lot_size=rng.choice([0.01, 0.02, 0.05]), direction=direction,
+        strategy=rng.choice(LOGICS), open_time=datetime.now().isoformat(), **fields
+    )
+
+
+def set_aligned_trends(trend_manager):
+    for symbol in SYMBOLS:
+        for tf in TIMEFRAMES:
+            trend_manager.update_trend(symbol, tf, "bull")
+
+
+# Benchmarks: each takes (size, work_dir) and returns (prepare, ops, cleanup)
+# prepare() runs untimed before every repeat and returns the timed callable
+
+def bench_alert_validation(calls, work_dir):
+    base = datetime.now() - timedelta(seconds=calls * 0.2)
+    alerts = [{
+        "type": "entry", "symbol": SYMBOLS[i % len(SYMBOLS)],
+        "tf": TIMEFRAMES[(i // len(SYMBOLS)) % len(TIMEFRAMES)],
+        "signal": "buy" if (i // 40) % 2 == 0 else "sell",
+        "price": 2650.0 + i * 0.01, "strategy": "LOGIC1",
+        "timestamp": (base + timedelta(seconds=i * 0.2)).isoformat()
+    } for i in range(calls)]
+
+    def prepare():
+        processor = AlertProcessor({})
+        return lambda: [processor.validate_alert(dict(data)) for data in alerts]
+    return prepare, calls, None
+
+
+def _trend_manager(work_dir):
+    manager = TimeframeTrendManager(os.path.join(work_dir, "bench_trends.json"), debounce_ms=60000)
+    set_aligned_trends(manager)
+    return manager
+
+
+def bench_trend_alignment(calls, work_dir):
+    manager = _trend_manager(work_dir)
+    queries = [(SYMBOLS[i % len(SYMBOLS)], LOGICS[i % len(LOGICS)]) for i in range(calls)]
+
+    def prepare():
+        return lambda: [manager.check_logic_alignment(symbol, logic) for symbol, logic in queries]
+    return prepare, calls, None
+
+
+def bench_trend_alignment_cold(calls, work_dir):
+    manager = _trend_manager(work_dir)
+    queries = [(SYMBOLS[i % len(SYMBOLS)], LOGICS[i % len(LOGICS)]) for i in range(calls)]
+
+    def run():
+        for symbol, logic in queries:
+            manager.invalidate_alignment(symbol)
+            manager.check_logic_alignment(symbol, logic)
+    return lambda: run, calls, None
+
+
+def bench_sl_price(calls, work_dir):
+    calculator = PipCalculator(make_config(work_dir))
+    rng = random.Random(1)
+    requests = [(symbol, SIMULATED_PRICES[symbol], rng.choice(["buy", "sell"]),
+                 rng.choice([0.01, 0.05, 0.1]), rng.choice([5000.0, 10000.0, 50000.0]))
+                for symbol in (rng.choice(SYMBOLS) for _ in range(calls))]
+
+    def prepare():
+        return lambda: [calculator.calculate_sl_price(*request) for request in requests]
+    return prepare, calls, None
+
+
+def _engine(work_dir):
+    config = make_config(work_dir)
+    risk_manager = RiskManager(config)
+    engine = TradingEngine(config, risk_manager, MT5Client(config), RecordingNotifier(), AlertProcessor(config))
+    set_aligned_trends(engine.trend_manager)
+    return engine
+
+
+def _close_engine(engine, loop):
+    engine.mt5.shutdown()
+    engine.events.close()
+    engine.db.close()
+    loop.close()
+
+
+def bench_open_trade_sweep(trades, work_dir):
+    engine = _engine(work_dir)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(engine.mt5.initialize())
+    rng = random.Random(2)
+    for i in range(trades):
+        engine.open_trades.add(make_trade(rng, SYMBOLS[i % len(SYMBOLS)], trade_id=i + 1))
+
+    def prepare():
+        return lambda: loop.run_until_complete(engine.sweep_open_trades())
+    return prepare, 1, lambda: _close_engine(engine, loop)
+
+
+def bench_profit_chain_checks(chains, work_dir):
+    engine = _engine(work_dir)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(engine.mt5.initialize())
+    manager = engine.profit_booking_manager
+    book = engine.open_trades
+    rng = random.Random(3)
+    ticket = 1
+    for i in range(chains):
+        symbol = SYMBOLS[i % len(SYMBOLS)]
+        root = make_trade(rng, symbol, trade_id=ticket, order_type="PROFIT_TRAIL")
+        ticket += 1
+        chain = manager.create_profit_chain(root)
+        book.add(root)
+        # Orders at the current level, priced so nothing reaches the target
+        for _ in range(3):
+            trade = make_trade(rng, symbol, trade_id=ticket, order_type="PROFIT_TRAIL",
+                               profit_chain_id=chain.chain_id, profit_level=0)
+            trade.entry = SIMULATED_PRICES[symbol]
+            chain.active_orders.append(ticket)
+            book.add(trade)
+            ticket += 1
+        root.entry = SIMULATED_PRICES[symbol]
+        book.reindex(root)
+
+    def run():
+        for chain in list(manager.get_all_chains().values()):
+            if manager.validate_chain_state(chain, book):
+                manager.check_profit_targets(chain, book, SIMULATED_PRICES[chain.symbol])
+    return lambda: run, chains, lambda: _close_engine(engine, loop)
+
+
+def bench_db_insert(rows, work_dir):
+    db = TradeDatabase(os.path.join(work_dir, "bench_insert.db"))
+    rng = random.Random(4)
+    counter = iter(range(1, 10 ** 9))
+
+    def prepare():
+        trades = []
+        for _ in range(rows):
+            trade = make_trade(rng, rng.choice(SYMBOLS), trade_id=next(counter))
+            trade.status = "closed"
+            trade.close_time = datetime.now().isoformat()
+            trade.pnl = rng.uniform(-20, 20)
+            trades.append(trade)
+
+        def run():
+            for trade in trades:
+                db.save_trade(trade)
+                db.record_pnl_rollup(trade)
+            db.flush(timeout=60)
+        return run
+    return prepare, rows, db.close
+
+
+def bench_db_query(rows, work_dir):
+    db = TradeDatabase(os.path.join(work_dir, "bench_query.db"))
+    rng = random.Random(5)
+    for i in range(rows):
+        trade = make_trade(rng, rng.choice(SYMBOLS), trade_id=i + 1)
+        trade.status = "closed"
+        trade.close_time = datetime.now().isoformat()
+        trade.pnl = rng.uniform(-20, 20)
+        db.save_trade(trade)
+        db.record_pnl_rollup(trade)
+    db.flush(timeout=60)
+    analytics = AnalyticsEngine(db)
+    queries = 20
+
+    def run():
+        for _ in range(queries // 2):
+            db.get_trade_history(days=30)
+            analytics.get_performance_report(days=30)
+    return lambda: run, queries, db.close
+
+
+def bench_reentry_check(calls, work_dir):
+    manager = ReEntryManager(make_config(work_dir))
+    rng = random.Random(6)
+    # Recent SL hits and TP completions on every symbol, one live chain each
+    for symbol in SYMBOLS:
+        trade = make_trade(rng, symbol, trade_id=rng.randint(1, 10 ** 6))
+        chain = manager.create_chain(trade)
+        trade.chain_id = chain.chain_id
+        manager.record_sl_hit(trade)
+        manager.record_tp_hit(trade, trade.tp)
+    signals = [(rng.choice(SYMBOLS), rng.choice(["buy", "sell"])) for _ in range(calls)]
+
+    def prepare():
+        return lambda: [manager.check_reentry_opportunity(symbol, signal, SIMULATED_PRICES[symbol])
+                        for symbol, signal in signals]
+    return prepare, calls, None
+
+
+def bench_event_journal_append(calls, work_dir):
+    # Small segments so the timing includes rotations
+    journal = EventJournal(os.path.join(work_dir, "events"), segment_size_mb=1, max_segments=4)
+    rng = random.Random(7)
+    trades = [make_trade(rng, rng.choice(SYMBOLS), trade_id=i + 1) for i in range(calls)]
+
+    def prepare():
+        return lambda: [journal.record_trade(EventType.FILL, trade) for trade in trades]
+    return prepare, calls, journal.close
+
+
+BENCHMARKS = {
+    "alert_validation": (bench_alert_validation, "calls"),
+    "trend_alignment": (bench_trend_alignment, "calls"),
+    "trend_alignment_cold": (bench_trend_alignment_cold, "calls"),
+    "sl_price": (bench_sl_price, "calls"),
+    "open_trade_sweep": (bench_open_trade_sweep, "trades"),
+    "profit_chain_checks": (bench_profit_chain_checks, "chains"),
+    "db_insert": (bench_db_insert, "db_rows"),
+    "db_query": (bench_db_query, "db_rows"),
+    "reentry_check": (bench_reentry_check, "calls"),
+    "event_journal_append": (bench_event_journal_append, "calls"),
+}
+
+
+def measure(prepare, ops, repeat):
+    """Per-op wall time over repeat runs (best / median / mean, microseconds)"""
+    samples = []
+    for _ in range(repeat):
+        run = prepare()
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) / ops * 1_000_000)
+    best = min(samples)
+    return {
+        "ops": ops,
+        "repeat": repeat,
+        "best_us": round(best, 3),
+        "median_us": round(statistics.median(samples), 3),
+        "mean_us": round(statistics.fmean(samples), 3),
+        "ops_per_sec": round(1_000_000 / best, 1) if best > 0 else None
+    }
+
+
+def run_suite(names, sizes, repeat):
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_") as work_dir:
+        for name in names:
+            bench, size_arg = BENCHMARKS[name]
+            for size in sizes[size_arg]:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    prepare, ops, cleanup = bench(size, work_dir)
+                    try:
+                        prepare()()  # warm-up
+                        result = measure(prepare, ops, repeat)
+                    finally:
+                        if cleanup is not None:
+                            cleanup()
+                result.update({"name": name, size_arg: size})
+                results.append(result)
+                print(f"{name:22s} {size_arg + '=' + str(size):16s} best {result['best_us']:12.2f} us/op  "
+                      f"median {result['median_us']:12.2f} us/op")
+        flush_all_state_writers()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def result_key(result):
+    size_arg = BENCHMARKS[result["name"]][1] if result["name"] in BENCHMARKS else None
+    return result["name"], result.get(size_arg)
+
+
+def print_comparison(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {result_key(r): r for r in json.load(f).get("results", [])}
+    print("=" * 60)
+    print(f"COMPARISON vs {baseline_path} (best us/op, negative = faster)")
+    print("=" * 60)
+    for result in results:
+        previous = baseline.get(result_key(result))
+        if previous is None or not previous.get("best_us"):
+            continue
+        change = (result["best_us"] - previous["best_us"]) / previous["best_us"] * 100
+        name, size = result_key(result)
+        print(f"{name:22s} {size!s:>7s}  {previous['best_us']:12.2f} -> {result['best_us']:12.2f}  {change:+7.1f}%")
+
+
+def parse_sizes(text):
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline micro-benchmarks of the engine's hot paths")
+    parser.add_argument("--calls", default="2000", help="Calls per run for per-call benchmarks (comma list)")
+    parser.add_argument("--trades", default="10,100,1000", help="Open trades for open_trade_sweep (comma list)")
+    parser.add_argument("--chains", default="10,100", help="Profit chains for profit_chain_checks (comma list)")
+    parser.add_argument("--db-rows", default="1000", help="Rows for db_insert / db_query (comma list)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", default="", help="Comma list of benchmark names")
+    parser.add_argument("--out", help="Write results as JSON")
+    parser.add_argument("--compare", help="Previous JSON results to compare against")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)} (choose from {', '.join(BENCHMARKS)})")
+    sizes = {
+        "calls": parse_sizes(args.calls),
+        "trades": parse_sizes(args.trades),
+        "chains": parse_sizes(args.chains),
+        "db_rows": parse_sizes(args.db_rows)
+    }
+
+    print("=" * 60)
+    print(f"BENCHMARK SUITE (best of {args.repeat})")
+    print("=" * 60)
+    results = run_suite(names, sizes, args.repeat)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "sizes": sizes
+        },
+        "results": results
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"Results written to {args.out}")
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Backtest / Replay
+Replays historical ticks (or OHLC bars) and webhook alerts through the real
+trading engine in event time and writes a trade ledger and metrics
+
+Usage: python scripts/run_backtest.py --ticks data/xauusd_m1.csv --alerts data/alerts.jsonl
+           [--override '{"re_entry_config": {"sl_hunt_offset_pips": 2.0}}'] [--override-file overrides.json]
+           [--balance 10000] [--out backtest_results] [--verbose]
+"""
+import sys
+import os
+import io
+import csv
+import json
+import asyncio
+import logging
+import argparse
+import contextlib
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.backtest.feeds import load_ticks, load_alerts
+from src.backtest.replay import ReplayEngine, deep_merge
+
+LEDGER_FIELDS = ["ticket", "symbol", "direction", "lot_size", "open_time", "open_price",
+                 "close_time", "close_price", "sl", "tp", "pnl", "comment"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay ticks and alerts through the trading engine")
+    parser.add_argument("--ticks", required=True, help="CSV: time,symbol,bid,ask or time,symbol,open,high,low,close")
+    parser.add_argument("--alerts", required=True, help="JSON lines (or array) of webhook alerts with timestamps")
+    parser.add_argument("--override", action="append", default=[], help="JSON config overrides (repeatable)")
+    parser.add_argument("--override-file", action="append", default=[], help="JSON file of config overrides")
+    parser.add_argument("--balance", type=float, default=10000.0)
+    parser.add_argument("--out", default="backtest_results", help="Output directory for ledger.csv / metrics.json")
+    parser.add_argument("--verbose", action="store_true", help="Show engine output instead of discarding it")
+    args = parser.parse_args()
+
+    overrides = {}
+    for path in args.override_file:
+        with open(path) as f:
+            deep_merge(overrides, json.load(f))
+    for text in args.override:
+        deep_merge(overrides, json.loads(text))
+
+    ticks = load_ticks(args.ticks)
+    alerts = load_alerts(args.alerts)
+    print(f"Loaded {len(ticks)} ticks and {len(alerts)} alerts")
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    engine = ReplayEngine(overrides, initial_balance=args.balance)
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        result = asyncio.run(engine.run(ticks, alerts))
+
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, "ledger.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=LEDGER_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(result.ledger)
+    with open(os.path.join(args.out, "metrics.json"), "w") as f:
+        json.dump(result.metrics, f, indent=4)
+
+    metrics = result.metrics
+    print("=" * 60)
+    print(f"BACKTEST {metrics['start']} -> {metrics['end']}")
+    print("=" * 60)
+    print(f"Trades:        {metrics['trades']} ({metrics['wins']} W / {metrics['losses']} L, {metrics['win_rate']}%)")
+    print(f"Net PnL:       ${metrics['net_pnl']:.2f} | Profit factor: {metrics['profit_factor']}")
+    print(f"Max drawdown:  ${metrics['max_drawdown']:.2f} | Final balance: ${metrics['final_balance']:.2f}")
+    print(f"Open at end:   {metrics['open_positions']} (unrealized ${metrics['unrealized_pnl']:.2f})")
+    print(f"Replay:        {metrics['ticks'] + metrics['alerts']} events in {metrics['replay_seconds']}s")
+    print(f"Results written to {args.out}/")
+
+
+if __name__ == "__main__":
+    main()
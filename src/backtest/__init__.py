@@ -0,0 +1 @@
+# Backtest / Replay
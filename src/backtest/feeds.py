@@ -0,0 +1,109 @@
+import csv
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+
+class TickEvent(NamedTuple):
+    """One top-of-book update from the tick/bar file"""
+    time: datetime
+    symbol: str
+    bid: float
+    ask: float
+
+
+class AlertEvent(NamedTuple):
+    """One webhook payload from the alert file"""
+    time: datetime
+    data: Dict[str, Any]
+
+
+def parse_time(value: Any) -> datetime:
+    """ISO-8601 string or epoch seconds -> naive local datetime (like datetime.now())"""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(float(value))
+    text = str(value).strip()
+    try:
+        return datetime.fromtimestamp(float(text))
+    except ValueError:
+        pass
+    parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = datetime.fromtimestamp(parsed.timestamp())
+    return parsed
+
+
+def load_ticks(path: str) -> List[TickEvent]:
+    """
+    Load a CSV price file, either
+    - ticks: time,symbol,bid,ask
+    - bars:  time,symbol,open,high,low,close[,spread] - expanded to four ticks
+      (open, low/high, high/low, close; the extreme nearer the open first)
+    Spread is in price units and applied to the ask
+    """
+    events: List[TickEvent] = []
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        columns = set(reader.fieldnames or [])
+        is_bars = {"open", "high", "low", "close"} <= columns
+        if not is_bars and not {"bid", "ask"} <= columns:
+            raise ValueError(f"{path}: expected time,symbol,bid,ask or time,symbol,open,high,low,close columns")
+
+        for row in reader:
+            when = parse_time(row["time"])
+            symbol = row["symbol"].strip()
+            if not is_bars:
+                events.append(TickEvent(when, symbol, float(row["bid"]), float(row["ask"])))
+                continue
+
+            spread = float(row.get("spread") or 0.0)
+            o, h, l, c = (float(row[k]) for k in ("open", "high", "low", "close"))
+            path_prices = (o, l, h, c) if abs(o - l) <= abs(h - o) else (o, h, l, c)
+            for price in path_prices:
+                events.append(TickEvent(when, symbol, price, price + spread))
+
+    events.sort(key=lambda e: e.time)
+    return events
+
+
+def load_alerts(path: str) -> List[AlertEvent]:
+    """
+    Load webhook alerts from JSON lines (or a JSON array)
+    Each alert needs a timestamp ("timestamp" or "time")
+    """
+    with open(path) as f:
+        text = f.read()
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        payloads = json.loads(stripped)
+    else:
+        payloads = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    events: List[AlertEvent] = []
+    for data in payloads:
+        raw_time = data.get("timestamp", data.pop("time", None))
+        if raw_time is None:
+            raise ValueError(f"{path}: alert without timestamp: {data}")
+        when = parse_time(raw_time)
+        data["timestamp"] = when.isoformat()
+        events.append(AlertEvent(when, data))
+
+    events.sort(key=lambda e: e.time)
+    return events
+
+
+def merge_events(ticks: List[TickEvent], alerts: List[AlertEvent]) -> Iterator[Any]:
+    """Event-time ordered stream; at equal times the tick comes first"""
+    i = j = 0
+    while i < len(ticks) or j < len(alerts):
+        if j >= len(alerts) or (i < len(ticks) and ticks[i].time <= alerts[j].time):
+            yield ticks[i]
+            i += 1
+        else:
+            yield alerts[j]
+            j += 1
+
+
+def first_event_time(ticks: List[TickEvent], alerts: List[AlertEvent]) -> Optional[datetime]:
+    times = [events[0].time for events in (ticks, alerts) if events]
+    return min(times) if times else None
@@ -0,0 +1,219 @@
+import copy
+import os
+import time
+import tempfile
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional
+from src.config import Config
+from src.managers.risk_manager import RiskManager
+from src.processors.alert_processor import AlertProcessor
+from src.core.trading_engine import TradingEngine
+from src.backtest.feeds import TickEvent, AlertEvent, merge_events, first_event_time
+from src.backtest.simulated_broker import SimulatedBroker
+from src.utils import clock
+from src.utils.clock import VirtualClock
+from src.utils.json_state_writer import flush_all_state_writers
+
+
+class BacktestResult(NamedTuple):
+    """Closed-trade ledger (broker fills) and summary metrics"""
+    ledger: List[Dict[str, Any]]
+    metrics: Dict[str, Any]
+
+
+class RecordingNotifier:
+    """Telegram stand-in: counts and keeps the last messages"""
+
+    def __init__(self, keep: int = 200):
+        self.keep = keep
+        self.count = 0
+        self.messages: List[str] = []
+
+    def send_message(self, message: str) -> bool:
+        self.count += 1
+        self.messages.append(message)
+        if len(self.messages) > self.keep:
+            del self.messages[0]
+        return True
+
+    def set_trend_manager(self, trend_manager):
+        pass
+
+
+def deep_merge(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Recursively apply override sections (re_entry_config, sl_systems, ...)"""
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            deep_merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+class ReplayEngine:
+    """
+    Deterministic replay of historical ticks and alerts through the real
+    TradingEngine, ReEntryManager, PriceMonitorService and
+    ProfitBookingManager in event time
+    - A VirtualClock replaces the wall clock for the whole run
+    - Ticks go to a SimulatedBroker, then engine.on_price_tick(symbol)
+    - Alerts are validated by AlertProcessor then engine.process_alert()
+      (an alert without a price gets the replayed mid price)
+    - engine.sweep_open_trades() runs every sweep_interval_seconds of event time
+    - Daily loss resets at daily_reset_time in event time
+    - Nothing touches the live config, trends, stats or database files
+    """
+
+    def __init__(self, config_overrides: Optional[Dict[str, Any]] = None,
+                 initial_balance: float = 10000.0, work_dir: Optional[str] = None):
+        self.config_overrides = config_overrides or {}
+        self.initial_balance = initial_balance
+        self.work_dir = work_dir
+
+    def _build_config(self, work_dir: str) -> Config:
+        config = Config()
+        config.config = deep_merge(copy.deepcopy(config.config), copy.deepcopy(self.config_overrides))
+        config.config_file = os.path.join(work_dir, "config.json")
+        config.writer = None
+
+        config.config["simulate_orders"] = False
+        database_config = config.config.setdefault("database_config", {})
+        database_config["path"] = os.path.join(work_dir, "backtest.db")
+        state_config = config.config.setdefault("state_writer_config", {})
+        state_config["trends_file"] = os.path.join(work_dir, "timeframe_trends.json")
+        state_config["stats_file"] = os.path.join(work_dir, "stats.json")
+        config.config.setdefault("tick_pump_config", {})["enabled"] = False
+        config.config.setdefault("event_journal_config", {})["directory"] = os.path.join(work_dir, "events")
+        return config
+
+    async def run(self, ticks: List[TickEvent], alerts: List[AlertEvent]) -> BacktestResult:
+        start = first_event_time(ticks, alerts)
+        if start is None:
+            raise ValueError("Nothing to replay: no ticks and no alerts")
+
+        virtual_clock = VirtualClock(start)
+        clock.set_clock(virtual_clock)
+        temp_dir = None
+        work_dir = self.work_dir
+        if work_dir is None:
+            temp_dir = tempfile.TemporaryDirectory(prefix="backtest_")
+            work_dir = temp_dir.name
+        os.makedirs(work_dir, exist_ok=True)
+
+        try:
+            config = self._build_config(work_dir)
+            risk_manager = RiskManager(config)
+            broker = SimulatedBroker(config, self.initial_balance)
+            notifier = RecordingNotifier()
+            alert_processor = AlertProcessor(config)
+            engine = TradingEngine(config, risk_manager, broker, notifier, alert_processor)
+            try:
+                await engine.mt5.initialize()
+                return await self._replay(engine, broker, notifier, alert_processor,
+                                          virtual_clock, ticks, alerts)
+            finally:
+                engine.mt5.shutdown()
+                engine.events.close()
+                engine.db.close()
+                flush_all_state_writers()
+        finally:
+            clock.set_clock(None)
+            if temp_dir is not None:
+                temp_dir.cleanup()
+
+    async def _replay(self, engine: TradingEngine, broker: SimulatedBroker,
+                      notifier: RecordingNotifier, alert_processor: AlertProcessor,
+                      virtual_clock: VirtualClock, ticks: List[TickEvent],
+                      alerts: List[AlertEvent]) -> BacktestResult:
+        config = engine.config
+        sweep_interval = timedelta(seconds=config.get("tick_pump_config", {}).get("sweep_interval_seconds", 5))
+        reset_hour, reset_minute = (int(x) for x in config.get("daily_reset_time", "03:35").split(":"))
+
+        def next_reset_after(when: datetime) -> datetime:
+            reset = when.replace(hour=reset_hour, minute=reset_minute, second=0, microsecond=0)
+            return reset if reset > when else reset + timedelta(days=1)
+
+        counts = {"ticks": 0, "alerts": 0, "alerts_accepted": 0, "alerts_rejected": 0,
+                  "sweeps": 0, "daily_resets": 0}
+        next_sweep = virtual_clock.now() + sweep_interval
+        next_reset = next_reset_after(virtual_clock.now())
+        wall_start = time.perf_counter()
+
+        for event in merge_events(ticks, alerts):
+            virtual_clock.set(event.time)
+
+            if event.time >= next_reset:
+                engine.risk_manager.reset_daily_loss()
+                counts["daily_resets"] += 1
+                next_reset = next_reset_after(event.time)
+
+            if isinstance(event, TickEvent):
+                counts["ticks"] += 1
+                broker.update_tick(event.symbol, event.bid, event.ask, event.time)
+                await engine.on_price_tick(event.symbol)
+            else:
+                counts["alerts"] += 1
+                data = dict(event.data)
+                quote = broker.get_quote(data.get("symbol", ""))
+                if not data.get("price") and quote is not None:
+                    data["price"] = quote.mid
+                alert = alert_processor.validate_alert(data)
+                if alert is None:
+                    counts["alerts_rejected"] += 1
+                else:
+                    counts["alerts_accepted"] += 1
+                    await engine.process_alert(alert)
+
+            if event.time >= next_sweep:
+                counts["sweeps"] += 1
+                await engine.sweep_open_trades()
+                next_sweep = event.time + sweep_interval
+
+        wall_seconds = time.perf_counter() - wall_start
+        # Trades closed on the same tick are ordered by ticket, not by the
+        # engine's (memory-keyed) trigger order
+        ledger = sorted(broker.ledger, key=lambda t: (t["close_time"], t["ticket"]))
+        metrics = summarize(ledger, self.initial_balance)
+        metrics.update(counts)
+        metrics.update({
+            "start": first_event_time(ticks, alerts).isoformat(),
+            "end": virtual_clock.now().isoformat(),
+            "open_positions": len(broker.positions),
+            "unrealized_pnl": round(broker.unrealized_pnl(), 2),
+            "rejected_orders": broker.rejected_orders,
+            "notifications": notifier.count,
+            "replay_seconds": round(wall_seconds, 3),
+            "events_per_second": round((counts["ticks"] + counts["alerts"]) / wall_seconds, 1) if wall_seconds > 0 else None
+        })
+        return BacktestResult(ledger, metrics)
+
+
+def summarize(ledger: List[Dict[str, Any]], initial_balance: float) -> Dict[str, Any]:
+    """Trade statistics and drawdown over the realized equity curve"""
+    pnls = [t["pnl"] for t in ledger]
+    wins = [p for p in pnls if p > 0]
+    losses = [p for p in pnls if p <= 0]
+    gross_profit = sum(wins)
+    gross_loss = -sum(losses)
+
+    equity = peak = initial_balance
+    max_drawdown = 0.0
+    for pnl in pnls:
+        equity += pnl
+        peak = max(peak, equity)
+        max_drawdown = max(max_drawdown, peak - equity)
+
+    return {
+        "trades": len(pnls),
+        "wins": len(wins),
+        "losses": len(losses),
+        "win_rate": round(len(wins) / len(pnls) * 100, 2) if pnls else 0.0,
+        "net_pnl": round(sum(pnls), 2),
+        "gross_profit": round(gross_profit, 2),
+        "gross_loss": round(gross_loss, 2),
+        "profit_factor": round(gross_profit / gross_loss, 3) if gross_loss > 0 else None,
+        "avg_win": round(gross_profit / len(wins), 2) if wins else 0.0,
+        "avg_loss": round(-gross_loss / len(losses), 2) if losses else 0.0,
+        "max_drawdown": round(max_drawdown, 2),
+        "final_balance": round(equity, 2)
+    }
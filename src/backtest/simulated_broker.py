@@ -0,0 +1,127 @@
+from types import SimpleNamespace
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from src.config import Config
+from src.clients.mt5_client import MT5Client, Quote, OrderIntent, OrderResult, BatchOrderResult
+from src.utils import clock
+
+
+class SimulatedBroker(MT5Client):
+    """
+    MT5Client stand-in for replays
+    - Quotes come from the replayed tick stream (update_tick)
+    - Market orders fill at the current ask (buy) / bid (sell), closes at the
+      opposite side; tickets are sequential so runs are deterministic
+    - SL/TP are not executed broker-side: the engine's own trigger checks
+      close trades, exactly as its backstop does live
+    - Every fill is recorded in a ledger with PnL from symbol_config
+    """
+
+    def __init__(self, config: Config, initial_balance: float = 10000.0):
+        super().__init__(config)
+        self.initial_balance = initial_balance
+        self.realized_pnl = 0.0
+        self.quotes: Dict[str, Quote] = {}
+        self.positions: Dict[int, Dict[str, Any]] = {}
+        self.ledger: List[Dict[str, Any]] = []
+        self.next_ticket = 1
+        self.rejected_orders = 0
+
+    def initialize(self) -> bool:
+        self.initialized = True
+        return True
+
+    def shutdown(self):
+        self.initialized = False
+
+    def update_tick(self, symbol: str, bid: float, ask: float, when: datetime):
+        """Apply one replayed price update"""
+        self.quotes[symbol] = Quote(symbol, bid, ask, (bid + ask) / 2, when.timestamp(), clock.monotonic())
+
+    def get_quote(self, symbol: str, max_age_ms: Optional[float] = None) -> Optional[Quote]:
+        return self.quotes.get(symbol)
+
+    def get_cached_quote(self, symbol: str, max_age_ms: Optional[float] = None) -> Optional[Quote]:
+        return self.quotes.get(symbol)
+
+    def place_order(self, symbol: str, order_type: str, lot_size: float,
+                    price: float, sl: float, tp: float = None, comment: str = "") -> Optional[int]:
+        quote = self.quotes.get(symbol)
+        if quote is None:
+            self.rejected_orders += 1
+            print(f"ERROR: Backtest order rejected - no price for {symbol} yet")
+            return None
+
+        ticket = self.next_ticket
+        self.next_ticket += 1
+        self.positions[ticket] = {
+            "ticket": ticket,
+            "symbol": symbol,
+            "direction": order_type,
+            "lot_size": lot_size,
+            "open_time": clock.now().isoformat(),
+            "open_price": quote.ask if order_type == "buy" else quote.bid,
+            "requested_price": price,
+            "sl": sl,
+            "tp": tp,
+            "comment": comment
+        }
+        return ticket
+
+    def place_orders(self, intents: List[OrderIntent]) -> BatchOrderResult:
+        results = []
+        for intent in intents:
+            trade_id = self.place_order(*intent)
+            error = None if trade_id else f"No price for {intent.symbol}"
+            results.append(OrderResult(intent, trade_id, error, 0.0))
+        return BatchOrderResult(results, 0.0)
+
+    def close_position(self, position_id: int, percentage: float = 100):
+        position = self.positions.pop(position_id, None)
+        if position is None:
+            return True  # Already closed, as MT5 reports a missing ticket
+
+        quote = self.quotes[position["symbol"]]
+        close_price = quote.bid if position["direction"] == "buy" else quote.ask
+        symbol_config = self.config["symbol_config"][position["symbol"]]
+        price_diff = close_price - position["open_price"]
+        if position["direction"] == "sell":
+            price_diff = -price_diff
+        pnl = price_diff / symbol_config["pip_size"] * symbol_config["pip_value_per_std_lot"] * position["lot_size"]
+
+        self.realized_pnl += pnl
+        position.update({
+            "close_time": clock.now().isoformat(),
+            "close_price": close_price,
+            "pnl": pnl
+        })
+        self.ledger.append(position)
+        return True
+
+    def get_current_price(self, symbol: str) -> float:
+        quote = self.quotes.get(symbol)
+        return quote.mid if quote else 0.0
+
+    def get_account_balance(self) -> float:
+        return self.initial_balance + self.realized_pnl
+
+    def get_positions(self) -> Optional[tuple]:
+        return tuple(
+            SimpleNamespace(
+                ticket=p["ticket"], symbol=p["symbol"], volume=p["lot_size"],
+                type=0 if p["direction"] == "buy" else 1, price_open=p["open_price"],
+                sl=p["sl"], tp=p["tp"]
+            )
+            for p in self.positions.values()
+        )
+
+    def unrealized_pnl(self) -> float:
+        """Open positions marked at the current bid/ask"""
+        total = 0.0
+        for p in self.positions.values():
+            quote = self.quotes[p["symbol"]]
+            symbol_config = self.config["symbol_config"][p["symbol"]]
+            price = quote.bid if p["direction"] == "buy" else quote.ask
+            diff = price - p["open_price"] if p["direction"] == "buy" else p["open_price"] - price
+            total += diff / symbol_config["pip_size"] * symbol_config["pip_value_per_std_lot"] * p["lot_size"]
+        return total
@@ -0,0 +1,197 @@
+import asyncio
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+from src.clients.mt5_client import MT5Client, Quote, OrderIntent, OrderResult, BatchOrderResult
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMT5Client:
+    """
+    Awaitable facade over MT5Client
+    - Every terminal call runs on one dedicated worker thread (the MetaTrader5
+      library is not thread-safe), so calls are serialized in submit order
+    - The event loop keeps serving webhooks and monitors while an order is
+      in flight
+    - Per-call timeouts for reads; on timeout the typed methods return the
+      same failure value as MT5Client (None/False/0.0). The terminal call
+      itself cannot be interrupted and still completes on the worker thread
+    - Order sends (place / close, run_order) are never abandoned: a timed-out
+      order_send can still open or close a position, so the caller waits for
+      the real result; calls slower than order_timeout are logged as slow
+    - Fresh cached quotes are served directly without a thread hop
+    """
+
+    def __init__(self, config, mt5_client: MT5Client):
+        self.client = mt5_client
+
+        async_config = config.get("mt5_async_config", {})
+        self.default_timeout = async_config.get("default_timeout_seconds", 10)
+        self.order_timeout = async_config.get("order_timeout_seconds", 30)
+        self.quote_timeout = async_config.get("quote_timeout_seconds", 5)
+        self.init_timeout = async_config.get("init_timeout_seconds", 300)
+
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mt5")
+
+        self.stats = {
+            "calls": 0,
+            "timeouts": 0,
+            "slow_calls": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "call_time_total_ms": 0.0,
+            "call_time_max_ms": 0.0
+        }
+
+    @property
+    def initialized(self) -> bool:
+        return self.client.initialized
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run a blocking callable on the MT5 worker thread
+        Use for read-only terminal calls. Raises asyncio.TimeoutError on
+        timeout - use run_order for anything that sends orders
+        """
+        if timeout is None:
+            timeout = self.default_timeout
+        return await self._run(getattr(fn, "__name__", "call"), fn, args, kwargs, timeout, wait=False)
+
+    async def run_order(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run an order-sending callable (e.g. a manager method placing orders)
+        on the worker thread and wait for its result however long it takes
+        """
+        return await self._run(getattr(fn, "__name__", "call"), fn, args, kwargs, self.order_timeout, wait=True)
+
+    async def _run(self, name: str, fn: Callable, args: tuple, kwargs: Dict[str, Any],
+                   timeout: float, wait: bool) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, partial(fn, *args, **kwargs))
+
+        self.stats["calls"] += 1
+        self.stats["in_flight"] += 1
+        start = time.perf_counter()
+        try:
+            try:
+                return await asyncio.wait_for(asyncio.shield(future) if wait else future, timeout=timeout)
+            except asyncio.TimeoutError:
+                if not wait:
+                    self.stats["timeouts"] += 1
+                    raise
+            # The order may still fill on the terminal - report what actually happened
+            self.stats["slow_calls"] += 1
+            logger.warning(f"MT5 {name} still running after {timeout}s - waiting for its result")
+            return await future
+        except asyncio.TimeoutError:
+            raise
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            self.stats["in_flight"] -= 1
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.stats["call_time_total_ms"] += elapsed_ms
+            if elapsed_ms > self.stats["call_time_max_ms"]:
+                self.stats["call_time_max_ms"] = elapsed_ms
+
+    async def _call(self, name: str, fn: Callable, *args, default: Any = None,
+                    timeout: Optional[float] = None, **kwargs) -> Any:
+        """run() that logs and returns default instead of raising"""
+        try:
+            return await self.run(fn, *args, timeout=timeout, **kwargs)
+        except asyncio.TimeoutError:
+            logger.error(f"MT5 {name} timed out after {timeout or self.default_timeout}s")
+            return default
+        except Exception as e:
+            logger.error(f"MT5 {name} error: {str(e)}")
+            return default
+
+    async def _call_order(self, name: str, fn: Callable, *args, default: Any = None, **kwargs) -> Any:
+        """run_order() that logs and returns default instead of raising"""
+        try:
+            return await self.run_order(fn, *args, **kwargs)
+        except Exception as e:
+            logger.error(f"MT5 {name} error: {str(e)}")
+            return default
+
+    async def initialize(self) -> bool:
+        """Connect to MT5 (login retries can take a while)"""
+        return await self._call(
+            "initialize", self.client.initialize,
+            default=False, timeout=self.init_timeout
+        )
+
+    async def place_order(self, symbol: str, order_type: str, lot_size: float,
+                          price: float, sl: float, tp: float = None,
+                          comment: str = "") -> Optional[int]:
+        """Awaitable MT5Client.place_order (waits for the terminal's answer)"""
+        return await self._call_order(
+            "place_order", self.client.place_order,
+            symbol=symbol, order_type=order_type, lot_size=lot_size,
+            price=price, sl=sl, tp=tp, comment=comment, default=None
+        )
+
+    async def place_orders(self, intents: List[OrderIntent]) -> BatchOrderResult:
+        """
+        Awaitable MT5Client.place_orders - the whole batch is one worker call,
+        awaited to completion so every placed order gets its ticket
+        """
+        if not intents:
+            return BatchOrderResult([], 0.0)
+        batch = await self._call_order(
+            "place_orders", self.client.place_orders, list(intents), default=None
+        )
+        if batch is None:
+            return BatchOrderResult(
+                [OrderResult(intent, None, "MT5 batch call failed", 0.0) for intent in intents], 0.0
+            )
+        return batch
+
+    async def close_position(self, position_id: int, percentage: float = 100) -> bool:
+        """Awaitable MT5Client.close_position (waits for the terminal's answer)"""
+        return await self._call_order(
+            "close_position", self.client.close_position, position_id, percentage, default=False
+        )
+
+    async def get_quote(self, symbol: str, max_age_ms: Optional[float] = None) -> Optional[Quote]:
+        """Awaitable MT5Client.get_quote (cache hits skip the worker thread)"""
+        cached = self.client.get_cached_quote(symbol, max_age_ms)
+        if cached is not None:
+            return cached
+        return await self._call(
+            "get_quote", self.client.get_quote, symbol, max_age_ms,
+            default=None, timeout=self.quote_timeout
+        )
+
+    async def get_current_price(self, symbol: str) -> float:
+        """Awaitable MT5Client.get_current_price"""
+        quote = await self.get_quote(symbol)
+        return quote.mid if quote else 0.0
+
+    async def get_account_balance(self) -> float:
+        """Awaitable MT5Client.get_account_balance"""
+        return await self._call(
+            "get_account_balance", self.client.get_account_balance,
+            default=0.0, timeout=self.default_timeout
+        )
+
+    async def get_positions(self) -> Optional[tuple]:
+        """Awaitable MT5Client.get_positions (None on API error)"""
+        return await self._call(
+            "get_positions", self.client.get_positions,
+            default=None, timeout=self.default_timeout
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Worker call counters"""
+        stats = dict(self.stats)
+        stats["avg_call_ms"] = (stats["call_time_total_ms"] / stats["calls"]) if stats["calls"] > 0 else 0.0
+        return stats
+
+    def shutdown(self):
+        """Stop the worker thread after queued calls finish"""
+        self.executor.shutdown(wait=True)
@@ -7,12 +7,80 @@ except ImportError:
 
 import time
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, NamedTuple
 from src.config import Config
 from src.models import Trade
+from src.utils import metrics
 
 logger = logging.getLogger(__name__)
 
+# Terminal call latency and failures (None/False results) by call type
+MT5_CALL_SECONDS = metrics.histogram(
+    "mt5_call_seconds", "MT5 terminal call latency in seconds", ["call"]
+)
+MT5_CALL_FAILURES = metrics.counter(
+    "mt5_call_failures_total", "MT5 terminal calls that failed or returned no result", ["call"]
+)
+
+# Dummy prices used when running without a live MT5 terminal
+SIMULATED_PRICES = {
+    "XAUUSD": 2650.0, "GOLD": 2650.0,
+    "EURUSD": 1.0850, "GBPUSD": 1.2650,
+    "USDJPY": 149.50, "USDCAD": 1.3550
+}
+
+class Quote(NamedTuple):
+    """Snapshot of a symbol's top of book"""
+    symbol: str
+    bid: float
+    ask: float
+    mid: float
+    time: float        # Tick time reported by the terminal (epoch seconds)
+    fetched_at: float  # time.monotonic() when the quote was fetched
+
+class OrderIntent(NamedTuple):
+    """One order for MT5Client.place_orders()"""
+    symbol: str
+    order_type: str
+    lot_size: float
+    price: float
+    sl: float
+    tp: Optional[float] = None
+    comment: str = ""
+
+class OrderResult(NamedTuple):
+    """Outcome of one OrderIntent"""
+    intent: OrderIntent
+    trade_id: Optional[int]
+    error: Optional[str]
+    latency_ms: float
+
+class BatchOrderResult(NamedTuple):
+    """Per-order results of place_orders(), in intent order"""
+    results: List[OrderResult]
+    wall_time_ms: float
+
+    @property
+    def trade_ids(self) -> List[Optional[int]]:
+        return [r.trade_id for r in self.results]
+
+    @property
+    def placed(self) -> int:
+        return sum(1 for r in self.results if r.trade_id)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.placed
+
+    @property
+    def partial(self) -> bool:
+        """Some orders placed and some failed"""
+        return 0 < self.placed < len(self.results)
+
+    @property
+    def errors(self) -> List[str]:
+        return [r.error for r in self.results if r.error]
+
 class MT5Client:
     def __init__(self, config: Config):
         self.config = config
@@ -21,6 +89,19 @@ class MT5Client:
         self.symbol_mapping = config.get("symbol_mapping", {})
         # Cache for symbol mappings to avoid repeated lookups and debug logs
         self.symbol_cache = {}
+        
+        # Shared quote cache - one terminal round trip per symbol per TTL window
+        quote_config = config.get("quote_cache_config", {})
+        self.quote_ttl_ms = quote_config.get("ttl_ms", 500)
+        self.symbol_quote_ttl_ms = quote_config.get("symbol_ttl_ms", {})
+        self.quote_cache: Dict[str, Quote] = {}
+        self.quote_stats = {
+            "hits": 0,
+            "misses": 0,
+            "errors": 0,
+            "fetch_time_total_ms": 0.0,
+            "fetch_time_max_ms": 0.0
+        }
 
     def _map_symbol(self, symbol: str) -> str:
         """
@@ -104,6 +185,7 @@ class MT5Client:
         
         return False
 
+    @metrics.timed(MT5_CALL_SECONDS, "place_order", MT5_CALL_FAILURES)
     def place_order(self, symbol: str, order_type: str, lot_size: float, 
                    price: float, sl: float, tp: float = None, 
                    comment: str = "") -> Optional[int]:
@@ -126,58 +208,21 @@ class MT5Client:
         mt5_symbol = self._map_symbol(symbol)
         
         try:
-            # Get symbol info using the mapped broker symbol
-            symbol_info = mt5.symbol_info(mt5_symbol)
+            symbol_info = self._prepare_symbol(mt5_symbol)
             if symbol_info is None:
-                print(f"ERROR: Symbol {mt5_symbol} not found in MT5")
                 return None
-                
-            if not symbol_info.visible:
-                print(f"Symbol {mt5_symbol} is not visible, attempting to enable")
-                if not mt5.symbol_select(mt5_symbol, True):
-                    print(f"ERROR: Failed to enable symbol {mt5_symbol}")
-                    return None
-            
-            # Determine order type and get current price
-            if order_type == "buy":
-                order_type_mt5 = mt5.ORDER_TYPE_BUY
-                price = mt5.symbol_info_tick(mt5_symbol).ask
-            else:
-                order_type_mt5 = mt5.ORDER_TYPE_SELL
-                price = mt5.symbol_info_tick(mt5_symbol).bid
-            
-            # Round prices to symbol's digit precision
-            digits = symbol_info.digits
-            price = round(price, digits)
-            sl = round(sl, digits)
-            if tp:
-                tp = round(tp, digits)
-            
-            # Prepare order request with mapped symbol
-            request = {
-                "action": mt5.TRADE_ACTION_DEAL,
-                "symbol": mt5_symbol,  # Use broker's symbol name
-                "volume": lot_size,
-                "type": order_type_mt5,
-                "price": price,
-                "sl": sl,
-                "deviation": 20,
-                "magic": 234000,
-                "comment": comment,
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": mt5.ORDER_FILLING_IOC,
-            }
             
-            # Add TP if provided
-            if tp:
-                request["tp"] = tp
+            tick = mt5.symbol_info_tick(mt5_symbol)
+            request = self._order_request(
+                mt5_symbol, symbol_info, tick, order_type, lot_size, sl, tp, comment
+            )
             
             # Send order to MT5
             result = mt5.order_send(request)
             
             if result.retcode != mt5.TRADE_RETCODE_DONE:
                 print(f"ERROR: Order failed: {result.comment} (Error code: {result.retcode})")
-                print(f"Request details: Symbol={mt5_symbol}, Lot={lot_size}, Price={price}, SL={sl}, TP={tp}")
+                print(f"Request details: Symbol={mt5_symbol}, Lot={lot_size}, Price={request['price']}, SL={request['sl']}, TP={request.get('tp')}")
                 return None
             
             print(f"SUCCESS: Order placed successfully: Ticket #{result.order}")
@@ -189,6 +234,129 @@ class MT5Client:
             traceback.print_exc()
             return None
 
+    @metrics.timed(MT5_CALL_SECONDS, "place_orders", MT5_CALL_FAILURES)
+    def place_orders(self, intents: List[OrderIntent]) -> BatchOrderResult:
+        """
+        Place several orders back to back in one call
+        Symbol info, visibility and the tick are resolved once per symbol and
+        requests are sent without other terminal traffic in between, so a
+        pyramid level is opened at (nearly) one price. Orders are independent:
+        a failure does not stop or roll back the others. A requote is retried
+        once with a fresh tick
+        """
+        start = time.perf_counter()
+        results: List[OrderResult] = []
+        
+        if not self.initialized:
+            if not self.initialize():
+                return BatchOrderResult(
+                    [OrderResult(intent, None, "MT5 not initialized", 0.0) for intent in intents],
+                    (time.perf_counter() - start) * 1000
+                )
+        
+        # Simulation mode
+        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+            import random
+            for intent in intents:
+                simulated_ticket = random.randint(100000, 999999)
+                print(f"SIMULATED ORDER: {intent.order_type.upper()} {intent.lot_size} lots {intent.symbol} @ {intent.price}, SL={intent.sl}, TP={intent.tp} (Ticket #{simulated_ticket})")
+                results.append(OrderResult(intent, simulated_ticket, None, 0.0))
+            return BatchOrderResult(results, (time.perf_counter() - start) * 1000)
+        
+        symbols: Dict[str, Any] = {}  # mt5_symbol -> (symbol_info, tick)
+        for intent in intents:
+            order_start = time.perf_counter()
+            trade_id, error = None, None
+            try:
+                mt5_symbol = self._map_symbol(intent.symbol)
+                if mt5_symbol not in symbols:
+                    symbol_info = self._prepare_symbol(mt5_symbol)
+                    tick = mt5.symbol_info_tick(mt5_symbol) if symbol_info is not None else None
+                    symbols[mt5_symbol] = (symbol_info, tick)
+                symbol_info, tick = symbols[mt5_symbol]
+                
+                if symbol_info is None or tick is None:
+                    error = f"Symbol {mt5_symbol} unavailable"
+                else:
+                    request = self._order_request(
+                        mt5_symbol, symbol_info, tick, intent.order_type,
+                        intent.lot_size, intent.sl, intent.tp, intent.comment
+                    )
+                    result = mt5.order_send(request)
+                    
+                    if result is not None and result.retcode in (mt5.TRADE_RETCODE_REQUOTE,
+                                                                  mt5.TRADE_RETCODE_PRICE_CHANGED):
+                        tick = mt5.symbol_info_tick(mt5_symbol)
+                        symbols[mt5_symbol] = (symbol_info, tick)
+                        request = self._order_request(
+                            mt5_symbol, symbol_info, tick, intent.order_type,
+                            intent.lot_size, intent.sl, intent.tp, intent.comment
+                        )
+                        result = mt5.order_send(request)
+                    
+                    if result is None:
+                        error = f"order_send failed: {mt5.last_error()}"
+                    elif result.retcode != mt5.TRADE_RETCODE_DONE:
+                        error = f"{result.comment} (Error code: {result.retcode})"
+                    else:
+                        trade_id = result.order
+            except Exception as e:
+                error = f"Order placement error: {str(e)}"
+            
+            if error:
+                print(f"ERROR: Order failed: {intent.symbol} {intent.order_type.upper()} {intent.lot_size} - {error}")
+            results.append(OrderResult(intent, trade_id, error, (time.perf_counter() - order_start) * 1000))
+        
+        batch = BatchOrderResult(results, (time.perf_counter() - start) * 1000)
+        print(f"Batch orders: {batch.placed}/{len(intents)} placed in {batch.wall_time_ms:.1f}ms")
+        return batch
+
+    def _prepare_symbol(self, mt5_symbol: str):
+        """Symbol info for a broker symbol, enabling it in Market Watch if needed"""
+        symbol_info = mt5.symbol_info(mt5_symbol)
+        if symbol_info is None:
+            print(f"ERROR: Symbol {mt5_symbol} not found in MT5")
+            return None
+            
+        if not symbol_info.visible:
+            print(f"Symbol {mt5_symbol} is not visible, attempting to enable")
+            if not mt5.symbol_select(mt5_symbol, True):
+                print(f"ERROR: Failed to enable symbol {mt5_symbol}")
+                return None
+        return symbol_info
+
+    def _order_request(self, mt5_symbol: str, symbol_info, tick, order_type: str,
+                       lot_size: float, sl: float, tp: Optional[float], comment: str) -> Dict[str, Any]:
+        """Market order request priced from tick (ask for buy, bid for sell)"""
+        if order_type == "buy":
+            order_type_mt5 = mt5.ORDER_TYPE_BUY
+            price = tick.ask
+        else:
+            order_type_mt5 = mt5.ORDER_TYPE_SELL
+            price = tick.bid
+        
+        # Round prices to symbol's digit precision
+        digits = symbol_info.digits
+        request = {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": mt5_symbol,  # Use broker's symbol name
+            "volume": lot_size,
+            "type": order_type_mt5,
+            "price": round(price, digits),
+            "sl": round(sl, digits),
+            "deviation": 20,
+            "magic": 234000,
+            "comment": comment,
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": mt5.ORDER_FILLING_IOC,
+        }
+        
+        # Add TP if provided
+        if tp:
+            request["tp"] = round(tp, digits)
+        return request
+
+    @metrics.timed(MT5_CALL_SECONDS, "close_position", MT5_CALL_FAILURES)
     def close_position(self, position_id: int, percentage: float = 100):
         """Close a position completely"""
         if not self.initialized:
@@ -253,23 +421,47 @@ class MT5Client:
             print(f"Position close error: {str(e)}")
             return False
 
-    def get_current_price(self, symbol: str) -> float:
+    def get_quote(self, symbol: str, max_age_ms: Optional[float] = None) -> Optional[Quote]:
         """
-        Get current price for a symbol with automatic mapping support
-        Handles both TradingView symbols and broker symbols
+        Get bid/ask/mid quote for a symbol through the shared quote cache
+        A cached quote is reused while it is younger than the symbol's TTL
+        (quote_cache_config.symbol_ttl_ms, falling back to ttl_ms)
         """
         if not self.initialized:
             if not self.initialize():
-                return 0.0
+                return None
+        
+        if max_age_ms is None:
+            max_age_ms = self.symbol_quote_ttl_ms.get(symbol, self.quote_ttl_ms)
+        
+        now = time.monotonic()
+        cached = self.quote_cache.get(symbol)
+        if cached is not None and (now - cached.fetched_at) * 1000 <= max_age_ms:
+            self.quote_stats["hits"] += 1
+            return cached
+        
+        self.quote_stats["misses"] += 1
+        quote = self._fetch_quote(symbol)
         
+        fetch_ms = (time.monotonic() - now) * 1000
+        self.quote_stats["fetch_time_total_ms"] += fetch_ms
+        if fetch_ms > self.quote_stats["fetch_time_max_ms"]:
+            self.quote_stats["fetch_time_max_ms"] = fetch_ms
+        
+        if quote is None:
+            self.quote_stats["errors"] += 1
+            return None
+        
+        self.quote_cache[symbol] = quote
+        return quote
+    
+    @metrics.timed(MT5_CALL_SECONDS, "tick", MT5_CALL_FAILURES)
+    def _fetch_quote(self, symbol: str) -> Optional[Quote]:
+        """Fetch a fresh quote from the terminal (or simulation prices)"""
         # Simulation mode - return dummy prices
         if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
-            dummy_prices = {
-                "XAUUSD": 2650.0, "GOLD": 2650.0,
-                "EURUSD": 1.0850, "GBPUSD": 1.2650,
-                "USDJPY": 149.50, "USDCAD": 1.3550
-            }
-            return dummy_prices.get(symbol, 1.0)
+            price = SIMULATED_PRICES.get(symbol, 1.0)
+            return Quote(symbol, price, price, price, time.time(), time.monotonic())
         
         # Map symbol to broker's format
         mt5_symbol = self._map_symbol(symbol)
@@ -277,10 +469,47 @@ class MT5Client:
         try:
             tick = mt5.symbol_info_tick(mt5_symbol)
             if tick:
-                return (tick.ask + tick.bid) / 2
-            return 0.0
-        except:
-            return 0.0
+                return Quote(
+                    symbol, tick.bid, tick.ask, (tick.ask + tick.bid) / 2,
+                    tick.time, time.monotonic()
+                )
+            return None
+        except Exception:
+            return None
+    
+    def get_cached_quote(self, symbol: str, max_age_ms: Optional[float] = None) -> Optional[Quote]:
+        """Cached quote if still fresh, never touches the terminal (None on miss)"""
+        if max_age_ms is None:
+            max_age_ms = self.symbol_quote_ttl_ms.get(symbol, self.quote_ttl_ms)
+        cached = self.quote_cache.get(symbol)
+        if cached is not None and (time.monotonic() - cached.fetched_at) * 1000 <= max_age_ms:
+            self.quote_stats["hits"] += 1
+            return cached
+        return None
+    
+    def invalidate_quotes(self, symbol: Optional[str] = None):
+        """Drop cached quotes (all symbols if symbol is None)"""
+        if symbol is None:
+            self.quote_cache.clear()
+        else:
+            self.quote_cache.pop(symbol, None)
+    
+    def get_quote_stats(self) -> Dict[str, Any]:
+        """Get quote cache hit/miss and fetch latency counters"""
+        stats = dict(self.quote_stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] / lookups * 100) if lookups > 0 else 0.0
+        stats["avg_fetch_ms"] = (stats["fetch_time_total_ms"] / stats["misses"]) if stats["misses"] > 0 else 0.0
+        stats["cached_symbols"] = len(self.quote_cache)
+        return stats
+
+    def get_current_price(self, symbol: str) -> float:
+        """
+        Get current mid price for a symbol with automatic mapping support
+        Served from the shared quote cache
+        """
+        quote = self.get_quote(symbol)
+        return quote.mid if quote else 0.0
 
     def get_account_balance(self) -> float:
         """Get current account balance"""
@@ -300,6 +529,26 @@ class MT5Client:
         except:
             return 0.0
 
+    @metrics.timed(MT5_CALL_SECONDS, "positions_get", MT5_CALL_FAILURES)
+    def get_positions(self) -> Optional[tuple]:
+        """
+        Get all open MT5 positions
+        Returns None on API error (or in simulation) so callers can tell
+        an error apart from "no positions"
+        """
+        if not self.initialized:
+            if not self.initialize():
+                return None
+        
+        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+            return None
+        
+        try:
+            return mt5.positions_get()
+        except Exception as e:
+            print(f"ERROR: MT5 positions error: {str(e)}")
+            return None
+
     def shutdown(self):
         """Shutdown MT5 connection gracefully"""
         if self.initialized:
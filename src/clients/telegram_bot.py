@@ -7,6 +7,16 @@ from src.config import Config
 from src.managers.risk_manager import RiskManager
 from src.services.analytics_engine import AnalyticsEngine
 from src.managers.timeframe_trend_manager import TimeframeTrendManager
+from src.clients.telegram_outbox import TelegramOutbox
+from src.utils import metrics
+
+TELEGRAM_SEND_SECONDS = metrics.histogram(
+    "telegram_send_seconds", "Telegram sendMessage request latency in seconds"
+)
+# reason: rate_limited (429), transient (5xx / network), rejected (4xx / other)
+TELEGRAM_SEND_FAILURES = metrics.counter(
+    "telegram_send_failures_total", "Telegram deliveries that failed", ["reason"]
+)
 
 if TYPE_CHECKING:
     from src.core.trading_engine import TradingEngine
@@ -94,24 +104,60 @@ class TelegramBot:
         }
         self.risk_manager = None
         self.trading_engine = None
-        self.analytics_engine = AnalyticsEngine()
+        self._analytics_engine = None
+        
+        # Non-blocking notification outbox (delivery happens on a sender thread)
+        outbox_config = config.get("telegram_outbox_config", {})
+        self.outbox = TelegramOutbox(
+            self._post_message,
+            max_queue_size=outbox_config.get("max_queue_size", 500),
+            max_retries=outbox_config.get("max_retries", 3),
+            retry_backoff_seconds=outbox_config.get("retry_backoff_seconds", 1.0),
+            max_backoff_seconds=outbox_config.get("max_backoff_seconds", 30.0),
+            min_send_interval_seconds=outbox_config.get("min_send_interval_seconds", 0.5)
+        )
 
     def set_dependencies(self, risk_manager: RiskManager, trading_engine: 'TradingEngine'):
         """Set dependent modules"""
         self.risk_manager = risk_manager
         self.trading_engine = trading_engine
 
+    @property
+    def analytics_engine(self) -> AnalyticsEngine:
+        """Built on the first analytics command, on the engine's database"""
+        if self._analytics_engine is None:
+            db = self.trading_engine.db if self.trading_engine is not None else None
+            self._analytics_engine = AnalyticsEngine(db)
+        return self._analytics_engine
+
     def set_trend_manager(self, trend_manager: TimeframeTrendManager):
         """Set trend manager"""
         self.trend_manager = trend_manager
         print("SUCCESS: Trend manager set in Telegram bot")
 
     def send_message(self, message: str):
-        """Send message to Telegram"""
+        """Queue message for Telegram delivery - returns immediately"""
         if not self.token or not self.chat_id:
             print("WARNING: Telegram credentials not configured - message not sent")
             return False
         
+        return self.outbox.enqueue(message)
+
+    def _post_message(self, message: str):
+        """
+        Deliver a single message to Telegram (runs on the outbox sender thread)
+        Returns: (delivered, retry_after_seconds, retryable)
+        """
+        start = time.perf_counter()
+        delivered, retry_after, retryable = self._send_request(message)
+        TELEGRAM_SEND_SECONDS.observe(time.perf_counter() - start)
+        if not delivered:
+            reason = "rate_limited" if retry_after is not None else "transient" if retryable else "rejected"
+            TELEGRAM_SEND_FAILURES.labels(reason).inc()
+        return delivered, retry_after, retryable
+
+    def _send_request(self, message: str):
+        """One sendMessage request, returns (delivered, retry_after_seconds, retryable)"""
         try:
             url = f"{self.base_url}/sendMessage"
             payload = {
@@ -121,16 +167,35 @@ class TelegramBot:
             }
             response = requests.post(url, json=payload, timeout=10)
             if response.status_code == 200:
-                return True
-            else:
-                print(f"WARNING: Telegram API error: Status {response.status_code}, Response: {response.text}")
-                return False
+                return True, None, False
+            
+            if response.status_code == 429:
+                # Rate limited - Telegram tells us how long to back off
+                retry_after = 1.0
+                try:
+                    retry_after = float(response.json().get("parameters", {}).get("retry_after", 1))
+                except Exception:
+                    pass
+                print(f"WARNING: Telegram rate limit hit, retrying after {retry_after}s")
+                return False, retry_after, True
+            
+            print(f"WARNING: Telegram API error: Status {response.status_code}, Response: {response.text}")
+            # 5xx errors are transient, 4xx (bad request/HTML) are not
+            return False, None, response.status_code >= 500
         except requests.exceptions.RequestException as e:
             print(f"WARNING: Telegram API request failed: {str(e)}")
-            return False
+            return False, None, True
         except Exception as e:
             print(f"WARNING: Telegram send_message error: {str(e)}")
-            return False
+            return False, None, False
+
+    def get_outbox_stats(self) -> Dict[str, Any]:
+        """Get notification outbox counters"""
+        return self.outbox.get_stats()
+
+    def shutdown(self, timeout: float = 5.0):
+        """Flush pending notifications and stop the sender thread"""
+        self.outbox.stop(timeout)
 
     def handle_start(self, message):
         """Handle /start command"""
@@ -658,6 +723,11 @@ class TelegramBot:
         msg += f"Total PnL: ${report['total_pnl']:.2f}\n"
         msg += f"Avg Win: ${report['average_win']:.2f}\n"
         msg += f"Avg Loss: ${report['average_loss']:.2f}"
+        curve = report['equity_curve'][-7:]
+        if curve:
+            msg += "\n\nDaily PnL (last 7 active days):\n"
+            for point in curve:
+                msg += f"{point['bucket_start']}: ${point['pnl']:.2f} (cum ${point['cumulative_pnl']:.2f})\n"
         self.send_message(msg)
 
     def handle_pair_report(self, message):
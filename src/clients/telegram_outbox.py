@@ -0,0 +1,156 @@
+import queue
+import threading
+import time
+import logging
+from typing import Callable, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sender callback result: (delivered, retry_after_seconds, retryable)
+DeliveryResult = Tuple[bool, Optional[float], bool]
+
+
+class TelegramOutbox:
+    """
+    Bounded, non-blocking outbox for Telegram notifications
+    - enqueue() returns immediately (safe to call from the asyncio loop)
+    - A daemon sender thread delivers messages in FIFO order
+    - Retries with exponential backoff, honours Telegram 429 retry_after
+    - When the queue is full the OLDEST message is dropped and counted
+    """
+
+    def __init__(self, deliver: Callable[[str], DeliveryResult],
+                 max_queue_size: int = 500, max_retries: int = 3,
+                 retry_backoff_seconds: float = 1.0, max_backoff_seconds: float = 30.0,
+                 min_send_interval_seconds: float = 0.5):
+        self.deliver = deliver
+        self.max_queue_size = max_queue_size
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.min_send_interval_seconds = min_send_interval_seconds
+
+        self.queue: "queue.Queue[str]" = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._last_send_time = 0.0
+        self._in_flight = 0
+
+        self.stats = {
+            "enqueued": 0,
+            "sent": 0,
+            "failed": 0,
+            "retried": 0,
+            "rate_limited": 0,
+            "dropped_overflow": 0
+        }
+
+    def start(self):
+        """Start the sender thread (idempotent)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._sender_loop, name="telegram-outbox", daemon=True
+            )
+            self._thread.start()
+
+    def enqueue(self, message: str) -> bool:
+        """Queue a message for delivery - never blocks the caller"""
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+
+        with self._lock:
+            while True:
+                try:
+                    self.queue.put_nowait(message)
+                    self.stats["enqueued"] += 1
+                    return True
+                except queue.Full:
+                    # Drop the oldest notification - newer state is more relevant
+                    try:
+                        self.queue.get_nowait()
+                        self.queue.task_done()
+                        self.stats["dropped_overflow"] += 1
+                    except queue.Empty:
+                        pass
+
+    def _sender_loop(self):
+        """Deliver queued messages until stopped"""
+        while not self._stop_event.is_set() or not self.queue.empty():
+            try:
+                message = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            self._in_flight = 1
+            try:
+                self._deliver_with_retry(message)
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.warning(f"Telegram outbox delivery error: {str(e)}")
+            finally:
+                self._in_flight = 0
+                self.queue.task_done()
+
+    def _deliver_with_retry(self, message: str):
+        """Send one message, retrying transient failures with backoff"""
+        backoff = self.retry_backoff_seconds
+
+        for attempt in range(self.max_retries + 1):
+            # Pace sends to stay under Telegram's per-chat rate limit
+            wait = self.min_send_interval_seconds - (time.monotonic() - self._last_send_time)
+            if wait > 0:
+                time.sleep(wait)
+
+            delivered, retry_after, retryable = self.deliver(message)
+            self._last_send_time = time.monotonic()
+
+            if delivered:
+                self.stats["sent"] += 1
+                return
+
+            if not retryable or attempt >= self.max_retries:
+                break
+
+            self.stats["retried"] += 1
+            if retry_after is not None:
+                self.stats["rate_limited"] += 1
+                delay = retry_after
+            else:
+                delay = backoff
+                backoff = min(backoff * 2, self.max_backoff_seconds)
+
+            # Wake up early if shutdown is requested
+            if self._stop_event.wait(min(delay, self.max_backoff_seconds)):
+                break
+
+        self.stats["failed"] += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until the queue is drained (True) or the timeout expires (False)"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.queue.empty() and not self._in_flight:
+                return True
+            if self._thread is None or not self._thread.is_alive():
+                return self.queue.empty()
+            time.sleep(0.05)
+        return False
+
+    def stop(self, timeout: float = 5.0):
+        """Flush pending messages and stop the sender thread"""
+        self.flush(timeout)
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get outbox counters and current queue depth"""
+        stats = dict(self.stats)
+        stats["queue_depth"] = self.queue.qsize()
+        stats["max_queue_size"] = self.max_queue_size
+        stats["running"] = self._thread is not None and self._thread.is_alive()
+        return stats
@@ -1,6 +1,7 @@
 import json
 import os
 from typing import Dict, Any
+from src.utils.json_state_writer import JsonStateWriter
 
 def safe_int_from_env(env_var: str, default: int = 0) -> int:
     """Safely parse integer from environment variable with normalization"""
@@ -77,8 +78,92 @@ class Config:
                 "multipliers": [1, 2, 4, 8, 16],
                 "profit_targets": [10, 20, 40, 80, 160],
                 "sl_reductions": [0, 10, 25, 40, 50]
+            },
+            "telegram_outbox_config": {
+                "max_queue_size": 500,
+                "max_retries": 3,
+                "retry_backoff_seconds": 1.0,
+                "max_backoff_seconds": 30.0,
+                "min_send_interval_seconds": 0.5
+            },
+            "quote_cache_config": {
+                "ttl_ms": 500,
+                "symbol_ttl_ms": {}
+            },
+            "tick_pump_config": {
+                "enabled": True,
+                "poll_interval_ms": 250,
+                "max_queue_size": 1000,
+                "sweep_interval_seconds": 5
+            },
+            "database_config": {
+                "path": "data/trading_bot.db",
+                "batch_interval_ms": 50,
+                "batch_max_ops": 200,
+                "reader_pool_size": 4,
+                "busy_timeout_ms": 5000
+            },
+            "alert_ingestion_config": {
+                "enabled": False,
+                "max_queue_per_symbol": 100,
+                "max_tracked_alerts": 1000,
+                "worker_idle_timeout_seconds": 300
+            },
+            "mt5_async_config": {
+                "default_timeout_seconds": 10,
+                "order_timeout_seconds": 30,
+                "quote_timeout_seconds": 5,
+                "init_timeout_seconds": 300
+            },
+            "alert_dedup_config": {
+                "window_seconds": 300,
+                "type_windows_seconds": {}
+            },
+            "state_writer_config": {
+                "debounce_ms": 500,
+                "trends_file": "config/timeframe_trends.json",
+                "stats_file": "data/stats.json"
+            },
+            "trend_alignment_config": {
+                "logic_rules": {},
+                "entry_logics": {}
+            },
+            "hot_path_logging_config": {
+                "interval_seconds": 30,
+                "sample_rate": 1.0,
+                "structured": False
+            },
+            "logging_config": {
+                "level": "INFO",
+                "console_level": "WARNING",
+                "json_lines": False,
+                "redirect_stdout": True,
+                "max_bytes": 10485760,
+                "backup_count": 5,
+                "max_queue_size": 10000,
+                "batch_size": 256
+            },
+            "mark_to_market_config": {
+                "include_open_loss_in_limits": False,
+                "quote_max_age_ms": 5000
+            },
+            "engine_state_config": {
+                "enabled": True,
+                "directory": "data/engine_state",
+                "journal_interval_ms": 250,
+                "snapshot_interval_seconds": 300,
+                "snapshot_max_journal_entries": 1000,
+                "fsync_journal": True
+            },
+            "event_journal_config": {
+                "enabled": True,
+                "directory": "data/events",
+                "segment_size_mb": 16,
+                "max_segments": 64,
+                "flush_interval_seconds": 1.0
             }
         }
+        self.writer = None
         self.load_config()
 
     def load_config(self):
@@ -122,10 +207,14 @@ class Config:
         else:
             self.config = self.default_config
             self.save_config()
+            self.writer.flush()
 
     def save_config(self):
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=4)
+        """Schedule a debounced atomic write of config.json"""
+        if self.writer is None:
+            debounce_ms = self.config.get("state_writer_config", {}).get("debounce_ms", 500)
+            self.writer = JsonStateWriter(self.config_file, lambda: self.config, debounce_ms)
+        self.writer.mark_dirty()
 
     def __getitem__(self, key):
         return self.config.get(key)
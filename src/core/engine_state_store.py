@@ -0,0 +1,357 @@
+import os
+import json
+import asyncio
+import logging
+import time
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from src.models import Trade, ReEntryChain, ProfitBookingChain
+from src.utils.json_state_writer import JsonStateWriter
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+# Price monitor dicts persisted as-is (symbol -> pending re-entry)
+PENDING_SECTIONS = ("sl_hunt_pending", "tp_continuation_pending", "exit_continuation_pending")
+# Re-entry manager event lists (symbol -> [{"time": datetime, ...}])
+EVENT_SECTIONS = ("recent_sl_hits", "completed_tps")
+ENGINE_FLAGS = ("is_paused", "logic1_enabled", "logic2_enabled", "logic3_enabled")
+
+
+def trade_key(trade: Trade) -> str:
+    """Stable key of an open trade (simulated trades have no ticket)"""
+    if trade.trade_id:
+        return str(trade.trade_id)
+    return f"sim:{trade.symbol}:{trade.open_time}:{trade.order_type}:{trade.profit_level}"
+
+
+def _dump(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+class EngineStateStore:
+    """
+    Crash recovery for the engine's in-memory state: a compact snapshot
+    plus an append-only journal of changes since the snapshot
+    - State is captured per record (open trades, re-entry and profit
+      chains, pending re-entries, recent SL/TP events, engine flags);
+      checkpoint() appends only the records that changed (upsert, or None
+      for a removal) as JSON lines
+    - Every snapshot_interval_seconds or snapshot_max_journal_entries the
+      whole state is written atomically and the journal is truncated
+    - restore() loads the snapshot, replays journal entries newer than it
+      (a torn last line is ignored) and puts the state back into the engine
+    - Runs every journal_interval_ms (capture on the event loop, diff and
+      fsync on a worker thread), so at most that window of changes is lost
+      on a crash; the hot path never checkpoints inline. stop() writes a
+      final snapshot
+    """
+
+    def __init__(self, engine, config: Dict[str, Any]):
+        self.engine = engine
+        self.enabled = config.get("enabled", True)
+        directory = config.get("directory", "data/engine_state")
+        self.snapshot_path = os.path.join(directory, "engine_state.json")
+        self.journal_path = os.path.join(directory, "engine_state.journal")
+        self.journal_interval_seconds = config.get("journal_interval_ms", 250) / 1000
+        self.snapshot_interval_seconds = config.get("snapshot_interval_seconds", 300)
+        self.snapshot_max_journal_entries = config.get("snapshot_max_journal_entries", 1000)
+        self.fsync_journal = config.get("fsync_journal", True)
+
+        self.seq = 0
+        # section -> key -> serialized record as last persisted
+        self._persisted: Dict[str, Dict[str, str]] = {}
+        self._snapshot_state: Dict[str, Dict[str, Any]] = {}
+        self._journal_file = None
+        self._journal_entries = 0
+        self._last_snapshot = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self._writer: Optional[JsonStateWriter] = None
+        # Background checkpoints persist on a worker thread, stop() on the loop
+        self._persist_lock = threading.Lock()
+        self.restored = False
+
+        self.stats = {
+            "checkpoints": 0,
+            "journal_entries": 0,
+            "snapshots": 0,
+            "errors": 0,
+            "last_checkpoint_ms": 0.0,
+            "max_checkpoint_ms": 0.0,
+            "restore_ms": 0.0,
+            "restored_records": 0
+        }
+
+    # ------------------------------------------------------------------
+    # Capture / apply
+    # ------------------------------------------------------------------
+
+    def capture(self) -> Dict[str, Dict[str, Any]]:
+        """Current engine state as JSON-ready records per section"""
+        engine = self.engine
+        monitor = engine.price_monitor
+        reentry = engine.reentry_manager
+        state: Dict[str, Dict[str, Any]] = {
+            "open_trades": {trade_key(t): t.model_dump() for t in list(engine.open_trades)
+                            if t.status != "closed"},
+            "reentry_chains": {cid: c.model_dump() for cid, c in list(reentry.active_chains.items())},
+            "profit_chains": {cid: c.model_dump()
+                              for cid, c in list(engine.profit_booking_manager.active_chains.items())},
+            "engine": {"flags": {name: getattr(engine, name) for name in ENGINE_FLAGS}}
+        }
+        for section in PENDING_SECTIONS:
+            state[section] = {symbol: dict(pending) for symbol, pending in list(getattr(monitor, section).items())}
+        for section in EVENT_SECTIONS:
+            state[section] = {
+                symbol: [dict(event, time=event["time"].isoformat()) for event in events]
+                for symbol, events in list(getattr(reentry, section).items()) if events
+            }
+        return state
+
+    def apply(self, state: Dict[str, Dict[str, Any]]) -> int:
+        """Put restored records back into the engine, returns the record count"""
+        engine = self.engine
+        monitor = engine.price_monitor
+        reentry = engine.reentry_manager
+        count = 0
+
+        for data in state.get("open_trades", {}).values():
+            engine.risk_manager.add_open_trade(Trade(**data))
+            count += 1
+        for chain_id, data in state.get("reentry_chains", {}).items():
+            reentry.active_chains[chain_id] = ReEntryChain(**data)
+            count += 1
+        for chain_id, data in state.get("profit_chains", {}).items():
+            engine.profit_booking_manager.active_chains[chain_id] = ProfitBookingChain(**data)
+            count += 1
+        for section in PENDING_SECTIONS:
+            pending = getattr(monitor, section)
+            for symbol, data in state.get(section, {}).items():
+                pending[symbol] = data
+                monitor.monitored_symbols.add(symbol)
+                count += 1
+        for section in EVENT_SECTIONS:
+            events = getattr(reentry, section)
+            for symbol, data in state.get(section, {}).items():
+                events[symbol] = [dict(event, time=datetime.fromisoformat(event["time"])) for event in data]
+                count += len(data)
+        for name, value in state.get("engine", {}).get("flags", {}).items():
+            if name in ENGINE_FLAGS:
+                setattr(engine, name, value)
+        return count
+
+    # ------------------------------------------------------------------
+    # Restore
+    # ------------------------------------------------------------------
+
+    def load(self) -> Tuple[Dict[str, Dict[str, Any]], int]:
+        """Snapshot plus newer journal entries, returns (state, last seq)"""
+        state: Dict[str, Dict[str, Any]] = {}
+        seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if snapshot.get("version") == SNAPSHOT_VERSION:
+                state = snapshot.get("state", {})
+                seq = snapshot.get("seq", 0)
+            else:
+                logger.warning(f"Ignoring engine snapshot version {snapshot.get('version')}")
+
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn write at the crash point - nothing after it is usable
+                        logger.warning("Engine journal ends with a partial entry, ignoring it")
+                        break
+                    if entry["seq"] <= seq:
+                        continue
+                    seq = entry["seq"]
+                    records = state.setdefault(entry["section"], {})
+                    if entry["value"] is None:
+                        records.pop(entry["key"], None)
+                    else:
+                        records[entry["key"]] = entry["value"]
+        return state, seq
+
+    def restore(self) -> int:
+        """Load the persisted state into the engine (once), returns records restored"""
+        if not self.enabled or self.restored:
+            return 0
+        self.restored = True
+        start = time.perf_counter()
+        try:
+            state, self.seq = self.load()
+            count = self.apply(state)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Engine state restore failed: {str(e)}")
+            return 0
+        self.stats["restore_ms"] = (time.perf_counter() - start) * 1000
+        self.stats["restored_records"] = count
+        if count:
+            logger.info(f"Restored {count} engine state records in {self.stats['restore_ms']:.1f}ms")
+        return count
+
+    # ------------------------------------------------------------------
+    # Persist
+    # ------------------------------------------------------------------
+
+    def _diff(self, state: Dict[str, Dict[str, Any]]) -> List[Tuple[str, str, Any, Optional[str]]]:
+        changes = []
+        for section, records in state.items():
+            persisted = self._persisted.get(section, {})
+            for key, value in records.items():
+                text = _dump(value)
+                if persisted.get(key) != text:
+                    changes.append((section, key, value, text))
+            for key in persisted:
+                if key not in records:
+                    changes.append((section, key, None, None))
+        return changes
+
+    def _remember(self, changes: List[Tuple[str, str, Any, Optional[str]]]):
+        for section, key, _, text in changes:
+            persisted = self._persisted.setdefault(section, {})
+            if text is None:
+                persisted.pop(key, None)
+            else:
+                persisted[key] = text
+
+    def _capture_for_checkpoint(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        # Never persist before restore - an empty engine would overwrite the saved state
+        if not self.enabled or not self.restored:
+            return None
+        try:
+            return self.capture()
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Engine state capture failed: {str(e)}")
+            return None
+
+    def checkpoint(self, force_snapshot: bool = False) -> int:
+        """Journal what changed since the last checkpoint, returns entries written"""
+        state = self._capture_for_checkpoint()
+        if state is None:
+            return 0
+        return self._persist(state, force_snapshot)
+
+    def _persist(self, state: Dict[str, Dict[str, Any]], force_snapshot: bool = False) -> int:
+        """Diff, journal (or snapshot) a captured state - safe to run off the event loop"""
+        with self._persist_lock:
+            start = time.perf_counter()
+            try:
+                if force_snapshot or self._snapshot_due():
+                    self.snapshot(state)
+                    written = 0
+                else:
+                    changes = self._diff(state)
+                    written = self._append(changes) if changes else 0
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Engine state checkpoint failed: {str(e)}")
+                return 0
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.stats["checkpoints"] += 1
+            self.stats["last_checkpoint_ms"] = elapsed_ms
+            if elapsed_ms > self.stats["max_checkpoint_ms"]:
+                self.stats["max_checkpoint_ms"] = elapsed_ms
+            return written
+
+    def _snapshot_due(self) -> bool:
+        return (self._journal_entries >= self.snapshot_max_journal_entries
+                or time.monotonic() - self._last_snapshot >= self.snapshot_interval_seconds)
+
+    def _append(self, changes: List[Tuple[str, str, Any, Optional[str]]]) -> int:
+        if self._journal_file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.journal_path)), exist_ok=True)
+            self._journal_file = open(self.journal_path, "a", encoding="utf-8")
+        lines = []
+        for section, key, value, _ in changes:
+            self.seq += 1
+            lines.append(_dump({"seq": self.seq, "section": section, "key": key, "value": value}))
+        self._journal_file.write("\n".join(lines) + "\n")
+        self._journal_file.flush()
+        if self.fsync_journal:
+            os.fsync(self._journal_file.fileno())
+        self._remember(changes)
+        self._journal_entries += len(changes)
+        self.stats["journal_entries"] += len(changes)
+        return len(changes)
+
+    def snapshot(self, state: Optional[Dict[str, Dict[str, Any]]] = None):
+        """Write the whole state atomically and start an empty journal"""
+        if state is None:
+            state = self.capture()
+        if self._writer is None:
+            self._writer = JsonStateWriter(self.snapshot_path, lambda: self._snapshot_state,
+                                           debounce_ms=0, indent=None)
+        self.seq += 1
+        self._snapshot_state = {
+            "version": SNAPSHOT_VERSION,
+            "seq": self.seq,
+            "saved_at": datetime.now().isoformat(),
+            "state": state
+        }
+        errors = self._writer.stats["errors"]
+        self._writer.mark_dirty()
+        if self._writer.stats["errors"] != errors:
+            raise IOError(f"Could not write {self.snapshot_path}")
+        # Entries up to seq are in the snapshot - restore skips them even if truncation is lost
+        if self._journal_file is not None:
+            self._journal_file.close()
+        self._journal_file = open(self.journal_path, "w", encoding="utf-8")
+        self._persisted = {section: {key: _dump(value) for key, value in records.items()}
+                           for section, records in state.items()}
+        self._journal_entries = 0
+        self._last_snapshot = time.monotonic()
+        self.stats["snapshots"] += 1
+
+    # ------------------------------------------------------------------
+    # Background checkpointing
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start periodic checkpoints on the running event loop"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.journal_interval_seconds)
+            # Capture on the loop (the engine mutates state there), serialize,
+            # diff and fsync on a worker thread
+            state = self._capture_for_checkpoint()
+            if state is not None:
+                await loop.run_in_executor(None, self._persist, state, False)
+
+    async def stop(self):
+        """Stop checkpointing and write a final snapshot"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.checkpoint(force_snapshot=True)
+        self.close()
+
+    def close(self):
+        """Close the journal file (no final snapshot)"""
+        with self._persist_lock:
+            if self._journal_file is not None:
+                self._journal_file.close()
+                self._journal_file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["enabled"] = self.enabled
+        stats["seq"] = self.seq
+        stats["pending_journal_entries"] = self._journal_entries
+        return stats
@@ -0,0 +1,433 @@
+import os
+import mmap
+import time
+import glob
+import struct
+import zlib
+import logging
+import threading
+from enum import IntEnum
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Union
+from datetime import datetime
+from src.utils import clock
+
+logger = logging.getLogger(__name__)
+
+
+class EventType(IntEnum):
+    ALERT_RECEIVED = 1
+    ALIGNMENT = 2
+    ORDER_INTENT = 3
+    FILL = 4
+    CLOSE = 5
+    REENTRY_REGISTERED = 6
+    REENTRY_TRIGGERED = 7
+    PROFIT_LEVEL = 8
+    ORDER_REJECTED = 9
+
+
+# Segment header: magic, version, record size, first seq, created (epoch seconds)
+SEGMENT_MAGIC = b"ZEJ1"
+SEGMENT_VERSION = 1
+_HEADER = struct.Struct("<4sHHQd")
+HEADER_SIZE = 64
+
+# Fixed 128 byte record: seq, time, type, side, level, ticket, price, lot,
+# value, symbol, strategy, ref - then a crc32 of the preceding bytes
+_BODY = struct.Struct("<QdBbh4xqddd12s12s44s")
+_CRC = struct.Struct("<I")
+RECORD_SIZE = _BODY.size + _CRC.size
+
+SEGMENT_PATTERN = "events-*.seg"
+
+
+class JournalEvent(NamedTuple):
+    seq: int
+    time: float
+    type: EventType
+    side: int
+    level: int
+    ticket: int
+    price: float
+    lot: float
+    value: float
+    symbol: str
+    strategy: str
+    ref: str
+
+    @property
+    def direction(self) -> Optional[str]:
+        return {1: "buy", -1: "sell"}.get(self.side)
+
+    @property
+    def datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.time)
+
+
+def _side(direction: Optional[str]) -> int:
+    if not direction:
+        return 0
+    direction = direction.lower()
+    if direction in ("buy", "bull", "bullish"):
+        return 1
+    if direction in ("sell", "bear", "bearish"):
+        return -1
+    return 0
+
+
+def _text(value: Any, size: int) -> bytes:
+    return str(value or "").encode("utf-8", "replace")[:size]
+
+
+def _decode(raw: bytes) -> str:
+    return raw.rstrip(b"\x00").decode("utf-8", "replace")
+
+
+def _timestamp(value: Union[None, float, datetime]) -> Optional[float]:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return value
+
+
+def _segment_path(directory: str, first_seq: int) -> str:
+    return os.path.join(directory, f"events-{first_seq:016d}.seg")
+
+
+def _segment_paths(directory: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(directory, SEGMENT_PATTERN)))
+
+
+def _unpack(buffer, offset: int) -> Optional[JournalEvent]:
+    """Record at offset, None at the end of the written area or a torn record"""
+    body = bytes(buffer[offset:offset + _BODY.size])
+    if len(body) < _BODY.size or body[:8] == b"\x00" * 8:
+        return None
+    (crc,) = _CRC.unpack_from(buffer, offset + _BODY.size)
+    if zlib.crc32(body) != crc:
+        return None
+    seq, ts, kind, side, level, ticket, price, lot, value, symbol, strategy, ref = _BODY.unpack(body)
+    try:
+        kind = EventType(kind)
+    except ValueError:
+        pass
+    return JournalEvent(seq, ts, kind, side, level, ticket, price, lot, value,
+                        _decode(symbol), _decode(strategy), _decode(ref))
+
+
+def _read_header(buffer) -> Optional[int]:
+    """First seq of a segment, None if the header is not a journal header"""
+    if len(buffer) < HEADER_SIZE:
+        return None
+    magic, version, record_size, first_seq, _ = _HEADER.unpack_from(buffer, 0)
+    if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION or record_size != RECORD_SIZE:
+        return None
+    return first_seq
+
+
+class EventJournal:
+    """
+    Append-only binary journal of engine decisions (alerts, alignment,
+    order intents, fills / rejections, closes, re-entries, profit-chain levels)
+    - Records have a fixed 128 byte struct layout copied straight
+      into a memory-mapped, preallocated segment file - no JSON, no fsync
+      or commit per event; the mapping is flushed every flush_interval_seconds
+      and on rotation / close
+    - A full segment is rotated to a new file named after its first seq;
+      only the newest max_segments are kept
+    - Each record carries a crc32, so a torn record at the end of the last
+      segment marks the end of the journal when it is reopened
+    - Files are created on the first record, constructing does no I/O
+    """
+
+    def __init__(self, directory: str = "data/events", segment_size_mb: float = 16,
+                 max_segments: int = 64, flush_interval_seconds: float = 1.0, enabled: bool = True):
+        self.directory = directory
+        self.enabled = enabled
+        self.records_per_segment = max(1, (int(segment_size_mb * 1024 * 1024) - HEADER_SIZE) // RECORD_SIZE)
+        self.segment_size = HEADER_SIZE + self.records_per_segment * RECORD_SIZE
+        self.max_segments = max_segments
+        self.flush_interval_seconds = flush_interval_seconds
+
+        self.seq = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._segment_path: Optional[str] = None
+        self._offset = 0
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._opened = False
+
+        self.stats = {
+            "records": 0,
+            "segments_created": 0,
+            "segments_removed": 0,
+            "flushes": 0,
+            "errors": 0
+        }
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "EventJournal":
+        return cls(
+            directory=config.get("directory", "data/events"),
+            segment_size_mb=config.get("segment_size_mb", 16),
+            max_segments=config.get("max_segments", 64),
+            flush_interval_seconds=config.get("flush_interval_seconds", 1.0),
+            enabled=config.get("enabled", True)
+        )
+
+    def record(self, event_type: EventType, symbol: str = "", direction: Optional[str] = None,
+               ticket: Optional[int] = None, price: float = 0.0, lot: float = 0.0,
+               value: float = 0.0, level: int = 0, strategy: str = "", ref: str = "") -> int:
+        """Append one event, returns its seq (0 when disabled or on error)"""
+        if not self.enabled:
+            return 0
+        with self._lock:
+            try:
+                if not self._opened:
+                    self._open()
+                if self._offset + RECORD_SIZE > self.segment_size:
+                    self._rotate()
+                seq = self.seq + 1
+                body = _BODY.pack(
+                    seq, clock.timestamp(), int(event_type), _side(direction), int(level or 0),
+                    int(ticket or 0), float(price or 0.0), float(lot or 0.0), float(value or 0.0),
+                    _text(symbol, 12), _text(strategy, 12), _text(ref, 44)
+                )
+                offset = self._offset
+                self._mmap[offset:offset + _BODY.size] = body
+                # Checksum written last: a record torn by a crash fails it
+                _CRC.pack_into(self._mmap, offset + _BODY.size, zlib.crc32(body))
+                self._offset = offset + RECORD_SIZE
+                self.seq = seq
+                self._dirty = True
+                self.stats["records"] += 1
+                if time.monotonic() - self._last_flush >= self.flush_interval_seconds:
+                    self._flush()
+                return seq
+            except Exception as e:
+                self.stats["errors"] += 1
+                if self.stats["errors"] == 1 or self.stats["errors"] % 1000 == 0:
+                    logger.error(f"Event journal write failed ({self.stats['errors']} errors): {e}")
+                return 0
+
+    def record_trade(self, event_type: EventType, trade, price: Optional[float] = None,
+                     value: float = 0.0, ref: str = "") -> int:
+        """Event for a Trade (ticket, symbol, side, lot, strategy and chain from the trade)"""
+        return self.record(
+            event_type, trade.symbol, trade.direction, ticket=trade.trade_id,
+            price=trade.entry if price is None else price, lot=trade.lot_size,
+            value=value, level=trade.profit_level, strategy=trade.strategy,
+            ref=ref or trade.profit_chain_id or trade.chain_id or trade.order_type
+        )
+
+    def _open(self):
+        """Resume after the last valid record of the newest segment"""
+        os.makedirs(self.directory, exist_ok=True)
+        self._opened = True
+        paths = _segment_paths(self.directory)
+        if paths:
+            path = paths[-1]
+            with open(path, "r+b") as handle:
+                size = os.fstat(handle.fileno()).st_size
+                first_seq = None
+                if size >= HEADER_SIZE:
+                    with mmap.mmap(handle.fileno(), 0) as existing:
+                        first_seq = _read_header(existing)
+            if first_seq is not None and size == self.segment_size:
+                self._map(path)
+                offset, seq = HEADER_SIZE, first_seq - 1
+                while offset + RECORD_SIZE <= self.segment_size:
+                    event = _unpack(self._mmap, offset)
+                    if event is None or event.seq != seq + 1:
+                        break
+                    seq = event.seq
+                    offset += RECORD_SIZE
+                # Clear a torn tail so readers stop at the same place
+                self._mmap[offset:offset + RECORD_SIZE] = b"\x00" * min(RECORD_SIZE, self.segment_size - offset)
+                self._offset = offset
+                self.seq = seq
+                return
+            # Segment from another size setting (or damaged) - continue after its records
+            self.seq = max((e.seq for e in EventJournalReader(self.directory).scan()), default=0)
+        self._new_segment()
+
+    def _map(self, path: str):
+        self._file = open(path, "r+b")
+        self._mmap = mmap.mmap(self._file.fileno(), self.segment_size)
+        self._segment_path = path
+
+    def _new_segment(self):
+        path = _segment_path(self.directory, self.seq + 1)
+        with open(path, "wb") as handle:
+            handle.truncate(self.segment_size)
+        self._map(path)
+        _HEADER.pack_into(self._mmap, 0, SEGMENT_MAGIC, SEGMENT_VERSION, RECORD_SIZE,
+                          self.seq + 1, clock.timestamp())
+        self._offset = HEADER_SIZE
+        self.stats["segments_created"] += 1
+        self._prune()
+
+    def _rotate(self):
+        self._close_segment()
+        self._new_segment()
+
+    def _prune(self):
+        paths = _segment_paths(self.directory)
+        for path in paths[:max(0, len(paths) - self.max_segments)]:
+            try:
+                os.remove(path)
+                self.stats["segments_removed"] += 1
+            except OSError as e:
+                logger.warning(f"Could not remove event segment {path}: {e}")
+
+    def _flush(self):
+        if self._mmap is not None and self._dirty:
+            self._mmap.flush()
+            self.stats["flushes"] += 1
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def _close_segment(self):
+        if self._mmap is not None:
+            self._flush()
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._close_segment()
+            self._opened = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "last_seq": self.seq,
+            "segment": os.path.basename(self._segment_path) if self._segment_path else None
+        }
+
+
+class EventJournalReader:
+    """
+    Reads the segments an EventJournal writes (the writer may be running)
+    - scan() yields events in seq order, optionally by time range, type and
+      symbol; segments that end before start are skipped without decoding
+    - tail() follows the journal, picking up new records and segments
+    - replay() feeds a scan to a handler
+    """
+
+    def __init__(self, directory: str = "data/events"):
+        self.directory = directory
+
+    def _read_segment(self, path: str, from_seq: int = 0) -> Iterator[JournalEvent]:
+        try:
+            with open(path, "rb") as handle:
+                if os.fstat(handle.fileno()).st_size < HEADER_SIZE:
+                    return
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    first_seq = _read_header(buffer)
+                    if first_seq is None:
+                        return
+                    offset = HEADER_SIZE
+                    if from_seq > first_seq:
+                        offset += (from_seq - first_seq) * RECORD_SIZE
+                    expected = None
+                    while offset + RECORD_SIZE <= len(buffer):
+                        event = _unpack(buffer, offset)
+                        if event is None or (expected is not None and event.seq != expected):
+                            return
+                        expected = event.seq + 1
+                        yield event
+                        offset += RECORD_SIZE
+        except FileNotFoundError:
+            # Pruned by the writer while reading
+            return
+
+    def _segments(self) -> List[tuple]:
+        """(first_seq, path) of every segment, oldest first"""
+        segments = []
+        for path in _segment_paths(self.directory):
+            try:
+                segments.append((int(os.path.basename(path)[7:-4]), path))
+            except ValueError:
+                continue
+        return segments
+
+    def _first_time(self, path: str) -> Optional[float]:
+        for event in self._read_segment(path):
+            return event.time
+        return None
+
+    def scan(self, start: Union[None, float, datetime] = None, end: Union[None, float, datetime] = None,
+             types=None, symbol: Optional[str] = None, from_seq: int = 0) -> Iterator[JournalEvent]:
+        """Events with start <= time < end (epoch seconds or datetimes)"""
+        start, end = _timestamp(start), _timestamp(end)
+        wanted = {int(t) for t in types} if types is not None else None
+        segments = self._segments()
+        for index, (first_seq, path) in enumerate(segments):
+            if index + 1 < len(segments):
+                if from_seq and segments[index + 1][0] <= from_seq:
+                    continue
+                if start is not None:
+                    next_first = self._first_time(segments[index + 1][1])
+                    if next_first is not None and next_first < start:
+                        continue
+            for event in self._read_segment(path, from_seq):
+                if event.seq < from_seq:
+                    continue
+                if start is not None and event.time < start:
+                    continue
+                if end is not None and event.time >= end:
+                    return
+                if wanted is not None and int(event.type) not in wanted:
+                    continue
+                if symbol is not None and event.symbol != symbol:
+                    continue
+                yield event
+
+    def tail(self, from_seq: Optional[int] = None, follow: bool = True, poll_interval: float = 0.2,
+             stop: Optional[Callable[[], bool]] = None) -> Iterator[JournalEvent]:
+        """
+        Events after from_seq (default: the end at the time of the call, like
+        tail -f); with follow the iterator polls for new records until stop()
+        """
+        if from_seq is None:
+            from_seq = self.last_seq()
+        return self._follow(from_seq + 1, follow, poll_interval, stop)
+
+    def _follow(self, next_seq: int, follow: bool, poll_interval: float,
+                stop: Optional[Callable[[], bool]]) -> Iterator[JournalEvent]:
+        while True:
+            for event in self.scan(from_seq=next_seq):
+                next_seq = event.seq + 1
+                yield event
+            if not follow or (stop is not None and stop()):
+                return
+            time.sleep(poll_interval)
+
+    def replay(self, handler: Callable[[JournalEvent], Any], start=None, end=None,
+               types=None, symbol: Optional[str] = None) -> int:
+        """Call handler for every matching event in order, returns the count"""
+        count = 0
+        for event in self.scan(start, end, types, symbol):
+            handler(event)
+            count += 1
+        return count
+
+    def last_seq(self) -> int:
+        segments = self._segments()
+        for _, path in reversed(segments):
+            last = 0
+            for event in self._read_segment(path):
+                last = event.seq
+            if last:
+                return last
+        return 0
@@ -0,0 +1,216 @@
+import math
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from src.models import Trade
+from src.core.price_trigger_index import PriceTriggerIndex
+from src.core.position_array_store import PositionArrayStore
+
+
+class OpenTradeBook:
+    """
+    Shared, indexed book of open trades
+    - One instance is shared by TradingEngine, RiskManager and the managers
+    - Indexed by trade_id, symbol, chain_id, profit_chain_id and
+      (profit_chain_id, profit_level) for O(1) insert/remove and
+      per-index lookups instead of full list scans
+    - List compatible (append, remove, in, len, iteration, slicing) so
+      existing callers keep working
+    - Owns a PriceTriggerIndex of SL/TP levels so price checks only visit
+      trades whose level was crossed
+    - Owns a PositionArrayStore (positions) for vectorized mark-to-market
+      of every open trade
+    - Trades are keyed by identity; if an indexed field (including sl/tp)
+      changes after the trade was added, call reindex(trade) or use
+      update_levels()
+    """
+
+    INDEXES = ("trade_id", "symbol", "chain_id", "profit_chain_id", "profit_level")
+
+    def __init__(self, trades: Optional[List[Trade]] = None,
+                 symbol_config: Optional[Dict[str, Any]] = None):
+        self._trades: Dict[int, Trade] = {}
+        self._keys: Dict[int, Tuple] = {}
+        self._index: Dict[str, Dict[Any, Dict[int, Trade]]] = {name: {} for name in self.INDEXES}
+        self.triggers = PriceTriggerIndex()
+        self.positions = PositionArrayStore(symbol_config)
+        for trade in trades or []:
+            self.add(trade)
+
+    @staticmethod
+    def _index_keys(trade: Trade) -> Tuple:
+        """Index keys for a trade, in INDEXES order (None = not indexed)"""
+        profit_chain_id = trade.profit_chain_id
+        return (
+            trade.trade_id,
+            trade.symbol,
+            trade.chain_id,
+            profit_chain_id,
+            (profit_chain_id, trade.profit_level) if profit_chain_id else None
+        )
+
+    def _link(self, key: int, trade: Trade):
+        keys = self._index_keys(trade)
+        for name, value in zip(self.INDEXES, keys):
+            if value is not None:
+                self._index[name].setdefault(value, {})[key] = trade
+        self._keys[key] = keys
+        self.triggers.add(key, trade)
+        self.positions.add(key, trade)
+
+    def _unlink(self, key: int):
+        self.triggers.remove(key)
+        self.positions.remove(key)
+        keys = self._keys.pop(key, None)
+        if keys is None:
+            return
+        for name, value in zip(self.INDEXES, keys):
+            if value is None:
+                continue
+            bucket = self._index[name].get(value)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self._index[name][value]
+
+    def add(self, trade: Trade):
+        """Add a trade (idempotent - re-adding refreshes its index entries)"""
+        key = id(trade)
+        if key in self._trades:
+            self.reindex(trade)
+            return
+        self._trades[key] = trade
+        self._link(key, trade)
+
+    def append(self, trade: Trade):
+        """List-compatible alias for add()"""
+        self.add(trade)
+
+    def discard(self, trade: Trade) -> bool:
+        """Remove a trade if present, returns True if it was removed"""
+        key = id(trade)
+        if key not in self._trades:
+            return False
+        del self._trades[key]
+        self._unlink(key)
+        return True
+
+    def remove(self, trade: Trade):
+        """List-compatible remove (raises ValueError if missing)"""
+        if not self.discard(trade):
+            raise ValueError("trade not in OpenTradeBook")
+
+    def reindex(self, trade: Trade):
+        """Refresh index entries after trade_id/symbol/chain, SL/TP or entry/lot fields changed"""
+        key = id(trade)
+        if key not in self._trades:
+            return
+        if (self._keys.get(key) == self._index_keys(trade) and self.triggers.is_current(key, trade)
+                and self.positions.is_current(key, trade)):
+            return
+        self._unlink(key)
+        self._link(key, trade)
+
+    def purge_closed(self) -> int:
+        """Drop trades whose status is closed, returns number removed"""
+        closed = [t for t in self._trades.values() if t.status == "closed"]
+        for trade in closed:
+            self.discard(trade)
+        return len(closed)
+
+    def clear(self):
+        """Remove all trades"""
+        self._trades.clear()
+        self._keys.clear()
+        for index in self._index.values():
+            index.clear()
+        self.triggers.clear()
+        self.positions.clear()
+
+    def update_levels(self, trade: Trade, sl: Optional[float] = None, tp: Optional[float] = None):
+        """Change a trade's SL and/or TP and keep the trigger index in sync"""
+        if sl is not None:
+            trade.sl = sl
+        if tp is not None:
+            trade.tp = tp
+        self.reindex(trade)
+
+    # Index lookups
+
+    def get_by_trade_id(self, trade_id) -> Optional[Trade]:
+        """Trade with the given MT5 ticket (None if not in the book)"""
+        bucket = self._index["trade_id"].get(trade_id)
+        if not bucket:
+            return None
+        return next(iter(bucket.values()))
+
+    def has_open_trade_id(self, trade_id) -> bool:
+        """True if an open trade with this ticket is in the book"""
+        bucket = self._index["trade_id"].get(trade_id)
+        return bool(bucket) and any(t.status == "open" for t in bucket.values())
+
+    def for_symbol(self, symbol: str) -> List[Trade]:
+        """Trades on a symbol"""
+        return list(self._index["symbol"].get(symbol, {}).values())
+
+    def for_chain(self, chain_id: str) -> List[Trade]:
+        """Trades in a re-entry chain"""
+        return list(self._index["chain_id"].get(chain_id, {}).values())
+
+    def for_profit_chain(self, profit_chain_id: str) -> List[Trade]:
+        """Trades in a profit booking chain (all levels)"""
+        return list(self._index["profit_chain_id"].get(profit_chain_id, {}).values())
+
+    def for_profit_level(self, profit_chain_id: str, level: int) -> List[Trade]:
+        """Trades in a profit booking chain at one level"""
+        return list(self._index["profit_level"].get((profit_chain_id, level), {}).values())
+
+    def has_profit_level(self, profit_chain_id: str, level: int) -> bool:
+        """True if any trade is in the profit chain level"""
+        return bool(self._index["profit_level"].get((profit_chain_id, level)))
+
+    def triggered(self, symbol: str, price: float) -> List[Trade]:
+        """Trades on symbol whose SL or TP is crossed at price"""
+        return self.triggers.triggered(symbol, price)
+
+    # Mark-to-market (PositionArrayStore)
+
+    def trade_pnl(self, trade: Trade, price: float) -> Optional[float]:
+        """Unrealized PnL of one trade at price (None if not in the book)"""
+        if trade not in self:
+            return None
+        return self.positions.position_pnl(id(trade), price)
+
+    def profit_level_pnl(self, profit_chain_id: str, level: int, price: float) -> List[Tuple[Trade, float]]:
+        """(trade, unrealized PnL) for a profit chain level, valued in one pass"""
+        keys, pnl = self.positions.level_pnl(profit_chain_id, level, price)
+        return [(self._trades[key], float(value)) for key, value in zip(keys, pnl)]
+
+    def trade_pnls(self, prices: Dict[str, float]) -> List[Tuple[Trade, Optional[float]]]:
+        """(trade, unrealized PnL or None if unpriced) for every trade in the book"""
+        pnl = self.positions.pnl_by_key(prices)
+        return [(trade, None if math.isnan(pnl[key]) else pnl[key]) for key, trade in self._trades.items()]
+
+    def mark_to_market(self, prices: Dict[str, float]) -> Dict[str, Any]:
+        """Total unrealized PnL and sums per symbol, profit chain and strategy"""
+        return self.positions.mark_to_market(prices)
+
+    def symbols(self) -> List[str]:
+        """Symbols with at least one trade in the book"""
+        return list(self._index["symbol"].keys())
+
+    # List protocol
+
+    def __iter__(self) -> Iterator[Trade]:
+        # Snapshot so callers may close/remove trades while iterating
+        return iter(list(self._trades.values()))
+
+    def __len__(self) -> int:
+        return len(self._trades)
+
+    def __contains__(self, trade) -> bool:
+        return id(trade) in self._trades and self._trades[id(trade)] is trade
+
+    def __getitem__(self, index):
+        return list(self._trades.values())[index]
+
+    def __repr__(self) -> str:
+        return f"OpenTradeBook({len(self)} trades)"
@@ -0,0 +1,249 @@
+from typing import Any, Dict, List, Optional, Tuple
+import threading
+import numpy as np
+from src.models import Trade
+
+
+class _Codes:
+    """Interns names (symbol, chain, strategy) to small integer codes"""
+
+    __slots__ = ("codes", "names")
+
+    def __init__(self, reserve_none: bool = False):
+        self.codes: Dict[Any, int] = {}
+        # Code 0 stands for "not set" when reserve_none (e.g. no profit chain)
+        self.names: List[Any] = [None] if reserve_none else []
+
+    def intern(self, name: Any) -> int:
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def clear(self, reserve_none: bool = False):
+        self.codes.clear()
+        self.names = [None] if reserve_none else []
+
+
+class PositionArrayStore:
+    """
+    Column store of open positions for vectorized mark-to-market
+    - One slot per trade: entry, lot, direction sign, pip_size,
+      pip_value_per_std_lot, symbol / profit chain / strategy codes and
+      profit level, plus the precomputed dollar-per-price-unit scale
+    - unrealized_pnl(prices) values every position in one NumPy expression:
+      (price[symbol_idx] - entry) * sign * pip_value * lot / pip_size
+    - Group sums per symbol, profit chain and strategy use np.bincount
+    - Maintained by OpenTradeBook on add/remove/reindex, keyed like the
+      PriceTriggerIndex; freed slots are reused
+    - Symbols missing from symbol_config (or without a price) value as NaN
+      and are left out of the sums
+    - Rows change on the event loop while RiskManager values the book from
+      the MT5 worker (can_trade) and the Telegram thread (get_stats), so
+      mutators and valuation share one lock
+    """
+
+    COLUMNS = ("entry", "lot", "sign", "pip_size", "pip_value", "scale",
+               "symbol_idx", "chain_code", "level", "strategy_code")
+
+    def __init__(self, symbol_config: Optional[Dict[str, Any]] = None, capacity: int = 64):
+        self.symbol_config = symbol_config if symbol_config is not None else {}
+        self._allocate(capacity)
+        self._slots: Dict[int, int] = {}
+        self._slot_keys: List[Optional[int]] = []
+        self._free: List[int] = []
+        # key -> (symbol, direction, entry, lot_size, profit_chain_id, profit_level, strategy) as stored
+        self._fields: Dict[int, Tuple] = {}
+        self._symbols = _Codes()
+        self._chains = _Codes(reserve_none=True)
+        self._strategies = _Codes()
+        # symbol code -> (pip_size, pip_value_per_std_lot), read once per symbol
+        self._specs: List[Tuple[float, float]] = []
+        self._lock = threading.Lock()
+
+    def _allocate(self, capacity: int):
+        self.entry = np.zeros(capacity)
+        self.lot = np.zeros(capacity)
+        self.sign = np.zeros(capacity)  # +1 buy, -1 sell, 0 free slot
+        self.pip_size = np.ones(capacity)
+        self.pip_value = np.zeros(capacity)
+        self.scale = np.zeros(capacity)  # sign * pip_value * lot / pip_size
+        self.symbol_idx = np.zeros(capacity, dtype=np.int32)
+        self.chain_code = np.zeros(capacity, dtype=np.int32)
+        self.level = np.zeros(capacity, dtype=np.int16)
+        self.strategy_code = np.zeros(capacity, dtype=np.int32)
+
+    def _grow(self):
+        columns = {name: getattr(self, name) for name in self.COLUMNS}
+        self._allocate(len(self.entry) * 2)
+        for name, old in columns.items():
+            getattr(self, name)[:len(old)] = old
+
+    @staticmethod
+    def _fields_of(trade: Trade) -> Tuple:
+        return (trade.symbol, trade.direction, trade.entry, trade.lot_size,
+                trade.profit_chain_id, trade.profit_level, trade.strategy)
+
+    def _symbol_code(self, symbol: str) -> int:
+        code = self._symbols.intern(symbol)
+        if code == len(self._specs):
+            spec = self.symbol_config.get(symbol, {})
+            self._specs.append((spec.get("pip_size", np.nan), spec.get("pip_value_per_std_lot", np.nan)))
+        return code
+
+    def add(self, key: int, trade: Trade):
+        """Store (or overwrite) a trade's position row"""
+        with self._lock:
+            self._add(key, trade)
+
+    def _add(self, key: int, trade: Trade):
+        slot = self._slots.get(key)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                slot = len(self._slot_keys)
+                if slot == len(self.entry):
+                    self._grow()
+                self._slot_keys.append(None)
+            self._slots[key] = slot
+            self._slot_keys[slot] = key
+
+        symbol_code = self._symbol_code(trade.symbol)
+        pip_size, pip_value = self._specs[symbol_code]
+        sign = 1.0 if trade.direction == "buy" else -1.0
+        self.entry[slot] = trade.entry
+        self.lot[slot] = trade.lot_size
+        self.sign[slot] = sign
+        self.pip_size[slot] = pip_size
+        self.pip_value[slot] = pip_value
+        self.scale[slot] = sign * pip_value * trade.lot_size / pip_size
+        self.symbol_idx[slot] = symbol_code
+        self.chain_code[slot] = self._chains.intern(trade.profit_chain_id) if trade.profit_chain_id else 0
+        self.level[slot] = trade.profit_level
+        self.strategy_code[slot] = self._strategies.intern(trade.strategy)
+        self._fields[key] = self._fields_of(trade)
+
+    def remove(self, key: int):
+        """Free a trade's slot (no-op if not stored)"""
+        with self._lock:
+            slot = self._slots.pop(key, None)
+            self._fields.pop(key, None)
+            if slot is None:
+                return
+            self._slot_keys[slot] = None
+            self.sign[slot] = 0.0
+            self.scale[slot] = 0.0
+            self.chain_code[slot] = 0
+            self._free.append(slot)
+
+    def is_current(self, key: int, trade: Trade) -> bool:
+        """True if the stored row still matches the trade"""
+        return self._fields.get(key) == self._fields_of(trade)
+
+    def clear(self):
+        with self._lock:
+            self._allocate(len(self.entry))
+            self._slots.clear()
+            self._slot_keys.clear()
+            self._free.clear()
+            self._fields.clear()
+            self._symbols.clear()
+            self._chains.clear(reserve_none=True)
+            self._strategies.clear()
+            self._specs.clear()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    # Valuation
+
+    def price_vector(self, prices: Dict[str, float]) -> np.ndarray:
+        """Prices by symbol code (NaN where missing or 0)"""
+        vector = np.full(len(self._symbols.names), np.nan)
+        for symbol, price in prices.items():
+            code = self._symbols.codes.get(symbol)
+            if code is not None and price:
+                vector[code] = price
+        return vector
+
+    def unrealized_pnl(self, prices: Dict[str, float]) -> np.ndarray:
+        """PnL in dollars per slot (NaN for free slots and unpriced symbols)"""
+        with self._lock:
+            return self._unrealized_pnl(prices)
+
+    def _unrealized_pnl(self, prices: Dict[str, float]) -> np.ndarray:
+        n = len(self._slot_keys)
+        if n == 0:
+            return np.zeros(0)
+        price = self.price_vector(prices)
+        pnl = (price[self.symbol_idx[:n]] - self.entry[:n]) * self.scale[:n]
+        pnl[self.sign[:n] == 0] = np.nan
+        return pnl
+
+    def pnl_by_key(self, prices: Dict[str, float]) -> Dict[int, float]:
+        """PnL per stored key (NaN where unpriced)"""
+        with self._lock:
+            pnl = self._unrealized_pnl(prices)
+            return {key: float(pnl[slot]) for key, slot in self._slots.items()}
+
+    def position_pnl(self, key: int, price: float) -> Optional[float]:
+        """One stored position at price (None if not stored or not valued)"""
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                return None
+            pnl = (price - self.entry[slot]) * self.scale[slot]
+        return None if np.isnan(pnl) else float(pnl)
+
+    def level_pnl(self, chain_id: str, level: int, price: float) -> Tuple[List[int], np.ndarray]:
+        """Keys and PnL of every position in a profit chain level at price"""
+        with self._lock:
+            code = self._chains.codes.get(chain_id)
+            n = len(self._slot_keys)
+            if code is None or n == 0:
+                return [], np.zeros(0)
+            slots = np.flatnonzero((self.chain_code[:n] == code) & (self.level[:n] == level))
+            pnl = (price - self.entry[slots]) * self.scale[slots]
+            return [self._slot_keys[i] for i in slots], pnl
+
+    @staticmethod
+    def _group(codes: np.ndarray, names: List[Any], pnl: np.ndarray,
+               valued: Optional[np.ndarray] = None) -> Dict[Any, float]:
+        if valued is None:
+            valued = ~np.isnan(pnl)
+        codes = codes[valued]
+        counts = np.bincount(codes, minlength=len(names))
+        sums = np.bincount(codes, weights=pnl[valued], minlength=len(names))
+        return {names[c]: float(sums[c]) for c in np.flatnonzero(counts) if names[c] is not None}
+
+    def pnl_by_symbol(self, prices: Dict[str, float]) -> Dict[str, float]:
+        with self._lock:
+            pnl = self._unrealized_pnl(prices)
+            return self._group(self.symbol_idx[:len(pnl)], self._symbols.names, pnl)
+
+    def pnl_by_chain(self, prices: Dict[str, float]) -> Dict[str, float]:
+        with self._lock:
+            pnl = self._unrealized_pnl(prices)
+            return self._group(self.chain_code[:len(pnl)], self._chains.names, pnl)
+
+    def pnl_by_strategy(self, prices: Dict[str, float]) -> Dict[str, float]:
+        with self._lock:
+            pnl = self._unrealized_pnl(prices)
+            return self._group(self.strategy_code[:len(pnl)], self._strategies.names, pnl)
+
+    def mark_to_market(self, prices: Dict[str, float]) -> Dict[str, Any]:
+        """Total and grouped unrealized PnL from one valuation pass"""
+        with self._lock:
+            pnl = self._unrealized_pnl(prices)
+            n = len(pnl)
+            valued = ~np.isnan(pnl)
+            return {
+                "unrealized_pnl": float(pnl[valued].sum()),
+                "positions": len(self._slots),
+                "valued_positions": int(np.count_nonzero(valued)),
+                "by_symbol": self._group(self.symbol_idx[:n], self._symbols.names, pnl, valued),
+                "by_chain": self._group(self.chain_code[:n], self._chains.names, pnl, valued),
+                "by_strategy": self._group(self.strategy_code[:n], self._strategies.names, pnl, valued)
+            }
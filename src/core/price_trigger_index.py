@@ -0,0 +1,132 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+from src.models import Trade
+
+# Sorted entries are (level, key) - key is the trade's identity in OpenTradeBook
+Entry = Tuple[float, int]
+
+
+class _SymbolTriggers:
+    """Sorted SL/TP levels for one symbol, split by direction"""
+
+    __slots__ = ("buy_sl", "buy_tp", "sell_sl", "sell_tp")
+
+    def __init__(self):
+        self.buy_sl: List[Entry] = []
+        self.buy_tp: List[Entry] = []
+        self.sell_sl: List[Entry] = []
+        self.sell_tp: List[Entry] = []
+
+    def is_empty(self) -> bool:
+        return not (self.buy_sl or self.buy_tp or self.sell_sl or self.sell_tp)
+
+
+class PriceTriggerIndex:
+    """
+    Per-symbol sorted index of open trade SL/TP levels
+    triggered(symbol, price) returns only trades whose SL or TP was crossed,
+    found with bisect in O(log n + k) instead of checking every trade:
+    - BUY:  SL hit when price <= sl, TP hit when price >= tp
+    - SELL: SL hit when price >= sl, TP hit when price <= tp
+    Maintained by OpenTradeBook on add/remove/reindex
+    """
+
+    def __init__(self):
+        self._symbols: Dict[str, _SymbolTriggers] = {}
+        self._trades: Dict[int, Trade] = {}
+        # key -> (symbol, direction, sl, tp) as indexed
+        self._levels: Dict[int, Tuple[str, str, float, float]] = {}
+
+    @staticmethod
+    def _remove_entry(levels: List[Entry], entry: Entry):
+        i = bisect_left(levels, entry)
+        if i < len(levels) and levels[i] == entry:
+            del levels[i]
+
+    def add(self, key: int, trade: Trade):
+        """Index a trade's current SL/TP levels"""
+        if key in self._levels:
+            self.remove(key)
+        triggers = self._symbols.get(trade.symbol)
+        if triggers is None:
+            triggers = self._symbols[trade.symbol] = _SymbolTriggers()
+
+        if trade.direction == "buy":
+            insort(triggers.buy_sl, (trade.sl, key))
+            insort(triggers.buy_tp, (trade.tp, key))
+        else:
+            insort(triggers.sell_sl, (trade.sl, key))
+            insort(triggers.sell_tp, (trade.tp, key))
+
+        self._trades[key] = trade
+        self._levels[key] = (trade.symbol, trade.direction, trade.sl, trade.tp)
+
+    def remove(self, key: int):
+        """Drop a trade's levels (no-op if not indexed)"""
+        indexed = self._levels.pop(key, None)
+        self._trades.pop(key, None)
+        if indexed is None:
+            return
+        symbol, direction, sl, tp = indexed
+        triggers = self._symbols.get(symbol)
+        if triggers is None:
+            return
+
+        if direction == "buy":
+            self._remove_entry(triggers.buy_sl, (sl, key))
+            self._remove_entry(triggers.buy_tp, (tp, key))
+        else:
+            self._remove_entry(triggers.sell_sl, (sl, key))
+            self._remove_entry(triggers.sell_tp, (tp, key))
+
+        if triggers.is_empty():
+            del self._symbols[symbol]
+
+    def is_current(self, key: int, trade: Trade) -> bool:
+        """True if the indexed levels still match the trade"""
+        return self._levels.get(key) == (trade.symbol, trade.direction, trade.sl, trade.tp)
+
+    def clear(self):
+        self._symbols.clear()
+        self._trades.clear()
+        self._levels.clear()
+
+    def triggered(self, symbol: str, price: float) -> List[Trade]:
+        """Trades on symbol whose SL or TP is crossed at price"""
+        triggers = self._symbols.get(symbol)
+        if triggers is None:
+            return []
+
+        keys = []
+        # BUY SL: sl >= price (suffix)
+        keys.extend(k for _, k in triggers.buy_sl[bisect_left(triggers.buy_sl, (price, -1)):])
+        # BUY TP: tp <= price (prefix)
+        keys.extend(k for _, k in triggers.buy_tp[:bisect_right(triggers.buy_tp, (price, float("inf")))])
+        # SELL SL: sl <= price (prefix)
+        keys.extend(k for _, k in triggers.sell_sl[:bisect_right(triggers.sell_sl, (price, float("inf")))])
+        # SELL TP: tp >= price (suffix)
+        keys.extend(k for _, k in triggers.sell_tp[bisect_left(triggers.sell_tp, (price, -1)):])
+
+        # A trade can cross both levels only if sl/tp are inverted - report it once
+        seen = set()
+        result = []
+        for key in keys:
+            if key not in seen:
+                seen.add(key)
+                result.append(self._trades[key])
+        return result
+
+    def nearest_levels(self, symbol: str) -> Optional[Dict[str, Optional[float]]]:
+        """Closest pending trigger levels per side (for diagnostics)"""
+        triggers = self._symbols.get(symbol)
+        if triggers is None:
+            return None
+        return {
+            "buy_sl_max": triggers.buy_sl[-1][0] if triggers.buy_sl else None,
+            "buy_tp_min": triggers.buy_tp[0][0] if triggers.buy_tp else None,
+            "sell_sl_min": triggers.sell_sl[0][0] if triggers.sell_sl else None,
+            "sell_tp_max": triggers.sell_tp[-1][0] if triggers.sell_tp else None
+        }
+
+    def __len__(self) -> int:
+        return len(self._levels)
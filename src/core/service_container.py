@@ -0,0 +1,171 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ServiceContainer:
+    """
+    Lazy dependency container for the bot's components
+    - Components are registered as factories (container -> instance) and
+      constructed on first access, so importing the app does no I/O
+    - Construction time is recorded per component (own time, excluding
+      dependencies it pulls in) for the startup report
+    - Startup phases (e.g. engine initialize) can be recorded alongside
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[["ServiceContainer"], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._order: List[str] = []
+        self._lock = threading.RLock()
+        # Stack of names under construction with the seconds spent on their dependencies
+        self._building: List[List[Any]] = []
+        self.construct_seconds: Dict[str, float] = {}
+        self.phase_seconds: Dict[str, float] = {}
+        self.import_seconds: Optional[float] = None
+
+    def register(self, name: str, factory: Callable[["ServiceContainer"], Any]):
+        """Register (or replace, before it is built) a component factory"""
+        if name in self._instances:
+            raise ValueError(f"Component {name} already constructed")
+        if name not in self._factories:
+            self._order.append(name)
+        self._factories[name] = factory
+
+    def provide(self, name: str, instance: Any):
+        """Register an already constructed component (tests, scripts)"""
+        if name not in self._factories:
+            self._order.append(name)
+        self._factories[name] = lambda c: instance
+        self._instances[name] = instance
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            if name in self._instances:
+                return self._instances[name]
+            factory = self._factories.get(name)
+            if factory is None:
+                raise KeyError(f"Unknown component: {name}")
+            if any(frame[0] == name for frame in self._building):
+                chain = " -> ".join([frame[0] for frame in self._building] + [name])
+                raise RuntimeError(f"Circular component dependency: {chain}")
+
+            frame = [name, 0.0]
+            self._building.append(frame)
+            start = time.perf_counter()
+            try:
+                instance = factory(self)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._building.pop()
+                if self._building:
+                    self._building[-1][1] += elapsed
+            self.construct_seconds[name] = elapsed - frame[1]
+            self._instances[name] = instance
+            return instance
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self.get(name)
+        except KeyError:
+            raise AttributeError(f"No component registered as {name}") from None
+
+    def is_built(self, name: str) -> bool:
+        return name in self._instances
+
+    def build_all(self):
+        """Construct every registered component in registration order"""
+        for name in self._order:
+            self.get(name)
+
+    def record_phase(self, name: str, seconds: float):
+        self.phase_seconds[name] = seconds
+
+    def report(self) -> Dict[str, Any]:
+        """Import / construction / startup phase timings in seconds"""
+        components = {name: round(self.construct_seconds[name], 6)
+                      for name in self._order if name in self.construct_seconds}
+        construct_total = sum(self.construct_seconds.values())
+        total = construct_total + sum(self.phase_seconds.values()) + (self.import_seconds or 0.0)
+        return {
+            "import_seconds": round(self.import_seconds, 6) if self.import_seconds is not None else None,
+            "construct_seconds": round(construct_total, 6),
+            "components": components,
+            "pending": [name for name in self._order if name not in self._instances],
+            "phases": {name: round(s, 6) for name, s in self.phase_seconds.items()},
+            "total_seconds": round(total, 6)
+        }
+
+    def format_report(self) -> str:
+        report = self.report()
+        parts = [f"{name} {seconds * 1000:.1f}ms" for name, seconds in report["components"].items()]
+        parts += [f"{name} {seconds * 1000:.1f}ms" for name, seconds in report["phases"].items()]
+        imported = report["import_seconds"]
+        head = f"import {imported * 1000:.1f}ms, " if imported is not None else ""
+        return f"Startup: {head}total {report['total_seconds'] * 1000:.1f}ms ({', '.join(parts)})"
+
+
+def create_services(config=None) -> ServiceContainer:
+    """
+    Container wired with the trading bot's components
+    Heavy modules (engine, managers, clients) are imported inside the
+    factories, so only the components actually used get imported and built
+    """
+    services = ServiceContainer()
+
+    def make_config(c):
+        from src.config import Config
+        return Config()
+
+    def make_log_pipeline(c):
+        from src.utils.log_pipeline import start_log_pipeline
+        return start_log_pipeline(c.config.get("logging_config", {}))
+
+    def make_risk_manager(c):
+        from src.managers.risk_manager import RiskManager
+        return RiskManager(c.config)
+
+    def make_mt5_client(c):
+        from src.clients.mt5_client import MT5Client
+        return MT5Client(c.config)
+
+    def make_telegram_bot(c):
+        from src.clients.telegram_bot import TelegramBot
+        return TelegramBot(c.config)
+
+    def make_alert_processor(c):
+        from src.processors.alert_processor import AlertProcessor
+        return AlertProcessor(c.config)
+
+    def make_trading_engine(c):
+        from src.core.trading_engine import TradingEngine
+        engine = TradingEngine(c.config, c.risk_manager, c.mt5_client, c.telegram_bot, c.alert_processor)
+        c.telegram_bot.set_dependencies(c.risk_manager, engine)
+        return engine
+
+    def make_alert_ingestion(c):
+        from src.services.alert_ingestion import AlertIngestionService
+        # Accept-and-ack webhook ingestion (per-symbol ordered worker queues)
+        return AlertIngestionService(
+            c.config,
+            c.trading_engine.process_alert,
+            on_error=lambda msg: c.telegram_bot.send_message(f"ERROR: {msg}")
+        )
+
+    if config is not None:
+        services.provide("config", config)
+    else:
+        services.register("config", make_config)
+    services.register("log_pipeline", make_log_pipeline)
+    services.register("risk_manager", make_risk_manager)
+    services.register("mt5_client", make_mt5_client)
+    services.register("telegram_bot", make_telegram_bot)
+    services.register("alert_processor", make_alert_processor)
+    services.register("trading_engine", make_trading_engine)
+    services.register("alert_ingestion", make_alert_ingestion)
+    return services
@@ -1,20 +1,35 @@
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, Set, Union
 from src.models import Alert, Trade, ReEntryChain, ProfitBookingChain
 from src.config import Config
 from src.managers.risk_manager import RiskManager
-from src.clients.mt5_client import MT5Client
+from src.clients.mt5_client import MT5Client, OrderIntent
+from src.clients.async_mt5_client import AsyncMT5Client
 from src.processors.alert_processor import AlertProcessor
-from src.database import TradeDatabase
+from src.database import get_database
 from src.utils.pip_calculator import PipCalculator
+from src.utils import clock
+from src.utils.hot_path_logger import HotPathLogger
+from src.utils import metrics
 from src.managers.timeframe_trend_manager import TimeframeTrendManager
 from src.managers.reentry_manager import ReEntryManager
 from src.services.price_monitor_service import PriceMonitorService
 from src.services.reversal_exit_handler import ReversalExitHandler
+from src.services.tick_pump import TickPump
+from src.core.open_trade_book import OpenTradeBook
+from src.core.engine_state_store import EngineStateStore
+from src.core.event_journal import EventJournal, EventType
 from src.managers.dual_order_manager import DualOrderManager
 from src.managers.profit_booking_manager import ProfitBookingManager
 import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+LOOP_CYCLE_SECONDS = metrics.histogram(
+    "loop_cycle_seconds", "Background loop cycle duration in seconds", ["loop"]
+)
 
 class TradingEngine:
     def __init__(self, config: Config, risk_manager: RiskManager, 
@@ -23,23 +38,41 @@ class TradingEngine:
         self.config = config
         self.risk_manager = risk_manager
         self.mt5_client = mt5_client
+        # Awaitable MT5 calls on a dedicated worker thread (shared with services)
+        self.mt5 = AsyncMT5Client(config, mt5_client)
+        # Rate-limited logging for per-entry / per-cycle records
+        self.hot_log = HotPathLogger.from_config(logger, config)
         self.telegram_bot = telegram_bot
         self.alert_processor = alert_processor
         
         # Risk manager ko MT5 client set karo
         self.risk_manager.set_mt5_client(mt5_client)
         
-        # Database for trade history
-        self.db = TradeDatabase()
+        # Shared database for trade history (write-behind, group commits, reader pool)
+        db_config = config.get("database_config", {})
+        self.db = get_database(
+            db_config.get("path", "data/trading_bot.db"),
+            batch_interval_ms=db_config.get("batch_interval_ms", 50),
+            batch_max_ops=db_config.get("batch_max_ops", 200),
+            reader_pool_size=db_config.get("reader_pool_size", 4),
+            busy_timeout_ms=db_config.get("busy_timeout_ms", 5000)
+        )
         
         # Core managers
         self.pip_calculator = PipCalculator(config)
-        self.trend_manager = TimeframeTrendManager()
+        state_config = config.get("state_writer_config", {})
+        self.trend_manager = TimeframeTrendManager(
+            config_file=state_config.get("trends_file", "config/timeframe_trends.json"),
+            debounce_ms=state_config.get("debounce_ms", 500),
+            logic_rules=config.get("trend_alignment_config", {}).get("logic_rules", {}),
+            entry_logics=config.get("trend_alignment_config", {}).get("entry_logics", {})
+        )
         self.reentry_manager = ReEntryManager(config)
         
         # NEW: Dual order and profit booking managers
         self.profit_booking_manager = ProfitBookingManager(
-            config, mt5_client, self.pip_calculator, risk_manager, self.db
+            config, mt5_client, self.pip_calculator, risk_manager, self.db,
+            async_mt5_client=self.mt5
         )
         # Pass profit SL calculator to dual order manager for Order B
         self.dual_order_manager = DualOrderManager(
@@ -50,27 +83,42 @@ class TradingEngine:
         # NEW: Advanced re-entry and exit handlers
         self.price_monitor = PriceMonitorService(
             config, mt5_client, self.reentry_manager, 
-            self.trend_manager, self.pip_calculator, self
+            self.trend_manager, self.pip_calculator, self,
+            async_mt5_client=self.mt5
         )
         self.reversal_handler = ReversalExitHandler(
-            config, mt5_client, telegram_bot, self.db, price_monitor=self.price_monitor
+            config, mt5_client, telegram_bot, self.db, price_monitor=self.price_monitor,
+            async_mt5_client=self.mt5
         )
         
         # Current signals per symbol
         self.current_signals = {}
         
-        self.open_trades: List[Trade] = []
+        # Indexed open trade book shared with the risk manager
+        self.open_trades: OpenTradeBook = risk_manager.open_trades
         self.is_paused = False
+        
+        # Event-driven price feed - per-symbol checks on quote change
+        self.tick_pump = TickPump(config, mt5_client, self.get_active_symbols, async_client=self.mt5)
+        self.tick_consumer_task = None
+        self.trade_check_lock = asyncio.Lock()
+        # Trades with a close in flight (close_trade awaits the terminal)
+        self.closing_trades: Set[int] = set()
         self.trade_count = 0
         
         # Logic control flags
         self.logic1_enabled = True
         self.logic2_enabled = True  
         self.logic3_enabled = True
+        
+        # Snapshot + journal of trades, chains and pending re-entries (restored in initialize)
+        self.state_store = EngineStateStore(self, config.get("engine_state_config", {}))
+        # Binary journal of every decision (alerts, alignment, orders, fills, closes, chains)
+        self.events = EventJournal.from_config(config.get("event_journal_config", {}))
 
     async def initialize(self):
         """Initialize the trading engine"""
-        success = self.mt5_client.initialize()
+        success = await self.mt5.initialize()
         if success:
             self.telegram_bot.send_message("✅ MT5 Connection Established")
             self.telegram_bot.set_trend_manager(self.trend_manager)
@@ -91,6 +139,9 @@ class TradingEngine:
                 f"  SL Reduction Per Level: {re_entry_config.get('sl_reduction_per_level', 0.5)}"
             )
             
+            # Pre-crash trades, chains and pending re-entries from the last snapshot + journal
+            restored = self.state_store.restore()
+            
             # Start background price monitor
             await self.price_monitor.start()
             
@@ -108,6 +159,13 @@ class TradingEngine:
                 # Clean up stale chains (fixes infinite loop spam)
                 self.profit_booking_manager.cleanup_stale_chains()
             
+            # Restored trades closed by the broker while the bot was down
+            if restored and not self.config["simulate_orders"]:
+                await self.reconcile_with_mt5()
+            # Fresh snapshot of the reconciled state, then journal changes in the background
+            self.state_store.checkpoint(force_snapshot=True)
+            self.state_store.start()
+            
             print("SUCCESS: Trading engine initialized successfully")
             print("SUCCESS: Price monitor service started")
             if self.profit_booking_manager.is_enabled():
@@ -124,11 +182,15 @@ class TradingEngine:
                 '1d': None
             }
 
-    async def process_alert(self, data: Dict[str, Any]) -> bool:
-        """Process incoming alert from webhook"""
+    async def process_alert(self, data: Union[Alert, Dict[str, Any]]) -> bool:
+        """Process incoming alert (the Alert from validate_alert, or a raw dict)"""
         try:
-            alert = Alert(**data)
+            alert = data if isinstance(data, Alert) else Alert(**data)
             symbol = alert.symbol
+            self.events.record(
+                EventType.ALERT_RECEIVED, symbol, alert.signal, price=alert.price or 0.0,
+                strategy=alert.tf, ref=alert.type
+            )
             
             # Initialize symbol signals if not exists
             self.initialize_symbol_signals(symbol)
@@ -145,10 +207,13 @@ class TradingEngine:
                         close_info['exit_price'],
                         close_info['exit_reason']
                     )
+                    if close_info['trade'].status == "closed":
+                        self.events.record_trade(
+                            EventType.CLOSE, close_info['trade'], price=close_info['exit_price'],
+                            value=close_info['trade'].pnl or 0.0, ref=close_info['exit_reason']
+                        )
                     # Remove from open trades
-                    if close_info['trade'] in self.open_trades:
-                        self.open_trades.remove(close_info['trade'])
-                        self.risk_manager.remove_closed_trade(close_info['trade'])
+                    self.risk_manager.remove_open_trade(close_info['trade'])
                     
                     # Stop TP continuation monitoring for this symbol (opposite signal received)
                     self.price_monitor.stop_tp_continuation(
@@ -197,39 +262,35 @@ class TradingEngine:
             
         symbol = alert.symbol
         
-        # Check if specific logic is enabled
-        if alert.tf == '5m' and not self.logic1_enabled:
-            return
-        if alert.tf == '15m' and not self.logic2_enabled:
+        # Determine which logic this trade belongs to (trend_alignment_config.entry_logics)
+        logic = self.trend_manager.logic_for_timeframe(alert.tf)
+        if logic is None:
             return
-        if alert.tf == '1h' and not self.logic3_enabled:
+        
+        # Check if specific logic is enabled (custom logics have no switch)
+        enabled = {"LOGIC1": self.logic1_enabled, "LOGIC2": self.logic2_enabled, "LOGIC3": self.logic3_enabled}
+        if not enabled.get(logic, True):
             return
             
         # Check risk limits before trading
-        if not self.risk_manager.can_trade():
+        if not await self.mt5.run(self.risk_manager.can_trade):
             self.telegram_bot.send_message("⛔ Trading paused due to risk limits")
             return
         
-        # Determine which logic this trade belongs to
-        if alert.tf == '5m':
-            logic = "LOGIC1"
-        elif alert.tf == '15m':
-            logic = "LOGIC2"
-        elif alert.tf == '1h':
-            logic = "LOGIC3"
-        else:
-            return
-        
         # Check trend alignment for the logic
         alignment = self.trend_manager.check_logic_alignment(symbol, logic)
+        signal_direction = "BULLISH" if alert.signal == "buy" else "BEARISH"
+        self.events.record(
+            EventType.ALIGNMENT, symbol, alert.signal, price=alert.price or 0.0,
+            value=1.0 if alignment["aligned"] and alignment["direction"] == signal_direction else 0.0,
+            strategy=logic, ref=str(alignment["direction"])
+        )
         
         if not alignment["aligned"]:
             print(f"ERROR: Trend not aligned for {logic}: {alignment['details']}")
             return
         
         # Check if signal matches the aligned direction
-        signal_direction = "BULLISH" if alert.signal == "buy" else "BEARISH"
-        
         if alignment["direction"] == signal_direction:
             # Check for re-entry opportunity
             reentry_info = self.reentry_manager.check_reentry_opportunity(
@@ -247,17 +308,22 @@ class TradingEngine:
         """Place a new trade order - now with dual orders (Order A: TP Trail, Order B: Profit Trail)"""
         try:
             # Get account balance and lot size
-            account_balance = self.mt5_client.get_account_balance()
+            account_balance = await self.mt5.get_account_balance()
             lot_size = self.risk_manager.get_fixed_lot_size(account_balance)
             
             if lot_size <= 0:
                 self.telegram_bot.send_message("⚠️ Invalid lot size")
                 return
+            self.events.record(
+                EventType.ORDER_INTENT, alert.symbol, alert.signal, price=alert.price,
+                lot=lot_size, strategy=strategy, ref="FRESH"
+            )
             
             # Check if dual orders enabled
             if self.dual_order_manager.is_enabled():
                 # Use dual order manager to create both orders
-                dual_result = self.dual_order_manager.create_dual_orders(
+                dual_result = await self.mt5.run_order(
+                    self.dual_order_manager.create_dual_orders,
                     alert, strategy, account_balance
                 )
                 
@@ -272,6 +338,7 @@ class TradingEngine:
                     self.open_trades.append(order_a)
                     self.risk_manager.add_open_trade(order_a)
                     self.db.save_trade(order_a)
+                    self.events.record_trade(EventType.FILL, order_a)
                     self.trade_count += 1
                 
                 # Handle Order B (Profit Trail)
@@ -287,6 +354,15 @@ class TradingEngine:
                     self.open_trades.append(order_b)
                     self.risk_manager.add_open_trade(order_b)
                     self.db.save_trade(order_b)
+                    self.events.record_trade(EventType.FILL, order_b)
+                
+                for placed, order_type in ((dual_result["order_a_placed"], "TP_TRAIL"),
+                                           (dual_result["order_b_placed"], "PROFIT_TRAIL")):
+                    if not placed:
+                        self.events.record(
+                            EventType.ORDER_REJECTED, alert.symbol, alert.signal, price=alert.price,
+                            lot=lot_size, strategy=strategy, ref=order_type
+                        )
                 
                 # Send notification
                 rr_ratio = self.config.get("rr_ratio", 1.0)
@@ -354,21 +430,20 @@ class TradingEngine:
                 alert.price, sl_price, alert.signal, self.config.get("rr_ratio", 1.0)
             )
             
-            # Log SL/TP calculation details
             sl_pips = abs(alert.price - sl_price) / symbol_config["pip_size"]
             tp_pips = abs(tp_price - alert.price) / symbol_config["pip_size"]
-            print(f"SL/TP Calculation:")
-            print(f"   Symbol: {alert.symbol} | Lot: {lot_size:.2f}")
-            print(f"   Entry: {alert.price:.5f}")
-            print(f"   SL: {sl_price:.5f} ({sl_pips:.1f} pips)")
-            print(f"   TP: {tp_price:.5f} ({tp_pips:.1f} pips)")
-            print(f"   Risk: ${account_tier} tier | Volatility: {symbol_config['volatility']}")
             
             # Validate trade risk before execution
             validation = self.pip_calculator.validate_trade_risk(
                 alert.symbol, lot_size, sl_pips, account_balance
             )
-            print(f"   {validation['message']}")
+            # Log SL/TP calculation details (repeats for the same setup are rate-limited)
+            self.hot_log.info(
+                "SL_TP_CALCULATION", alert.symbol, (alert.signal, lot_size, sl_pips, tp_pips),
+                Lot=lot_size, Entry=alert.price, SL=sl_price, SLPips=round(sl_pips, 1),
+                TP=tp_price, TPPips=round(tp_pips, 1), Tier=account_tier,
+                Volatility=symbol_config['volatility'], Risk=validation['message']
+            )
             
             if not validation["valid"]:
                 warning = (
@@ -389,14 +464,14 @@ class TradingEngine:
                 lot_size=lot_size,
                 direction=alert.signal,
                 strategy=strategy,
-                open_time=datetime.now().isoformat(),
+                open_time=clock.now().isoformat(),
                 original_entry=alert.price,
                 original_sl_distance=sl_distance
             )
             
             # Execute trade
             if not self.config.get("simulate_orders", False):
-                trade_id = self.mt5_client.place_order(
+                trade_id = await self.mt5.place_order(
                     symbol=alert.symbol,
                     order_type=alert.signal,
                     lot_size=lot_size,
@@ -408,6 +483,7 @@ class TradingEngine:
                 if trade_id:
                     trade.trade_id = trade_id
                 else:
+                    self.events.record_trade(EventType.ORDER_REJECTED, trade)
                     self.telegram_bot.send_message(f"❌ Order placement failed for {alert.symbol}")
                     return
             
@@ -421,6 +497,7 @@ class TradingEngine:
             self.open_trades.append(trade)
             self.risk_manager.add_open_trade(trade)
             self.db.save_trade(trade)
+            self.events.record_trade(EventType.FILL, trade)
             self.trade_count += 1
             
             # Send notification
@@ -449,7 +526,7 @@ class TradingEngine:
         """Place a re-entry trade - now with dual orders (Order A: TP Trail, Order B: Profit Trail)"""
         try:
             # Get account balance and lot size
-            account_balance = self.mt5_client.get_account_balance()
+            account_balance = await self.mt5.get_account_balance()
             lot_size = self.risk_manager.get_fixed_lot_size(account_balance)
             
             # Get original SL distance from chain
@@ -458,6 +535,14 @@ class TradingEngine:
                 # No chain found, place fresh order instead
                 await self.place_fresh_order(alert, strategy)
                 return
+            self.events.record(
+                EventType.REENTRY_TRIGGERED, alert.symbol, alert.signal, price=alert.price,
+                level=reentry_info["level"], strategy=strategy, ref=reentry_info["chain_id"]
+            )
+            self.events.record(
+                EventType.ORDER_INTENT, alert.symbol, alert.signal, price=alert.price, lot=lot_size,
+                level=reentry_info["level"], strategy=strategy, ref=reentry_info["chain_id"]
+            )
             
             # Calculate adjusted SL distance for re-entry level
             adjusted_sl_distance = self.pip_calculator.adjust_sl_for_reentry(
@@ -486,7 +571,7 @@ class TradingEngine:
                     lot_size=lot_size,
                     direction=alert.signal,
                     strategy=strategy,
-                    open_time=datetime.now().isoformat(),
+                    open_time=clock.now().isoformat(),
                     chain_id=reentry_info["chain_id"],
                     chain_level=reentry_info["level"],
                     is_re_entry=True,
@@ -495,26 +580,6 @@ class TradingEngine:
                     order_type="TP_TRAIL"
                 )
                 
-                # Place Order A
-                order_a_placed = False
-                if not self.config.get("simulate_orders", False):
-                    trade_id_a = self.mt5_client.place_order(
-                        symbol=alert.symbol,
-                        order_type=alert.signal,
-                        lot_size=lot_size,
-                        price=alert.price,
-                        sl=sl_price,
-                        tp=tp_price,
-                        comment=f"{strategy}_RE{reentry_info['level']}_TP"
-                    )
-                    if trade_id_a:
-                        order_a.trade_id = trade_id_a
-                        order_a_placed = True
-                else:
-                    # Simulation mode
-                    order_a.trade_id = int(datetime.now().timestamp() * 1000) % 1000000
-                    order_a_placed = True
-                
                 # Create Order B (Profit Trail) for re-entry
                 order_b = Trade(
                     symbol=alert.symbol,
@@ -524,7 +589,7 @@ class TradingEngine:
                     lot_size=lot_size,
                     direction=alert.signal,
                     strategy=strategy,
-                    open_time=datetime.now().isoformat(),
+                    open_time=clock.now().isoformat(),
                     chain_id=reentry_info["chain_id"],
                     chain_level=reentry_info["level"],
                     is_re_entry=True,
@@ -533,25 +598,22 @@ class TradingEngine:
                     order_type="PROFIT_TRAIL"
                 )
                 
-                # Place Order B independently
-                order_b_placed = False
+                # Place both orders in one batch (independent - no rollback)
                 if not self.config.get("simulate_orders", False):
-                    trade_id_b = self.mt5_client.place_order(
-                        symbol=alert.symbol,
-                        order_type=alert.signal,
-                        lot_size=lot_size,
-                        price=alert.price,
-                        sl=sl_price,
-                        tp=tp_price,
-                        comment=f"{strategy}_RE{reentry_info['level']}_PROFIT"
-                    )
-                    if trade_id_b:
-                        order_b.trade_id = trade_id_b
-                        order_b_placed = True
+                    batch = await self.mt5.place_orders([
+                        OrderIntent(alert.symbol, alert.signal, lot_size, alert.price, sl_price, tp_price,
+                                    f"{strategy}_RE{reentry_info['level']}_TP"),
+                        OrderIntent(alert.symbol, alert.signal, lot_size, alert.price, sl_price, tp_price,
+                                    f"{strategy}_RE{reentry_info['level']}_PROFIT")
+                    ])
+                    order_a.trade_id, order_b.trade_id = batch.trade_ids
+                    order_a_placed = bool(order_a.trade_id)
+                    order_b_placed = bool(order_b.trade_id)
                 else:
                     # Simulation mode
-                    order_b.trade_id = int(datetime.now().timestamp() * 1000) % 1000000 + 1
-                    order_b_placed = True
+                    order_a.trade_id = int(clock.now().timestamp() * 1000) % 1000000
+                    order_b.trade_id = order_a.trade_id + 1
+                    order_a_placed = order_b_placed = True
                 
                 # Handle Order A
                 if order_a_placed:
@@ -560,6 +622,7 @@ class TradingEngine:
                     self.open_trades.append(order_a)
                     self.risk_manager.add_open_trade(order_a)
                     self.db.save_trade(order_a)
+                    self.events.record_trade(EventType.FILL, order_a)
                     self.trade_count += 1
                 
                 # Handle Order B
@@ -573,6 +636,11 @@ class TradingEngine:
                     self.open_trades.append(order_b)
                     self.risk_manager.add_open_trade(order_b)
                     self.db.save_trade(order_b)
+                    self.events.record_trade(EventType.FILL, order_b)
+                
+                for placed, order in ((order_a_placed, order_a), (order_b_placed, order_b)):
+                    if not placed:
+                        self.events.record_trade(EventType.ORDER_REJECTED, order)
                 
                 # Send notification
                 re_type = "TP Continuation" if reentry_info.get("type") == "tp_continuation" else "SL Recovery"
@@ -634,7 +702,7 @@ class TradingEngine:
                 lot_size=lot_size,
                 direction=alert.signal,
                 strategy=strategy,
-                open_time=datetime.now().isoformat(),
+                open_time=clock.now().isoformat(),
                 chain_id=reentry_info["chain_id"],
                 chain_level=reentry_info["level"],
                 is_re_entry=True,
@@ -644,7 +712,7 @@ class TradingEngine:
             
             # Execute trade
             if not self.config.get("simulate_orders", False):
-                trade_id = self.mt5_client.place_order(
+                trade_id = await self.mt5.place_order(
                     symbol=alert.symbol,
                     order_type=alert.signal,
                     lot_size=lot_size,
@@ -656,11 +724,12 @@ class TradingEngine:
                 if trade_id:
                     trade.trade_id = trade_id
                 else:
+                    self.events.record_trade(EventType.ORDER_REJECTED, trade)
                     self.telegram_bot.send_message(f"❌ Re-entry order failed for {alert.symbol}")
                     return
             else:
                 # Simulation mode: generate pseudo trade ID
-                trade.trade_id = int(datetime.now().timestamp() * 1000) % 1000000
+                trade.trade_id = int(clock.now().timestamp() * 1000) % 1000000
             
             # Update chain with new trade (both live and simulation modes)
             self.reentry_manager.update_chain_level(reentry_info["chain_id"], trade.trade_id)
@@ -668,6 +737,7 @@ class TradingEngine:
             self.open_trades.append(trade)
             self.risk_manager.add_open_trade(trade)
             self.db.save_trade(trade)
+            self.events.record_trade(EventType.FILL, trade)
             self.trade_count += 1
             
             # Send notification
@@ -695,114 +765,174 @@ class TradingEngine:
     async def reconcile_with_mt5(self):
         """Sync bot's trade list with MT5 positions - auto-close orphaned trades"""
         try:
-            import MetaTrader5 as mt5
-            
-            # Get all open positions from MT5
-            mt5_positions = mt5.positions_get()
-            mt5_ticket_ids = {pos.ticket for pos in mt5_positions} if mt5_positions else set()
+            # Get all open positions from MT5 (None = API error, skip this cycle)
+            mt5_positions = await self.mt5.get_positions()
+            if mt5_positions is None:
+                return
+            mt5_ticket_ids = {pos.ticket for pos in mt5_positions}
             
             # Check each bot trade against MT5
-            for trade in self.open_trades[:]:  # Use slice to avoid modifying list during iteration
+            for trade in self.open_trades:  # Iterates a snapshot - safe to close while looping
                 if trade.status == "closed":
                     continue
                     
                 if trade.trade_id and trade.trade_id not in mt5_ticket_ids:
                     # Position doesn't exist in MT5 - was auto-closed by TP/SL
-                    current_price = self.mt5_client.get_current_price(trade.symbol)
+                    current_price = await self.mt5.get_current_price(trade.symbol)
                     print(f"Auto-reconciliation: Position {trade.trade_id} already closed in MT5")
                     await self.close_trade(trade, "MT5_AUTO_CLOSED", current_price)
                     
         except Exception as e:
             print(f"WARNING: Reconciliation error: {e}")
     
+    def get_active_symbols(self) -> Set[str]:
+        """Symbols that need live prices: open trades and pending re-entries"""
+        symbols = set(self.open_trades.symbols())
+        symbols.update(self.price_monitor.get_pending_symbols())
+        return symbols
+    
     async def manage_open_trades(self):
-        """Monitor and manage open trades"""
+        """
+        Monitor and manage open trades
+        Price-driven checks run per symbol from the tick pump as soon as a
+        quote changes; this loop is the periodic sweep (MT5 reconciliation,
+        trend reversal exits and a backstop SL/TP trigger pass)
+        """
+        tick_config = self.config.get("tick_pump_config", {})
+        sweep_interval = tick_config.get("sweep_interval_seconds", 5)
+        
+        if tick_config.get("enabled", True) and self.tick_consumer_task is None:
+            await self.tick_pump.start()
+            self.tick_consumer_task = asyncio.create_task(self._consume_ticks())
+        
+        cycle_seconds = LOOP_CYCLE_SECONDS.labels("manage_open_trades")
         while True:
             try:
-                # MT5 Reconciliation - Check if positions still exist in MT5
-                if not self.config["simulate_orders"]:
-                    await self.reconcile_with_mt5()
-                
-                # Remove closed trades from list
-                self.open_trades = [t for t in self.open_trades if t.status != "closed"]
-                
-                for trade in self.open_trades:
-                    if trade.status == "closed":
-                        continue
-                    
-                    # Get current price
-                    current_price = self.mt5_client.get_current_price(trade.symbol)
-                    if current_price == 0:
-                        continue
-                    
-                    # Check SL hit
-                    if ((trade.direction == "buy" and current_price <= trade.sl) or
-                        (trade.direction == "sell" and current_price >= trade.sl)):
-                        await self.close_trade(trade, "SL_HIT", current_price)
-                        self.reentry_manager.record_sl_hit(trade)
-                        
-                        # NEW: Register for SL hunt re-entry monitoring
-                        if self.config["re_entry_config"]["sl_hunt_reentry_enabled"]:
-                            self.price_monitor.register_sl_hunt(trade, trade.strategy)
-                        continue
-                    
-                    # Check TP hit
-                    if ((trade.direction == "buy" and current_price >= trade.tp) or
-                        (trade.direction == "sell" and current_price <= trade.tp)):
-                        import logging
-                        logger = logging.getLogger(__name__)
-                        
-                        # DIAGNOSTIC: Log TP hit and registration attempt
-                        logger.info(
-                            f"🎯 [TP_HIT] Trade {trade.trade_id}: {trade.symbol} {trade.direction.upper()} "
-                            f"TP={trade.tp:.5f} Current={current_price:.5f} "
-                            f"Chain={trade.chain_id} Strategy={trade.strategy}"
-                        )
-                        
-                        await self.close_trade(trade, "TP_HIT", current_price)
-                        self.reentry_manager.record_tp_hit(trade, current_price)
-                        
-                        # NEW: Register for TP continuation re-entry monitoring
-                        tp_reentry_enabled = self.config["re_entry_config"].get("tp_reentry_enabled", False)
-                        logger.info(
-                            f"📝 [TP_CONTINUATION_REGISTRATION_ATTEMPT] Trade {trade.trade_id}: "
-                            f"TP Re-entry Enabled={tp_reentry_enabled}, "
-                            f"Chain ID={trade.chain_id}, Strategy={trade.strategy}"
-                        )
-                        
-                        if tp_reentry_enabled:
-                            self.price_monitor.register_tp_continuation(trade, current_price, trade.strategy)
-                            logger.info(
-                                f"✅ [TP_CONTINUATION_REGISTERED] Trade {trade.trade_id}: "
-                                f"Successfully registered for TP continuation monitoring"
-                            )
-                        else:
-                            logger.warning(
-                                f"⚠️ [TP_CONTINUATION_SKIPPED] Trade {trade.trade_id}: "
-                                f"TP re-entry is disabled in config"
-                            )
-                        continue
-                    
-                    # Check trend reversal exit
-                    if self.should_exit_by_trend_reversal(trade):
-                        await self.close_trade(trade, "TREND_REVERSAL", current_price)
-                        continue
-                
-                await asyncio.sleep(5)
+                with cycle_seconds.time():
+                    await self.sweep_open_trades()
+                await asyncio.sleep(sweep_interval)
                 
             except Exception as e:
                 error_msg = f"Trade management error: {str(e)}"
                 print(f"Error: {e}")
                 await asyncio.sleep(30)
+    
+    async def sweep_open_trades(self):
+        """One periodic sweep over every open trade (also driven by the backtest replay)"""
+        # MT5 Reconciliation - Check if positions still exist in MT5
+        if not self.config["simulate_orders"]:
+            await self.reconcile_with_mt5()
+        
+        # Remove closed trades from list
+        self.open_trades.purge_closed()
+        
+        async with self.trade_check_lock:
+            # SL/TP backstop - only trades whose level was crossed
+            for symbol in self.open_trades.symbols():
+                await self.check_symbol_triggers(symbol)
+            
+            # Trend reversal exits are not price levels - check every trade
+            for trade in self.open_trades:
+                if trade.status != "closed" and self.should_exit_by_trend_reversal(trade):
+                    current_price = await self.mt5.get_current_price(trade.symbol)
+                    if current_price != 0:
+                        await self.close_trade(trade, "TREND_REVERSAL", current_price)
+    
+    async def _consume_ticks(self):
+        """Run symbol-scoped checks whenever the tick pump reports a price change"""
+        while True:
+            try:
+                symbol = await self.tick_pump.next_symbol()
+                await self.on_price_tick(symbol)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"WARNING: Tick processing error: {e}")
+    
+    async def on_price_tick(self, symbol: str):
+        """Check SL/TP, re-entry and profit booking triggers for one symbol"""
+        async with self.trade_check_lock:
+            await self.check_symbol_triggers(symbol)
+        await self.price_monitor.check_symbol(symbol)
+    
+    async def check_symbol_triggers(self, symbol: str):
+        """Check SL/TP for the trades on symbol whose level the price has crossed"""
+        current_price = await self.mt5.get_current_price(symbol)
+        if current_price == 0:
+            return
+        for trade in self.open_trades.triggered(symbol, current_price):
+            await self.check_trade(trade)
+    
+    async def check_trade(self, trade: Trade):
+        """Check a single open trade for SL hit, TP hit and trend reversal exit"""
+        if trade.status == "closed":
+            return
+        
+        # Get current price (shared quote cache)
+        current_price = await self.mt5.get_current_price(trade.symbol)
+        if current_price == 0:
+            return
+        
+        # Check SL hit
+        if ((trade.direction == "buy" and current_price <= trade.sl) or
+            (trade.direction == "sell" and current_price >= trade.sl)):
+            await self.close_trade(trade, "SL_HIT", current_price)
+            self.reentry_manager.record_sl_hit(trade)
+            
+            # NEW: Register for SL hunt re-entry monitoring
+            if self.config["re_entry_config"]["sl_hunt_reentry_enabled"]:
+                self.price_monitor.register_sl_hunt(trade, trade.strategy)
+            return
+        
+        # Check TP hit
+        if ((trade.direction == "buy" and current_price >= trade.tp) or
+            (trade.direction == "sell" and current_price <= trade.tp)):
+            import logging
+            logger = logging.getLogger(__name__)
+            
+            # DIAGNOSTIC: Log TP hit and registration attempt
+            logger.info(
+                f"🎯 [TP_HIT] Trade {trade.trade_id}: {trade.symbol} {trade.direction.upper()} "
+                f"TP={trade.tp:.5f} Current={current_price:.5f} "
+                f"Chain={trade.chain_id} Strategy={trade.strategy}"
+            )
+            
+            await self.close_trade(trade, "TP_HIT", current_price)
+            self.reentry_manager.record_tp_hit(trade, current_price)
+            
+            # NEW: Register for TP continuation re-entry monitoring
+            tp_reentry_enabled = self.config["re_entry_config"].get("tp_reentry_enabled", False)
+            logger.info(
+                f"📝 [TP_CONTINUATION_REGISTRATION_ATTEMPT] Trade {trade.trade_id}: "
+                f"TP Re-entry Enabled={tp_reentry_enabled}, "
+                f"Chain ID={trade.chain_id}, Strategy={trade.strategy}"
+            )
+            
+            if tp_reentry_enabled:
+                self.price_monitor.register_tp_continuation(trade, current_price, trade.strategy)
+                logger.info(
+                    f"✅ [TP_CONTINUATION_REGISTERED] Trade {trade.trade_id}: "
+                    f"Successfully registered for TP continuation monitoring"
+                )
+            else:
+                logger.warning(
+                    f"⚠️ [TP_CONTINUATION_SKIPPED] Trade {trade.trade_id}: "
+                    f"TP re-entry is disabled in config"
+                )
+            return
+        
+        # Check trend reversal exit
+        if self.should_exit_by_trend_reversal(trade):
+            await self.close_trade(trade, "TREND_REVERSAL", current_price)
+            return
 
     def should_exit_by_trend_reversal(self, trade: Trade) -> bool:
         """Check if we should exit due to trend reversal"""
         # Grace period: Don't exit trades within first 5 minutes of entry
         # This prevents premature exits when signals are still arriving
         try:
-            from datetime import datetime, timedelta
             trade_open_time = datetime.fromisoformat(trade.open_time)
-            time_since_open = datetime.now() - trade_open_time
+            time_since_open = clock.now() - trade_open_time
             
             if time_since_open < timedelta(minutes=5):
                 return False  # Grace period - don't check trend reversal yet
@@ -823,23 +953,24 @@ class TradingEngine:
 
     async def close_trade(self, trade: Trade, reason: str, current_price: float):
         """Close a trade"""
+        # Another path (tick, sweep, reversal) is already closing this trade
+        if trade.status == "closed" or id(trade) in self.closing_trades:
+            return
+        self.closing_trades.add(id(trade))
         try:
             # Try to close in MT5 (skip if simulating)
             if not self.config["simulate_orders"] and trade.trade_id:
-                success = self.mt5_client.close_position(trade.trade_id)
+                success = await self.mt5.close_position(trade.trade_id)
                 if not success:
                     self.telegram_bot.send_message(f"❌ Failed to close trade {trade.trade_id} - will retry on next cycle")
                     return  # Don't mark as closed if MT5 close failed - keep retrying!
             
             # Only mark as closed if MT5 close succeeded or we're in simulation
             trade.status = "closed"
-            trade.close_time = datetime.now().isoformat()
+            trade.close_time = clock.now().isoformat()
+            # Remove from the shared open trade book immediately
             self.risk_manager.remove_open_trade(trade)
             
-            # Remove from open trades list immediately
-            if trade in self.open_trades:
-                self.open_trades.remove(trade)
-            
             # Calculate PnL using proper pip values per symbol
             symbol_config = self.config["symbol_config"][trade.symbol]
             pip_size = symbol_config["pip_size"]
@@ -864,8 +995,10 @@ class TradingEngine:
             # Update risk manager
             self.risk_manager.update_pnl(pnl)
             
-            # Save to database
+            # Save to database and roll PnL into hour/day buckets
             self.db.save_trade(trade)
+            self.db.record_pnl_rollup(trade)
+            self.events.record_trade(EventType.CLOSE, trade, price=current_price, value=pnl, ref=reason)
             
             # Send notification
             emoji = "✅" if pnl > 0 else "❌"
@@ -883,6 +1016,8 @@ class TradingEngine:
         except Exception as e:
             error_msg = f"Trade close error: {str(e)}"
             self.telegram_bot.send_message(f"❌ {error_msg}")
+        finally:
+            self.closing_trades.discard(id(trade))
 
     # Logic control methods
     def enable_logic(self, logic_number: int):
@@ -1,12 +1,330 @@
+import os
 import sqlite3
+import atexit
+import threading
+import queue
+import time
+import weakref
+import logging
+from concurrent.futures import Future
+from contextlib import contextmanager
 from datetime import datetime
 from src.models import Trade, ReEntryChain
-from typing import List, Dict, Any
+from src.utils import metrics
+from typing import List, Dict, Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Read query latency by method, batch commit time and per-write latency
+# (queued -> committed, includes the write-behind batching delay)
+DB_OPERATION_SECONDS = metrics.histogram(
+    "db_operation_seconds", "TradeDatabase query and batch commit latency in seconds", ["operation"]
+)
+DB_OPERATION_FAILURES = metrics.counter(
+    "db_operation_failures_total", "TradeDatabase operations that raised", ["operation"]
+)
+DB_WRITE_LATENCY_SECONDS = metrics.histogram(
+    "db_write_latency_seconds", "Seconds from queuing a write to its commit"
+)
+
+# Column order of the trades table (excluding the id primary key)
+TRADE_COLUMNS = (
+    "trade_id", "symbol", "entry_price", "exit_price", "sl_price", "tp_price",
+    "lot_size", "direction", "strategy", "pnl", "status", "open_time",
+    "close_time", "chain_id", "chain_level", "is_re_entry", "order_type",
+    "profit_chain_id", "profit_level"
+)
+
+class _WriteOp:
+    """Queued write: fn(cursor) runs inside a group transaction"""
+    __slots__ = ("fn", "future", "barrier", "queued_at")
+    
+    def __init__(self, fn: Optional[Callable], future: Future, barrier: bool = False):
+        self.fn = fn
+        self.future = future
+        self.barrier = barrier
+        self.queued_at = time.perf_counter()
+
+_STOP = object()
+
+class _ReaderPool:
+    """Bounded pool of read-only connections, opened on first demand"""
+    
+    def __init__(self, connect: Callable[[], sqlite3.Connection], size: int):
+        self._connect = connect
+        self.size = max(1, size)
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self.waits = 0
+    
+    def acquire(self, timeout: float) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._connections) < self.size:
+                conn = self._connect()
+                self._connections.append(conn)
+                return conn
+            self.waits += 1
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(f"No reader connection free after {timeout}s") from None
+    
+    def release(self, conn: sqlite3.Connection):
+        self._idle.put(conn)
+    
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._idle = queue.LifoQueue()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {"size": self.size, "open": len(self._connections),
+                "idle": self._idle.qsize(), "waits": self.waits}
 
 class TradeDatabase:
-    def __init__(self):
-        self.conn = sqlite3.connect('data/trading_bot.db', check_same_thread=False)
+    """
+    SQLite trade store with write-behind persistence
+    - Writes are queued and applied by a dedicated writer thread in group
+      transactions (every batch_interval_ms or batch_max_ops operations),
+      so a burst of writes costs one commit/fsync
+    - Reads (get_*, fetch_all / fetch_one) borrow a connection from a small
+      pool of query_only connections, so report queries from the Telegram
+      thread and HTTP handlers never share a connection or block the writer
+      (WAL journal mode)
+    - save_* methods return a Future resolved once the write is committed
+    - Trades are upserted: one row per trade, updated on close
+    - Use get_database() for the process-wide instance per file
+    """
+    
+    def __init__(self, db_path: str = 'data/trading_bot.db',
+                 batch_interval_ms: float = 50, batch_max_ops: int = 200,
+                 reader_pool_size: int = 4, busy_timeout_ms: int = 5000):
+        self.db_path = db_path
+        self.batch_interval_seconds = batch_interval_ms / 1000
+        self.batch_max_ops = batch_max_ops
+        self.busy_timeout_ms = busy_timeout_ms
+        
+        # Schema setup / maintenance connection (writes only before the writer starts)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._configure_connection(self.conn)
         self.create_tables()
+        
+        self._readers = _ReaderPool(self._connect_reader, reader_pool_size)
+        
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._closed = False
+        
+        # Row ids of open trades saved by this process, keyed by object
+        self._trade_rows: Dict[int, tuple] = {}
+        
+        self.write_stats = {
+            "ops_enqueued": 0,
+            "ops_committed": 0,
+            "ops_failed": 0,
+            "batches": 0,
+            "max_batch_size": 0
+        }
+    
+    def _configure_connection(self, conn: sqlite3.Connection):
+        conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"Could not enable WAL mode: {str(e)}")
+    
+    def _connect_reader(self) -> sqlite3.Connection:
+        """Read-only connection for the pool (query_only rejects any write)"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+        conn.execute('PRAGMA query_only=ON')
+        return conn
+    
+    # ------------------------------------------------------------------
+    # Write-behind queue
+    # ------------------------------------------------------------------
+    
+    def _ensure_writer(self):
+        if self._writer_thread is not None and self._writer_thread.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer_thread is not None and self._writer_thread.is_alive():
+                return
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop, name="db-writer", daemon=True
+            )
+            self._writer_thread.start()
+            # Daemon thread - make sure queued writes reach disk on interpreter exit
+            atexit.register(self.close)
+    
+    def _submit(self, fn: Callable[[sqlite3.Cursor], Any]) -> Future:
+        """Queue a write operation, returns a Future resolved after commit"""
+        future = Future()
+        if self._closed:
+            future.set_exception(RuntimeError("TradeDatabase is closed"))
+            return future
+        self._ensure_writer()
+        self.write_stats["ops_enqueued"] += 1
+        self._queue.put(_WriteOp(fn, future))
+        return future
+    
+    def _writer_loop(self):
+        """Collect queued writes into batches and commit each batch once"""
+        writer = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._configure_connection(writer)
+        stopping = False
+        
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            
+            # Gather more ops until the interval expires, the batch is full,
+            # or someone is waiting on a flush
+            deadline = time.monotonic() + self.batch_interval_seconds
+            while not item.barrier and len(batch) < self.batch_max_ops:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            self._commit_batch(writer, batch)
+        
+        # Drain anything queued after the stop request
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftover.append(item)
+        if leftover:
+            self._commit_batch(writer, leftover)
+        writer.close()
+    
+    @metrics.timed(DB_OPERATION_SECONDS, "commit_batch")
+    def _commit_batch(self, writer: sqlite3.Connection, batch: List[_WriteOp]):
+        """Apply a batch in one transaction and resolve its futures"""
+        cursor = writer.cursor()
+        results = []
+        for op in batch:
+            if op.fn is None:
+                results.append((op, None, None))
+                continue
+            try:
+                results.append((op, op.fn(cursor), None))
+            except Exception as e:
+                results.append((op, None, e))
+        
+        try:
+            writer.commit()
+        except Exception as e:
+            logger.error(f"Database batch commit failed: {str(e)}")
+            # Discard the failed transaction so the next batch doesn't commit it
+            try:
+                writer.rollback()
+            except Exception as rollback_error:
+                logger.error(f"Database batch rollback failed: {str(rollback_error)}")
+            for op, _, _ in results:
+                op.future.set_exception(e)
+            self.write_stats["ops_failed"] += len(batch)
+            return
+        
+        self.write_stats["batches"] += 1
+        self.write_stats["max_batch_size"] = max(self.write_stats["max_batch_size"], len(batch))
+        committed_at = time.perf_counter()
+        for op, result, error in results:
+            if error is not None:
+                self.write_stats["ops_failed"] += 1
+                logger.error(f"Database write failed: {str(error)}")
+                op.future.set_exception(error)
+            else:
+                if op.fn is not None:
+                    self.write_stats["ops_committed"] += 1
+                    DB_WRITE_LATENCY_SECONDS.observe(committed_at - op.queued_at)
+                op.future.set_result(result)
+    
+    @contextmanager
+    def reader(self):
+        """
+        Borrow a pooled read-only connection that sees every write queued
+        before the read
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("TradeDatabase is closed")
+        stats = self.write_stats
+        if stats["ops_enqueued"] > stats["ops_committed"] + stats["ops_failed"]:
+            self.flush()
+        conn = self._readers.acquire(timeout=self.busy_timeout_ms / 1000)
+        try:
+            yield conn
+        finally:
+            self._readers.release(conn)
+    
+    def fetch_all(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        """Run a read query, rows as dicts keyed by column name"""
+        with self.reader() as conn:
+            cursor = conn.execute(sql, params)
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def fetch_one(self, sql: str, params: tuple = ()) -> Dict[str, Any]:
+        """First row of a read query as a dict ({} if no row)"""
+        rows = self.fetch_all(sql, params)
+        return rows[0] if rows else {}
+    
+    def _execute(self, sql: str, params: tuple = ()) -> Future:
+        """Queue a single statement (params are bound now, written later)"""
+        return self._submit(lambda cursor: cursor.execute(sql, params).lastrowid)
+    
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Block until every write queued so far is committed"""
+        if self._writer_thread is None or not self._writer_thread.is_alive():
+            return self._queue.empty()
+        future = Future()
+        self._queue.put(_WriteOp(None, future, barrier=True))
+        try:
+            future.result(timeout=timeout)
+            return True
+        except Exception:
+            return False
+    
+    def close(self, timeout: float = 5.0):
+        """Commit pending writes, stop the writer thread and close connections"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer_thread is not None and self._writer_thread.is_alive():
+            self._queue.put(_STOP)
+            self._writer_thread.join(timeout=timeout)
+        self._readers.close()
+        self.conn.close()
+    
+    def get_write_stats(self) -> Dict[str, Any]:
+        """Get write-behind queue counters"""
+        stats = dict(self.write_stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["writer_running"] = self._writer_thread is not None and self._writer_thread.is_alive()
+        stats["readers"] = self._readers.get_stats()
+        return stats
 
     def create_tables(self):
         cursor = self.conn.cursor()
@@ -162,55 +480,248 @@ class TradeDatabase:
             )
         ''')
         
-        self.conn.commit()
-
-    def save_trade(self, trade: Trade):
-        cursor = self.conn.cursor()
+        # Time-bucketed PnL rollups (hour/day), maintained on trade close
         cursor.execute('''
-            INSERT INTO trades VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-        ''', (None, trade.trade_id, trade.symbol, trade.entry, trade.close_time, 
-              trade.sl, trade.tp, trade.lot_size, trade.direction, trade.strategy,
-              trade.pnl, trade.status, trade.open_time, trade.close_time,
-              trade.chain_id, trade.chain_level, trade.is_re_entry,
-              trade.order_type, trade.profit_chain_id, trade.profit_level))
+            CREATE TABLE IF NOT EXISTS pnl_rollups (
+                granularity TEXT NOT NULL,
+                bucket_start TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                strategy TEXT NOT NULL,
+                order_type TEXT NOT NULL,
+                is_re_entry INTEGER NOT NULL,
+                trades INTEGER DEFAULT 0,
+                wins INTEGER DEFAULT 0,
+                losses INTEGER DEFAULT 0,
+                pnl REAL DEFAULT 0,
+                gross_profit REAL DEFAULT 0,
+                gross_loss REAL DEFAULT 0,
+                PRIMARY KEY (granularity, bucket_start, symbol, strategy, order_type, is_re_entry)
+            )
+        ''')
+        
+        # Secondary indexes for lookups and reporting queries
+        indexes = [
+            ('idx_trades_close_time', 'trades', 'close_time'),
+            ('idx_trades_symbol', 'trades', 'symbol'),
+            ('idx_trades_strategy', 'trades', 'strategy'),
+            ('idx_trades_chain_id', 'trades', 'chain_id'),
+            ('idx_trades_profit_chain_id', 'trades', 'profit_chain_id'),
+            ('idx_trades_trade_id', 'trades', 'trade_id'),
+            ('idx_sl_events_hit_time', 'sl_events', 'hit_time'),
+            ('idx_tp_reentry_events_timestamp', 'tp_reentry_events', 'timestamp'),
+            ('idx_tp_reentry_events_chain_id', 'tp_reentry_events', 'chain_id'),
+            ('idx_reversal_exit_events_timestamp', 'reversal_exit_events', 'timestamp'),
+            ('idx_profit_booking_chains_status', 'profit_booking_chains', 'status'),
+            ('idx_profit_booking_orders_chain_id', 'profit_booking_orders', 'chain_id'),
+            ('idx_profit_booking_events_chain_id', 'profit_booking_events', 'chain_id')
+        ]
+        for name, table, column in indexes:
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table}({column})')
+        
         self.conn.commit()
+        self._backfill_pnl_rollups()
 
-    def save_chain(self, chain: ReEntryChain):
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO reentry_chains VALUES (?,?,?,?,?,?,?,?,?,?)
-        ''', (chain.chain_id, chain.symbol, chain.direction, 
-              chain.original_entry, chain.original_sl_distance,
-              chain.current_level, chain.total_profit, chain.status,
-              chain.created_at, datetime.now().isoformat() if chain.status == "completed" else None))
-        self.conn.commit()
+    def save_trade(self, trade: Trade) -> Future:
+        """Upsert a trade - one row per trade, updated when it closes"""
+        values = (trade.trade_id, trade.symbol, trade.entry, trade.close_time, 
+                  trade.sl, trade.tp, trade.lot_size, trade.direction, trade.strategy,
+                  trade.pnl, trade.status, trade.open_time, trade.close_time,
+                  trade.chain_id, trade.chain_level, trade.is_re_entry,
+                  trade.order_type, trade.profit_chain_id, trade.profit_level)
+        trade_key = id(trade)
+        trade_ref = weakref.ref(trade)
+        closed = trade.status == "closed"
+        
+        trade_id = trade.trade_id
+        open_time = trade.open_time
+        
+        def write(cursor):
+            assignments = ", ".join(f"{col} = ?" for col in TRADE_COLUMNS)
+            updated = False
+            # Update the row this object was saved to (tickets are not unique
+            # over time - simulated / re-entry ids repeat after ~1k trades)
+            row = self._trade_rows.get(trade_key)
+            live = trade_ref()
+            if row is not None and live is not None and row[0]() is live:
+                cursor.execute(f'UPDATE trades SET {assignments} WHERE id = ?',
+                               values + (row[1],))
+                updated = cursor.rowcount > 0
+            elif trade_id is not None:
+                # Object not seen by this process (restored after a restart)
+                cursor.execute(f'UPDATE trades SET {assignments} WHERE trade_id = ? AND open_time = ?',
+                               values + (trade_id, open_time))
+                updated = cursor.rowcount > 0
+            
+            if not updated:
+                cursor.execute(f'''
+                    INSERT INTO trades ({", ".join(TRADE_COLUMNS)})
+                    VALUES ({", ".join("?" for _ in TRADE_COLUMNS)})
+                ''', values)
+                if not closed:
+                    self._trade_rows[trade_key] = (trade_ref, cursor.lastrowid)
+            
+            if closed:
+                self._trade_rows.pop(trade_key, None)
+            return cursor.lastrowid
+        
+        return self._submit(write)
+
+    def save_chain(self, chain: ReEntryChain) -> Future:
+        return self._execute('''
+                INSERT OR REPLACE INTO reentry_chains VALUES (?,?,?,?,?,?,?,?,?,?)
+            ''', (chain.chain_id, chain.symbol, chain.direction, 
+                  chain.original_entry, chain.original_sl_distance,
+                  chain.current_level, chain.total_profit, chain.status,
+                  chain.created_at, datetime.now().isoformat() if chain.status == "completed" else None))
 
     def save_sl_event(self, trade_id: str, symbol: str, sl_price: float, 
                      original_entry: float, recovery_attempted: bool = False,
-                     recovery_successful: bool = False):
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT INTO sl_events VALUES (?,?,?,?,?,?,?,?)
-        ''', (None, trade_id, symbol, sl_price, original_entry, 
-              datetime.now().isoformat(), recovery_attempted, recovery_successful))
-        self.conn.commit()
+                     recovery_successful: bool = False) -> Future:
+        return self._execute('''
+                INSERT INTO sl_events VALUES (?,?,?,?,?,?,?,?)
+            ''', (None, trade_id, symbol, sl_price, original_entry, 
+                  datetime.now().isoformat(), recovery_attempted, recovery_successful))
 
+    def save_tp_reentry_event(self, chain_id: str, symbol: str, tp_level: int,
+                              tp_price: float, reentry_price: float,
+                              sl_reduction_percent: float, pnl: float = 0) -> Future:
+        """Save TP continuation re-entry event"""
+        return self._execute('''
+            INSERT INTO tp_reentry_events VALUES (?,?,?,?,?,?,?,?,?)
+        ''', (None, chain_id, symbol, tp_level, tp_price, reentry_price,
+              sl_reduction_percent, pnl, datetime.now().isoformat()))
+
+    def save_reversal_exit_event(self, trade_id, symbol: str, exit_price: float,
+                                 exit_signal: str, pnl: float) -> Future:
+        """Save reversal exit event"""
+        return self._execute('''
+            INSERT INTO reversal_exit_events VALUES (?,?,?,?,?,?,?)
+        ''', (None, trade_id, symbol, exit_price, exit_signal, pnl,
+              datetime.now().isoformat()))
+
+    @metrics.timed(DB_OPERATION_SECONDS, failures=DB_OPERATION_FAILURES)
     def get_trade_history(self, days=30) -> List[Dict[str, Any]]:
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        return self.fetch_all('''
             SELECT * FROM trades 
             WHERE close_time >= datetime('now', ?)
             ORDER BY close_time DESC
         ''', (f'-{days} days',))
-        
-        columns = [description[0] for description in cursor.description]
-        return [dict(zip(columns, row)) for row in cursor.fetchall()]
 
-    def get_chain_statistics(self) -> Dict[str, Any]:
+    # ------------------------------------------------------------------
+    # PnL rollups
+    # ------------------------------------------------------------------
+    
+    ROLLUP_GROUP_COLUMNS = ('bucket_start', 'symbol', 'strategy', 'order_type', 'is_re_entry')
+    
+    _ROLLUP_UPSERT = '''
+        INSERT INTO pnl_rollups
+        (granularity, bucket_start, symbol, strategy, order_type, is_re_entry,
+         trades, wins, losses, pnl, gross_profit, gross_loss)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (granularity, bucket_start, symbol, strategy, order_type, is_re_entry)
+        DO UPDATE SET
+            trades = trades + excluded.trades,
+            wins = wins + excluded.wins,
+            losses = losses + excluded.losses,
+            pnl = pnl + excluded.pnl,
+            gross_profit = gross_profit + excluded.gross_profit,
+            gross_loss = gross_loss + excluded.gross_loss
+    '''
+    
+    @staticmethod
+    def _rollup_buckets(close_time: str) -> Dict[str, str]:
+        """Hour and day bucket keys for an ISO close time"""
+        return {
+            'hour': close_time[:13] + ':00:00',
+            'day': close_time[:10]
+        }
+    
+    def record_pnl_rollup(self, trade: Trade) -> Future:
+        """Add a closed trade to its hour and day PnL buckets"""
+        close_time = trade.close_time or datetime.now().isoformat()
+        pnl = trade.pnl or 0.0
+        dimensions = (trade.symbol, trade.strategy, trade.order_type or "SINGLE",
+                      1 if trade.is_re_entry else 0)
+        measures = (1, 1 if pnl > 0 else 0, 1 if pnl < 0 else 0, pnl,
+                    pnl if pnl > 0 else 0.0, -pnl if pnl < 0 else 0.0)
+        rows = [(granularity, bucket) + dimensions + measures
+                for granularity, bucket in self._rollup_buckets(close_time).items()]
+        return self._submit(lambda cursor: cursor.executemany(self._ROLLUP_UPSERT, rows).rowcount)
+    
+    def _backfill_pnl_rollups(self):
+        """Build rollups from closed trades when the rollup table is empty"""
         cursor = self.conn.cursor()
+        cursor.execute('SELECT 1 FROM pnl_rollups LIMIT 1')
+        if cursor.fetchone():
+            return
+        for granularity, bucket_expr in (('hour', "substr(close_time, 1, 13) || ':00:00'"),
+                                         ('day', 'substr(close_time, 1, 10)')):
+            cursor.execute(f'''
+                INSERT INTO pnl_rollups
+                (granularity, bucket_start, symbol, strategy, order_type, is_re_entry,
+                 trades, wins, losses, pnl, gross_profit, gross_loss)
+                SELECT 
+                    ?, {bucket_expr}, symbol, strategy,
+                    COALESCE(order_type, 'SINGLE'), CASE WHEN is_re_entry THEN 1 ELSE 0 END,
+                    COUNT(*),
+                    COUNT(CASE WHEN pnl > 0 THEN 1 END),
+                    COUNT(CASE WHEN pnl < 0 THEN 1 END),
+                    COALESCE(SUM(pnl), 0),
+                    COALESCE(SUM(CASE WHEN pnl > 0 THEN pnl ELSE 0 END), 0),
+                    COALESCE(SUM(CASE WHEN pnl < 0 THEN -pnl ELSE 0 END), 0)
+                FROM trades
+                WHERE status = 'closed' AND close_time IS NOT NULL
+                GROUP BY 2, 3, 4, 5, 6
+            ''', (granularity,))
+        self.conn.commit()
+    
+    @metrics.timed(DB_OPERATION_SECONDS, failures=DB_OPERATION_FAILURES)
+    def get_pnl_rollups(self, start: str, end: str, granularity: str = 'day',
+                        group_by: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Sum PnL buckets with bucket_start in [start, end)
+        start/end are ISO dates or datetimes; group_by is a subset of
+        ROLLUP_GROUP_COLUMNS (None = one grand total row)
+        """
+        if granularity not in ('hour', 'day'):
+            raise ValueError(f"Unsupported granularity: {granularity}")
+        group_by = list(group_by or [])
+        for column in group_by:
+            if column not in self.ROLLUP_GROUP_COLUMNS:
+                raise ValueError(f"Unsupported group_by column: {column}")
+        
+        select_keys = "".join(f"{column}, " for column in group_by)
+        group_clause = f"GROUP BY {', '.join(group_by)} ORDER BY {', '.join(group_by)}" if group_by else ""
         
+        return self.fetch_all(f'''
+            SELECT 
+                {select_keys}
+                COALESCE(SUM(trades), 0) as trades,
+                COALESCE(SUM(wins), 0) as wins,
+                COALESCE(SUM(losses), 0) as losses,
+                COALESCE(SUM(pnl), 0) as pnl,
+                COALESCE(SUM(gross_profit), 0) as gross_profit,
+                COALESCE(SUM(gross_loss), 0) as gross_loss
+            FROM pnl_rollups
+            WHERE granularity = ? AND bucket_start >= ? AND bucket_start < ?
+            {group_clause}
+        ''', (granularity, start, end))
+
+    @metrics.timed(DB_OPERATION_SECONDS, failures=DB_OPERATION_FAILURES)
+    def get_equity_curve(self, start: str, end: str, granularity: str = 'day') -> List[Dict[str, Any]]:
+        """Per-bucket PnL with running cumulative total"""
+        curve = []
+        cumulative = 0.0
+        for row in self.get_pnl_rollups(start, end, granularity, group_by=['bucket_start']):
+            cumulative += row['pnl']
+            curve.append({'bucket_start': row['bucket_start'], 'pnl': row['pnl'],
+                          'trades': row['trades'], 'cumulative_pnl': cumulative})
+        return curve
+
+    @metrics.timed(DB_OPERATION_SECONDS, failures=DB_OPERATION_FAILURES)
+    def get_chain_statistics(self) -> Dict[str, Any]:
         # Get chain performance
-        cursor.execute('''
+        return self.fetch_one('''
             SELECT 
                 COUNT(*) as total_chains,
                 AVG(max_level_reached) as avg_max_level,
@@ -219,16 +730,10 @@ class TradeDatabase:
                 COUNT(CASE WHEN total_profit > 0 THEN 1 END) as profitable_chains
             FROM reentry_chains
         ''')
-        
-        result = cursor.fetchone()
-        columns = [description[0] for description in cursor.description]
-        
-        return dict(zip(columns, result))
 
+    @metrics.timed(DB_OPERATION_SECONDS, failures=DB_OPERATION_FAILURES)
     def get_sl_recovery_stats(self) -> Dict[str, Any]:
-        cursor = self.conn.cursor()
-        
-        cursor.execute('''
+        return self.fetch_one('''
             SELECT 
                 COUNT(*) as total_sl_hits,
                 COUNT(CASE WHEN recovery_attempted THEN 1 END) as recovery_attempts,
@@ -236,24 +741,17 @@ class TradeDatabase:
             FROM sl_events
             WHERE hit_time >= datetime('now', '-30 days')
         ''')
-        
-        result = cursor.fetchone()
-        columns = [description[0] for description in cursor.description]
-        
-        return dict(zip(columns, result))
-    
-    def clear_lifetime_losses(self):
+
+    def clear_lifetime_losses(self) -> Future:
         """Reset lifetime loss counter (database side)"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            UPDATE system_state SET value = '0', updated_at = ? WHERE key = 'lifetime_loss'
-        ''', (datetime.now().isoformat(),))
-        self.conn.commit()
+        return self._execute('''
+                UPDATE system_state SET value = '0', updated_at = ? WHERE key = 'lifetime_loss'
+            ''', (datetime.now().isoformat(),))
         
+    @metrics.timed(DB_OPERATION_SECONDS, failures=DB_OPERATION_FAILURES)
     def get_tp_reentry_stats(self) -> Dict[str, Any]:
         """Get TP re-entry statistics"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        return self.fetch_one('''
             SELECT 
                 COUNT(*) as total_tp_reentries,
                 SUM(pnl) as total_tp_reentry_pnl,
@@ -262,80 +760,66 @@ class TradeDatabase:
             FROM tp_reentry_events
             WHERE timestamp >= datetime('now', '-30 days')
         ''')
-        result = cursor.fetchone()
-        columns = [desc[0] for desc in cursor.description]
-        return dict(zip(columns, result)) if result else {}
-    
+
+    @metrics.timed(DB_OPERATION_SECONDS, failures=DB_OPERATION_FAILURES)
     def get_sl_hunt_reentry_stats(self) -> Dict[str, Any]:
         """Get SL hunt re-entry statistics (from sl_events where recovery_successful=1)"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        return self.fetch_one('''
             SELECT 
                 COUNT(CASE WHEN recovery_successful THEN 1 END) as total_sl_hunt_reentries,
                 COUNT(CASE WHEN recovery_attempted THEN 1 END) as sl_hunt_attempts
             FROM sl_events
             WHERE hit_time >= datetime('now', '-30 days')
         ''')
-        result = cursor.fetchone()
-        columns = [desc[0] for desc in cursor.description]
-        return dict(zip(columns, result)) if result else {}
-    
-    def save_profit_chain(self, chain):
+
+    def save_profit_chain(self, chain) -> Future:
         """Save profit booking chain to database"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO profit_booking_chains 
-            (chain_id, symbol, direction, base_lot, current_level, total_profit, status, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            chain.chain_id,
-            chain.symbol,
-            chain.direction,
-            chain.base_lot,
-            chain.current_level,
-            chain.total_profit,
-            chain.status,
-            chain.created_at,
-            chain.updated_at
-        ))
-        self.conn.commit()
+        return self._execute('''
+                INSERT OR REPLACE INTO profit_booking_chains 
+                (chain_id, symbol, direction, base_lot, current_level, total_profit, status, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                chain.chain_id,
+                chain.symbol,
+                chain.direction,
+                chain.base_lot,
+                chain.current_level,
+                chain.total_profit,
+                chain.status,
+                chain.created_at,
+                chain.updated_at
+            ))
     
+    @metrics.timed(DB_OPERATION_SECONDS, failures=DB_OPERATION_FAILURES)
     def get_active_profit_chains(self) -> List[Dict[str, Any]]:
         """Get all active profit booking chains from database"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        return self.fetch_all('''
             SELECT * FROM profit_booking_chains
             WHERE status = 'ACTIVE'
         ''')
-        columns = [description[0] for description in cursor.description]
-        return [dict(zip(columns, row)) for row in cursor.fetchall()]
-    
+
     def save_profit_booking_order(self, order_id: str, chain_id: str, level: int, 
-                                  profit_target: float, sl_reduction: int, status: str):
+                                  profit_target: float, sl_reduction: int, status: str) -> Future:
         """Save profit booking order to database"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO profit_booking_orders
-            (order_id, chain_id, level, profit_target, sl_reduction, status, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (order_id, chain_id, level, profit_target, sl_reduction, status, datetime.now().isoformat()))
-        self.conn.commit()
+        return self._execute('''
+                INSERT OR REPLACE INTO profit_booking_orders
+                (order_id, chain_id, level, profit_target, sl_reduction, status, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (order_id, chain_id, level, profit_target, sl_reduction, status, datetime.now().isoformat()))
     
     def save_profit_booking_event(self, chain_id: str, level: int, profit_booked: float,
-                                  orders_closed: int, orders_placed: int):
+                                  orders_closed: int, orders_placed: int) -> Future:
         """Save profit booking event to database"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT INTO profit_booking_events
-            (chain_id, level, profit_booked, orders_closed, orders_placed, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (chain_id, level, profit_booked, orders_closed, orders_placed, datetime.now().isoformat()))
-        self.conn.commit()
+        return self._execute('''
+                INSERT INTO profit_booking_events
+                (chain_id, level, profit_booked, orders_closed, orders_placed, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (chain_id, level, profit_booked, orders_closed, orders_placed, datetime.now().isoformat()))
     
+    @metrics.timed(DB_OPERATION_SECONDS, failures=DB_OPERATION_FAILURES)
     def get_profit_chain_stats(self) -> Dict[str, Any]:
         """Get profit booking chain statistics"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        return self.fetch_one('''
             SELECT 
                 COUNT(*) as total_chains,
                 COUNT(CASE WHEN status = 'COMPLETED' THEN 1 END) as completed_chains,
@@ -345,6 +829,33 @@ class TradeDatabase:
                 AVG(total_profit) as avg_profit_per_chain
             FROM profit_booking_chains
         ''')
-        result = cursor.fetchone()
-        columns = [desc[0] for desc in cursor.description]
-        return dict(zip(columns, result)) if result else {}
\ No newline at end of file
+
+
+# Process-wide instances, one per database file
+_databases: Dict[str, TradeDatabase] = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(db_path: str = 'data/trading_bot.db', **options) -> TradeDatabase:
+    """
+    Shared TradeDatabase for a file - the engine, analytics and reports use
+    one writer thread and one reader pool instead of opening their own
+    connections. options (batch_interval_ms, batch_max_ops,
+    reader_pool_size, busy_timeout_ms) apply when the instance is created;
+    a closed instance is replaced
+    """
+    key = os.path.abspath(db_path)
+    with _databases_lock:
+        db = _databases.get(key)
+        if db is None or db._closed:
+            db = _databases[key] = TradeDatabase(db_path, **options)
+        return db
+
+
+def close_databases():
+    """Flush and close every shared instance (shutdown)"""
+    with _databases_lock:
+        databases = list(_databases.values())
+        _databases.clear()
+    for db in databases:
+        db.close()
@@ -1,15 +1,16 @@
 #!/usr/bin/env python3
+import time
+_import_started = time.perf_counter()
+
 import json
 import os
 import sys
 import asyncio
-import uvicorn
 import logging
-from logging.handlers import RotatingFileHandler
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
-from datetime import datetime, date, timedelta, timezone
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, FastAPI, Request, HTTPException
+from fastapi.responses import JSONResponse, Response
+from datetime import datetime, timezone
+from typing import Optional
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
@@ -21,80 +22,68 @@ if project_root not in sys.path:
 # Load .env file before anything else (highest priority for credentials)
 load_dotenv()
 
-# Configure logging with rotation and spam protection
-def setup_logging():
-    """Setup logging with rotation and level filtering"""
-    # Create logs directory if it doesn't exist
-    os.makedirs("logs", exist_ok=True)
-    
-    # Setup root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)  # Only INFO and above
-    
-    # Remove existing handlers
-    root_logger.handlers.clear()
-    
-    # Create rotating file handler (max 10MB, keep 5 files)
-    file_handler = RotatingFileHandler(
-        'logs/bot.log',
-        maxBytes=10*1024*1024,  # 10MB
-        backupCount=5,          # Keep 5 backup files
-        encoding='utf-8'
-    )
-    file_handler.setLevel(logging.INFO)
-    
-    # Create console handler (for important messages)
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.WARNING)  # Only warnings and errors to console
-    
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-    
-    # Add handlers
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+# Components (config, engine, clients, database) are built lazily by the
+# container - importing this module opens no database, broker or Telegram session
+from src.core.service_container import ServiceContainer, create_services
+from src.database import close_databases
+from src.services.alert_ingestion import WEBHOOK_LATENCY_SECONDS
+from src.utils import metrics
+from src.utils.json_state_writer import flush_all_state_writers, get_state_writer_stats
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def setup_logging(services: ServiceContainer):
+    """
+    Setup queue-fed logging: callers (and print) only enqueue, a listener
+    thread formats and writes logs/bot.log (+ logs/bot.jsonl if json_lines)
+    with rotation, warnings and printed output go to the console
+    """
+    pipeline = services.log_pipeline
     
     # Suppress noisy loggers
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("uvicorn").setLevel(logging.INFO)
     
-    return root_logger
-
-# Setup logging before importing other modules
-setup_logging()
-
-from src.config import Config
-from src.core.trading_engine import TradingEngine
-from src.managers.risk_manager import RiskManager
-from src.clients.mt5_client import MT5Client
-from src.clients.telegram_bot import TelegramBot
-from src.processors.alert_processor import AlertProcessor
-from src.services.analytics_engine import AnalyticsEngine 
-from src.models import Alert
-
-# Initialize components
-config = Config()
-risk_manager = RiskManager(config)
-mt5_client = MT5Client(config)
-telegram_bot = TelegramBot(config)
-alert_processor = AlertProcessor(config)
-
-# Initialize trading engine with all components
-trading_engine = TradingEngine(config, risk_manager, mt5_client, telegram_bot, alert_processor)
-
-# Set dependencies
-telegram_bot.set_dependencies(risk_manager, trading_engine)
-
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Lifespan context manager for startup and shutdown"""
-    # Startup
+    return pipeline
+
+
+def register_gauges(trading_engine):
+    """Scrape-time gauges for /metrics (counts owned by the engine and managers)"""
+    metrics.gauge("open_trades", "Open trades in the shared trade book").set_function(
+        lambda: len(trading_engine.open_trades)
+    )
+    pending_reentries = metrics.gauge("pending_reentries", "Re-entries waiting for their price", ["kind"])
+    pending_reentries.labels("sl_hunt").set_function(lambda: len(trading_engine.price_monitor.sl_hunt_pending))
+    pending_reentries.labels("tp_continuation").set_function(
+        lambda: len(trading_engine.price_monitor.tp_continuation_pending)
+    )
+    pending_reentries.labels("exit_continuation").set_function(
+        lambda: len(trading_engine.price_monitor.exit_continuation_pending)
+    )
+    active_chains = metrics.gauge("active_chains", "Active re-entry and profit booking chains", ["kind"])
+    active_chains.labels("reentry").set_function(
+        lambda: sum(1 for c in trading_engine.reentry_manager.active_chains.values() if c.status == "active")
+    )
+    active_chains.labels("profit_booking").set_function(
+        lambda: sum(1 for c in trading_engine.profit_booking_manager.active_chains.values() if c.status == "ACTIVE")
+    )
+
+
+async def start_services(services: ServiceContainer):
+    """Construct every component, initialize the engine and start background tasks"""
+    setup_logging(services)
+    services.build_all()
+    config = services.config
+    trading_engine = services.trading_engine
+    telegram_bot = services.telegram_bot
+    register_gauges(trading_engine)
+    
+    started = time.perf_counter()
     success = await trading_engine.initialize()
+    services.record_phase("initialize", time.perf_counter() - started)
     
     if success:
         # MT5 initialization successful (connected OR simulation mode active)
@@ -112,7 +101,9 @@ async def lifespan(app: FastAPI):
         config.update('simulate_orders', True)
         
         # Retry initialization with simulation mode enabled
+        started = time.perf_counter()
         success_retry = await trading_engine.initialize()
+        services.record_phase("initialize_retry", time.perf_counter() - started)
         if success_retry:
             telegram_bot.send_message(f"Trading Bot v2.0 Started in SIMULATION MODE\n"
                                      f"WARNING: MT5 unavailable - simulating all trades\n"
@@ -126,27 +117,85 @@ async def lifespan(app: FastAPI):
             print(error_msg)
             raise RuntimeError("Bot initialization failed")
     
-    yield
-    
-    # Shutdown (cleanup if needed)
+    logger.info(services.format_report())
+
+
+async def stop_services(services: ServiceContainer):
+    """Stop background workers and flush state (only components that were built)"""
     print("Trading bot shutting down...")
+    if services.is_built("alert_ingestion"):
+        await services.alert_ingestion.stop()
+    if services.is_built("trading_engine"):
+        await services.trading_engine.state_store.stop()
+        await services.trading_engine.tick_pump.stop()
+    if services.is_built("telegram_bot"):
+        services.telegram_bot.shutdown()
+    if services.is_built("trading_engine"):
+        services.trading_engine.mt5.shutdown()
+        services.trading_engine.events.close()
+    close_databases()
+    flush_all_state_writers()
+
 
-app = FastAPI(title="Zepix Automated Trading Bot v2.0", lifespan=lifespan)
+def create_app(services: Optional[ServiceContainer] = None) -> FastAPI:
+    """
+    App factory - components are constructed in lifespan (or on first use),
+    not at import time
+    """
+    if services is None:
+        services = create_services()
+    
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        """Lifespan context manager for startup and shutdown"""
+        await start_services(services)
+        yield
+        await stop_services(services)
+    
+    app = FastAPI(title="Zepix Automated Trading Bot v2.0", lifespan=lifespan)
+    app.state.services = services
+    app.include_router(router)
+    return app
 
-@app.post("/webhook")
-async def handle_webhook(request: Request):
+
+def get_services(request: Request) -> ServiceContainer:
+    return request.app.state.services
+
+@router.post("/webhook")
+async def handle_webhook(request: Request, services: ServiceContainer = Depends(get_services)):
     """Handle incoming webhook alerts from TradingView/Zepix"""
+    received_at = time.perf_counter()
+    alert = None
     try:
         data = await request.json()
         
-        print(f"Webhook received: {json.dumps(data, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Webhook received: {json.dumps(data, indent=2)}")
         
-        # Validate alert
-        if not alert_processor.validate_alert(data):
+        # Validate alert - parsed once, the Alert is passed on as-is
+        alert = services.alert_processor.validate_alert(data)
+        if alert is None:
+            WEBHOOK_LATENCY_SECONDS.labels("unknown", "invalid").observe(time.perf_counter() - received_at)
             return JSONResponse(content={"status": "rejected", "message": "Alert validation failed"})
         
+        # Ingestion mode - queue for the symbol's worker and acknowledge immediately
+        if services.alert_ingestion.enabled:
+            alert_id = services.alert_ingestion.submit(alert, received_at)
+            if alert_id is None:
+                return JSONResponse(
+                    status_code=503,
+                    content={"status": "rejected", "message": f"Alert queue full for {alert.symbol}"}
+                )
+            return JSONResponse(
+                status_code=202,
+                content={"status": "accepted", "alert_id": alert_id}
+            )
+        
         # Process alert
-        result = await trading_engine.process_alert(data)
+        result = await services.trading_engine.process_alert(alert)
+        WEBHOOK_LATENCY_SECONDS.labels(alert.type, "processed" if result else "rejected").observe(
+            time.perf_counter() - received_at
+        )
         
         if result:
             return JSONResponse(content={"status": "success", "message": "Alert processed"})
@@ -154,20 +203,34 @@ async def handle_webhook(request: Request):
             return JSONResponse(content={"status": "rejected", "message": "Alert processing failed"})
             
     except Exception as e:
+        WEBHOOK_LATENCY_SECONDS.labels(alert.type if alert else "unknown", "failed").observe(
+            time.perf_counter() - received_at
+        )
         error_msg = f"Webhook processing error: {str(e)}"
-        telegram_bot.send_message(f"ERROR: {error_msg}")
+        services.telegram_bot.send_message(f"ERROR: {error_msg}")
         raise HTTPException(status_code=400, detail=error_msg)
 
-@app.get("/health")
-async def health_check():
+@router.get("/health")
+async def health_check(services: ServiceContainer = Depends(get_services)):
     """Health check endpoint"""
     return {
         "status": "healthy",
         "version": "2.0",
         "timestamp": datetime.now(timezone.utc).isoformat(),
-        "daily_loss": risk_manager.daily_loss,
-        "lifetime_loss": risk_manager.lifetime_loss,
-        "mt5_connected": mt5_client.initialized,
+        "daily_loss": services.risk_manager.daily_loss,
+        "lifetime_loss": services.risk_manager.lifetime_loss,
+        "mt5_connected": services.mt5_client.initialized,
+        "telegram_outbox": services.telegram_bot.get_outbox_stats(),
+        "quote_cache": services.mt5_client.get_quote_stats(),
+        "mt5_worker": services.trading_engine.mt5.get_stats(),
+        "tick_pump": services.trading_engine.tick_pump.get_stats(),
+        "database_writer": services.trading_engine.db.get_write_stats(),
+        "alert_ingestion": services.alert_ingestion.get_status()["stats"],
+        "state_writers": get_state_writer_stats(),
+        "engine_state": services.trading_engine.state_store.get_stats(),
+        "event_journal": services.trading_engine.events.get_stats(),
+        "log_pipeline": services.log_pipeline.get_stats(),
+        "startup": services.report(),
         "features": {
             "fixed_lots": True,
             "reentry_system": True,
@@ -176,10 +239,28 @@ async def health_check():
         }
     }
 
-@app.get("/stats")
-async def get_stats():
+@router.get("/metrics")
+async def get_metrics():
+    """Counters, gauges and latency histograms in Prometheus text format"""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+@router.get("/alerts/status")
+async def get_alert_queue_status(services: ServiceContainer = Depends(get_services)):
+    """Alert ingestion queue depth per symbol and counters"""
+    return services.alert_ingestion.get_status()
+
+@router.get("/alerts/{alert_id}")
+async def get_alert_status(alert_id: str, services: ServiceContainer = Depends(get_services)):
+    """Outcome of an alert accepted by the webhook"""
+    status = services.alert_ingestion.get_alert_status(alert_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown alert id")
+    return status
+
+@router.get("/stats")
+async def get_stats(services: ServiceContainer = Depends(get_services)):
     """Get current statistics"""
-    stats = risk_manager.get_stats()
+    stats = services.risk_manager.get_stats()
     return {
         "daily_profit": stats["daily_profit"],
         "daily_loss": stats["daily_loss"],
@@ -189,31 +270,31 @@ async def get_stats():
         "win_rate": stats["win_rate"],
         "current_risk_tier": stats["current_risk_tier"],
         "risk_parameters": stats["risk_parameters"],
-        "trading_paused": trading_engine.is_paused,
-        "simulation_mode": config["simulate_orders"],
+        "trading_paused": services.trading_engine.is_paused,
+        "simulation_mode": services.config["simulate_orders"],
         "lot_size": stats["current_lot_size"],
         "balance": stats["account_balance"]
     }
 
-@app.post("/pause")
-async def pause_trading():
+@router.post("/pause")
+async def pause_trading(services: ServiceContainer = Depends(get_services)):
     """Pause trading"""
-    trading_engine.is_paused = True
+    services.trading_engine.is_paused = True
     return {"status": "success", "message": "Trading paused"}
 
-@app.post("/resume")
-async def resume_trading():
+@router.post("/resume")
+async def resume_trading(services: ServiceContainer = Depends(get_services)):
     """Resume trading"""
-    trading_engine.is_paused = False
+    services.trading_engine.is_paused = False
     return {"status": "success", "message": "Trading resumed"}
 
-@app.get("/trends")
-async def get_trends():
+@router.get("/trends")
+async def get_trends(services: ServiceContainer = Depends(get_services)):
     """Get all trends"""
     trends = {}
     
     # Get all symbols that have trends set (both from webhooks and manual)
-    trend_data = trading_engine.trend_manager.trends.get("symbols", {})
+    trend_data = services.trading_engine.trend_manager.trends.get("symbols", {})
     
     # If no symbols set, show default list
     if not trend_data:
@@ -222,72 +303,77 @@ async def get_trends():
         symbols = list(trend_data.keys())
     
     for symbol in symbols:
-        trends[symbol] = trading_engine.trend_manager.get_all_trends(symbol)
+        trends[symbol] = services.trading_engine.trend_manager.get_all_trends(symbol)
     
     return {"status": "success", "trends": trends}
 
-@app.post("/set_trend")
-async def set_trend_api(symbol: str, timeframe: str, trend: str, mode: str = "MANUAL"):
+@router.post("/set_trend")
+async def set_trend_api(symbol: str, timeframe: str, trend: str, mode: str = "MANUAL",
+                        services: ServiceContainer = Depends(get_services)):
     """Set trend via API"""
     try:
-        trading_engine.trend_manager.update_trend(symbol, timeframe, trend.lower(), mode)
+        services.trading_engine.trend_manager.update_trend(symbol, timeframe, trend.lower(), mode)
         return {"status": "success", "message": f"Trend set for {symbol} {timeframe}: {trend}"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
-@app.get("/chains")
-async def get_reentry_chains():
+@router.get("/chains")
+async def get_reentry_chains(services: ServiceContainer = Depends(get_services)):
     """Get active re-entry chains"""
     chains = []
-    for chain_id, chain in trading_engine.reentry_manager.active_chains.items():
+    for chain_id, chain in services.trading_engine.reentry_manager.active_chains.items():
         chains.append(chain.dict())
     return {"status": "success", "chains": chains}
 
-@app.get("/lot_config")
-async def get_lot_config():
+@router.get("/lot_config")
+async def get_lot_config(services: ServiceContainer = Depends(get_services)):
     """Get lot size configuration"""
     return {
-        "fixed_lots": config["fixed_lot_sizes"],
-        "manual_overrides": config.get("manual_lot_overrides", {}),
-        "current_balance": mt5_client.get_account_balance(),
-        "current_lot": risk_manager.get_fixed_lot_size(mt5_client.get_account_balance())
+        "fixed_lots": services.config["fixed_lot_sizes"],
+        "manual_overrides": services.config.get("manual_lot_overrides", {}),
+        "current_balance": services.mt5_client.get_account_balance(),
+        "current_lot": services.risk_manager.get_fixed_lot_size(services.mt5_client.get_account_balance())
     }
 
-@app.post("/set_lot_size")
-async def set_lot_size(tier: int, lot_size: float):
+@router.post("/set_lot_size")
+async def set_lot_size(tier: int, lot_size: float, services: ServiceContainer = Depends(get_services)):
     """Set manual lot size override"""
     try:
-        risk_manager.set_manual_lot_size(tier, lot_size)
+        services.risk_manager.set_manual_lot_size(tier, lot_size)
         return {"status": "success", "message": f"Lot size set: ${tier} → {lot_size}"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
-@app.post("/reset_stats")
-async def reset_stats():
+@router.post("/reset_stats")
+async def reset_stats(services: ServiceContainer = Depends(get_services)):
     """Reset risk manager stats (for testing only)"""
     try:
-        risk_manager.daily_loss = 0.0
-        risk_manager.daily_profit = 0.0
-        risk_manager.lifetime_loss = 0.0
-        risk_manager.total_trades = 0
-        risk_manager.winning_trades = 0
-        risk_manager.save_stats()
+        services.risk_manager.daily_loss = 0.0
+        services.risk_manager.daily_profit = 0.0
+        services.risk_manager.lifetime_loss = 0.0
+        services.risk_manager.total_trades = 0
+        services.risk_manager.winning_trades = 0
+        services.risk_manager.save_stats()
         return {"status": "success", "message": "Stats reset successfully"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
-@app.get("/status")
-async def get_status():
+@router.get("/status")
+async def get_status(services: ServiceContainer = Depends(get_services)):
     """Get bot status with open trades"""
-    stats = risk_manager.get_stats()
+    stats = services.risk_manager.get_stats()
+    prices = services.risk_manager.get_open_prices()
+    exposure = services.trading_engine.open_trades.mark_to_market(prices)
     open_trades_data = []
-    for trade in trading_engine.open_trades:
-        open_trades_data.append(trade.to_dict())
+    for trade, pnl in services.trading_engine.open_trades.trade_pnls(prices):
+        trade_data = trade.to_dict()
+        trade_data["unrealized_pnl"] = pnl
+        open_trades_data.append(trade_data)
     
     return {
         "status": "running",
-        "trading_paused": trading_engine.is_paused,
-        "simulation_mode": config["simulate_orders"],
+        "trading_paused": services.trading_engine.is_paused,
+        "simulation_mode": services.config["simulate_orders"],
         "daily_profit": stats["daily_profit"],
         "daily_loss": stats["daily_loss"],
         "lifetime_loss": stats["lifetime_loss"],
@@ -295,12 +381,21 @@ async def get_status():
         "winning_trades": stats["winning_trades"],
         "win_rate": stats["win_rate"],
         "open_trades": open_trades_data,
-        "open_trades_count": len(trading_engine.open_trades),
-        "mt5_connected": mt5_client.initialized,
-        "dual_orders_enabled": config.get("dual_order_config", {}).get("enabled", True),
-        "profit_booking_enabled": config.get("profit_booking_config", {}).get("enabled", True)
+        "open_trades_count": len(services.trading_engine.open_trades),
+        "unrealized_pnl": exposure["unrealized_pnl"],
+        "unrealized_pnl_by_symbol": exposure["by_symbol"],
+        "unrealized_pnl_by_chain": exposure["by_chain"],
+        "unrealized_pnl_by_strategy": exposure["by_strategy"],
+        "mt5_connected": services.mt5_client.initialized,
+        "dual_orders_enabled": services.config.get("dual_order_config", {}).get("enabled", True),
+        "profit_booking_enabled": services.config.get("profit_booking_config", {}).get("enabled", True)
     }
 
+# Default app for `uvicorn src.main:app` - cheap to import, built in lifespan
+services = create_services()
+app = create_app(services)
+services.import_seconds = time.perf_counter() - _import_started
+
 def check_port_available(host: str, port: int) -> bool:
     """Check if port is available"""
     import socket
@@ -349,7 +444,7 @@ if __name__ == "__main__":
     import argparse
     import socket
     import subprocess
-    import time
+    import uvicorn
     parser = argparse.ArgumentParser(description="Zepix Trading Bot v2.0")
     parser.add_argument("--host", default="0.0.0.0", help="Host address")
     parser.add_argument("--port", default=80, type=int, help="Port number (default: 80 for Windows VM)")
@@ -372,7 +467,7 @@ if __name__ == "__main__":
             print(f"Then: taskkill /F /PID <process_id>")
             exit(1)
     
-    rr_ratio = config.get("rr_ratio", 1.0)
+    rr_ratio = services.config.get("rr_ratio", 1.0)
     print("=" * 50)
     print("ZEPIX TRADING BOT v2.0")
     print("=" * 50)
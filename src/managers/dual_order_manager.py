@@ -2,9 +2,9 @@ from typing import Dict, Any, List, Tuple, Optional
 from src.models import Trade, Alert
 from src.config import Config
 from src.managers.risk_manager import RiskManager
-from src.clients.mt5_client import MT5Client
+from src.clients.mt5_client import MT5Client, OrderIntent
 from src.utils.pip_calculator import PipCalculator
-from datetime import datetime
+from src.utils import clock
 import logging
 
 class DualOrderManager:
@@ -170,7 +170,7 @@ class DualOrderManager:
                 lot_size=lot_size,
                 direction=alert.signal,
                 strategy=strategy,
-                open_time=datetime.now().isoformat(),
+                open_time=clock.now().isoformat(),
                 original_entry=alert.price,
                 original_sl_distance=sl_distance_a,
                 order_type="TP_TRAIL"
@@ -185,7 +185,7 @@ class DualOrderManager:
                 lot_size=lot_size,  # Same lot size
                 direction=alert.signal,
                 strategy=strategy,
-                open_time=datetime.now().isoformat(),
+                open_time=clock.now().isoformat(),
                 original_entry=alert.price,
                 original_sl_distance=sl_distance_b,
                 order_type="PROFIT_TRAIL"
@@ -194,23 +194,21 @@ class DualOrderManager:
             result["order_a"] = order_a
             result["order_b"] = order_b
             
-            # Place Order A independently
-            order_a_result = self._place_single_order(order_a, strategy, "TP_TRAIL")
+            # Place both orders in one batch - independent, no rollback if one fails
+            order_a_result, order_b_result = self._place_orders(
+                [(order_a, "TP_TRAIL"), (order_b, "PROFIT_TRAIL")], strategy
+            )
             if order_a_result["success"]:
                 result["order_a_placed"] = True
                 order_a.trade_id = order_a_result["trade_id"]
             else:
                 result["errors"].append(f"Order A failed: {order_a_result.get('error', 'Unknown error')}")
-                # Order A failed - but we continue to try Order B (independent)
             
-            # Place Order B independently (regardless of Order A result)
-            order_b_result = self._place_single_order(order_b, strategy, "PROFIT_TRAIL")
             if order_b_result["success"]:
                 result["order_b_placed"] = True
                 order_b.trade_id = order_b_result["trade_id"]
             else:
                 result["errors"].append(f"Order B failed: {order_b_result.get('error', 'Unknown error')}")
-                # Order B failed - but Order A continues independently (no rollback)
             
             # Log results
             if result["order_a_placed"] and result["order_b_placed"]:
@@ -236,32 +234,46 @@ class DualOrderManager:
         Place a single order in MT5
         Returns: {"success": bool, "trade_id": Optional[int], "error": Optional[str]}
         """
+        return self._place_orders([(trade, order_type)], strategy)[0]
+    
+    def _place_orders(self, orders: List[Tuple[Trade, str]], 
+                      strategy: str) -> List[Dict[str, Any]]:
+        """
+        Place (trade, order_type) pairs as one MT5 batch
+        Returns one {"success", "trade_id", "error"} dict per order, in order
+        """
         try:
             if self.config.get("simulate_orders", False):
                 # Simulation mode
                 import random
-                trade_id = random.randint(100000, 999999)
-                self.logger.info(f"SIMULATED: {order_type}: {trade.symbol} {trade.direction.upper()} @ {trade.entry}")
-                return {"success": True, "trade_id": trade_id, "error": None}
+                results = []
+                for trade, order_type in orders:
+                    trade_id = random.randint(100000, 999999)
+                    self.logger.info(f"SIMULATED: {order_type}: {trade.symbol} {trade.direction.upper()} @ {trade.entry}")
+                    results.append({"success": True, "trade_id": trade_id, "error": None})
+                return results
             
             # Live trading mode
-            trade_id = self.mt5_client.place_order(
-                symbol=trade.symbol,
-                order_type=trade.direction,
-                lot_size=trade.lot_size,
-                price=trade.entry,
-                sl=trade.sl,
-                tp=trade.tp,
-                comment=f"{strategy}_{order_type}"
-            )
+            batch = self.mt5_client.place_orders([
+                OrderIntent(
+                    symbol=trade.symbol,
+                    order_type=trade.direction,
+                    lot_size=trade.lot_size,
+                    price=trade.entry,
+                    sl=trade.sl,
+                    tp=trade.tp,
+                    comment=f"{strategy}_{order_type}"
+                )
+                for trade, order_type in orders
+            ])
             
-            if trade_id:
-                return {"success": True, "trade_id": trade_id, "error": None}
-            else:
-                return {"success": False, "trade_id": None, "error": "MT5 order placement failed"}
+            return [
+                {"success": True, "trade_id": r.trade_id, "error": None} if r.trade_id else
+                {"success": False, "trade_id": None, "error": r.error or "MT5 order placement failed"}
+                for r in batch.results
+            ]
                 
         except Exception as e:
             error_msg = f"Order placement error: {str(e)}"
             self.logger.error(error_msg)
-            return {"success": False, "trade_id": None, "error": error_msg}
-
+            return [{"success": False, "trade_id": None, "error": error_msg} for _ in orders]
@@ -1,14 +1,17 @@
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from src.core.open_trade_book import OpenTradeBook
+from src.core.event_journal import EventType
 from src.models import Trade, ProfitBookingChain
 from src.config import Config
 from src.database import TradeDatabase
-from src.clients.mt5_client import MT5Client
+from src.clients.mt5_client import MT5Client, OrderIntent
+from src.clients.async_mt5_client import AsyncMT5Client
 from src.utils.pip_calculator import PipCalculator
 from src.managers.risk_manager import RiskManager
+from src.utils import clock
+import math
 import uuid
 import logging
-import time
 
 class ProfitBookingManager:
     """
@@ -22,9 +25,11 @@ class ProfitBookingManager:
     
     def __init__(self, config: Config, mt5_client: MT5Client, 
                  pip_calculator: PipCalculator, risk_manager: RiskManager,
-                 db: TradeDatabase):
+                 db: TradeDatabase, async_mt5_client: Optional[AsyncMT5Client] = None):
         self.config = config
         self.mt5_client = mt5_client
+        # Awaitable MT5 calls for the async booking paths (shared worker thread)
+        self.mt5 = async_mt5_client or AsyncMT5Client(config, mt5_client)
         self.pip_calculator = pip_calculator
         self.risk_manager = risk_manager
         self.db = db
@@ -79,8 +84,8 @@ class ProfitBookingManager:
                 total_profit=0.0,
                 active_orders=[trade.trade_id] if trade.trade_id else [],
                 status="ACTIVE",
-                created_at=datetime.now().isoformat(),
-                updated_at=datetime.now().isoformat(),
+                created_at=clock.now().isoformat(),
+                updated_at=clock.now().isoformat(),
                 profit_targets=[self.min_profit] * (self.max_level + 1),  # All levels use $7 minimum
                 multipliers=self.multipliers.copy(),
                 sl_reductions=[0] * (self.max_level + 1),  # No SL reduction (uses fixed $10 SL)
@@ -133,51 +138,24 @@ class ProfitBookingManager:
         return 0.0
     
     def calculate_combined_pnl(self, chain: ProfitBookingChain, 
-                               open_trades: List[Trade]) -> float:
+                               open_trades: OpenTradeBook,
+                               current_price: Optional[float] = None) -> float:
         """
         Calculate combined unrealized PnL for all orders in current level
-        Returns total PnL in dollars
+        Returns total PnL in dollars (valued in one pass by the book's PositionArrayStore)
         """
         try:
-            # Get all trades for this chain at current level
-            chain_trades = [
-                t for t in open_trades
-                if t.profit_chain_id == chain.chain_id 
-                and t.profit_level == chain.current_level
-                and t.status == "open"
-            ]
-            
-            if not chain_trades:
+            if not open_trades.has_profit_level(chain.chain_id, chain.current_level):
                 return 0.0
             
-            # Get current price
-            current_price = self.mt5_client.get_current_price(chain.symbol)
+            # Get current price (unless the caller already has it)
+            if current_price is None:
+                current_price = self.mt5_client.get_current_price(chain.symbol)
             if current_price == 0:
                 return 0.0
             
-            # Calculate PnL for each trade and sum
-            total_pnl = 0.0
-            
-            for trade in chain_trades:
-                symbol_config = self.config["symbol_config"][trade.symbol]
-                pip_size = symbol_config["pip_size"]
-                pip_value_per_std_lot = symbol_config["pip_value_per_std_lot"]
-                
-                # Calculate price difference in pips
-                if trade.direction == "buy":
-                    price_diff = current_price - trade.entry
-                else:
-                    price_diff = trade.entry - current_price
-                
-                pips_moved = price_diff / pip_size
-                
-                # Calculate PnL: pips × pip_value × lot_size
-                pip_value = pip_value_per_std_lot * trade.lot_size
-                trade_pnl = pips_moved * pip_value
-                
-                total_pnl += trade_pnl
-            
-            return total_pnl
+            level_pnl = open_trades.profit_level_pnl(chain.chain_id, chain.current_level, current_price)
+            return sum(pnl for trade, pnl in level_pnl if trade.status == "open" and not math.isnan(pnl))
             
         except Exception as e:
             self.logger.error(f"Error calculating combined PnL: {str(e)}")
@@ -187,6 +165,7 @@ class ProfitBookingManager:
         """
         Calculate individual order PnL (for profit booking)
         Returns PnL in dollars for a single order
+        Open trades are valued from the shared book's position store
         """
         try:
             if current_price == 0:
@@ -194,6 +173,10 @@ class ProfitBookingManager:
                 if current_price == 0:
                     return 0.0
             
+            stored_pnl = self.risk_manager.open_trades.trade_pnl(trade, current_price)
+            if stored_pnl is not None:
+                return stored_pnl
+            
             symbol_config = self.config["symbol_config"][trade.symbol]
             pip_size = symbol_config["pip_size"]
             pip_value_per_std_lot = symbol_config["pip_value_per_std_lot"]
@@ -233,7 +216,8 @@ class ProfitBookingManager:
         return should_book
     
     def check_profit_targets(self, chain: ProfitBookingChain, 
-                            open_trades: List[Trade]) -> List[Trade]:
+                            open_trades: OpenTradeBook,
+                            current_price: Optional[float] = None) -> List[Trade]:
         """
         NEW: Check individual orders for profit booking (≥ $7 per order)
         Returns list of orders that should be booked immediately
@@ -247,43 +231,36 @@ class ProfitBookingManager:
         if chain.current_level >= chain.max_level:
             return orders_to_book
         
-        # Get all trades for this chain at current level
-        chain_trades = [
-            t for t in open_trades
-            if t.profit_chain_id == chain.chain_id 
-            and t.profit_level == chain.current_level
-            and t.status == "open"
-        ]
-        
-        if not chain_trades:
+        if not open_trades.has_profit_level(chain.chain_id, chain.current_level):
             return orders_to_book
         
-        # Get current price once
-        current_price = self.mt5_client.get_current_price(chain.symbol)
+        # Get current price once (unless the caller already has it)
+        if current_price is None:
+            current_price = self.mt5_client.get_current_price(chain.symbol)
         if current_price == 0:
             return orders_to_book
         
-        # Check each order individually
-        for trade in chain_trades:
-            if self.should_book_order(trade, current_price):
+        # Value every order at this level in one pass, then check each individually
+        for trade, pnl in open_trades.profit_level_pnl(chain.chain_id, chain.current_level, current_price):
+            if trade.status == "open" and pnl >= self.min_profit:
                 orders_to_book.append(trade)
                 self.logger.info(
                     f"✅ Order {trade.trade_id} ready to book: "
                     f"Chain {chain.chain_id} Level {chain.current_level} - "
-                    f"PnL=${self.calculate_individual_pnl(trade, current_price):.2f} >= ${self.min_profit:.2f}"
+                    f"PnL=${pnl:.2f} >= ${self.min_profit:.2f}"
                 )
         
         return orders_to_book
     
     async def book_individual_order(self, trade: Trade, chain: ProfitBookingChain,
-                                   open_trades: List[Trade], trading_engine) -> bool:
+                                   open_trades: OpenTradeBook, trading_engine) -> bool:
         """
         Book a single order immediately when it reaches ≥ $7 profit
         Returns True if successfully booked, False otherwise
         """
         try:
             # Get current price
-            current_price = self.mt5_client.get_current_price(trade.symbol)
+            current_price = await self.mt5.get_current_price(trade.symbol)
             if current_price == 0:
                 self.logger.error(f"Failed to get current price for {trade.symbol}")
                 return False
@@ -296,7 +273,7 @@ class ProfitBookingManager:
             
             # Update chain profit
             chain.total_profit += profit_booked
-            chain.updated_at = datetime.now().isoformat()
+            chain.updated_at = clock.now().isoformat()
             self.db.save_profit_chain(chain)
             
             # Save profit booking event
@@ -321,7 +298,7 @@ class ProfitBookingManager:
             return False
     
     async def check_and_progress_chain(self, chain: ProfitBookingChain,
-                                      open_trades: List[Trade], trading_engine) -> bool:
+                                      open_trades: OpenTradeBook, trading_engine) -> bool:
         """
         Check if all orders in current level are closed, then progress to next level
         Returns True if progressed, False otherwise
@@ -333,17 +310,15 @@ class ProfitBookingManager:
             if chain.current_level >= chain.max_level:
                 # Max level reached - complete chain
                 chain.status = "COMPLETED"
-                chain.updated_at = datetime.now().isoformat()
+                chain.updated_at = clock.now().isoformat()
                 self.db.save_profit_chain(chain)
                 self.logger.info(f"SUCCESS: Chain {chain.chain_id} completed - max level reached")
                 return True
             
             # Check if all orders in current level are closed
             current_level_trades = [
-                t for t in open_trades
-                if t.profit_chain_id == chain.chain_id 
-                and t.profit_level == chain.current_level
-                and t.status == "open"
+                t for t in open_trades.for_profit_level(chain.chain_id, chain.current_level)
+                if t.status == "open"
             ]
             
             # If there are still open orders, don't progress yet
@@ -365,11 +340,11 @@ class ProfitBookingManager:
             next_order_count = self.get_order_multiplier(next_level)
             
             # Place new orders for next level
-            account_balance = self.mt5_client.get_account_balance()
+            account_balance = await self.mt5.get_account_balance()
             lot_size = self.risk_manager.get_fixed_lot_size(account_balance)
             
             # Get current price
-            current_price = self.mt5_client.get_current_price(chain.symbol)
+            current_price = await self.mt5.get_current_price(chain.symbol)
             if current_price == 0:
                 self.logger.error(f"Failed to get current price for {chain.symbol}")
                 return False
@@ -386,6 +361,7 @@ class ProfitBookingManager:
             
             # Place multiple orders for next level
             new_trade_ids = []
+            new_trades = []
             orders_placed = 0
             
             for i in range(next_order_count):
@@ -398,38 +374,26 @@ class ProfitBookingManager:
                     lot_size=lot_size,
                     direction=chain.direction,
                     strategy=chain.metadata.get("strategy", "LOGIC1"),
-                    open_time=datetime.now().isoformat(),
+                    open_time=clock.now().isoformat(),
                     original_entry=chain.metadata.get("original_entry", current_price),
                     original_sl_distance=sl_distance,
                     order_type="PROFIT_TRAIL",
                     profit_chain_id=chain.chain_id,
                     profit_level=next_level
                 )
-                
-                # Place order
-                if not self.config.get("simulate_orders", False):
-                    trade_id = self.mt5_client.place_order(
-                        symbol=chain.symbol,
-                        order_type=chain.direction,
-                        lot_size=lot_size,
-                        price=current_price,
-                        sl=sl_price,
-                        tp=tp_price,
-                        comment=f"{chain.metadata.get('strategy', 'LOGIC1')}_PROFIT_L{next_level}"
-                    )
-                    if trade_id:
-                        new_trade.trade_id = trade_id
-                        new_trade_ids.append(trade_id)
-                else:
-                    # Simulation mode
-                    import random
-                    trade_id = random.randint(100000, 999999)
-                    new_trade.trade_id = trade_id
-                    new_trade_ids.append(trade_id)
-                
+                new_trades.append(new_trade)
+            
+            # Submit the whole level as one batch so all orders fill near one price
+            await self._place_level_orders(chain, next_level, new_trades, new_trade_ids)
+            
+            for new_trade in new_trades:
                 # Add to open trades
                 trading_engine.open_trades.append(new_trade)
                 trading_engine.risk_manager.add_open_trade(new_trade)
+                if new_trade.trade_id:
+                    trading_engine.events.record_trade(EventType.FILL, new_trade)
+                else:
+                    trading_engine.events.record_trade(EventType.ORDER_REJECTED, new_trade)
                 
                 # Save to database
                 if new_trade.trade_id:
@@ -446,8 +410,13 @@ class ProfitBookingManager:
             
             # Update chain
             chain.current_level = next_level
+            trading_engine.events.record(
+                EventType.PROFIT_LEVEL, chain.symbol, chain.direction, price=current_price,
+                value=len(new_trade_ids), level=next_level, strategy=chain.metadata.get("strategy", ""),
+                ref=chain.chain_id
+            )
             chain.active_orders = new_trade_ids
-            chain.updated_at = datetime.now().isoformat()
+            chain.updated_at = clock.now().isoformat()
             self.db.save_profit_chain(chain)
             
             # Send Telegram notification
@@ -475,7 +444,7 @@ class ProfitBookingManager:
             return False
     
     async def execute_profit_booking(self, chain: ProfitBookingChain, 
-                                    open_trades: List[Trade],
+                                    open_trades: OpenTradeBook,
                                     trading_engine) -> bool:
         """
         Execute profit booking: close current level orders and place next level orders
@@ -488,17 +457,15 @@ class ProfitBookingManager:
             if chain.current_level >= chain.max_level:
                 # Max level reached - complete chain
                 chain.status = "COMPLETED"
-                chain.updated_at = datetime.now().isoformat()
+                chain.updated_at = clock.now().isoformat()
                 self.db.save_profit_chain(chain)
                 self.logger.info(f"SUCCESS: Chain {chain.chain_id} completed - max level reached")
                 return True
             
             # Get all trades for current level
             current_level_trades = [
-                t for t in open_trades
-                if t.profit_chain_id == chain.chain_id 
-                and t.profit_level == chain.current_level
-                and t.status == "open"
+                t for t in open_trades.for_profit_level(chain.chain_id, chain.current_level)
+                if t.status == "open"
             ]
             
             if not current_level_trades:
@@ -506,12 +473,14 @@ class ProfitBookingManager:
                 return False
             
             # Calculate profit booked (combined PnL)
-            profit_booked = self.calculate_combined_pnl(chain, open_trades)
+            profit_booked = self.calculate_combined_pnl(
+                chain, open_trades, await self.mt5.get_current_price(chain.symbol)
+            )
             
             # Close all orders in current level
             orders_closed = 0
             for trade in current_level_trades:
-                current_price = self.mt5_client.get_current_price(trade.symbol)
+                current_price = await self.mt5.get_current_price(trade.symbol)
                 if current_price > 0:
                     await trading_engine.close_trade(trade, "PROFIT_BOOKING", current_price)
                     orders_closed += 1
@@ -526,11 +495,11 @@ class ProfitBookingManager:
             
             # Place new orders for next level
             orders_placed = 0
-            account_balance = self.mt5_client.get_account_balance()
+            account_balance = await self.mt5.get_account_balance()
             lot_size = self.risk_manager.get_fixed_lot_size(account_balance)
             
             # Get current price
-            current_price = self.mt5_client.get_current_price(chain.symbol)
+            current_price = await self.mt5.get_current_price(chain.symbol)
             if current_price == 0:
                 self.logger.error(f"Failed to get current price for {chain.symbol}")
                 return False
@@ -546,6 +515,7 @@ class ProfitBookingManager:
             
             # Place multiple orders for next level
             new_trade_ids = []
+            new_trades = []
             for i in range(next_order_count):
                 # Create trade object
                 new_trade = Trade(
@@ -556,38 +526,26 @@ class ProfitBookingManager:
                     lot_size=lot_size,
                     direction=chain.direction,
                     strategy=chain.metadata.get("strategy", "LOGIC1"),
-                    open_time=datetime.now().isoformat(),
+                    open_time=clock.now().isoformat(),
                     original_entry=chain.metadata.get("original_entry", current_price),
                     original_sl_distance=sl_distance,
                     order_type="PROFIT_TRAIL",
                     profit_chain_id=chain.chain_id,
                     profit_level=next_level
                 )
-                
-                # Place order
-                if not self.config.get("simulate_orders", False):
-                    trade_id = self.mt5_client.place_order(
-                        symbol=chain.symbol,
-                        order_type=chain.direction,
-                        lot_size=lot_size,
-                        price=current_price,
-                        sl=sl_price,
-                        tp=tp_price,
-                        comment=f"{chain.metadata.get('strategy', 'LOGIC1')}_PROFIT_L{next_level}"
-                    )
-                    if trade_id:
-                        new_trade.trade_id = trade_id
-                        new_trade_ids.append(trade_id)
-                else:
-                    # Simulation mode
-                    import random
-                    trade_id = random.randint(100000, 999999)
-                    new_trade.trade_id = trade_id
-                    new_trade_ids.append(trade_id)
-                
+                new_trades.append(new_trade)
+            
+            # Submit the whole level as one batch so all orders fill near one price
+            await self._place_level_orders(chain, next_level, new_trades, new_trade_ids)
+            
+            for new_trade in new_trades:
                 # Add to open trades
                 trading_engine.open_trades.append(new_trade)
                 trading_engine.risk_manager.add_open_trade(new_trade)
+                if new_trade.trade_id:
+                    trading_engine.events.record_trade(EventType.FILL, new_trade)
+                else:
+                    trading_engine.events.record_trade(EventType.ORDER_REJECTED, new_trade)
                 
                 # Save to database
                 if new_trade.trade_id:
@@ -604,8 +562,13 @@ class ProfitBookingManager:
             
             # Update chain
             chain.current_level = next_level
+            trading_engine.events.record(
+                EventType.PROFIT_LEVEL, chain.symbol, chain.direction, price=current_price,
+                value=len(new_trade_ids), level=next_level, strategy=chain.metadata.get("strategy", ""),
+                ref=chain.chain_id
+            )
             chain.active_orders = new_trade_ids
-            chain.updated_at = datetime.now().isoformat()
+            chain.updated_at = clock.now().isoformat()
             self.db.save_profit_chain(chain)
             
             # Save profit booking event
@@ -643,12 +606,41 @@ class ProfitBookingManager:
             traceback.print_exc()
             return False
     
+    async def _place_level_orders(self, chain: ProfitBookingChain, level: int,
+                                  new_trades: List[Trade], new_trade_ids: List[int]):
+        """Place a level's orders as one MT5 batch, filling trade_id on success"""
+        if not self.config.get("simulate_orders", False):
+            comment = f"{chain.metadata.get('strategy', 'LOGIC1')}_PROFIT_L{level}"
+            batch = await self.mt5.place_orders([
+                OrderIntent(t.symbol, t.direction, t.lot_size, t.entry, t.sl, t.tp, comment)
+                for t in new_trades
+            ])
+            for new_trade, trade_id in zip(new_trades, batch.trade_ids):
+                if trade_id:
+                    new_trade.trade_id = trade_id
+                    new_trade_ids.append(trade_id)
+            if batch.failed:
+                self.logger.warning(
+                    f"Chain {chain.chain_id} Level {level}: {batch.failed}/{len(new_trades)} orders failed "
+                    f"({'; '.join(batch.errors)})"
+                )
+            self.logger.info(
+                f"Chain {chain.chain_id} Level {level}: {batch.placed} orders placed in {batch.wall_time_ms:.1f}ms"
+            )
+        else:
+            # Simulation mode
+            import random
+            for new_trade in new_trades:
+                trade_id = random.randint(100000, 999999)
+                new_trade.trade_id = trade_id
+                new_trade_ids.append(trade_id)
+    
     def stop_chain(self, chain_id: str, reason: str = "Manual stop"):
         """Stop a profit booking chain"""
         if chain_id in self.active_chains:
             chain = self.active_chains[chain_id]
             chain.status = "STOPPED"
-            chain.updated_at = datetime.now().isoformat()
+            chain.updated_at = clock.now().isoformat()
             self.db.save_profit_chain(chain)
             self.logger.info(f"STOPPED: Chain {chain_id} stopped: {reason}")
     
@@ -657,7 +649,7 @@ class ProfitBookingManager:
         for chain_id in list(self.active_chains.keys()):
             self.stop_chain(chain_id, reason)
     
-    def recover_chains_from_database(self, open_trades: List[Trade]):
+    def recover_chains_from_database(self, open_trades: OpenTradeBook):
         """
         Recover active profit booking chains from database on bot restart
         """
@@ -665,6 +657,9 @@ class ProfitBookingManager:
             active_chains_data = self.db.get_active_profit_chains()
             
             for chain_data in active_chains_data:
+                # Already restored (with its orders) from the engine state snapshot
+                if chain_data["chain_id"] in self.active_chains:
+                    continue
                 try:
                     chain = ProfitBookingChain(
                         chain_id=chain_data["chain_id"],
@@ -676,8 +671,8 @@ class ProfitBookingManager:
                         total_profit=chain_data.get("total_profit", 0.0),
                         active_orders=[],  # Will be populated from open_trades
                         status=chain_data.get("status", "ACTIVE"),
-                        created_at=chain_data.get("created_at", datetime.now().isoformat()),
-                        updated_at=chain_data.get("updated_at", datetime.now().isoformat()),
+                        created_at=chain_data.get("created_at", clock.now().isoformat()),
+                        updated_at=chain_data.get("updated_at", clock.now().isoformat()),
                         profit_targets=[self.min_profit] * (self.max_level + 1),  # All levels use $7 minimum
                         multipliers=self.multipliers.copy(),
                         sl_reductions=[0] * (self.max_level + 1),  # No SL reduction (uses fixed $10 SL)
@@ -686,9 +681,8 @@ class ProfitBookingManager:
                     
                     # Find active orders for this chain
                     chain_orders = [
-                        t.trade_id for t in open_trades
-                        if t.profit_chain_id == chain.chain_id
-                        and t.status == "open"
+                        t.trade_id for t in open_trades.for_profit_chain(chain.chain_id)
+                        if t.status == "open"
                     ]
                     chain.active_orders = chain_orders
                     
@@ -712,7 +706,7 @@ class ProfitBookingManager:
         return self.active_chains.copy()
     
     def validate_chain_state(self, chain: ProfitBookingChain, 
-                            open_trades: List[Trade]) -> bool:
+                            open_trades: OpenTradeBook) -> bool:
         """
         Validate chain state integrity
         Returns True if valid, False otherwise
@@ -733,10 +727,7 @@ class ProfitBookingManager:
             
             # Check if all active orders still exist
             for order_id in chain.active_orders:
-                order_exists = any(
-                    t.trade_id == order_id and t.status == "open"
-                    for t in open_trades
-                )
+                order_exists = open_trades.has_open_trade_id(order_id)
                 
                 if not order_exists:
                     missing_orders.append(order_id)
@@ -753,7 +744,7 @@ class ProfitBookingManager:
                     self.checked_missing_orders[order_key] = check_count + 1
                     
                     # Log error only once per 5 minutes per order
-                    current_time = time.time()
+                    current_time = clock.timestamp()
                     last_log = self.last_error_log_time.get(order_key, 0)
                     
                     if current_time - last_log > 300:  # 5 minutes
@@ -788,7 +779,7 @@ class ProfitBookingManager:
             self.logger.error(f"Error validating chain state: {str(e)}")
             return False
     
-    def handle_orphaned_orders(self, open_trades: List[Trade]):
+    def handle_orphaned_orders(self, open_trades: OpenTradeBook):
         """
         Handle orders that have profit_chain_id but chain doesn't exist
         """
@@ -798,6 +789,7 @@ class ProfitBookingManager:
                     # Orphaned order - clear profit_chain_id
                     trade.profit_chain_id = None
                     trade.profit_level = 0
+                    open_trades.reindex(trade)
                     self.logger.warning(
                         f"Cleared orphaned order: {trade.trade_id} "
                         f"from missing chain: {trade.profit_chain_id}"
@@ -828,7 +820,7 @@ class ProfitBookingManager:
                 if chain_id in self.active_chains:
                     chain = self.active_chains[chain_id]
                     chain.status = "STALE"
-                    chain.updated_at = datetime.now().isoformat()
+                    chain.updated_at = clock.now().isoformat()
                     self.db.save_profit_chain(chain)
                     del self.active_chains[chain_id]
                     self.logger.info(f"Removed stale chain: {chain_id}")
@@ -1,6 +1,7 @@
 from typing import Dict, Optional, List, Any
-from datetime import datetime, timedelta
+from datetime import timedelta
 from src.models import Trade, ReEntryChain
+from src.utils import clock
 import uuid
 
 class ReEntryManager:
@@ -24,7 +25,7 @@ class ReEntryManager:
             trade_ids = [trade.trade_id]
         else:
             # Create a pseudo-ID for simulation mode
-            sim_id = int(datetime.now().timestamp() * 1000) % 1000000
+            sim_id = int(clock.now().timestamp() * 1000) % 1000000
             trade_ids = [sim_id]
             print(f"INFO: Simulation mode: Using pseudo trade ID {sim_id}")
         
@@ -62,8 +63,8 @@ class ReEntryManager:
             current_level=1,
             max_level=self.config["re_entry_config"]["max_chain_levels"],
             trades=trade_ids,
-            created_at=datetime.now().isoformat(),
-            last_update=datetime.now().isoformat(),
+            created_at=clock.now().isoformat(),
+            last_update=clock.now().isoformat(),
             metadata={
                 "sl_system_used": active_system,
                 "sl_reduction_percent": symbol_reduction,
@@ -121,7 +122,7 @@ class ReEntryManager:
             return result
         
         recent_tps = self.completed_tps[symbol]
-        current_time = datetime.now()
+        current_time = clock.now()
         
         for tp_event in recent_tps:
             time_since_tp = current_time - tp_event["time"]
@@ -160,7 +161,7 @@ class ReEntryManager:
             return result
         
         recent_sls = self.recent_sl_hits[symbol]
-        current_time = datetime.now()
+        current_time = clock.now()
         
         for sl_event in recent_sls:
             time_since_sl = current_time - sl_event["time"]
@@ -231,7 +232,7 @@ class ReEntryManager:
         self._clean_old_events(self.completed_tps[trade.symbol])
         
         self.completed_tps[trade.symbol].append({
-            "time": datetime.now(),
+            "time": clock.now(),
             "chain_id": trade.chain_id,
             "direction": trade.direction,
             "tp_price": tp_price,
@@ -242,7 +243,7 @@ class ReEntryManager:
         if trade.chain_id in self.active_chains:
             chain = self.active_chains[trade.chain_id]
             chain.total_profit += abs(tp_price - trade.entry) * trade.lot_size * 10000
-            chain.last_update = datetime.now().isoformat()
+            chain.last_update = clock.now().isoformat()
     
     def record_sl_hit(self, trade: Trade):
         """Record SL hit for recovery tracking"""
@@ -254,7 +255,7 @@ class ReEntryManager:
         self._clean_old_events(self.recent_sl_hits[trade.symbol])
         
         self.recent_sl_hits[trade.symbol].append({
-            "time": datetime.now(),
+            "time": clock.now(),
             "direction": trade.direction,
             "sl_price": trade.sl,
             "original_entry": trade.original_entry or trade.entry,
@@ -268,7 +269,7 @@ class ReEntryManager:
     def _clean_old_events(self, events: List[Dict]):
         """Remove events older than recovery window"""
         
-        current_time = datetime.now()
+        current_time = clock.now()
         window = timedelta(minutes=self.config["re_entry_config"]["recovery_window_minutes"])
         
         events[:] = [e for e in events if current_time - e["time"] <= window]
@@ -285,11 +286,11 @@ class ReEntryManager:
                 chain.trades.append(new_trade_id)
             else:
                 # Create pseudo-ID for simulation
-                sim_id = int(datetime.now().timestamp() * 1000) % 1000000
+                sim_id = int(clock.now().timestamp() * 1000) % 1000000
                 chain.trades.append(sim_id)
                 print(f"INFO: Simulation mode: Using pseudo trade ID {sim_id} for re-entry")
             
-            chain.last_update = datetime.now().isoformat()
+            chain.last_update = clock.now().isoformat()
             
             if chain.current_level >= chain.max_level:
                 chain.status = "completed"
\ No newline at end of file
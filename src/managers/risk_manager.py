@@ -1,20 +1,32 @@
 import json
 import os
-from datetime import datetime, date
+from datetime import datetime
 from typing import Dict, Any, List
 from src.config import Config
+from src.core.open_trade_book import OpenTradeBook
+from src.utils.json_state_writer import JsonStateWriter
+from src.utils import clock
 
 class RiskManager:
     def __init__(self, config: Config):
         self.config = config
-        self.stats_file = "data/stats.json"
+        self.stats_file = config.get("state_writer_config", {}).get("stats_file", "data/stats.json")
         self.daily_loss = 0.0
         self.lifetime_loss = 0.0
         self.daily_profit = 0.0
         self.total_trades = 0
         self.winning_trades = 0
-        self.open_trades = []
+        # Shared with TradingEngine (engine.open_trades is this same book)
+        self.open_trades = OpenTradeBook(symbol_config=config.get("symbol_config", {}))
+        mtm_config = config.get("mark_to_market_config", {})
+        self.include_open_loss = mtm_config.get("include_open_loss_in_limits", False)
+        # Valuation reads only cached quotes (kept fresh by the tick pump)
+        self.quote_max_age_ms = mtm_config.get("quote_max_age_ms", 5000)
         self.mt5_client = None
+        self.writer = JsonStateWriter(
+            self.stats_file, self._stats_snapshot,
+            config.get("state_writer_config", {}).get("debounce_ms", 500)
+        )
         self.load_stats()
         
     def load_stats(self):
@@ -24,7 +36,7 @@ class RiskManager:
                 with open(self.stats_file, 'r') as f:
                     stats = json.load(f)
                     
-                if stats.get("date") != str(date.today()):
+                if stats.get("date") != str(clock.today()):
                     self.daily_loss = 0.0
                     self.daily_profit = 0.0
                 else:
@@ -62,21 +74,18 @@ class RiskManager:
         self.save_stats()
     
     def save_stats(self):
-        """Save statistics to file"""
-        stats = {
-            "date": str(date.today()),
+        """Schedule a debounced atomic write of the statistics file"""
+        self.writer.mark_dirty()
+    
+    def _stats_snapshot(self) -> Dict[str, Any]:
+        return {
+            "date": str(clock.today()),
             "daily_loss": self.daily_loss,
             "daily_profit": self.daily_profit,
             "lifetime_loss": self.lifetime_loss,
             "total_trades": self.total_trades,
             "winning_trades": self.winning_trades
         }
-        
-        try:
-            with open(self.stats_file, 'w') as f:
-                json.dump(stats, f, indent=4)
-        except Exception as e:
-            print(f"ERROR: Error saving stats: {str(e)}")
     
     def get_fixed_lot_size(self, balance: float) -> float:
         """Get fixed lot size based on account balance"""
@@ -133,6 +142,14 @@ class RiskManager:
             print(f"BLOCKED: Daily loss limit reached: ${self.daily_loss}")
             return False
         
+        # Optionally count the open (unrealized) loss against the daily limit
+        if self.include_open_loss and len(self.open_trades) > 0:
+            open_loss = max(0.0, -self.get_open_exposure()["unrealized_pnl"])
+            if self.daily_loss + open_loss >= risk_params["daily_loss_limit"]:
+                print(f"BLOCKED: Daily loss limit reached with open loss: "
+                      f"${self.daily_loss} + ${open_loss:.2f} unrealized")
+                return False
+        
         # Note: Dual order validation is done separately in validate_dual_orders()
         # This method checks basic trading permission
         
@@ -152,13 +169,40 @@ class RiskManager:
         self.save_stats()
     
     def add_open_trade(self, trade):
-        """Add trade to open trades list"""
-        self.open_trades.append(trade)
+        """Add trade to the open trade book (no-op if already present)"""
+        self.open_trades.add(trade)
     
     def remove_open_trade(self, trade):
-        """Remove trade from open trades list"""
-        self.open_trades = [t for t in self.open_trades 
-                          if getattr(t, 'trade_id', None) != getattr(trade, 'trade_id', None)]
+        """Remove trade from the open trade book"""
+        if not self.open_trades.discard(trade):
+            # Different object for the same ticket
+            existing = self.open_trades.get_by_trade_id(getattr(trade, 'trade_id', None))
+            if existing is not None:
+                self.open_trades.discard(existing)
+    
+    def get_open_prices(self) -> Dict[str, float]:
+        """
+        Cached mid price for every symbol with an open trade
+        Never calls the terminal, so it is safe from any thread (can_trade
+        runs it on the MT5 worker, get_stats on the Telegram thread);
+        symbols without a fresh quote are left out and counted as unvalued
+        """
+        if not self.mt5_client:
+            return {}
+        prices = {}
+        for symbol in self.open_trades.symbols():
+            quote = self.mt5_client.get_cached_quote(symbol, self.quote_max_age_ms)
+            if quote is not None:
+                prices[symbol] = quote.mid
+        return prices
+    
+    def get_open_exposure(self) -> Dict[str, Any]:
+        """
+        Vectorized mark-to-market of all open trades (total, per symbol/chain/strategy)
+        The position store's lock keeps the valuation consistent while the
+        event loop adds and removes trades
+        """
+        return self.open_trades.mark_to_market(self.get_open_prices())
     
     def set_mt5_client(self, mt5_client):
         """Set MT5 client for balance checking"""
@@ -272,6 +316,7 @@ class RiskManager:
             return {}
             
         risk_params = self.config["risk_tiers"][risk_tier]
+        exposure = self.get_open_exposure()
         
         return {
             "daily_loss": self.daily_loss,
@@ -283,5 +328,7 @@ class RiskManager:
             "current_risk_tier": risk_tier,
             "risk_parameters": risk_params,
             "current_lot_size": lot_size,
-            "account_balance": account_balance
+            "account_balance": account_balance,
+            "unrealized_pnl": exposure["unrealized_pnl"],
+            "unrealized_pnl_by_symbol": exposure["by_symbol"]
         }
\ No newline at end of file
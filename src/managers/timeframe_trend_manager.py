@@ -1,14 +1,44 @@
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
 import json
+import logging
 import os
+import threading
+from src.utils.json_state_writer import JsonStateWriter
+from src.utils import clock
+
+logger = logging.getLogger(__name__)
+
+# Timeframes that must agree for each logic, bias timeframe first
+DEFAULT_LOGIC_RULES: Dict[str, List[str]] = {
+    "LOGIC1": ["1h", "15m"],  # 1H bias + 15M trend for 5M entries
+    "LOGIC2": ["1h", "15m"],  # 1H bias + 15M trend for 15M entries
+    "LOGIC3": ["1d", "1h"]    # 1D bias + 1H trend for 1H entries
+}
+
+# Entry alert timeframe -> logic whose rule gates it
+DEFAULT_ENTRY_LOGICS: Dict[str, str] = {
+    "5m": "LOGIC1",
+    "15m": "LOGIC2",
+    "1h": "LOGIC3"
+}
 
 class TimeframeTrendManager:
     """Manage trends per timeframe instead of per logic"""
     
-    def __init__(self, config_file="config/timeframe_trends.json"):
+    def __init__(self, config_file="config/timeframe_trends.json", debounce_ms: float = 500,
+                 logic_rules: Optional[Dict[str, List[str]]] = None,
+                 entry_logics: Optional[Dict[str, str]] = None):
         self.config_file = config_file
         self.trends = self.load_trends()
+        self.writer = JsonStateWriter(config_file, lambda: self.trends, debounce_ms)
+        # Extra/overridden logic definitions come from trend_alignment_config
+        self.logic_rules = {**DEFAULT_LOGIC_RULES, **(logic_rules or {})}
+        self.entry_logics = {**DEFAULT_ENTRY_LOGICS, **(entry_logics or {})}
+        self.alignment_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # Bumped on every invalidation; a result computed across a bump is stale
+        self.alignment_generation: Dict[str, int] = {}
+        self.alignment_epoch = 0
+        self._alignment_lock = threading.Lock()
         
     def load_trends(self) -> Dict[str, Any]:
         """Load trends from file with error handling"""
@@ -30,12 +60,8 @@ class TimeframeTrendManager:
             }
     
     def save_trends(self):
-        """Save trends to file"""
-        try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.trends, f, indent=4)
-        except Exception as e:
-            print(f"ERROR: Error saving trends: {str(e)}")
+        """Schedule a debounced atomic write of the trends file"""
+        self.writer.mark_dirty()
     
     def update_trend(self, symbol: str, timeframe: str, signal: str, mode: str = "AUTO"):
         """Update trend for a specific symbol and timeframe"""
@@ -64,8 +90,9 @@ class TimeframeTrendManager:
         self.trends["symbols"][symbol][timeframe] = {
             "trend": trend,
             "mode": mode,
-            "last_update": datetime.now().isoformat()
+            "last_update": clock.now().isoformat()
         }
+        self.invalidate_alignment(symbol)
         self.save_trends()
         print(f"SUCCESS: Trend updated: {symbol} {timeframe} -> {trend} ({mode})")
     
@@ -83,12 +110,42 @@ class TimeframeTrendManager:
         except:
             return "AUTO"
     
+    def logic_for_timeframe(self, timeframe: str) -> Optional[str]:
+        """Logic an entry alert on this timeframe trades under (None = no logic)"""
+        logic = self.entry_logics.get(timeframe)
+        return logic if logic in self.logic_rules else None
+    
     def check_logic_alignment(self, symbol: str, logic: str) -> Dict[str, Any]:
-        """Check if trends align for a specific trading logic"""
+        """
+        Check if trends align for a specific trading logic
+        Results are cached per (symbol, logic) and recomputed only after that
+        symbol's trends change - treat the returned dict as read-only.
+        Trends can change from the Telegram thread while a result is being
+        computed, so it is only cached if no invalidation happened meanwhile
+        """
+        result = self.alignment_cache.get((symbol, logic))
+        if result is not None:
+            return result
         
-        import logging
-        logger = logging.getLogger(__name__)
+        timeframes = self.logic_rules.get(logic)
+        if timeframes is None:
+            logger.warning("🔍 [ALIGNMENT_CHECK] %s %s: ❌ Unknown logic", symbol, logic)
+            return {
+                "aligned": False,
+                "direction": "NEUTRAL",
+                "details": {},
+                "failure_reason": f"Unknown logic: {logic}"
+            }
         
+        generation = (self.alignment_epoch, self.alignment_generation.get(symbol, 0))
+        result = self._compute_alignment(symbol, logic, timeframes)
+        with self._alignment_lock:
+            if generation == (self.alignment_epoch, self.alignment_generation.get(symbol, 0)):
+                self.alignment_cache[(symbol, logic)] = result
+        return result
+    
+    def _compute_alignment(self, symbol: str, logic: str, timeframes: List[str]) -> Dict[str, Any]:
+        """All rule timeframes must share the same non-neutral trend"""
         result = {
             "aligned": False,
             "direction": "NEUTRAL",
@@ -99,118 +156,49 @@ class TimeframeTrendManager:
         # DIAGNOSTIC: Check if symbol exists in trends
         if symbol not in self.trends["symbols"]:
             result["failure_reason"] = f"Symbol {symbol} not found in trends dictionary"
-            logger.debug(
-                f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ Symbol not in trends. "
-                f"Available symbols: {list(self.trends['symbols'].keys())}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "🔍 [ALIGNMENT_CHECK] %s %s: ❌ Symbol not in trends. Available symbols: %s",
+                    symbol, logic, list(self.trends["symbols"].keys())
+                )
             return result
         
         symbol_trends = self.trends["symbols"][symbol]
-        
-        if logic == "LOGIC1":  # 1H bias + 15M trend for 5M entries
-            h1_trend = symbol_trends.get("1h", {}).get("trend", "NEUTRAL")
-            m15_trend = symbol_trends.get("15m", {}).get("trend", "NEUTRAL")
-            
-            result["details"] = {"1h": h1_trend, "15m": m15_trend}
-            
-            # DIAGNOSTIC: Log alignment check details
-            if h1_trend == "NEUTRAL":
-                result["failure_reason"] = "1H trend is NEUTRAL"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ 1H trend is NEUTRAL "
-                    f"(1H={h1_trend}, 15M={m15_trend})"
-                )
-            elif m15_trend == "NEUTRAL":
-                result["failure_reason"] = "15M trend is NEUTRAL"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ 15M trend is NEUTRAL "
-                    f"(1H={h1_trend}, 15M={m15_trend})"
-                )
-            elif h1_trend != m15_trend:
-                result["failure_reason"] = f"Trends don't match: 1H={h1_trend} != 15M={m15_trend}"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ Trends don't match "
-                    f"(1H={h1_trend}, 15M={m15_trend})"
-                )
-            else:
-                result["aligned"] = True
-                result["direction"] = h1_trend
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ✅ ALIGNED "
-                    f"(1H={h1_trend}, 15M={m15_trend}, Direction={h1_trend})"
-                )
-                
-        elif logic == "LOGIC2":  # 1H bias + 15M trend for 15M entries
-            h1_trend = symbol_trends.get("1h", {}).get("trend", "NEUTRAL")
-            m15_trend = symbol_trends.get("15m", {}).get("trend", "NEUTRAL")
-            
-            result["details"] = {"1h": h1_trend, "15m": m15_trend}
-            
-            # DIAGNOSTIC: Log alignment check details
-            if h1_trend == "NEUTRAL":
-                result["failure_reason"] = "1H trend is NEUTRAL"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ 1H trend is NEUTRAL "
-                    f"(1H={h1_trend}, 15M={m15_trend})"
-                )
-            elif m15_trend == "NEUTRAL":
-                result["failure_reason"] = "15M trend is NEUTRAL"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ 15M trend is NEUTRAL "
-                    f"(1H={h1_trend}, 15M={m15_trend})"
-                )
-            elif h1_trend != m15_trend:
-                result["failure_reason"] = f"Trends don't match: 1H={h1_trend} != 15M={m15_trend}"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ Trends don't match "
-                    f"(1H={h1_trend}, 15M={m15_trend})"
-                )
-            else:
-                result["aligned"] = True
-                result["direction"] = h1_trend
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ✅ ALIGNED "
-                    f"(1H={h1_trend}, 15M={m15_trend}, Direction={h1_trend})"
-                )
-                
-        elif logic == "LOGIC3":  # 1D bias + 1H trend for 1H entries
-            d1_trend = symbol_trends.get("1d", {}).get("trend", "NEUTRAL")
-            h1_trend = symbol_trends.get("1h", {}).get("trend", "NEUTRAL")
-            
-            result["details"] = {"1d": d1_trend, "1h": h1_trend}
-            
-            # DIAGNOSTIC: Log alignment check details
-            if d1_trend == "NEUTRAL":
-                result["failure_reason"] = "1D trend is NEUTRAL"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ 1D trend is NEUTRAL "
-                    f"(1D={d1_trend}, 1H={h1_trend})"
-                )
-            elif h1_trend == "NEUTRAL":
-                result["failure_reason"] = "1H trend is NEUTRAL"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ 1H trend is NEUTRAL "
-                    f"(1D={d1_trend}, 1H={h1_trend})"
-                )
-            elif d1_trend != h1_trend:
-                result["failure_reason"] = f"Trends don't match: 1D={d1_trend} != 1H={h1_trend}"
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ Trends don't match "
-                    f"(1D={d1_trend}, 1H={h1_trend})"
-                )
-            else:
-                result["aligned"] = True
-                result["direction"] = d1_trend
-                logger.debug(
-                    f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ✅ ALIGNED "
-                    f"(1D={d1_trend}, 1H={h1_trend}, Direction={d1_trend})"
+        details = {tf: symbol_trends.get(tf, {}).get("trend", "NEUTRAL") for tf in timeframes}
+        result["details"] = details
+        
+        bias_tf = timeframes[0]
+        bias = details[bias_tf]
+        for tf in timeframes:
+            if details[tf] == "NEUTRAL":
+                result["failure_reason"] = f"{tf.upper()} trend is NEUTRAL"
+                break
+            if details[tf] != bias:
+                result["failure_reason"] = (
+                    f"Trends don't match: {bias_tf.upper()}={bias} != {tf.upper()}={details[tf]}"
                 )
+                break
         else:
-            result["failure_reason"] = f"Unknown logic: {logic}"
-            logger.warning(f"🔍 [ALIGNMENT_CHECK] {symbol} {logic}: ❌ Unknown logic")
+            result["aligned"] = True
+            result["direction"] = bias
         
+        logger.debug(
+            "🔍 [ALIGNMENT_CHECK] %s %s: %s (%s)", symbol, logic,
+            "✅ ALIGNED" if result["aligned"] else f"❌ {result['failure_reason']}", details
+        )
         return result
     
+    def invalidate_alignment(self, symbol: Optional[str] = None):
+        """Drop cached alignment results for a symbol (all symbols if None)"""
+        with self._alignment_lock:
+            if symbol is None:
+                self.alignment_epoch += 1
+                self.alignment_cache.clear()
+                return
+            self.alignment_generation[symbol] = self.alignment_generation.get(symbol, 0) + 1
+            for logic in self.logic_rules:
+                self.alignment_cache.pop((symbol, logic), None)
+    
     def set_manual_trend(self, symbol: str, timeframe: str, trend: str):
         """Manually set a trend that won't be overridden by signals"""
         # Convert BULLISH/BEARISH to bull/bear for signal
@@ -227,6 +215,7 @@ class TimeframeTrendManager:
         """Set trend back to AUTO mode (will be updated by TradingView signals)"""
         if symbol in self.trends["symbols"] and timeframe in self.trends["symbols"][symbol]:
             self.trends["symbols"][symbol][timeframe]["mode"] = "AUTO"
+            self.invalidate_alignment(symbol)
             self.save_trends()
             print(f"SUCCESS: Mode set to AUTO for {symbol} {timeframe}")
     
@@ -10,7 +10,8 @@ class Alert(BaseModel):
     tf: str  # "1h", "15m", "5m", "1d" - REQUIRED FIELD (no default)
     price: Optional[float] = None
     strategy: Optional[str] = None
-    raw_data: Optional[Dict[str, Any]] = None
+    timestamp: Optional[str] = None  # ISO time from the webhook (set on ingest if missing)
+    raw_data: Optional[Dict[str, Any]] = None  # Legacy - no longer populated on ingest
     
     @validator('type')
     def validate_type(cls, v):
@@ -1,108 +1,151 @@
-from typing import Dict, Any, List, Optional
+import logging
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from src.config import Config
 from src.models import Alert
+from src.utils import clock
+
+# (type, symbol, tf, signal)
+DedupKey = Tuple[str, str, str, str]
+
+logger = logging.getLogger(__name__)
 
 class AlertProcessor:
     def __init__(self, config: Config):
         self.config = config
-        self.recent_alerts: List[Alert] = []
-        self.alert_window = timedelta(minutes=5)
+        
+        # Duplicate window - default plus optional per alert type overrides
+        dedup_config = config.get("alert_dedup_config", {})
+        self.alert_window = timedelta(seconds=dedup_config.get("window_seconds", 300))
+        self.type_windows = {
+            alert_type: float(seconds)
+            for alert_type, seconds in dedup_config.get("type_windows_seconds", {}).items()
+        }
+        
+        # Dedup index: key -> deque of (seq, event_time) with decreasing
+        # event_time, so the left entry is the latest timestamp still in the
+        # window. Timestamps are parsed once when the alert is indexed
+        self.dedup_index: Dict[DedupKey, Deque[Tuple[int, float]]] = {}
+        # Per alert type expiry queue of (expires_at_monotonic, seq, key, alert)
+        # in arrival order - one window per type keeps each queue sorted
+        self.expiry_queues: Dict[str, Deque[Tuple[float, int, DedupKey, Alert]]] = {}
+        self.alert_seq = 0
     
-    def validate_alert(self, alert_data: Dict[str, Any]) -> bool:
-        """Validate incoming alert"""
+    def validate_alert(self, alert_data: Dict[str, Any]) -> Optional[Alert]:
+        """
+        Validate incoming alert
+        Returns the parsed Alert (pass it on to process_alert) or None if rejected
+        """
         try:
-            print(f"ALERT: Received alert: {alert_data}")
-            
-            # Add timestamp if not present
-            if 'timestamp' not in alert_data:
-                alert_data['timestamp'] = datetime.now().isoformat()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"ALERT: Received alert: {alert_data}")
             
             # NO DEFAULT TF FIELD - tf field is REQUIRED
             # If tf missing, Alert() will raise ValidationError
             
-            # Store raw_data properly
-            alert = Alert(**alert_data, raw_data=alert_data)
+            # Parsed once here - the same object flows through dedup and execution
+            alert = Alert(**alert_data)
+            
+            # Add timestamp if not present
+            if alert.timestamp is None:
+                alert.timestamp = clock.now().isoformat()
+            event_time = self._event_time(alert)
             
             # Clean old alerts BEFORE checking for duplicates
             self.clean_old_alerts()
             
             # Check if alert is duplicate
-            if self.is_duplicate_alert(alert):
+            if self.is_duplicate_alert(alert, event_time):
                 print("ERROR: Duplicate alert detected")
-                return False
+                return None
                 
             # Check if symbol is valid
             if not self.is_valid_symbol(alert.symbol):
                 print(f"ERROR: Invalid symbol: {alert.symbol}")
-                return False
+                return None
                 
             # Check if timeframe is valid
             if alert.tf not in ['1h', '15m', '5m', '1d']:
                 print(f"ERROR: Invalid timeframe: {alert.tf}")
-                return False
+                return None
                 
             # Check if signal type is valid
             if alert.type == 'bias' or alert.type == 'trend':
                 if alert.signal not in ['bull', 'bear']:
                     print(f"ERROR: Invalid signal for {alert.type}: {alert.signal}")
-                    return False
+                    return None
             elif alert.type == 'entry':
                 if alert.signal not in ['buy', 'sell']:
                     print(f"ERROR: Invalid signal for {alert.type}: {alert.signal}")
-                    return False
+                    return None
             elif alert.type == 'reversal':
                 if alert.signal not in ['reversal_bull', 'reversal_bear', 'bull', 'bear']:
                     print(f"ERROR: Invalid signal for {alert.type}: {alert.signal}")
-                    return False
+                    return None
             elif alert.type == 'exit':
                 if alert.signal not in ['bull', 'bear']:
                     print(f"ERROR: Invalid signal for {alert.type}: {alert.signal}")
-                    return False
+                    return None
                     
             # Store alert
-            self.recent_alerts.append(alert)
+            self._index_alert(alert, event_time)
             
             print("SUCCESS: Alert validation successful")
-            return True
+            return alert
             
         except Exception as e:
             print(f"ERROR: Alert validation error: {str(e)}")
             import traceback
             traceback.print_exc()
-            return False
+            return None
+    
+    @staticmethod
+    def _dedup_key(alert: Alert) -> DedupKey:
+        return (alert.type, alert.symbol, alert.tf, alert.signal)
+    
+    def _window_seconds(self, alert_type: str) -> float:
+        """Duplicate window for an alert type"""
+        return self.type_windows.get(alert_type, self.alert_window.total_seconds())
     
-    def is_duplicate_alert(self, alert: Alert) -> bool:
-        """Check if this is a duplicate alert"""
-        # Get incoming alert's timestamp
-        incoming_timestamp = datetime.now()
-        if alert.raw_data and isinstance(alert.raw_data, dict):
+    @staticmethod
+    def _event_time(alert: Alert) -> float:
+        """Alert's own timestamp as epoch seconds (now if missing or invalid)"""
+        timestamp_str = alert.timestamp
+        if not timestamp_str and alert.raw_data and isinstance(alert.raw_data, dict):
             timestamp_str = alert.raw_data.get('timestamp')
-            if timestamp_str:
-                try:
-                    incoming_timestamp = datetime.fromisoformat(timestamp_str)
-                except (ValueError, TypeError):
-                    pass
+        if timestamp_str:
+            try:
+                return datetime.fromisoformat(timestamp_str).timestamp()
+            except (ValueError, TypeError):
+                pass
+        return clock.timestamp()
+    
+    def _index_alert(self, alert: Alert, event_time: float):
+        """Add an accepted alert to the dedup index"""
+        self.alert_seq += 1
+        key = self._dedup_key(alert)
+        entries = self.dedup_index.setdefault(key, deque())
+        # Entries with an older timestamp can no longer decide a duplicate
+        while entries and entries[-1][1] <= event_time:
+            entries.pop()
+        entries.append((self.alert_seq, event_time))
+        self.expiry_queues.setdefault(alert.type, deque()).append(
+            (clock.monotonic() + self._window_seconds(alert.type), self.alert_seq, key, alert)
+        )
+    
+    def is_duplicate_alert(self, alert: Alert, event_time: Optional[float] = None) -> bool:
+        """Check if this is a duplicate alert - same key within the window (O(1))"""
+        entries = self.dedup_index.get(self._dedup_key(alert))
+        if not entries:
+            return False
         
-        for recent_alert in self.recent_alerts:
-            # Skip alerts older than alert_window relative to incoming alert
-            if recent_alert.raw_data and isinstance(recent_alert.raw_data, dict):
-                recent_timestamp_str = recent_alert.raw_data.get('timestamp')
-                if recent_timestamp_str:
-                    try:
-                        recent_alert_time = datetime.fromisoformat(recent_timestamp_str)
-                        if incoming_timestamp - recent_alert_time >= self.alert_window:
-                            continue  # Skip old alerts (>5 min apart)
-                    except (ValueError, TypeError):
-                        pass  # If timestamp invalid, still check for duplicate
-            
-            if (recent_alert.type == alert.type and
-                recent_alert.symbol == alert.symbol and
-                recent_alert.tf == alert.tf and
-                recent_alert.signal == alert.signal):
-                return True
-                
-        return False
+        if event_time is None:
+            event_time = self._event_time(alert)
+        
+        # Duplicate if within the window of any indexed timestamp for the key,
+        # i.e. of the latest one
+        return event_time - entries[0][1] < self._window_seconds(alert.type)
     
     def is_valid_symbol(self, symbol: str) -> bool:
         """Check if symbol is valid for trading"""
@@ -111,32 +154,29 @@ class AlertProcessor:
         return symbol in valid_symbols
     
     def clean_old_alerts(self):
-        """Remove alerts older than the alert window"""
+        """Remove alerts older than their type's window (amortized O(1))"""
         try:
-            current_time = datetime.now()
-            cleaned_alerts = []
-            
-            for alert in self.recent_alerts:
-                timestamp_str = None
-                
-                if alert.raw_data and isinstance(alert.raw_data, dict):
-                    timestamp_str = alert.raw_data.get('timestamp')
-                
-                if timestamp_str:
-                    try:
-                        alert_time = datetime.fromisoformat(timestamp_str)
-                        if current_time - alert_time < self.alert_window:
-                            cleaned_alerts.append(alert)
-                    except (ValueError, TypeError):
-                        cleaned_alerts.append(alert)
-                else:
-                    cleaned_alerts.append(alert)
-            
-            self.recent_alerts = cleaned_alerts
+            now = clock.monotonic()
+            for expiry_queue in self.expiry_queues.values():
+                while expiry_queue and expiry_queue[0][0] <= now:
+                    _, seq, key, _ = expiry_queue.popleft()
+                    entries = self.dedup_index.get(key)
+                    # Entry may already have been superseded by a later timestamp
+                    if entries and entries[0][0] == seq:
+                        entries.popleft()
+                        if not entries:
+                            del self.dedup_index[key]
             
         except Exception as e:
             print(f"WARNING: Error cleaning alerts: {str(e)}")
     
+    @property
+    def recent_alerts(self) -> List[Alert]:
+        """Alerts still inside their window, in arrival order"""
+        entries = [entry for expiry_queue in self.expiry_queues.values() for entry in expiry_queue]
+        entries.sort(key=lambda entry: entry[1])
+        return [entry[3] for entry in entries]
+    
     def get_recent_alerts(self, alert_type: Optional[str] = None, symbol: Optional[str] = None, tf: Optional[str] = None) -> List[Alert]:
         """Get recent alerts filtered by type, symbol, or timeframe"""
         filtered = self.recent_alerts
@@ -0,0 +1,174 @@
+import asyncio
+import time
+import uuid
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+from src.utils import metrics
+
+# Receipt of the webhook request -> alert processed, by alert type and outcome
+WEBHOOK_LATENCY_SECONDS = metrics.histogram(
+    "webhook_latency_seconds", "Webhook end-to-end latency in seconds (receipt to processed)",
+    ["type", "outcome"]
+)
+
+
+class AlertIngestionService:
+    """
+    Accept-and-ack ingestion for webhook alerts
+    - submit() assigns an alert id and pushes the alert onto a bounded
+      per-symbol queue, returning immediately (webhook answers 202)
+    - One worker task per symbol processes its queue in arrival order,
+      different symbols run concurrently
+    - Outcome of recent alerts is kept for the status endpoints
+    """
+
+    def __init__(self, config, process_alert: Callable[[Any], Awaitable[bool]],
+                 on_error: Optional[Callable[[str], Any]] = None):
+        self.process_alert = process_alert
+        self.on_error = on_error
+
+        ingestion_config = config.get("alert_ingestion_config", {})
+        self.enabled = ingestion_config.get("enabled", False)
+        self.max_queue_per_symbol = ingestion_config.get("max_queue_per_symbol", 100)
+        self.max_tracked_alerts = ingestion_config.get("max_tracked_alerts", 1000)
+        self.worker_idle_timeout = ingestion_config.get("worker_idle_timeout_seconds", 300)
+
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self.workers: Dict[str, asyncio.Task] = {}
+        self.alerts: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        self.stats = {
+            "accepted": 0,
+            "rejected_queue_full": 0,
+            "processed": 0,
+            "rejected": 0,
+            "failed": 0
+        }
+
+        self.logger = logging.getLogger(__name__)
+
+    def submit(self, alert, received_at: Optional[float] = None) -> Optional[str]:
+        """
+        Queue a validated alert (Alert or dict), returns its alert id
+        (None if the symbol queue is full)
+        received_at: time.perf_counter() when the webhook arrived (end-to-end latency)
+        """
+        if isinstance(alert, dict):
+            get = alert.get
+        else:
+            get = lambda name: getattr(alert, name, None)
+        symbol = get("symbol") or "UNKNOWN"
+        queue = self.queues.get(symbol)
+        if queue is None:
+            queue = self.queues[symbol] = asyncio.Queue(maxsize=self.max_queue_per_symbol)
+
+        if queue.full():
+            self.stats["rejected_queue_full"] += 1
+            return None
+
+        alert_id = uuid.uuid4().hex[:16]
+        self._track(alert_id, {
+            "alert_id": alert_id,
+            "symbol": symbol,
+            "type": get("type"),
+            "signal": get("signal"),
+            "tf": get("tf"),
+            "status": "queued",
+            "received_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "processing_ms": None,
+            "error": None
+        })
+        queue.put_nowait((alert_id, alert, time.perf_counter() if received_at is None else received_at))
+        self.stats["accepted"] += 1
+
+        worker = self.workers.get(symbol)
+        if worker is None or worker.done():
+            self.workers[symbol] = asyncio.create_task(self._worker(symbol))
+        return alert_id
+
+    def _track(self, alert_id: str, record: Dict[str, Any]):
+        self.alerts[alert_id] = record
+        while len(self.alerts) > self.max_tracked_alerts:
+            self.alerts.popitem(last=False)
+
+    async def _worker(self, symbol: str):
+        """Process one symbol's alerts in order; exits after being idle"""
+        queue = self.queues[symbol]
+        while True:
+            try:
+                alert_id, data, received_at = await asyncio.wait_for(queue.get(), timeout=self.worker_idle_timeout)
+            except asyncio.TimeoutError:
+                if queue.empty():
+                    # No await between this check and removal - submit() will start a new worker
+                    self.workers.pop(symbol, None)
+                    return
+                continue
+            except asyncio.CancelledError:
+                return
+
+            record = self.alerts.get(alert_id, {})
+            record["status"] = "processing"
+            record["started_at"] = datetime.now().isoformat()
+            start = time.perf_counter()
+            try:
+                result = await self.process_alert(data)
+                record["status"] = "processed" if result else "rejected"
+                self.stats["processed" if result else "rejected"] += 1
+            except asyncio.CancelledError:
+                record["status"] = "cancelled"
+                raise
+            except Exception as e:
+                record["status"] = "failed"
+                record["error"] = str(e)
+                self.stats["failed"] += 1
+                self.logger.error(f"Alert {alert_id} ({symbol}) processing error: {str(e)}")
+                if self.on_error:
+                    self.on_error(f"Alert processing error ({symbol}): {str(e)}")
+            finally:
+                record["finished_at"] = datetime.now().isoformat()
+                finished = time.perf_counter()
+                record["processing_ms"] = round((finished - start) * 1000, 2)
+                WEBHOOK_LATENCY_SECONDS.labels(record.get("type") or "unknown", record.get("status")).observe(
+                    finished - received_at
+                )
+                queue.task_done()
+
+    def get_alert_status(self, alert_id: str) -> Optional[Dict[str, Any]]:
+        """Outcome of a submitted alert (None if unknown or expired)"""
+        record = self.alerts.get(alert_id)
+        return dict(record) if record else None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Queue depth per symbol, worker state and counters"""
+        return {
+            "enabled": self.enabled,
+            "queues": {
+                symbol: {
+                    "depth": queue.qsize(),
+                    "max_size": self.max_queue_per_symbol,
+                    "worker_active": symbol in self.workers and not self.workers[symbol].done()
+                }
+                for symbol, queue in self.queues.items()
+            },
+            "total_queued": sum(queue.qsize() for queue in self.queues.values()),
+            "tracked_alerts": len(self.alerts),
+            "stats": dict(self.stats)
+        }
+
+    async def stop(self, timeout: float = 10.0):
+        """Let queued alerts finish (up to timeout), then cancel the workers"""
+        pending = [queue.join() for queue in self.queues.values() if queue.qsize() > 0]
+        if pending:
+            try:
+                await asyncio.wait_for(asyncio.gather(*pending), timeout=timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning("Alert ingestion stopped with alerts still queued")
+        for task in self.workers.values():
+            task.cancel()
+        if self.workers:
+            await asyncio.gather(*self.workers.values(), return_exceptions=True)
+        self.workers.clear()
@@ -1,59 +1,60 @@
-from src.database import TradeDatabase
+from datetime import datetime, timedelta
+from src.database import TradeDatabase, get_database
 
 class AnalyticsEngine:
-    def __init__(self):
-        self.db = TradeDatabase()
+    def __init__(self, db: TradeDatabase = None):
+        # Share the engine's database when given, else the process-wide default
+        self.db = db if db is not None else get_database()
 
-    def get_performance_report(self):
-        trades = self.db.get_trade_history(30)
+    def get_performance_report(self, days=30):
+        """Totals over the last N days from the pnl_rollups store, with the daily equity curve"""
+        start, end = self._rollup_range(days)
+        totals = self.db.get_pnl_rollups(start, end, 'day')[0]
         
         report = {
-            'total_trades': len(trades),
-            'winning_trades': sum(1 for t in trades if t['pnl'] > 0),
-            'losing_trades': sum(1 for t in trades if t['pnl'] < 0),
-            'total_pnl': sum(t['pnl'] for t in trades),
+            'total_trades': totals['trades'],
+            'winning_trades': totals['wins'],
+            'losing_trades': totals['losses'],
+            'total_pnl': totals['pnl'],
             'win_rate': 0,
             'average_win': 0,
-            'average_loss': 0
+            'average_loss': 0,
+            'equity_curve': self.get_equity_curve(days)
         }
         
         if report['total_trades'] > 0:
             report['win_rate'] = (report['winning_trades'] / report['total_trades']) * 100
-            wins = [t['pnl'] for t in trades if t['pnl'] > 0]
-            losses = [t['pnl'] for t in trades if t['pnl'] < 0]
-            report['average_win'] = sum(wins) / len(wins) if wins else 0
-            report['average_loss'] = sum(losses) / len(losses) if losses else 0
+        if report['winning_trades'] > 0:
+            report['average_win'] = totals['gross_profit'] / report['winning_trades']
+        if report['losing_trades'] > 0:
+            report['average_loss'] = -totals['gross_loss'] / report['losing_trades']
 
         return report
 
-    def get_pair_performance(self):
-        trades = self.db.get_trade_history(30)
-        pair_stats = {}
-        
-        for trade in trades:
-            symbol = trade['symbol']
-            if symbol not in pair_stats:
-                pair_stats[symbol] = {'trades': 0, 'pnl': 0, 'wins': 0}
-            
-            pair_stats[symbol]['trades'] += 1
-            pair_stats[symbol]['pnl'] += trade['pnl']
-            if trade['pnl'] > 0:
-                pair_stats[symbol]['wins'] += 1
-        
-        return pair_stats
+    def get_pair_performance(self, days=30):
+        return self._grouped_performance('symbol', days)
 
-    def get_strategy_performance(self):
-        trades = self.db.get_trade_history(30)
-        strategy_stats = {}
-        
-        for trade in trades:
-            strategy = trade['strategy']
-            if strategy not in strategy_stats:
-                strategy_stats[strategy] = {'trades': 0, 'pnl': 0, 'wins': 0}
-            
-            strategy_stats[strategy]['trades'] += 1
-            strategy_stats[strategy]['pnl'] += trade['pnl']
-            if trade['pnl'] > 0:
-                strategy_stats[strategy]['wins'] += 1
-        
-        return strategy_stats
\ No newline at end of file
+    def get_strategy_performance(self, days=30):
+        return self._grouped_performance('strategy', days)
+
+    def _grouped_performance(self, group_by, days):
+        """{key: {'trades': n, 'pnl': total, 'wins': n}} from the pnl_rollups store"""
+        return {
+            row[group_by]: {'trades': row['trades'], 'pnl': row['pnl'], 'wins': row['wins']}
+            for row in self.get_rollup_breakdown(group_by, days)
+        }
+
+    def _rollup_range(self, days):
+        end = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+        start = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        return start, end
+
+    def get_equity_curve(self, days=30, granularity='day'):
+        """Cumulative PnL per bucket from the pnl_rollups store"""
+        start, end = self._rollup_range(days)
+        return self.db.get_equity_curve(start, end, granularity)
+
+    def get_rollup_breakdown(self, group_by, days=30):
+        """PnL totals per symbol/strategy/order_type/is_re_entry from the pnl_rollups store"""
+        start, end = self._rollup_range(days)
+        return self.db.get_pnl_rollups(start, end, 'day', group_by=[group_by])
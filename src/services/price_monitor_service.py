@@ -1,22 +1,34 @@
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
 from src.models import Trade
+from src.core.event_journal import EventType
 from src.config import Config
+from src.clients.async_mt5_client import AsyncMT5Client
+from src.utils import clock
+from src.utils.hot_path_logger import HotPathLogger
+from src.utils import metrics
 import logging
 
+LOOP_CYCLE_SECONDS = metrics.histogram(
+    "loop_cycle_seconds", "Background loop cycle duration in seconds", ["loop"]
+)
+
 class PriceMonitorService:
     """
-    Background service to monitor prices every 30 seconds for:
+    Monitors prices for the checks below - per symbol on every tick pump
+    price change, plus a periodic sweep every price_monitor_interval_seconds:
     1. SL hunt re-entry (price reaches SL + offset)
     2. TP continuation re-entry (after TP hit with price gap)
     3. Reversal exit opportunities
     """
     
     def __init__(self, config: Config, mt5_client, reentry_manager, 
-                 trend_manager, pip_calculator, trading_engine):
+                 trend_manager, pip_calculator, trading_engine, async_mt5_client=None):
         self.config = config
         self.mt5_client = mt5_client
+        # Awaitable MT5 calls (shared worker thread with the trading engine)
+        self.mt5 = async_mt5_client or AsyncMT5Client(config, mt5_client)
         self.reentry_manager = reentry_manager
         self.trend_manager = trend_manager
         self.pip_calculator = pip_calculator
@@ -25,6 +37,9 @@ class PriceMonitorService:
         self.is_running = False
         self.monitor_task = None
         
+        # Serialises the periodic sweep and tick-driven per-symbol checks
+        self.check_lock = asyncio.Lock()
+        
         # Track symbols being monitored
         self.monitored_symbols = set()
         
@@ -39,6 +54,8 @@ class PriceMonitorService:
         
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
+        # Per-cycle price checks: rate-limited per symbol, logged on state change
+        self.hot_log = HotPathLogger.from_config(self.logger, config)
     
     def get_service_status(self) -> Dict[str, Any]:
         """
@@ -59,6 +76,7 @@ class PriceMonitorService:
                 "tp_continuation": dict(self.tp_continuation_pending),
                 "exit_continuation": dict(self.exit_continuation_pending)
             },
+            "hot_path_logging": self.hot_log.get_stats(),
             "configuration": {
                 "sl_hunt_enabled": self.config["re_entry_config"].get("sl_hunt_reentry_enabled", False),
                 "tp_reentry_enabled": self.config["re_entry_config"].get("tp_reentry_enabled", False),
@@ -152,6 +170,7 @@ class PriceMonitorService:
                 await self._check_all_opportunities()
                 
                 cycle_duration = (datetime.now() - cycle_start_time).total_seconds()
+                LOOP_CYCLE_SECONDS.labels("price_monitor").observe(cycle_duration)
                 if cycle_duration > interval:
                     self.logger.warning(
                         f"⚠️ Monitor cycle took {cycle_duration:.2f}s (longer than interval {interval}s)"
@@ -170,15 +189,40 @@ class PriceMonitorService:
         
         self.logger.info(f"Monitor loop stopped after {cycle_count} cycles")
     
+    def get_pending_symbols(self) -> Set[str]:
+        """Symbols with a pending SL hunt, TP continuation or exit continuation"""
+        return (set(self.sl_hunt_pending) | set(self.tp_continuation_pending) |
+                set(self.exit_continuation_pending))
+    
+    def _pending_symbols(self, pending: Dict[str, Dict], only_symbol: Optional[str]) -> List[str]:
+        """Snapshot of pending symbols to check, optionally limited to one symbol"""
+        if only_symbol is None:
+            return list(pending.keys())
+        return [only_symbol] if only_symbol in pending else []
+    
+    async def check_symbol(self, symbol: str):
+        """
+        Check re-entry and profit booking triggers for one symbol
+        Called by the trading engine when the tick pump reports a price change
+        """
+        async with self.check_lock:
+            await self._check_sl_hunt_reentries(symbol)
+            await self._check_tp_continuation_reentries(symbol)
+            await self._check_exit_continuation_reentries(symbol)
+            await self._check_profit_booking_chains(symbol)
+    
     async def _check_all_opportunities(self):
         """Check all pending re-entry opportunities"""
+        async with self.check_lock:
+            await self._check_all_opportunities_unlocked()
+    
+    async def _check_all_opportunities_unlocked(self):
+        """Full sweep over every pending re-entry and profit chain"""
         
         # DEBUG: Log monitoring cycle start
         self.logger.debug(
-            f"[MONITOR_CYCLE] Checking opportunities - "
-            f"SL Hunt: {len(self.sl_hunt_pending)}, "
-            f"TP Continuation: {len(self.tp_continuation_pending)}, "
-            f"Exit Continuation: {len(self.exit_continuation_pending)}"
+            "[MONITOR_CYCLE] Checking opportunities - SL Hunt: %d, TP Continuation: %d, Exit Continuation: %d",
+            len(self.sl_hunt_pending), len(self.tp_continuation_pending), len(self.exit_continuation_pending)
         )
         
         # Check SL hunt re-entries
@@ -193,7 +237,7 @@ class PriceMonitorService:
         # Check Profit Booking chains (NEW)
         await self._check_profit_booking_chains()
     
-    async def _check_sl_hunt_reentries(self):
+    async def _check_sl_hunt_reentries(self, only_symbol: Optional[str] = None):
         """
         Check if price has reached SL + offset for automatic re-entry
         After SL hunt, wait for price to recover to SL + 1 pip, then re-enter
@@ -201,13 +245,13 @@ class PriceMonitorService:
         if not self.config["re_entry_config"]["sl_hunt_reentry_enabled"]:
             return
         
-        for symbol in list(self.sl_hunt_pending.keys()):
+        for symbol in self._pending_symbols(self.sl_hunt_pending, only_symbol):
             pending = self.sl_hunt_pending[symbol]
             
             # Get current price from MT5
-            current_price = self._get_current_price(symbol, pending['direction'])
+            current_price = await self._get_current_price(symbol, pending['direction'])
             if current_price is None:
-                self.logger.debug(f"[SL_HUNT] {symbol}: Failed to get current price")
+                self.logger.debug("[SL_HUNT] %s: Failed to get current price", symbol)
                 continue
             
             target_price = pending['target_price']
@@ -215,13 +259,6 @@ class PriceMonitorService:
             chain_id = pending['chain_id']
             sl_price = pending.get('sl_price', 0)
             
-            # DEBUG: Log price comparison
-            self.logger.debug(
-                f"[SL_HUNT] {symbol} {direction.upper()}: "
-                f"Current={current_price:.5f} Target={target_price:.5f} "
-                f"SL={sl_price:.5f} Gap={abs(current_price - target_price):.5f}"
-            )
-            
             # Check if price has reached target
             price_reached = False
             if direction == 'buy':
@@ -229,13 +266,12 @@ class PriceMonitorService:
             else:
                 price_reached = current_price <= target_price
             
-            # DIAGNOSTIC: Detailed price check logging
-            price_diff = current_price - target_price if direction == 'buy' else target_price - current_price
-            self.logger.info(
-                f"🔍 [SL_HUNT_PRICE_CHECK] {symbol} {direction.upper()}: "
-                f"Current={current_price:.5f} Target={target_price:.5f} "
-                f"SL={sl_price:.5f} Diff={price_diff:.5f} "
-                f"Reached={'✅ YES' if price_reached else '❌ NO'}"
+            # DIAGNOSTIC: Price check logging (rate-limited, always on state change)
+            self.hot_log.info(
+                "SL_HUNT_PRICE_CHECK", symbol, (price_reached, target_price),
+                Direction=direction.upper(), Current=current_price, Target=target_price, SL=sl_price,
+                Diff=current_price - target_price if direction == 'buy' else target_price - current_price,
+                Reached=price_reached
             )
             
             if price_reached:
@@ -257,7 +293,7 @@ class PriceMonitorService:
                         f"⚠️ [SL_HUNT_BLOCKED] {symbol}: Re-entry blocked - "
                         f"Alignment failed: {alignment.get('failure_reason', 'Unknown reason')}"
                     )
-                    del self.sl_hunt_pending[symbol]
+                    self._drop_pending(self.sl_hunt_pending, symbol)
                     continue
                 
                 # Check signal direction matches alignment
@@ -268,7 +304,7 @@ class PriceMonitorService:
                         f"⚠️ [SL_HUNT_BLOCKED] {symbol}: Re-entry blocked - "
                         f"Direction mismatch: Signal={signal_direction} != Alignment={alignment_direction}"
                     )
-                    del self.sl_hunt_pending[symbol]
+                    self._drop_pending(self.sl_hunt_pending, symbol)
                     continue
                 
                 # Execute SL hunt re-entry
@@ -284,9 +320,9 @@ class PriceMonitorService:
                 )
                 
                 # Remove from pending
-                del self.sl_hunt_pending[symbol]
+                self._drop_pending(self.sl_hunt_pending, symbol)
     
-    async def _check_tp_continuation_reentries(self):
+    async def _check_tp_continuation_reentries(self, only_symbol: Optional[str] = None):
         """
         Check if price has moved enough after TP hit for re-entry
         After TP, wait for price gap (e.g., 2 pips), then re-enter with reduced SL
@@ -294,13 +330,13 @@ class PriceMonitorService:
         if not self.config["re_entry_config"]["tp_reentry_enabled"]:
             return
         
-        for symbol in list(self.tp_continuation_pending.keys()):
+        for symbol in self._pending_symbols(self.tp_continuation_pending, only_symbol):
             pending = self.tp_continuation_pending[symbol]
             
             # Get current price from MT5
-            current_price = self._get_current_price(symbol, pending['direction'])
+            current_price = await self._get_current_price(symbol, pending['direction'])
             if current_price is None:
-                self.logger.debug(f"[TP_CONTINUATION] {symbol}: Failed to get current price")
+                self.logger.debug("[TP_CONTINUATION] %s: Failed to get current price", symbol)
                 continue
             
             tp_price = pending['tp_price']
@@ -319,14 +355,6 @@ class PriceMonitorService:
             else:
                 target_price = tp_price - price_gap
             
-            # DEBUG: Log price comparison
-            self.logger.debug(
-                f"[TP_CONTINUATION] {symbol} {direction.upper()}: "
-                f"Current={current_price:.5f} TP={tp_price:.5f} "
-                f"Target={target_price:.5f} Gap={price_gap_pips}pips "
-                f"GapPrice={price_gap:.5f}"
-            )
-            
             # Check if price has moved enough from TP
             gap_reached = False
             if direction == 'buy':
@@ -334,15 +362,14 @@ class PriceMonitorService:
             else:
                 gap_reached = current_price <= target_price
             
-            # DIAGNOSTIC: Detailed price gap check logging
-            price_diff = current_price - target_price if direction == 'buy' else target_price - current_price
-            remaining_gap = abs(current_price - target_price)
-            self.logger.info(
-                f"🔍 [TP_CONTINUATION_PRICE_CHECK] {symbol} {direction.upper()}: "
-                f"Current={current_price:.5f} TP={tp_price:.5f} "
-                f"Target={target_price:.5f} Gap={price_gap_pips}pips "
-                f"Diff={price_diff:.5f} Remaining={remaining_gap/pip_size:.1f}pips "
-                f"Reached={'✅ YES' if gap_reached else '❌ NO'}"
+            # DIAGNOSTIC: Price gap check logging (rate-limited, always on state change)
+            self.hot_log.info(
+                "TP_CONTINUATION_PRICE_CHECK", symbol, (gap_reached, target_price),
+                Direction=direction.upper(), Current=current_price, TP=tp_price, Target=target_price,
+                GapPips=price_gap_pips,
+                Diff=current_price - target_price if direction == 'buy' else target_price - current_price,
+                RemainingPips=round(abs(current_price - target_price) / pip_size, 1),
+                Reached=gap_reached
             )
             
             if gap_reached:
@@ -364,7 +391,7 @@ class PriceMonitorService:
                         f"⚠️ [TP_CONTINUATION_BLOCKED] {symbol}: Re-entry blocked - "
                         f"Alignment failed: {alignment.get('failure_reason', 'Unknown reason')}"
                     )
-                    del self.tp_continuation_pending[symbol]
+                    self._drop_pending(self.tp_continuation_pending, symbol)
                     continue
                 
                 signal_direction = "BULLISH" if direction == "buy" else "BEARISH"
@@ -374,7 +401,7 @@ class PriceMonitorService:
                         f"⚠️ [TP_CONTINUATION_BLOCKED] {symbol}: Re-entry blocked - "
                         f"Direction mismatch: Signal={signal_direction} != Alignment={alignment_direction}"
                     )
-                    del self.tp_continuation_pending[symbol]
+                    self._drop_pending(self.tp_continuation_pending, symbol)
                     continue
                 
                 # Execute TP continuation re-entry
@@ -389,9 +416,9 @@ class PriceMonitorService:
                 )
                 
                 # Remove from pending
-                del self.tp_continuation_pending[symbol]
+                self._drop_pending(self.tp_continuation_pending, symbol)
     
-    async def _check_exit_continuation_reentries(self):
+    async def _check_exit_continuation_reentries(self, only_symbol: Optional[str] = None):
         """
         Check for re-entry after Exit Appeared/Reversal exit signals
         After exit (Exit Appeared/Reversal), continue monitoring for re-entry with price gap
@@ -400,11 +427,11 @@ class PriceMonitorService:
         if not self.config["re_entry_config"].get("exit_continuation_enabled", True):
             return
         
-        for symbol in list(self.exit_continuation_pending.keys()):
+        for symbol in self._pending_symbols(self.exit_continuation_pending, only_symbol):
             pending = self.exit_continuation_pending[symbol]
             
             # Get current price from MT5
-            current_price = self._get_current_price(symbol, pending['direction'])
+            current_price = await self._get_current_price(symbol, pending['direction'])
             if current_price is None:
                 continue
             
@@ -425,14 +452,6 @@ class PriceMonitorService:
             else:
                 target_price = exit_price - price_gap
             
-            # DEBUG: Log price comparison
-            self.logger.debug(
-                f"[EXIT_CONTINUATION] {symbol} {direction.upper()} ({exit_reason}): "
-                f"Current={current_price:.5f} Exit={exit_price:.5f} "
-                f"Target={target_price:.5f} Gap={price_gap_pips}pips "
-                f"GapPrice={price_gap:.5f}"
-            )
-            
             # Check if price has moved enough from exit price (continuation direction)
             gap_reached = False
             if direction == 'buy':
@@ -440,15 +459,14 @@ class PriceMonitorService:
             else:
                 gap_reached = current_price <= target_price
             
-            # DIAGNOSTIC: Detailed price gap check logging
-            price_diff = current_price - target_price if direction == 'buy' else target_price - current_price
-            remaining_gap = abs(current_price - target_price)
-            self.logger.info(
-                f"🔍 [EXIT_CONTINUATION_PRICE_CHECK] {symbol} {direction.upper()} ({exit_reason}): "
-                f"Current={current_price:.5f} Exit={exit_price:.5f} "
-                f"Target={target_price:.5f} Gap={price_gap_pips}pips "
-                f"Diff={price_diff:.5f} Remaining={remaining_gap/pip_size:.1f}pips "
-                f"Reached={'✅ YES' if gap_reached else '❌ NO'}"
+            # DIAGNOSTIC: Price gap check logging (rate-limited, always on state change)
+            self.hot_log.info(
+                "EXIT_CONTINUATION_PRICE_CHECK", symbol, (gap_reached, target_price),
+                Direction=direction.upper(), Reason=exit_reason, Current=current_price, Exit=exit_price,
+                Target=target_price, GapPips=price_gap_pips,
+                Diff=current_price - target_price if direction == 'buy' else target_price - current_price,
+                RemainingPips=round(abs(current_price - target_price) / pip_size, 1),
+                Reached=gap_reached
             )
             
             if gap_reached:
@@ -469,7 +487,7 @@ class PriceMonitorService:
                         f"⚠️ [EXIT_CONTINUATION_BLOCKED] {symbol} ({exit_reason}): Re-entry blocked - "
                         f"Alignment failed: {alignment.get('failure_reason', 'Unknown reason')}"
                     )
-                    del self.exit_continuation_pending[symbol]
+                    self._drop_pending(self.exit_continuation_pending, symbol)
                     continue
                 
                 signal_direction = "BULLISH" if direction == "buy" else "BEARISH"
@@ -479,7 +497,7 @@ class PriceMonitorService:
                         f"⚠️ [EXIT_CONTINUATION_BLOCKED] {symbol} ({exit_reason}): Re-entry blocked - "
                         f"Direction mismatch: Signal={signal_direction} != Alignment={alignment_direction}"
                     )
-                    del self.exit_continuation_pending[symbol]
+                    self._drop_pending(self.exit_continuation_pending, symbol)
                     continue
                 
                 # Execute Exit continuation re-entry
@@ -496,10 +514,14 @@ class PriceMonitorService:
                 )
                 
                 # Execute via trading engine
+                self.trading_engine.events.record(
+                    EventType.REENTRY_TRIGGERED, symbol, direction, price=current_price,
+                    strategy=logic, ref=exit_reason
+                )
                 await self.trading_engine.process_alert(entry_signal)
                 
                 # Remove from pending
-                del self.exit_continuation_pending[symbol]
+                self._drop_pending(self.exit_continuation_pending, symbol)
                 
                 self.logger.info(f"SUCCESS: Exit continuation re-entry executed for {symbol}")
     
@@ -516,7 +538,7 @@ class PriceMonitorService:
         reduction_per_level = self.config["re_entry_config"]["sl_reduction_per_level"]
         sl_adjustment = (1 - reduction_per_level) ** chain.current_level
         
-        account_balance = self.mt5_client.get_account_balance()
+        account_balance = await self.mt5.get_account_balance()
         lot_size = self.trading_engine.risk_manager.get_fixed_lot_size(account_balance)
         
         # Calculate SL and TP
@@ -537,15 +559,16 @@ class PriceMonitorService:
             lot_size=lot_size,
             direction=direction,
             strategy=logic,
-            open_time=datetime.now().isoformat(),
+            open_time=clock.now().isoformat(),
             chain_id=chain_id,
             chain_level=chain.current_level + 1,
             is_re_entry=True
         )
+        self.trading_engine.events.record_trade(EventType.REENTRY_TRIGGERED, trade, ref=chain_id)
         
         # Place order
         if not self.config["simulate_orders"]:
-            trade_id = self.mt5_client.place_order(
+            trade_id = await self.mt5.place_order(
                 symbol=symbol,
                 order_type=direction,
                 lot_size=lot_size,
@@ -563,6 +586,9 @@ class PriceMonitorService:
         # Add to open trades
         self.trading_engine.open_trades.append(trade)
         self.trading_engine.risk_manager.add_open_trade(trade)
+        # Simulated re-entries have no ticket, a live one without a ticket was rejected
+        placed = trade.trade_id or self.config["simulate_orders"]
+        self.trading_engine.events.record_trade(EventType.FILL if placed else EventType.ORDER_REJECTED, trade)
         
         # Send Telegram notification
         sl_reduction_percent = (1 - sl_adjustment) * 100
@@ -592,7 +618,7 @@ class PriceMonitorService:
         reduction_per_level = self.config["re_entry_config"]["sl_reduction_per_level"]
         sl_adjustment = (1 - reduction_per_level) ** chain.current_level
         
-        account_balance = self.mt5_client.get_account_balance()
+        account_balance = await self.mt5.get_account_balance()
         lot_size = self.trading_engine.risk_manager.get_fixed_lot_size(account_balance)
         
         # Calculate SL and TP
@@ -613,15 +639,16 @@ class PriceMonitorService:
             lot_size=lot_size,
             direction=direction,
             strategy=logic,
-            open_time=datetime.now().isoformat(),
+            open_time=clock.now().isoformat(),
             chain_id=chain_id,
             chain_level=chain.current_level + 1,
             is_re_entry=True
         )
+        self.trading_engine.events.record_trade(EventType.REENTRY_TRIGGERED, trade, ref=chain_id)
         
         # Place order
         if not self.config["simulate_orders"]:
-            trade_id = self.mt5_client.place_order(
+            trade_id = await self.mt5.place_order(
                 symbol=symbol,
                 order_type=direction,
                 lot_size=lot_size,
@@ -639,14 +666,16 @@ class PriceMonitorService:
         # Add to open trades
         self.trading_engine.open_trades.append(trade)
         self.trading_engine.risk_manager.add_open_trade(trade)
+        # Simulated re-entries have no ticket, a live one without a ticket was rejected
+        placed = trade.trade_id or self.config["simulate_orders"]
+        self.trading_engine.events.record_trade(EventType.FILL if placed else EventType.ORDER_REJECTED, trade)
         
         # Save to database
         tp_level = chain.current_level + 1
-        self.trading_engine.db.conn.cursor().execute('''
-            INSERT INTO tp_reentry_events VALUES (?,?,?,?,?,?,?,?,?)
-        ''', (None, chain_id, symbol, tp_level, chain.total_profit, price, 
-              (1-sl_adjustment)*100, 0, datetime.now().isoformat()))
-        self.trading_engine.db.conn.commit()
+        self.trading_engine.db.save_tp_reentry_event(
+            chain_id, symbol, tp_level, chain.total_profit, price,
+            (1-sl_adjustment)*100, 0
+        )
         
         # Send Telegram notification
         sl_reduction_percent = (1 - sl_adjustment) * 100
@@ -663,17 +692,17 @@ class PriceMonitorService:
             f"Level: {tp_level}/{chain.max_level}"
         )
     
-    def _get_current_price(self, symbol: str, direction: str) -> Optional[float]:
+    async def _get_current_price(self, symbol: str, direction: str) -> Optional[float]:
         """Get current price from MT5 (or simulation)"""
         try:
             if self.config.get("simulate_orders", True):
                 # Simulation mode - return None or mock price
                 return None
             
-            import MetaTrader5 as mt5
-            tick = mt5.symbol_info_tick(symbol)
-            if tick:
-                return tick.ask if direction == 'buy' else tick.bid
+            # Shared quote cache (handles broker symbol mapping)
+            quote = await self.mt5.get_quote(symbol)
+            if quote:
+                return quote.ask if direction == 'buy' else quote.bid
             return None
         except:
             return None
@@ -720,6 +749,10 @@ class PriceMonitorService:
                 'sl_price': trade.sl,
                 'logic': logic
             }
+            self.trading_engine.events.record(
+                EventType.REENTRY_REGISTERED, trade.symbol, trade.direction, ticket=trade.trade_id,
+                price=target_price, level=trade.chain_level, strategy=logic, ref=f"SL_HUNT:{trade.chain_id}"
+            )
             
             self.monitored_symbols.add(trade.symbol)
             self.logger.info(
@@ -766,6 +799,10 @@ class PriceMonitorService:
                 'chain_id': trade.chain_id,
                 'logic': logic
             }
+            self.trading_engine.events.record(
+                EventType.REENTRY_REGISTERED, trade.symbol, trade.direction, ticket=trade.trade_id,
+                price=tp_price, level=trade.chain_level, strategy=logic, ref=f"TP:{trade.chain_id}"
+            )
             
             self.monitored_symbols.add(trade.symbol)
             self.logger.info(
@@ -778,10 +815,15 @@ class PriceMonitorService:
             import traceback
             traceback.print_exc()
     
+    def _drop_pending(self, pending: Dict[str, Any], symbol: str):
+        """Remove a pending re-entry and its hot-path log rate-limit state"""
+        del pending[symbol]
+        self.hot_log.forget(symbol)
+    
     def stop_tp_continuation(self, symbol: str, reason: str = "Opposite signal received"):
         """Stop TP continuation monitoring for a symbol"""
         if symbol in self.tp_continuation_pending:
-            del self.tp_continuation_pending[symbol]
+            self._drop_pending(self.tp_continuation_pending, symbol)
             self.logger.info(f"STOPPED: TP continuation stopped for {symbol}: {reason}")
     
     def register_exit_continuation(self, trade: Trade, exit_price: float, exit_reason: str, logic: str, timeframe: str = '15M'):
@@ -812,6 +854,11 @@ class PriceMonitorService:
                 'exit_reason': exit_reason,
                 'timeframe': timeframe
             }
+            self.trading_engine.events.record(
+                EventType.REENTRY_REGISTERED, trade.symbol, trade.direction,
+                ticket=getattr(trade, 'trade_id', None), price=exit_price, strategy=logic,
+                ref=f"EXIT:{exit_reason}"
+            )
             
             self.monitored_symbols.add(trade.symbol)
             self.logger.info(
@@ -827,10 +874,10 @@ class PriceMonitorService:
     def stop_exit_continuation(self, symbol: str, reason: str = "Alignment lost"):
         """Stop exit continuation monitoring for a symbol"""
         if symbol in self.exit_continuation_pending:
-            del self.exit_continuation_pending[symbol]
+            self._drop_pending(self.exit_continuation_pending, symbol)
             self.logger.info(f"STOPPED: Exit continuation stopped for {symbol}: {reason}")
     
-    async def _check_profit_booking_chains(self):
+    async def _check_profit_booking_chains(self, only_symbol: Optional[str] = None):
         """
         Check profit booking chains for profit target achievement
         Runs every 30 seconds to monitor combined PnL
@@ -846,13 +893,12 @@ class PriceMonitorService:
             return
         
         # Periodic cleanup of stale chains (every 5 minutes)
-        import time
         if not hasattr(self, '_last_cleanup_time'):
-            self._last_cleanup_time = time.time()
+            self._last_cleanup_time = clock.timestamp()
         
-        if time.time() - self._last_cleanup_time > 300:  # 5 minutes
+        if clock.timestamp() - self._last_cleanup_time > 300:  # 5 minutes
             profit_manager.cleanup_stale_chains()
-            self._last_cleanup_time = time.time()
+            self._last_cleanup_time = clock.timestamp()
         
         # Get all active profit chains
         active_chains = profit_manager.get_all_chains()
@@ -863,14 +909,18 @@ class PriceMonitorService:
         open_trades = getattr(self.trading_engine, 'open_trades', [])
         
         # Check each chain
-        for chain_id, chain in active_chains.items():
+        for chain_id, chain in list(active_chains.items()):
+            if only_symbol is not None and chain.symbol != only_symbol:
+                continue
             try:
                 # Validate chain state (now with deduplication)
                 if not profit_manager.validate_chain_state(chain, open_trades):
                     continue
                 
                 # Check for orders ready to book (≥ $7 each)
-                orders_to_book = profit_manager.check_profit_targets(chain, open_trades)
+                orders_to_book = profit_manager.check_profit_targets(
+                    chain, open_trades, await self.mt5.get_current_price(chain.symbol)
+                )
                 
                 if orders_to_book:
                     # Book orders individually
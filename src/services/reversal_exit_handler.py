@@ -1,7 +1,8 @@
-from datetime import datetime
 from typing import Dict, Any, Optional
 from src.models import Trade, Alert
 from src.config import Config
+from src.clients.async_mt5_client import AsyncMT5Client
+from src.utils import clock
 import logging
 
 class ReversalExitHandler:
@@ -14,15 +15,17 @@ class ReversalExitHandler:
     4. Exit Appeared alerts (type: 'exit', early warning)
     """
     
-    def __init__(self, config: Config, mt5_client, telegram_bot, db, price_monitor=None):
+    def __init__(self, config: Config, mt5_client, telegram_bot, db, price_monitor=None,
+                 async_mt5_client=None):
         self.config = config
         self.mt5_client = mt5_client
+        self.mt5 = async_mt5_client or AsyncMT5Client(config, mt5_client)
         self.telegram_bot = telegram_bot
         self.db = db
         self.price_monitor = price_monitor
         self.logger = logging.getLogger(__name__)
     
-    async def check_reversal_exit(self, alert: Alert, open_trades: list) -> list:
+    async def check_reversal_exit(self, alert: Alert, open_trades) -> list:
         """
         Check if alert triggers reversal exit for any open trade
         Returns list of trades to close
@@ -32,9 +35,7 @@ class ReversalExitHandler:
         
         trades_to_close = []
         
-        for trade in open_trades:
-            if trade.symbol != alert.symbol:
-                continue
+        for trade in open_trades.for_symbol(alert.symbol):
             
             should_exit = False
             exit_reason = ""
@@ -108,11 +109,10 @@ class ReversalExitHandler:
                     profit_manager.stop_chain(trade.profit_chain_id, f"Exit signal: {exit_reason}")
                     
                     # Close all orders in the chain
-                    open_trades = getattr(trading_engine, 'open_trades', [])
+                    open_trades = trading_engine.open_trades
                     chain_orders = [
-                        t for t in open_trades
-                        if hasattr(t, 'profit_chain_id') and t.profit_chain_id == trade.profit_chain_id
-                        and t.status == "open"
+                        t for t in open_trades.for_profit_chain(trade.profit_chain_id)
+                        if t.status == "open"
                     ]
                     
                     for chain_trade in chain_orders:
@@ -123,7 +123,7 @@ class ReversalExitHandler:
         
         # Close position in MT5
         if not self.config.get("simulate_orders", True):
-            success = self.mt5_client.close_position(trade.trade_id)
+            success = await self.mt5.close_position(trade.trade_id)
             if not success:
                 self.logger.error(f"Failed to close position {trade.trade_id}")
                 return False
@@ -140,20 +140,18 @@ class ReversalExitHandler:
             pnl = pnl * 100  # Gold multiplier
         
         # Update trade
-        trade.close_time = datetime.now().isoformat()
+        trade.close_time = clock.now().isoformat()
         trade.pnl = pnl
         trade.status = "closed"
         
-        # Save to database
+        # Save to database and roll PnL into hour/day buckets
         self.db.save_trade(trade)
+        self.db.record_pnl_rollup(trade)
         
         # Save reversal exit event
-        cursor = self.db.conn.cursor()
-        cursor.execute('''
-            INSERT INTO reversal_exit_events VALUES (?,?,?,?,?,?,?)
-        ''', (None, trade.trade_id, trade.symbol, exit_price, 
-              exit_reason, pnl, datetime.now().isoformat()))
-        self.db.conn.commit()
+        self.db.save_reversal_exit_event(
+            trade.trade_id, trade.symbol, exit_price, exit_reason, pnl
+        )
         
         # Send Telegram notification
         profit_emoji = "✅" if pnl >= 0 else "❌"
@@ -186,9 +184,7 @@ class ReversalExitHandler:
     
     def get_reversal_exit_stats(self) -> Dict[str, Any]:
         """Get statistics for reversal exits"""
-        cursor = self.db.conn.cursor()
-        
-        cursor.execute('''
+        return self.db.fetch_one('''
             SELECT 
                 COUNT(*) as total_reversal_exits,
                 SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END) as profitable_exits,
@@ -197,8 +193,3 @@ class ReversalExitHandler:
             FROM reversal_exit_events
             WHERE timestamp >= datetime('now', '-30 days')
         ''')
-        
-        result = cursor.fetchone()
-        columns = [desc[0] for desc in cursor.description]
-        
-        return dict(zip(columns, result)) if result else {}
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+from typing import Callable, Dict, Any, Iterable, Optional, Set, Tuple
+
+
+class TickPump:
+    """
+    Event-driven price feed for the trading engine
+    - Polls quotes only for symbols that currently need watching
+      (open trades, pending re-entries) supplied by symbol_provider
+    - Publishes a symbol to the asyncio queue when its bid/ask changes
+    - Coalesces: a symbol already waiting in the queue is not queued again,
+      consumers read the latest quote from the MT5Client quote cache
+    - With an AsyncMT5Client the terminal reads run on its worker thread
+      instead of blocking the event loop
+    """
+
+    def __init__(self, config, mt5_client, symbol_provider: Callable[[], Iterable[str]],
+                 async_client=None):
+        self.config = config
+        self.mt5_client = mt5_client
+        self.symbol_provider = symbol_provider
+        self.async_client = async_client
+
+        tick_config = config.get("tick_pump_config", {})
+        self.poll_interval_seconds = tick_config.get("poll_interval_ms", 250) / 1000
+        self.max_queue_size = tick_config.get("max_queue_size", 1000)
+
+        self.queue: Optional[asyncio.Queue] = None
+        self.pump_task = None
+        self.is_running = False
+
+        self.last_quotes: Dict[str, Tuple[float, float]] = {}
+        self.queued_symbols: Set[str] = set()
+
+        self.stats = {
+            "poll_cycles": 0,
+            "quotes_polled": 0,
+            "ticks_published": 0,
+            "ticks_coalesced": 0,
+            "ticks_dropped": 0,
+            "idle_cycles": 0
+        }
+
+        self.logger = logging.getLogger(__name__)
+
+    async def start(self):
+        """Start the background polling task"""
+        if self.is_running:
+            return
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self.queued_symbols.clear()
+        self.is_running = True
+        self.pump_task = asyncio.create_task(self._pump_loop())
+        self.logger.info(
+            f"✅ Tick pump started - Poll interval: {self.poll_interval_seconds * 1000:.0f}ms"
+        )
+
+    async def stop(self):
+        """Stop the background polling task"""
+        self.is_running = False
+        if self.pump_task:
+            self.pump_task.cancel()
+            try:
+                await self.pump_task
+            except asyncio.CancelledError:
+                pass
+            self.pump_task = None
+        self.logger.info("STOPPED: Tick pump stopped")
+
+    async def _pump_loop(self):
+        """Poll active symbols until stopped"""
+        while self.is_running:
+            try:
+                if self.async_client is not None:
+                    symbols = self._active_symbols()
+                    quotes = await self.async_client.run(self._fetch_quotes, symbols) if symbols else {}
+                    self._publish_changes(symbols, quotes)
+                else:
+                    self.poll_once()
+                await asyncio.sleep(self.poll_interval_seconds)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(f"❌ Tick pump error: {str(e)}")
+                await asyncio.sleep(1)
+
+    def poll_once(self) -> int:
+        """Poll every active symbol once, returns number of symbols published"""
+        symbols = self._active_symbols()
+        return self._publish_changes(symbols, self._fetch_quotes(symbols))
+
+    def _active_symbols(self) -> Set[str]:
+        symbols = set(self.symbol_provider())
+        # Forget symbols that are no longer watched
+        for symbol in list(self.last_quotes.keys()):
+            if symbol not in symbols:
+                del self.last_quotes[symbol]
+        return symbols
+
+    def _fetch_quotes(self, symbols: Set[str]) -> Dict[str, Any]:
+        """Terminal reads only - safe to run on the MT5 worker thread"""
+        # Force a terminal read - downstream checks then hit the fresh cache entry
+        return {symbol: self.mt5_client.get_quote(symbol, max_age_ms=0) for symbol in symbols}
+
+    def _publish_changes(self, symbols: Set[str], quotes: Dict[str, Any]) -> int:
+        """Publish symbols whose bid/ask changed, returns number published"""
+        self.stats["poll_cycles"] += 1
+        if not symbols:
+            self.stats["idle_cycles"] += 1
+            return 0
+
+        published = 0
+        for symbol in symbols:
+            quote = quotes.get(symbol)
+            self.stats["quotes_polled"] += 1
+            if quote is None:
+                continue
+
+            current = (quote.bid, quote.ask)
+            if self.last_quotes.get(symbol) == current:
+                continue
+            self.last_quotes[symbol] = current
+
+            if self.publish(symbol):
+                published += 1
+        return published
+
+    def publish(self, symbol: str) -> bool:
+        """Queue a price-change event for a symbol (coalesced per symbol)"""
+        if self.queue is None:
+            return False
+        if symbol in self.queued_symbols:
+            self.stats["ticks_coalesced"] += 1
+            return False
+        try:
+            self.queue.put_nowait(symbol)
+        except asyncio.QueueFull:
+            self.stats["ticks_dropped"] += 1
+            return False
+        self.queued_symbols.add(symbol)
+        self.stats["ticks_published"] += 1
+        return True
+
+    async def next_symbol(self) -> str:
+        """Wait for the next symbol whose price changed"""
+        symbol = await self.queue.get()
+        self.queued_symbols.discard(symbol)
+        return symbol
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tick pump counters"""
+        stats = dict(self.stats)
+        stats["running"] = self.is_running
+        stats["watched_symbols"] = sorted(self.last_quotes.keys())
+        stats["queue_depth"] = self.queue.qsize() if self.queue else 0
+        stats["poll_interval_ms"] = self.poll_interval_seconds * 1000
+        return stats
@@ -0,0 +1,74 @@
+"""
+Process-wide clock used by the trading managers instead of datetime.now()
+Live runs use the system clock; the backtest installs a VirtualClock so
+chains, re-entry windows and timeouts advance in event time
+"""
+import time as _time
+from datetime import date, datetime, timedelta
+from typing import Optional, Union
+
+
+class SystemClock:
+    """Wall-clock time"""
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def timestamp(self) -> float:
+        return _time.time()
+
+    def monotonic(self) -> float:
+        return _time.monotonic()
+
+
+class VirtualClock:
+    """Clock that only moves when told to (replay / tests)"""
+
+    def __init__(self, start: Optional[datetime] = None):
+        self.current = start or datetime(2000, 1, 1)
+
+    def now(self) -> datetime:
+        return self.current
+
+    def timestamp(self) -> float:
+        return self.current.timestamp()
+
+    def monotonic(self) -> float:
+        # Event time never goes backwards during a replay
+        return self.current.timestamp()
+
+    def set(self, when: datetime):
+        if when > self.current:
+            self.current = when
+
+    def advance(self, seconds: Union[int, float]):
+        self.current += timedelta(seconds=seconds)
+
+
+_clock: Union[SystemClock, VirtualClock] = SystemClock()
+
+
+def get_clock() -> Union[SystemClock, VirtualClock]:
+    return _clock
+
+
+def set_clock(clock: Optional[Union[SystemClock, VirtualClock]] = None):
+    """Install a clock (None restores the system clock)"""
+    global _clock
+    _clock = clock or SystemClock()
+
+
+def now() -> datetime:
+    return _clock.now()
+
+
+def today() -> date:
+    return _clock.now().date()
+
+
+def timestamp() -> float:
+    return _clock.timestamp()
+
+
+def monotonic() -> float:
+    return _clock.monotonic()
@@ -1,7 +1,8 @@
 import asyncio
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Dict, Any
 from src.models import Trade
+from src.utils import clock
 
 class ExitStrategyManager:
     def __init__(self, mt5_client, trading_engine):
@@ -33,7 +34,7 @@ class ExitStrategyManager:
                             await self.trading_engine.close_trade(trade, 100, "TRAILING_SL_EXIT")
                             
                     elif strategy['type'] == 'time_based':
-                        if datetime.now() >= strategy['expiry_time']:
+                        if clock.now() >= strategy['expiry_time']:
                             # Trading engine ke through close karo
                             trade = strategy['trade']
                             await self.trading_engine.close_trade(trade, 100, "TIME_BASED_EXIT")
@@ -96,7 +97,7 @@ class ExitStrategyManager:
                         return current_price >= sl_price
                         
                 elif strategy['type'] == 'time_based':
-                    return datetime.now() >= strategy['expiry_time']
+                    return clock.now() >= strategy['expiry_time']
                     
             return False
             
@@ -112,7 +113,7 @@ class ExitStrategyManager:
             'symbol': trade.symbol,
             'trailing_points': trailing_points,
             'best_price': trade.entry,
-            'added_time': datetime.now()
+            'added_time': clock.now()
         }
         print(f"SUCCESS: Trailing SL added for {trade.symbol} - {trailing_points} points")
 
@@ -122,8 +123,8 @@ class ExitStrategyManager:
             'type': 'time_based',
             'trade': trade,
             'symbol': trade.symbol,
-            'expiry_time': datetime.now() + timedelta(hours=exit_after_hours),
-            'added_time': datetime.now()
+            'expiry_time': clock.now() + timedelta(hours=exit_after_hours),
+            'added_time': clock.now()
         }
         print(f"SUCCESS: Time-based exit added for {trade.symbol} - {exit_after_hours} hours")
 
@@ -0,0 +1,133 @@
+import json
+import time
+import random
+import logging
+from typing import Any, Callable, Dict, Hashable
+
+
+class HotPathLogger:
+    """
+    Logging for per-cycle / per-tick code paths
+    - Nothing is formatted unless the level is enabled and the record passes
+    - Per-key rate limit: a key (e.g. ("SL_HUNT_PRICE_CHECK", symbol)) logs at
+      most once every interval_seconds, but always logs when its state changes
+    - Sampling: records that pass the rate limit without a state change are
+      kept with probability sample_rate
+    - Suppressed records are counted; the next record for the key carries the
+      count so nothing disappears silently
+    - structured=True emits compact JSON instead of "[EVENT] subject: k=v ..."
+    """
+
+    def __init__(self, logger: logging.Logger, interval_seconds: float = 30.0,
+                 sample_rate: float = 1.0, structured: bool = False,
+                 clock: Callable[[], float] = time.monotonic):
+        self.logger = logger
+        self.interval_seconds = interval_seconds
+        self.sample_rate = sample_rate
+        self.structured = structured
+        self.clock = clock
+
+        # key -> [last_emit_time, last_state, suppressed_since_last_emit]
+        self.keys: Dict[Hashable, list] = {}
+
+        self.stats = {
+            "emitted": 0,
+            "suppressed": 0,
+            "rate_limited": 0,
+            "sampled_out": 0
+        }
+
+    @classmethod
+    def from_config(cls, logger: logging.Logger, config) -> "HotPathLogger":
+        """Build from hot_path_logging_config"""
+        cfg = config.get("hot_path_logging_config", {})
+        return cls(
+            logger,
+            interval_seconds=cfg.get("interval_seconds", 30.0),
+            sample_rate=cfg.get("sample_rate", 1.0),
+            structured=cfg.get("structured", False)
+        )
+
+    def debug(self, event: str, subject: str, state: Any = None, **fields) -> bool:
+        return self.log(logging.DEBUG, event, subject, state, **fields)
+
+    def info(self, event: str, subject: str, state: Any = None, **fields) -> bool:
+        return self.log(logging.INFO, event, subject, state, **fields)
+
+    def log(self, level: int, event: str, subject: str, state: Any = None, **fields) -> bool:
+        """
+        Log event for subject (rate-limit key is (event, subject))
+        Returns True if the record was emitted
+        """
+        if not self.logger.isEnabledFor(level):
+            return False
+
+        key = (event, subject)
+        now = self.clock()
+        entry = self.keys.get(key)
+        if entry is None:
+            entry = self.keys[key] = [None, state, 0]
+        elif state == entry[1]:
+            if now - entry[0] < self.interval_seconds:
+                self._suppress(entry, "rate_limited")
+                return False
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                self._suppress(entry, "sampled_out")
+                return False
+
+        suppressed = entry[2]
+        entry[0] = now
+        entry[1] = state
+        entry[2] = 0
+        self.stats["emitted"] += 1
+        self.logger.log(level, "%s", _LazyRecord(self.structured, event, subject, fields, suppressed))
+        return True
+
+    def _suppress(self, entry: list, reason: str):
+        entry[2] += 1
+        self.stats["suppressed"] += 1
+        self.stats[reason] += 1
+
+    def forget(self, subject: str):
+        """Drop rate-limit state for a subject (e.g. pending re-entry removed)"""
+        for key in [k for k in self.keys if k[1] == subject]:
+            del self.keys[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["tracked_keys"] = len(self.keys)
+        stats["structured"] = self.structured
+        return stats
+
+
+class _LazyRecord:
+    """Message object formatted only when a handler actually writes it"""
+    __slots__ = ("structured", "event", "subject", "fields", "suppressed")
+
+    def __init__(self, structured: bool, event: str, subject: str,
+                 fields: Dict[str, Any], suppressed: int):
+        self.structured = structured
+        self.event = event
+        self.subject = subject
+        self.fields = fields
+        self.suppressed = suppressed
+
+    def __str__(self) -> str:
+        if self.structured:
+            record = {"event": self.event, "subject": self.subject, **self.fields}
+            if self.suppressed:
+                record["suppressed"] = self.suppressed
+            return json.dumps(record, separators=(",", ":"), default=str)
+
+        parts = [f"{name}={_format_value(value)}" for name, value in self.fields.items()]
+        if self.suppressed:
+            parts.append(f"(+{self.suppressed} suppressed)")
+        return f"[{self.event}] {self.subject}: {' '.join(parts)}"
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "YES" if value else "NO"
+    if isinstance(value, float):
+        return f"{value:.5f}".rstrip("0").rstrip(".")
+    return str(value)
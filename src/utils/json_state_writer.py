@@ -0,0 +1,184 @@
+import os
+import json
+import time
+import atexit
+import tempfile
+import threading
+import weakref
+from typing import Any, Callable, Dict, Optional
+
+# Minimum delay before a failed write is retried
+RETRY_SECONDS = 1.0
+
+
+class JsonStateWriter:
+    """
+    Debounced, atomic write-behind for a JSON state file
+    - mark_dirty() is cheap: changes within debounce_ms are coalesced into a
+      single write done by a shared background flusher thread
+    - Writes go to a temp file in the same directory, are fsynced and then
+      renamed over the target, so a crash never leaves a half-written file
+    - flush() writes synchronously; all writers are flushed at exit and by
+      flush_all_state_writers() on shutdown
+    - A failed write leaves the writer dirty and is retried in the background
+    - get_state is called at write time, so the latest state is what lands
+    """
+
+    def __init__(self, path: str, get_state: Callable[[], Any],
+                 debounce_ms: float = 500, indent: Optional[int] = 4):
+        self.path = path
+        self.get_state = get_state
+        self.debounce_seconds = debounce_ms / 1000
+        self.indent = indent
+
+        self.dirty = False
+        self.write_lock = threading.Lock()
+
+        self.stats = {
+            "marks": 0,
+            "writes": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "bytes_written": 0,
+            "last_write_ms": 0.0,
+            "max_write_ms": 0.0
+        }
+
+        _registry.add(self)
+
+    def mark_dirty(self):
+        """Schedule a write (coalesced with other changes in the window)"""
+        self.stats["marks"] += 1
+        if self.dirty:
+            self.stats["coalesced"] += 1
+            return
+        self.dirty = True
+        if self.debounce_seconds <= 0:
+            self.flush()
+        else:
+            _flusher.schedule(self, time.monotonic() + self.debounce_seconds)
+
+    def flush(self) -> bool:
+        """Write now if there are pending changes, returns True if written"""
+        with self.write_lock:
+            if not self.dirty:
+                return False
+            self.dirty = False
+            try:
+                start = time.perf_counter()
+                text = self._serialize()
+                self._atomic_write(text)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self.stats["writes"] += 1
+                self.stats["bytes_written"] += len(text)
+                self.stats["last_write_ms"] = elapsed_ms
+                if elapsed_ms > self.stats["max_write_ms"]:
+                    self.stats["max_write_ms"] = elapsed_ms
+                return True
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"ERROR: Error saving {self.path}: {str(e)}")
+                # Keep the changes pending so a retry or the shutdown flush writes them
+                self.dirty = True
+                _flusher.schedule(self, time.monotonic() + max(self.debounce_seconds, RETRY_SECONDS))
+                return False
+
+    def _serialize(self) -> str:
+        # The compact dump runs in the C encoder without releasing the GIL, so
+        # it is a consistent snapshot even while the owner keeps mutating the
+        # state; pretty-printing then works on that private copy
+        for attempt in range(3):
+            try:
+                raw = json.dumps(self.get_state())
+                break
+            except RuntimeError:
+                # Changed size during iteration (pure-Python encoder fallback)
+                if attempt == 2:
+                    raise
+        if self.indent is None:
+            return raw
+        return json.dumps(json.loads(raw), indent=self.indent)
+
+    def _atomic_write(self, text: str):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=f".{os.path.basename(self.path)}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        if os.name == "posix":
+            # Persist the rename itself
+            dir_fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Write/coalesce counters"""
+        stats = dict(self.stats)
+        stats["path"] = self.path
+        stats["pending"] = self.dirty
+        return stats
+
+
+class _Flusher:
+    """Single background thread that flushes writers when their window ends"""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.due: Dict[JsonStateWriter, float] = {}
+        self.thread: Optional[threading.Thread] = None
+
+    def schedule(self, writer: JsonStateWriter, due_at: float):
+        with self.condition:
+            if writer not in self.due:
+                self.due[writer] = due_at
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="JsonStateFlusher", daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.due:
+                    self.condition.wait()
+                now = time.monotonic()
+                ready = [w for w, due_at in self.due.items() if due_at <= now]
+                if not ready:
+                    self.condition.wait(min(self.due.values()) - now)
+                    continue
+                for writer in ready:
+                    del self.due[writer]
+            for writer in ready:
+                writer.flush()
+
+
+_registry: "weakref.WeakSet[JsonStateWriter]" = weakref.WeakSet()
+_flusher = _Flusher()
+
+
+def flush_all_state_writers():
+    """Write every pending JSON state file now (shutdown)"""
+    for writer in list(_registry):
+        writer.flush()
+
+
+def get_state_writer_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters for every live writer, keyed by file path"""
+    return {writer.path: writer.get_stats() for writer in list(_registry)}
+
+
+atexit.register(flush_all_state_writers)
@@ -0,0 +1,285 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+STDOUT_LOGGER = "stdout"
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_DATEFMT = '%Y-%m-%d %H:%M:%S'
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line for machine parsing"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage()
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _BatchFlushMixin:
+    """Handlers flush once per listener batch instead of once per record"""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+
+class BatchRotatingFileHandler(_BatchFlushMixin, RotatingFileHandler):
+    pass
+
+
+class BatchStreamHandler(_BatchFlushMixin, logging.StreamHandler):
+    pass
+
+
+class _ConsoleFilter(logging.Filter):
+    """Console shows warnings and above, plus everything printed to stdout"""
+
+    def __init__(self, level: int):
+        super().__init__()
+        self.level = level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= self.level or record.name == STDOUT_LOGGER
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Producer side: interpolate the message and enqueue - never blocks
+    Formatting (timestamps, JSON) and all I/O happen on the listener thread
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Traceback objects must not outlive the producer's frame
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingQueueListener:
+    """Listener thread: drains up to batch_size records, writes, flushes once"""
+
+    _STOP = object()
+
+    def __init__(self, log_queue: queue.Queue, handlers: List[logging.Handler], batch_size: int = 256):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.thread: Optional[threading.Thread] = None
+        self.stats = {"records": 0, "batches": 0, "max_batch": 0}
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="LogListener", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        if self.thread is None:
+            return
+        self.queue.put(self._STOP)
+        self.thread.join(timeout)
+        self.thread = None
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = False
+            written = 0
+            for record in batch:
+                if record is self._STOP:
+                    stopping = True
+                    continue
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+                written += 1
+            for handler in self.handlers:
+                try:
+                    handler.flush_batch()
+                except Exception:
+                    pass
+
+            self.stats["records"] += written
+            self.stats["batches"] += 1
+            if written > self.stats["max_batch"]:
+                self.stats["max_batch"] = written
+            if stopping:
+                return
+
+
+class StdoutToLogger:
+    """
+    sys.stdout replacement: each printed line becomes a log record on the
+    "stdout" logger, so prints go through the queue instead of the console
+    Lines starting with ERROR/WARNING keep that level
+    """
+
+    def __init__(self, logger: logging.Logger, original=None):
+        self.logger = logger
+        self.original = original or sys.__stdout__
+        self.local = threading.local()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, "buffer", "") + text
+        *lines, rest = buffer.split("\n")
+        self.local.buffer = rest
+        for line in lines:
+            line = line.rstrip()
+            if line:
+                self.logger.log(self._level_for(line), line)
+        return len(text)
+
+    @staticmethod
+    def _level_for(line: str) -> int:
+        head = line.lstrip()[:8].upper()
+        if head.startswith(("ERROR", "CRITICAL")):
+            return logging.ERROR
+        if head.startswith("WARNING"):
+            return logging.WARNING
+        return logging.INFO
+
+    def flush(self):
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+    def writable(self) -> bool:
+        return True
+
+    def __getattr__(self, name):
+        return getattr(self.original, name)
+
+
+class LogPipeline:
+    """
+    Queue-fed logging: the root logger only has a non-blocking queue handler,
+    a listener thread formats, batches and writes rotating files and console
+    """
+
+    def __init__(self, log_dir: str = "logs", level: int = logging.INFO,
+                 console_level: int = logging.WARNING, json_lines: bool = False,
+                 max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                 max_queue_size: int = 10000, batch_size: int = 256,
+                 console_stream=None):
+        os.makedirs(log_dir, exist_ok=True)
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+
+        formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATEFMT)
+        handlers: List[logging.Handler] = []
+
+        file_handler = BatchRotatingFileHandler(
+            os.path.join(log_dir, "bot.log"), maxBytes=max_bytes,
+            backupCount=backup_count, encoding='utf-8'
+        )
+        file_handler.setLevel(level)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+        if json_lines:
+            json_handler = BatchRotatingFileHandler(
+                os.path.join(log_dir, "bot.jsonl"), maxBytes=max_bytes,
+                backupCount=backup_count, encoding='utf-8'
+            )
+            json_handler.setLevel(level)
+            json_handler.setFormatter(JsonFormatter())
+            handlers.append(json_handler)
+
+        # Console writes to the real stdout (sys.stdout may be redirected here)
+        console_handler = BatchStreamHandler(console_stream or sys.__stdout__)
+        console_handler.addFilter(_ConsoleFilter(console_level))
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+        self.handlers = handlers
+        self.queue_handler = NonBlockingQueueHandler(self.queue)
+        self.listener = BatchingQueueListener(self.queue, handlers, batch_size)
+        self.stdout_redirect: Optional[StdoutToLogger] = None
+        self.started = False
+
+    def start(self, root_logger: Optional[logging.Logger] = None, level: int = logging.INFO,
+              redirect_stdout: bool = True):
+        root = root_logger or logging.getLogger()
+        root.setLevel(level)
+        root.handlers.clear()
+        root.addHandler(self.queue_handler)
+        self.listener.start()
+        self.started = True
+
+        if redirect_stdout:
+            self.stdout_redirect = StdoutToLogger(logging.getLogger(STDOUT_LOGGER), sys.stdout)
+            sys.stdout = self.stdout_redirect
+        atexit.register(self.stop)
+        return root
+
+    def stop(self, timeout: float = 5.0):
+        """Restore stdout and write out everything still queued"""
+        if not self.started:
+            return
+        self.started = False
+        if self.stdout_redirect is not None and sys.stdout is self.stdout_redirect:
+            sys.stdout = self.stdout_redirect.original
+        self.listener.stop(timeout)
+        for handler in self.handlers:
+            handler.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.listener.stats)
+        stats["queued"] = self.queue.qsize()
+        stats["dropped"] = self.queue_handler.dropped
+        stats["stdout_redirected"] = self.stdout_redirect is not None and sys.stdout is self.stdout_redirect
+        return stats
+
+
+def start_log_pipeline(logging_config: Dict[str, Any], log_dir: str = "logs") -> LogPipeline:
+    """Build and start the pipeline from logging_config"""
+    level = getattr(logging, str(logging_config.get("level", "INFO")).upper(), logging.INFO)
+    pipeline = LogPipeline(
+        log_dir=log_dir,
+        level=level,
+        console_level=getattr(logging, str(logging_config.get("console_level", "WARNING")).upper(), logging.WARNING),
+        json_lines=logging_config.get("json_lines", False),
+        max_bytes=logging_config.get("max_bytes", 10 * 1024 * 1024),
+        backup_count=logging_config.get("backup_count", 5),
+        max_queue_size=logging_config.get("max_queue_size", 10000),
+        batch_size=logging_config.get("batch_size", 256)
+    )
+    pipeline.start(level=level, redirect_stdout=logging_config.get("redirect_stdout", True))
+    return pipeline
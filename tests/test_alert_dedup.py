@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the AlertProcessor de-duplication index
+"""
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.processors.alert_processor import AlertProcessor
+
+
+def make_alert(alert_type="entry", symbol="XAUUSD", tf="5m", signal="buy", timestamp=None):
+    data = {"type": alert_type, "symbol": symbol, "tf": tf, "signal": signal, "price": 2650.0}
+    if timestamp is not None:
+        data["timestamp"] = timestamp.isoformat()
+    return data
+
+
+def test_duplicate_window_by_alert_timestamp():
+    """Same key inside the window is rejected, outside it is accepted"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Duplicate detection by alert timestamp")
+    print("=" * 60)
+
+    processor = AlertProcessor({})
+    base = datetime(2025, 1, 6, 10, 0, 0)
+
+    assert processor.validate_alert(make_alert(timestamp=base))
+    assert not processor.validate_alert(make_alert(timestamp=base + timedelta(minutes=2)))
+    # Different signal/tf is a different key
+    assert processor.validate_alert(make_alert(signal="sell", timestamp=base))
+    assert processor.validate_alert(make_alert(tf="15m", timestamp=base))
+    # Replayed alert 5+ minutes later in its own time is not a duplicate
+    assert processor.validate_alert(make_alert(timestamp=base + timedelta(minutes=5)))
+    # ...and an older replay inside the latest alert's window is
+    assert not processor.validate_alert(make_alert(timestamp=base + timedelta(minutes=1)))
+
+    key = ("entry", "XAUUSD", "5m", "buy")
+    assert len(processor.dedup_index[key]) == 1  # superseded entry dropped
+    assert len(processor.recent_alerts) == 4
+
+
+def test_per_type_window_and_eviction():
+    """Per-type windows expire independently on the monotonic clock"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Per-type window and eviction")
+    print("=" * 60)
+
+    processor = AlertProcessor({"alert_dedup_config": {"type_windows_seconds": {"trend": 0.05}}})
+
+    assert processor.validate_alert(make_alert("trend", signal="bull"))
+    assert processor.validate_alert(make_alert("entry"))
+    assert not processor.validate_alert(make_alert("trend", signal="bull"))
+
+    time.sleep(0.06)
+    processor.clean_old_alerts()
+    assert ("trend", "XAUUSD", "5m", "bull") not in processor.dedup_index
+    assert ("entry", "XAUUSD", "5m", "buy") in processor.dedup_index
+    assert processor.validate_alert(make_alert("trend", signal="bull"))
+    assert [a.type for a in processor.get_recent_alerts()] == ["entry", "trend"]
+
+
+def test_validate_returns_parsed_alert():
+    """validate_alert returns the compact Alert passed on to process_alert"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Parse-once alert record")
+    print("=" * 60)
+
+    processor = AlertProcessor({})
+    data = make_alert(symbol="EURUSD")
+    alert = processor.validate_alert(data)
+    assert alert is not None
+    assert alert.symbol == "EURUSD" and alert.signal == "buy"
+    assert alert.timestamp is not None
+    assert alert.raw_data is None
+    assert "timestamp" not in data  # webhook payload is not mutated
+    assert processor.validate_alert(make_alert(symbol="BTCUSD")) is None
+
+
+if __name__ == "__main__":
+    test_duplicate_window_by_alert_timestamp()
+    test_per_type_window_and_eviction()
+    test_validate_returns_parsed_alert()
+    print("\n[PASS] All alert dedup tests passed")
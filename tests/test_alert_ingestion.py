@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for accept-and-ack alert ingestion
+Uses a fake process_alert coroutine - no trading engine required
+"""
+import sys
+import os
+import asyncio
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.services.alert_ingestion import AlertIngestionService
+
+
+def make_alert(symbol, signal="buy"):
+    return {"type": "entry", "symbol": symbol, "signal": signal, "tf": "5m", "price": 1.0}
+
+
+def test_per_symbol_ordering_and_concurrency():
+    """Alerts run in order within a symbol, symbols run concurrently"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Per-symbol ordering with concurrent symbols")
+    print("=" * 60)
+
+    async def run():
+        events = []
+
+        async def process(data):
+            events.append(("start", data["symbol"], data["signal"]))
+            await asyncio.sleep(0.02)
+            events.append(("end", data["symbol"], data["signal"]))
+            return True
+
+        service = AlertIngestionService({"alert_ingestion_config": {"enabled": True}}, process)
+        ids = [
+            service.submit(make_alert("XAUUSD", "buy")),
+            service.submit(make_alert("XAUUSD", "sell")),
+            service.submit(make_alert("EURUSD", "buy")),
+        ]
+        assert all(ids)
+        assert service.get_status()["total_queued"] == 3
+        await service.stop()
+        return service, ids, events
+
+    service, ids, events = asyncio.run(run())
+    print(f"  Events: {events}")
+
+    xau = [e for e in events if e[1] == "XAUUSD"]
+    assert xau == [("start", "XAUUSD", "buy"), ("end", "XAUUSD", "buy"),
+                   ("start", "XAUUSD", "sell"), ("end", "XAUUSD", "sell")]
+    # EURUSD started before the first XAUUSD alert finished
+    assert events.index(("start", "EURUSD", "buy")) < events.index(("end", "XAUUSD", "buy"))
+
+    for alert_id in ids:
+        assert service.get_alert_status(alert_id)["status"] == "processed"
+    assert service.get_status()["stats"]["processed"] == 3
+
+
+def test_queue_full_and_outcomes():
+    """Full symbol queue rejects, failures and rejections are recorded"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Bounded queue and per-alert outcome")
+    print("=" * 60)
+
+    async def run():
+        async def process(data):
+            if data["signal"] == "fail":
+                raise RuntimeError("broker down")
+            return data["signal"] == "buy"
+
+        errors = []
+        service = AlertIngestionService(
+            {"alert_ingestion_config": {"enabled": True, "max_queue_per_symbol": 2}},
+            process,
+            on_error=errors.append
+        )
+        ok_id = service.submit(make_alert("GBPUSD", "buy"))
+        fail_id = service.submit(make_alert("GBPUSD", "fail"))
+        assert service.submit(make_alert("GBPUSD", "sell")) is None
+
+        await service.stop()
+        rejected_id = service.submit(make_alert("GBPUSD", "sell"))
+        await service.stop()
+        return service, ok_id, fail_id, rejected_id, errors
+
+    service, ok_id, fail_id, rejected_id, errors = asyncio.run(run())
+    status = service.get_status()
+    print(f"  Status: {status}")
+
+    assert service.get_alert_status(ok_id)["status"] == "processed"
+    failed = service.get_alert_status(fail_id)
+    assert failed["status"] == "failed" and failed["error"] == "broker down"
+    assert service.get_alert_status(rejected_id)["status"] == "rejected"
+    assert service.get_alert_status("missing") is None
+    assert status["stats"]["rejected_queue_full"] == 1
+    assert len(errors) == 1
+
+
+if __name__ == "__main__":
+    test_per_symbol_ordering_and_concurrency()
+    test_queue_full_and_outcomes()
+    print("\n[PASS] All alert ingestion tests passed")
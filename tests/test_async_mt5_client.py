@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for the awaitable MT5 facade
+Uses a slow fake MT5 client - no terminal required
+"""
+import sys
+import os
+import time
+import asyncio
+import threading
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.clients.mt5_client import Quote
+from src.clients.async_mt5_client import AsyncMT5Client
+
+
+class SlowMT5Client:
+    """Blocking calls that record which thread ran them"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.initialized = True
+        self.threads = set()
+        self.active = 0
+        self.max_active = 0
+        self.cached = {}
+
+    def _enter(self):
+        self.threads.add(threading.get_ident())
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        self.active -= 1
+
+    def place_order(self, symbol, order_type, lot_size, price, sl, tp=None, comment=""):
+        self._enter()
+        return 123456
+
+    def get_account_balance(self):
+        self._enter()
+        return 10000.0
+
+    def get_cached_quote(self, symbol, max_age_ms=None):
+        return self.cached.get(symbol)
+
+    def get_quote(self, symbol, max_age_ms=None):
+        self._enter()
+        return Quote(symbol, 1.0, 1.2, 1.1, 0.0, 0.0)
+
+
+def test_calls_serialized_on_one_thread():
+    """Concurrent awaits run one at a time on a single worker thread"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Terminal calls serialized off the event loop")
+    print("=" * 60)
+
+    async def run():
+        client = SlowMT5Client()
+        facade = AsyncMT5Client({}, client)
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        results = await asyncio.gather(
+            facade.place_order("XAUUSD", "buy", 0.1, 2650.0, 2640.0, 2660.0),
+            facade.get_account_balance(),
+            facade.get_current_price("EURUSD"),
+            heartbeat()
+        )
+        facade.shutdown()
+        return client, facade, results, ticks
+
+    client, facade, results, ticks = asyncio.run(run())
+    print(f"  Results: {results[:3]} | Loop ticks while waiting: {ticks}")
+    assert results[:3] == [123456, 10000.0, 1.1]
+    assert len(client.threads) == 1
+    assert threading.get_ident() not in client.threads
+    assert client.max_active == 1
+    assert ticks == 10  # event loop kept running
+    assert facade.get_stats()["calls"] == 3
+
+
+def test_timeout_and_cached_quote():
+    """Reads time out, slow orders are awaited, cached quotes skip the worker"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Read timeout, slow order and cached quote fast path")
+    print("=" * 60)
+
+    async def run():
+        client = SlowMT5Client(delay=0.3)
+        facade = AsyncMT5Client({"mt5_async_config": {
+            "order_timeout_seconds": 0.05, "default_timeout_seconds": 0.05
+        }}, client)
+        balance = await facade.get_account_balance()
+        # An order slower than order_timeout still reports its ticket
+        trade_id = await facade.place_order("XAUUSD", "buy", 0.1, 2650.0, 2640.0)
+
+        client.cached["XAUUSD"] = Quote("XAUUSD", 2650.0, 2650.2, 2650.1, 0.0, 0.0)
+        price = await facade.get_current_price("XAUUSD")
+        facade.shutdown()
+        return balance, trade_id, price, facade.get_stats()
+
+    balance, trade_id, price, stats = asyncio.run(run())
+    print(f"  Stats: {stats}")
+    assert balance == 0.0
+    assert trade_id == 123456
+    assert price == 2650.1
+    assert stats["timeouts"] == 1
+    assert stats["slow_calls"] == 1
+    assert stats["calls"] == 2
+
+
+if __name__ == "__main__":
+    test_calls_serialized_on_one_thread()
+    test_timeout_and_cached_quote()
+    print("\n[PASS] All async MT5 client tests passed")
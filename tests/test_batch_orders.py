@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for batch order submission (MT5Client.place_orders)
+Uses a fake MetaTrader5 module - no terminal required
+"""
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import src.clients.mt5_client as mt5_module
+from src.clients.mt5_client import MT5Client, OrderIntent
+from src.clients.async_mt5_client import AsyncMT5Client
+
+
+class FakeMT5:
+    """Minimal MetaTrader5 stand-in that counts terminal calls"""
+    TRADE_ACTION_DEAL = 1
+    ORDER_TYPE_BUY = 0
+    ORDER_TYPE_SELL = 1
+    ORDER_TIME_GTC = 0
+    ORDER_FILLING_IOC = 1
+    TRADE_RETCODE_DONE = 10009
+    TRADE_RETCODE_REQUOTE = 10004
+    TRADE_RETCODE_PRICE_CHANGED = 10020
+
+    def __init__(self, retcodes=None):
+        self.calls = []
+        self.retcodes = list(retcodes or [])
+        self.next_ticket = 5000
+
+    def symbol_info(self, symbol):
+        self.calls.append("symbol_info")
+        return SimpleNamespace(visible=True, digits=2)
+
+    def symbol_select(self, symbol, enable):
+        return True
+
+    def symbol_info_tick(self, symbol):
+        self.calls.append("tick")
+        return SimpleNamespace(bid=2650.0, ask=2650.3)
+
+    def order_send(self, request):
+        self.calls.append("order_send")
+        retcode = self.retcodes.pop(0) if self.retcodes else self.TRADE_RETCODE_DONE
+        self.next_ticket += 1
+        return SimpleNamespace(retcode=retcode, order=self.next_ticket, comment="rejected")
+
+    def last_error(self):
+        return (0, "ok")
+
+
+def make_client(fake):
+    mt5_module.mt5 = fake
+    mt5_module.MT5_AVAILABLE = True
+    client = MT5Client({"simulate_orders": False, "symbol_mapping": {}})
+    client.initialized = True
+    return client
+
+
+def restore(saved):
+    mt5_module.MT5_AVAILABLE, mt5 = saved
+    if mt5 is None:
+        del mt5_module.mt5
+    else:
+        mt5_module.mt5 = mt5
+
+
+def test_batch_resolves_symbol_once():
+    """A 16-order level costs one symbol lookup and one tick, then sends"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Batch of 16 orders - per-symbol work done once")
+    print("=" * 60)
+
+    saved = (mt5_module.MT5_AVAILABLE, getattr(mt5_module, "mt5", None))
+    try:
+        fake = FakeMT5()
+        client = make_client(fake)
+        intents = [OrderIntent("XAUUSD", "buy", 0.01, 2650.0, 2640.0, 2660.0, f"L4_{i}") for i in range(16)]
+        batch = client.place_orders(intents)
+
+        sequential = FakeMT5()
+        mt5_module.mt5 = sequential
+        for intent in intents:
+            client.place_order(*intent)
+    finally:
+        restore(saved)
+
+    print(f"  Batch calls: {len(fake.calls)} | Sequential calls: {len(sequential.calls)}")
+    assert batch.placed == 16 and batch.failed == 0
+    assert fake.calls.count("symbol_info") == 1
+    assert fake.calls.count("tick") == 1
+    assert fake.calls.count("order_send") == 16
+    assert len(fake.calls) < len(sequential.calls)
+    assert batch.wall_time_ms >= 0
+
+
+def test_partial_failure_and_requote():
+    """Failures are reported per order, a requote is retried once"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Partial failure and requote retry")
+    print("=" * 60)
+
+    saved = (mt5_module.MT5_AVAILABLE, getattr(mt5_module, "mt5", None))
+    try:
+        fake = FakeMT5(retcodes=[
+            FakeMT5.TRADE_RETCODE_REQUOTE, FakeMT5.TRADE_RETCODE_DONE,  # order 1: requote then fill
+            10019,                                                       # order 2: rejected
+            FakeMT5.TRADE_RETCODE_DONE                                   # order 3: fill
+        ])
+        client = make_client(fake)
+        intents = [OrderIntent("XAUUSD", "sell", 0.01, 2650.0, 2660.0, 2640.0) for _ in range(3)]
+        batch = client.place_orders(intents)
+    finally:
+        restore(saved)
+
+    print(f"  Trade IDs: {batch.trade_ids} | Errors: {batch.errors}")
+    assert batch.trade_ids[0] is not None
+    assert batch.trade_ids[1] is None
+    assert batch.trade_ids[2] is not None
+    assert batch.partial
+    assert len(batch.errors) == 1 and "10019" in batch.errors[0]
+    assert fake.calls.count("tick") == 2  # refreshed after the requote
+
+
+def test_async_batch_simulation():
+    """The async facade runs the batch as one worker call"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Async batch in simulation mode")
+    print("=" * 60)
+
+    async def run():
+        client = MT5Client({"simulate_orders": True})
+        client.initialized = True
+        facade = AsyncMT5Client({}, client)
+        batch = await facade.place_orders(
+            [OrderIntent("EURUSD", "buy", 0.01, 1.085, 1.08, 1.09) for _ in range(4)]
+        )
+        stats = facade.get_stats()
+        facade.shutdown()
+        return batch, stats
+
+    batch, stats = asyncio.run(run())
+    assert batch.placed == 4
+    assert stats["calls"] == 1
+
+
+if __name__ == "__main__":
+    test_batch_resolves_symbol_once()
+    test_partial_failure_and_requote()
+    test_async_batch_simulation()
+    print("\n[PASS] All batch order tests passed")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared TradeDatabase: pooled read-only connections used from
+several threads while the writer commits, and the process-wide get_database()
+Uses a temporary database file
+"""
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.models import Trade
+from src.database import TradeDatabase, get_database, close_databases
+from src.services.analytics_engine import AnalyticsEngine
+
+
+def make_trade(i):
+    return Trade(
+        symbol="XAUUSD" if i % 2 else "EURUSD", entry=2650.0, sl=2640.0, tp=2665.0,
+        lot_size=0.01, direction="buy", strategy="LOGIC1", open_time="2025-01-01T00:00:00",
+        trade_id=i, status="closed", close_time="2099-01-01T00:00:00", pnl=1.0
+    )
+
+
+def test_concurrent_reads_during_writes():
+    """Report threads read through the pool while trades are written"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Pooled readers alongside the writer")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = TradeDatabase(os.path.join(tmpdir, "test.db"), reader_pool_size=2)
+        errors = []
+
+        def report():
+            try:
+                for _ in range(50):
+                    db.get_trade_history(36500)
+                    db.fetch_all("SELECT symbol, COUNT(*) AS n FROM trades GROUP BY symbol")
+            except Exception as e:
+                errors.append(e)
+
+        readers = [threading.Thread(target=report) for _ in range(4)]
+        for t in readers:
+            t.start()
+        for i in range(1, 201):
+            db.save_trade(make_trade(i))
+        for t in readers:
+            t.join()
+
+        stats = db.get_write_stats()["readers"]
+        print(f"  Reader pool: {stats}")
+        assert errors == []
+        assert stats["open"] <= 2
+        assert len(db.get_trade_history(36500)) == 200
+        assert db.fetch_one("SELECT COUNT(*) AS n FROM trades")["n"] == 200
+
+        # Pooled connections are read-only
+        with db.reader() as conn:
+            try:
+                conn.execute("DELETE FROM trades")
+                assert False, "write accepted on a reader connection"
+            except sqlite3.OperationalError:
+                pass
+        db.close()
+        assert db.get_write_stats()["readers"]["open"] == 0
+
+
+def test_shared_instance_per_file():
+    """get_database() hands out one instance per file, replaced once closed"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Process-wide database per file")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "shared.db")
+        db = get_database(path, reader_pool_size=1)
+        assert get_database(os.path.join(tmpdir, ".", "shared.db")) is db
+        assert AnalyticsEngine(db).get_performance_report()["total_trades"] == 0
+
+        db.close()
+        reopened = get_database(path)
+        assert reopened is not db
+        close_databases()
+        assert reopened._closed
+
+
+if __name__ == "__main__":
+    test_concurrent_reads_during_writes()
+    test_shared_instance_per_file()
+    print("\n[PASS] All database reader tests passed")
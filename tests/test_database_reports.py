@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Tests for TradeDatabase indexes
+Uses a temporary database file
+"""
+import sys
+import os
+import tempfile
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.database import TradeDatabase
+
+
+def test_history_query_uses_index():
+    """close_time filter is served by an index"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Query plan uses close_time index")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = TradeDatabase(os.path.join(tmpdir, "test.db"))
+        plan = db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM trades WHERE close_time >= datetime('now', '-30 days')"
+        ).fetchall()
+        print(f"  Plan: {plan}")
+        assert any("idx_trades_close_time" in str(row) for row in plan)
+        db.close()
+
+
+if __name__ == "__main__":
+    test_history_query_uses_index()
+    print("\n[PASS] All database index tests passed")
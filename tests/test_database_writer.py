@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the write-behind TradeDatabase (group commit + trade upserts)
+Uses a temporary database file
+"""
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.models import Trade
+from src.database import TradeDatabase
+
+
+def make_trade(trade_id=None):
+    return Trade(
+        symbol="XAUUSD", entry=2650.0, sl=2640.0, tp=2665.0, lot_size=0.01,
+        direction="buy", strategy="LOGIC1", open_time="2025-01-01T00:00:00",
+        trade_id=trade_id
+    )
+
+
+def open_db(tmpdir, **kwargs):
+    return TradeDatabase(os.path.join(tmpdir, "test.db"), **kwargs)
+
+
+def test_trade_upsert_single_row():
+    """Open and close of the same trade produce one row"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Trade upsert by trade_id and by object")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = open_db(tmpdir)
+        live = make_trade(trade_id=1001)
+        simulated = make_trade()
+        db.save_trade(live)
+        db.save_trade(simulated)
+
+        for trade in (live, simulated):
+            trade.status = "closed"
+            trade.close_time = "2025-01-01T01:00:00"
+            trade.pnl = 12.5
+            db.save_trade(trade)
+        assert db.flush()
+
+        rows = db.conn.execute("SELECT trade_id, status, pnl FROM trades ORDER BY id").fetchall()
+        print(f"  Rows: {rows}")
+        assert rows == [("1001", "closed", 12.5), (None, "closed", 12.5)]
+
+        # A later trade reusing the ticket gets its own row, the closed one keeps its PnL
+        reused = make_trade(trade_id=1001)
+        reused.open_time = "2025-01-02T00:00:00"
+        db.save_trade(reused)
+        reused.status = "closed"
+        reused.pnl = -3.0
+        db.save_trade(reused)
+        assert db.flush()
+        rows = db.conn.execute("SELECT trade_id, status, pnl FROM trades ORDER BY id").fetchall()
+        assert rows == [("1001", "closed", 12.5), (None, "closed", 12.5), ("1001", "closed", -3.0)]
+        db.close()
+
+
+def test_group_commit_and_futures():
+    """A burst of writes is committed in few batches, futures resolve"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Group commit of a write burst")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = open_db(tmpdir, batch_interval_ms=100, batch_max_ops=500)
+        start = time.perf_counter()
+        futures = [db.save_profit_booking_event("CHAIN", 0, 7.0, 1, 0) for _ in range(50)]
+        enqueue_ms = (time.perf_counter() - start) * 1000
+        for future in futures:
+            future.result(timeout=5)
+
+        stats = db.get_write_stats()
+        print(f"  Enqueue time: {enqueue_ms:.2f} ms, stats: {stats}")
+        assert stats["ops_committed"] == 50
+        assert stats["batches"] <= 3
+        count = db.conn.execute("SELECT COUNT(*) FROM profit_booking_events").fetchone()[0]
+        assert count == 50
+
+        mode = db.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.lower() == "wal"
+        db.close()
+
+
+if __name__ == "__main__":
+    test_trade_upsert_single_row()
+    test_group_commit_and_futures()
+    print("\n[PASS] All database writer tests passed")
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Tests for engine crash recovery: snapshot + journal of open trades, chains
+and pending re-entries restored into a fresh engine
+Uses a temporary state directory and database
+"""
+import sys
+import os
+import copy
+import json
+import asyncio
+import tempfile
+import threading
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.config import Config
+from src.models import Trade
+from src.managers.risk_manager import RiskManager
+from src.clients.mt5_client import MT5Client
+from src.processors.alert_processor import AlertProcessor
+from src.core.trading_engine import TradingEngine
+
+
+class SilentBot:
+    def send_message(self, message):
+        return True
+
+
+def make_engine(work_dir, **state_options):
+    config = Config()
+    config.config = copy.deepcopy(config.config)
+    config.config_file = os.path.join(work_dir, "config.json")
+    config.writer = None
+    config.config["simulate_orders"] = True
+    config.config["database_config"] = {"path": os.path.join(work_dir, "state.db")}
+    config.config["state_writer_config"] = {
+        "trends_file": os.path.join(work_dir, "timeframe_trends.json"),
+        "stats_file": os.path.join(work_dir, "stats.json")
+    }
+    config.config["engine_state_config"] = dict(
+        {"directory": os.path.join(work_dir, "engine_state"), "fsync_journal": False}, **state_options
+    )
+    config.config["event_journal_config"] = {"directory": os.path.join(work_dir, "events")}
+    engine = TradingEngine(config, RiskManager(config), MT5Client(config), SilentBot(), AlertProcessor(config))
+    engine.state_store.restore()
+    return engine
+
+
+def make_trade(entry, **fields):
+    return Trade(
+        symbol="XAUUSD", entry=entry, sl=entry - 10, tp=entry + 15, lot_size=0.01,
+        direction="buy", strategy="LOGIC1", open_time=f"2025-01-01T00:00:{int(entry) % 60:02d}", **fields
+    )
+
+
+def populate(engine):
+    """Open trades, a re-entry chain with an SL hit, pending re-entries"""
+    first = make_trade(2650.0, trade_id=1001)
+    engine.risk_manager.add_open_trade(first)
+    chain = engine.reentry_manager.create_chain(first)
+    engine.risk_manager.add_open_trade(make_trade(2651.0, order_type="PROFIT_TRAIL", profit_chain_id="P1"))
+    engine.reentry_manager.record_sl_hit(first)
+    engine.price_monitor.register_sl_hunt(first, "LOGIC1")
+    engine.price_monitor.register_tp_continuation(first, 2665.0, "LOGIC1")
+    engine.is_paused = True
+    return first, chain
+
+
+def test_journal_restores_exact_state():
+    """Journal-only recovery (no snapshot yet), removals and a torn last line"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Restore from journal")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        engine = make_engine(work_dir)
+        first, chain = populate(engine)
+        written = engine.state_store.checkpoint()
+        print(f"  Journal entries: {written}")
+        assert written >= 6
+        assert engine.state_store.checkpoint() == 0  # nothing changed
+
+        # TP continuation fired and the first trade closed
+        engine.price_monitor.stop_tp_continuation("XAUUSD")
+        first.status = "closed"
+        engine.risk_manager.remove_open_trade(first)
+        assert engine.state_store.checkpoint() == 2
+        expected = engine.state_store.capture()
+
+        # Crash mid-write of the next entry
+        with open(engine.state_store.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"seq": 999, "section": "open_trades", "ke')
+        engine.state_store.close()
+        engine.events.close()
+        engine.db.close()
+
+        restored = make_engine(work_dir)
+        print(f"  Restore stats: {restored.state_store.get_stats()}")
+        assert restored.state_store.capture() == expected
+        assert len(restored.open_trades) == 1
+        assert restored.open_trades.for_profit_chain("P1")
+        assert restored.reentry_manager.active_chains[chain.chain_id].status == "stopped"
+        assert "XAUUSD" in restored.price_monitor.sl_hunt_pending
+        assert "XAUUSD" not in restored.price_monitor.tp_continuation_pending
+        assert "XAUUSD" in restored.price_monitor.monitored_symbols
+        assert restored.reentry_manager.recent_sl_hits["XAUUSD"][0]["time"] == \
+            engine.reentry_manager.recent_sl_hits["XAUUSD"][0]["time"]
+        assert restored.is_paused
+        restored.state_store.close()
+        restored.events.close()
+        restored.db.close()
+
+
+def test_snapshot_compacts_journal():
+    """A snapshot replaces the journal, stale entries are not replayed"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Snapshot compaction")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        engine = make_engine(work_dir, snapshot_max_journal_entries=3)
+        populate(engine)
+        store = engine.state_store
+        store.checkpoint()
+        with open(store.journal_path, encoding="utf-8") as f:
+            old_entries = f.read()
+
+        # Journal is over the limit - the next checkpoint writes a snapshot
+        engine.risk_manager.add_open_trade(make_trade(2652.0))
+        assert store.checkpoint() == 0
+        assert store.get_stats()["snapshots"] == 1
+        assert os.path.getsize(store.journal_path) == 0
+        with open(store.snapshot_path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        assert len(snapshot["state"]["open_trades"]) == 3
+
+        # Truncation lost (crash right after the snapshot) - old entries are skipped
+        with open(store.journal_path, "w", encoding="utf-8") as f:
+            f.write(old_entries)
+        engine.price_monitor.stop_tp_continuation("XAUUSD")
+        store._journal_file.close()
+        store._journal_file = None
+        assert store.checkpoint() == 1
+        expected = store.capture()
+        engine.state_store.close()
+        engine.events.close()
+        engine.db.close()
+
+        restored = make_engine(work_dir)
+        assert restored.state_store.capture() == expected
+        assert len(restored.open_trades) == 3
+        restored.state_store.close()
+        restored.events.close()
+        restored.db.close()
+
+
+
+def test_background_checkpoints_off_loop():
+    """The periodic task journals a burst of changes from a worker thread"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Background checkpoints")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        engine = make_engine(work_dir, journal_interval_ms=20)
+        store = engine.state_store
+        persist = store._persist
+        threads = []
+
+        def recording_persist(state, force_snapshot=False):
+            threads.append(threading.get_ident())
+            return persist(state, force_snapshot)
+        store._persist = recording_persist
+
+        async def run():
+            store.start()
+            populate(engine)
+            for i in range(5):
+                engine.risk_manager.add_open_trade(make_trade(2660.0 + i))
+            await asyncio.sleep(0.2)
+            journaled = store.get_stats()["journal_entries"]
+            await store.stop()
+            return journaled
+
+        journaled = asyncio.run(run())
+        print(f"  Journaled in background: {journaled}")
+        assert journaled >= 11
+        # Only the final snapshot in stop() ran on the loop thread
+        assert threads.count(threading.get_ident()) == 1
+        expected = store.capture()
+        engine.events.close()
+        engine.db.close()
+
+        restored = make_engine(work_dir)
+        assert restored.state_store.capture() == expected
+        restored.state_store.close()
+        restored.events.close()
+        restored.db.close()
+
+if __name__ == "__main__":
+    test_journal_restores_exact_state()
+    test_snapshot_compacts_journal()
+    test_background_checkpoints_off_loop()
+    print("\n[PASS] All engine state store tests passed")
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Tests for the binary engine event journal: segment rotation, resume after
+a torn record, time-range scans, tailing and the engine's decision events
+Uses temporary journal directories
+"""
+import sys
+import os
+import copy
+import asyncio
+import tempfile
+from datetime import datetime, timedelta
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.utils import clock
+from src.utils.clock import VirtualClock
+from src.core.event_journal import (
+    EventJournal, EventJournalReader, EventType, HEADER_SIZE, RECORD_SIZE
+)
+
+
+def test_segments_rotate_resume_and_scan():
+    """Rotation, retention, torn tail on reopen and time / type / symbol filters"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Segment rotation, resume and scans")
+    print("=" * 60)
+
+    start = datetime(2025, 1, 6, 9, 0, 0)
+    virtual_clock = VirtualClock(start)
+    clock.set_clock(virtual_clock)
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            directory = os.path.join(work_dir, "events")
+            # 10 records per segment
+            segment_mb = (HEADER_SIZE + 10 * RECORD_SIZE) / (1024 * 1024)
+            journal = EventJournal(directory, segment_size_mb=segment_mb, max_segments=3)
+            assert not os.path.exists(directory), "constructing must not touch the disk"
+
+            for i in range(25):
+                symbol = "XAUUSD" if i % 2 == 0 else "EURUSD"
+                kind = EventType.FILL if i % 5 == 0 else EventType.ALERT_RECEIVED
+                seq = journal.record(kind, symbol, "buy" if i % 2 == 0 else "sell",
+                                     ticket=1000 + i, price=2650.0 + i, lot=0.01, ref=f"alert-{i}")
+                assert seq == i + 1
+                virtual_clock.advance(60)
+            journal.close()
+            segments = sorted(os.listdir(directory))
+            print(f"Segments: {segments}")
+            assert len(segments) == 3
+            assert segments[0] == "events-0000000000000001.seg"
+
+            reader = EventJournalReader(directory)
+            events = list(reader.scan())
+            assert [e.seq for e in events] == list(range(1, 26))
+            assert events[4].symbol == "XAUUSD" and events[4].direction == "buy"
+            assert events[4].ticket == 1004 and events[4].price == 2654.0 and events[4].ref == "alert-4"
+            assert events[5].type == EventType.FILL and events[5].side == -1
+
+            # [09:10, 09:15) -> seq 11..15, which starts the second segment
+            window = list(reader.scan(start + timedelta(minutes=10), start + timedelta(minutes=15)))
+            assert [e.seq for e in window] == [11, 12, 13, 14, 15]
+            fills = list(reader.scan(types=[EventType.FILL], symbol="XAUUSD"))
+            assert [e.seq for e in fills] == [1, 11, 21]
+
+            # Tear the last record (a crash mid-write): reopening resumes before it
+            path = os.path.join(directory, segments[-1])
+            with open(path, "r+b") as handle:
+                handle.seek(HEADER_SIZE + 4 * RECORD_SIZE + 20)
+                handle.write(b"\xff\xff\xff\xff")
+            assert reader.last_seq() == 24
+
+            journal = EventJournal(directory, segment_size_mb=segment_mb, max_segments=3)
+            assert journal.record(EventType.CLOSE, "XAUUSD", "buy", ticket=1024, value=12.5) == 25
+            for _ in range(10):
+                journal.record(EventType.ALERT_RECEIVED, "GBPUSD")
+            journal.close()
+            events = list(reader.scan())
+            assert [e.seq for e in events] == list(range(11, 36)), "oldest segment pruned"
+            assert events[14].type == EventType.CLOSE and events[14].value == 12.5
+            print(f"Stats: {journal.get_stats()}")
+            assert journal.get_stats()["segments_removed"] == 1
+    finally:
+        clock.set_clock(None)
+
+
+def test_engine_decisions_tail_and_replay():
+    """Alert, alignment, intent, fill and close events from the engine"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Engine decision events, tail and replay")
+    print("=" * 60)
+
+    from src.config import Config
+    from src.managers.risk_manager import RiskManager
+    from src.clients.mt5_client import MT5Client
+    from src.processors.alert_processor import AlertProcessor
+    from src.core.trading_engine import TradingEngine
+
+    class SilentBot:
+        def send_message(self, message):
+            return True
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        config = Config()
+        config.config = copy.deepcopy(config.config)
+        config.config_file = os.path.join(work_dir, "config.json")
+        config.writer = None
+        config.config["simulate_orders"] = True
+        config.config["database_config"] = {"path": os.path.join(work_dir, "events.db")}
+        config.config["state_writer_config"] = {
+            "trends_file": os.path.join(work_dir, "timeframe_trends.json"),
+            "stats_file": os.path.join(work_dir, "stats.json")
+        }
+        config.config["event_journal_config"] = {"directory": os.path.join(work_dir, "events")}
+        engine = TradingEngine(config, RiskManager(config), MT5Client(config), SilentBot(), AlertProcessor(config))
+        reader = EventJournalReader(os.path.join(work_dir, "events"))
+
+        async def run():
+            await engine.mt5.initialize()
+            for tf in ("1d", "1h", "15m", "5m"):
+                await engine.process_alert({"type": "trend", "symbol": "EURUSD", "signal": "bull", "tf": tf})
+            tail = reader.tail(follow=False)
+            assert await engine.process_alert(
+                {"type": "entry", "symbol": "EURUSD", "signal": "buy", "tf": "15m", "price": 1.085}
+            )
+            for trade in list(engine.open_trades):
+                await engine.close_trade(trade, "MANUAL", 1.086)
+            return list(tail)
+
+        try:
+            tailed = asyncio.run(run())
+        finally:
+            engine.mt5.shutdown()
+            engine.events.close()
+            engine.db.close()
+
+        kinds = [event.type for event in tailed]
+        print(f"Events after the trend alerts: {[k.name for k in kinds]}")
+        assert kinds[:3] == [EventType.ALERT_RECEIVED, EventType.ALIGNMENT, EventType.ORDER_INTENT]
+        assert tailed[1].value == 1.0 and tailed[1].strategy == "LOGIC2"
+        fills = [e for e in tailed if e.type == EventType.FILL]
+        closes = [e for e in tailed if e.type == EventType.CLOSE]
+        assert len(fills) == len(closes) >= 1
+        assert {e.ticket for e in fills} == {e.ticket for e in closes}
+        assert all(e.ref == "MANUAL" and e.price == 1.086 for e in closes)
+
+        replayed = []
+        count = reader.replay(replayed.append, types=[EventType.ALERT_RECEIVED])
+        assert count == 5 and [e.ref for e in replayed] == ["trend"] * 4 + ["entry"]
+
+
+def test_rejected_order_is_not_a_fill():
+    """A failed live order is journaled as ORDER_REJECTED, never as FILL"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Rejected orders")
+    print("=" * 60)
+
+    from src.config import Config
+    from src.managers.risk_manager import RiskManager
+    from src.clients.mt5_client import MT5Client
+    from src.processors.alert_processor import AlertProcessor
+    from src.core.trading_engine import TradingEngine
+
+    class SilentBot:
+        def send_message(self, message):
+            return True
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        config = Config()
+        config.config = copy.deepcopy(config.config)
+        config.config_file = os.path.join(work_dir, "config.json")
+        config.writer = None
+        config.config["simulate_orders"] = False
+        config.config["dual_order_config"] = {"enabled": False}
+        config.config["database_config"] = {"path": os.path.join(work_dir, "events.db")}
+        config.config["state_writer_config"] = {
+            "trends_file": os.path.join(work_dir, "timeframe_trends.json"),
+            "stats_file": os.path.join(work_dir, "stats.json")
+        }
+        config.config["event_journal_config"] = {"directory": os.path.join(work_dir, "events")}
+        engine = TradingEngine(config, RiskManager(config), MT5Client(config), SilentBot(), AlertProcessor(config))
+
+        async def rejecting_place_order(**kwargs):
+            return None
+
+        async def run():
+            await engine.mt5.initialize()
+            engine.mt5.place_order = rejecting_place_order
+            for tf in ("1d", "1h", "15m", "5m"):
+                await engine.process_alert({"type": "trend", "symbol": "EURUSD", "signal": "bull", "tf": tf})
+            await engine.process_alert(
+                {"type": "entry", "symbol": "EURUSD", "signal": "buy", "tf": "15m", "price": 1.085}
+            )
+
+        try:
+            asyncio.run(run())
+        finally:
+            engine.mt5.shutdown()
+            engine.events.close()
+            engine.db.close()
+
+        events = list(EventJournalReader(os.path.join(work_dir, "events")).scan())
+        kinds = [event.type for event in events]
+        print(f"Events: {[k.name for k in kinds]}")
+        assert EventType.FILL not in kinds
+        assert kinds[-2:] == [EventType.ORDER_INTENT, EventType.ORDER_REJECTED]
+        assert events[-1].symbol == "EURUSD" and events[-1].ticket == 0
+        assert not engine.open_trades
+
+
+if __name__ == "__main__":
+    test_segments_rotate_resume_and_scan()
+    test_engine_decisions_tail_and_replay()
+    test_rejected_order_is_not_a_fill()
+    print("\n[PASS] All event journal tests passed")
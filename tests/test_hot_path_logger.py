@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for rate-limited, sampled hot-path logging
+"""
+import sys
+import os
+import json
+import logging
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.utils.hot_path_logger import HotPathLogger
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def make_logger(name):
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = ListHandler()
+    logger.handlers = [handler]
+    return logger, handler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate_limit_and_state_change():
+    """Same state logs once per interval, a state change logs immediately"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Per-key rate limit with state-change bypass")
+    print("=" * 60)
+
+    logger, handler = make_logger("test.hot_path.rate")
+    clock = FakeClock()
+    hot_log = HotPathLogger(logger, interval_seconds=30, clock=clock)
+
+    for _ in range(100):
+        hot_log.info("PRICE_CHECK", "XAUUSD", False, Current=2650.3, Reached=False)
+        hot_log.info("PRICE_CHECK", "EURUSD", False, Current=1.085, Reached=False)
+    assert len(handler.messages) == 2
+    assert handler.messages[0] == "[PRICE_CHECK] XAUUSD: Current=2650.3 Reached=NO"
+
+    hot_log.info("PRICE_CHECK", "XAUUSD", True, Current=2651.0, Reached=True)
+    assert len(handler.messages) == 3
+    assert handler.messages[2].endswith("Reached=YES (+99 suppressed)")
+
+    hot_log.info("PRICE_CHECK", "XAUUSD", True, Current=2651.1, Reached=True)
+    clock.now = 31
+    hot_log.info("PRICE_CHECK", "XAUUSD", True, Current=2651.2, Reached=True)
+    assert len(handler.messages) == 4
+    assert "(+1 suppressed)" in handler.messages[3]
+
+    stats = hot_log.get_stats()
+    print(f"  Stats: {stats}")
+    assert stats["emitted"] == 4
+    assert stats["suppressed"] == stats["rate_limited"] == 199
+
+    # Pending re-entry removed: the next check for that symbol logs right away
+    hot_log.forget("XAUUSD")
+    assert list(hot_log.keys) == [("PRICE_CHECK", "EURUSD")]
+    assert hot_log.info("PRICE_CHECK", "XAUUSD", True, Current=2651.3, Reached=True)
+
+
+def test_disabled_level_sampling_and_structured():
+    """Disabled levels cost nothing, sampling drops repeats, JSON output is compact"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Disabled level, sampling and structured output")
+    print("=" * 60)
+
+    logger, handler = make_logger("test.hot_path.sample")
+    clock = FakeClock()
+    hot_log = HotPathLogger(logger, interval_seconds=0, sample_rate=0.0, structured=True, clock=clock)
+
+    assert not hot_log.debug("TICK", "XAUUSD", Bid=2650.0)
+    assert hot_log.get_stats()["emitted"] == 0 and not hot_log.keys
+
+    for _ in range(10):
+        hot_log.info("TICK", "XAUUSD", "flat", Bid=2650.0)
+    assert len(handler.messages) == 1
+    assert hot_log.get_stats()["sampled_out"] == 9
+
+    hot_log.info("TICK", "XAUUSD", "up", Bid=2650.5)
+    record = json.loads(handler.messages[1])
+    assert record == {"event": "TICK", "subject": "XAUUSD", "Bid": 2650.5, "suppressed": 9}
+
+
+if __name__ == "__main__":
+    test_rate_limit_and_state_change()
+    test_disabled_level_sampling_and_structured()
+    print("\n[PASS] All hot-path logger tests passed")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the debounced atomic JSON state writer
+"""
+import sys
+import os
+import json
+import time
+import tempfile
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.utils.json_state_writer import JsonStateWriter, flush_all_state_writers
+from src.managers.timeframe_trend_manager import TimeframeTrendManager
+
+
+def test_storm_coalesces_into_one_write():
+    """Many changes inside the window cost a single write of the latest state"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Alert storm coalesced into one write")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "state.json")
+        state = {"count": 0}
+        writer = JsonStateWriter(path, lambda: state, debounce_ms=50)
+
+        for i in range(500):
+            state["count"] = i + 1
+            writer.mark_dirty()
+        assert not os.path.exists(path)
+
+        time.sleep(0.3)
+        stats = writer.get_stats()
+        print(f"  Stats: {stats}")
+        assert stats["writes"] == 1
+        assert stats["marks"] == 500 and stats["coalesced"] == 499
+        assert not stats["pending"]
+        with open(path) as f:
+            assert json.load(f) == {"count": 500}
+        # No temp files left behind
+        assert os.listdir(tmp) == ["state.json"]
+
+
+def test_flush_on_shutdown_and_failed_write():
+    """flush_all writes pending state now, a failed write keeps the old file"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Shutdown flush and atomic replace")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trends.json")
+        manager = TimeframeTrendManager(path, debounce_ms=60_000)
+        manager.update_trend("XAUUSD", "1h", "bull")
+        assert not os.path.exists(path)
+
+        flush_all_state_writers()
+        with open(path) as f:
+            assert json.load(f)["symbols"]["XAUUSD"]["1h"]["trend"] == "BULLISH"
+
+        # Unserializable state: write fails, previous file is untouched
+        manager.trends["bad"] = object()
+        manager.save_trends()
+        assert not manager.writer.flush()
+        assert manager.writer.get_stats()["errors"] == 1
+        with open(path) as f:
+            assert "bad" not in json.load(f)
+        assert os.listdir(tmp) == ["trends.json"]
+        assert manager.writer.get_stats()["pending"], "failed write stays pending"
+        del manager.trends["bad"]
+        assert manager.writer.flush()
+
+
+def test_failed_write_is_retried():
+    """A write that fails (disk full, locked file) is written by the next flush"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Failed write retried")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "stats.json")
+        state = {"trades": 1}
+        writer = JsonStateWriter(path, lambda: state, debounce_ms=60_000)
+        atomic_write = writer._atomic_write
+        failures = []
+
+        def fail_once(text):
+            if not failures:
+                failures.append(text)
+                raise OSError(28, "No space left on device")
+            atomic_write(text)
+
+        writer._atomic_write = fail_once
+        writer.mark_dirty()
+        assert not writer.flush()
+        assert not os.path.exists(path)
+        assert writer.get_stats()["pending"] and writer.get_stats()["errors"] == 1
+
+        state["trades"] = 2
+        flush_all_state_writers()
+        with open(path) as f:
+            assert json.load(f) == {"trades": 2}
+        assert not writer.get_stats()["pending"] and writer.get_stats()["writes"] == 1
+
+
+if __name__ == "__main__":
+    test_storm_coalesces_into_one_write()
+    test_flush_on_shutdown_and_failed_write()
+    test_failed_write_is_retried()
+    print("\n[PASS] All JSON state writer tests passed")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the queue-fed logging pipeline
+"""
+import sys
+import os
+import io
+import json
+import logging
+import tempfile
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.utils.log_pipeline import LogPipeline, StdoutToLogger
+
+
+def test_queue_pipeline_writes_text_and_json():
+    """Records logged from the caller land in bot.log and bot.jsonl after stop"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Queue handler, batching listener, JSON lines")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        console = io.StringIO()
+        pipeline = LogPipeline(log_dir=tmp, json_lines=True, console_stream=console)
+        root = logging.getLogger("test.log_pipeline")
+        root.propagate = False
+        pipeline.start(root_logger=root, redirect_stdout=False)
+
+        for i in range(500):
+            root.info("order %d placed", i)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            root.exception("order failed")
+        pipeline.stop()
+
+        stats = pipeline.get_stats()
+        print(f"  Stats: {stats}")
+        assert stats["records"] == 501 and stats["dropped"] == 0
+        assert stats["batches"] < 501  # records are written in batches
+
+        with open(os.path.join(tmp, "bot.log"), encoding="utf-8") as f:
+            text = f.read()
+        assert "order 499 placed" in text
+        with open(os.path.join(tmp, "bot.jsonl"), encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        assert lines[0]["msg"] == "order 0 placed" and lines[0]["level"] == "INFO"
+        assert lines[-1]["level"] == "ERROR" and "ValueError: boom" in lines[-1]["exc"]
+        # Console only shows warnings and above
+        assert "order failed" in console.getvalue()
+        assert "order 0 placed" not in console.getvalue()
+
+
+def test_stdout_redirect_levels():
+    """Printed lines become records with the level their prefix implies"""
+    print("\n" + "=" * 60)
+    print("TEST 2: print() routed into logging")
+    print("=" * 60)
+
+    records = []
+    logger = logging.getLogger("test.log_pipeline.stdout")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger.handlers = [handler]
+
+    stream = StdoutToLogger(logger)
+    print("SUCCESS: Trade placed", file=stream)
+    print("ERROR: Order rejected", file=stream)
+    stream.write("WARNING: partial ")
+    assert len(records) == 2
+    stream.write("line\n\n")
+
+    assert [(r.levelno, r.getMessage()) for r in records] == [
+        (logging.INFO, "SUCCESS: Trade placed"),
+        (logging.ERROR, "ERROR: Order rejected"),
+        (logging.WARNING, "WARNING: partial line")
+    ]
+
+
+if __name__ == "__main__":
+    test_queue_pipeline_writes_text_and_json()
+    test_stdout_redirect_levels()
+    print("\n[PASS] All log pipeline tests passed")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process metrics registry and its Prometheus rendering
+"""
+import sys
+import os
+import tempfile
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.utils import metrics
+from src.utils.metrics import MetricsRegistry
+
+
+def test_registry_renders_prometheus_text():
+    """Counters, gauges and cumulative histogram buckets in exposition format"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Prometheus text rendering")
+    print("=" * 60)
+
+    registry = MetricsRegistry()
+    sends = registry.counter("sends_total", "Messages sent", ["reason"])
+    sends.labels("rate_limited").inc()
+    sends.labels('bad "quote"').inc(2)
+    depth = registry.gauge("queue_depth", "Items queued")
+    depth.set(3)
+    pending = registry.gauge("pending", "Pending by kind", ["kind"])
+    items = [1, 2]
+    pending.labels("sl_hunt").set_function(lambda: len(items))
+    latency = registry.histogram("call_seconds", "Call latency", ["call"], buckets=(0.01, 0.1, 1.0))
+    child = latency.labels("tick")
+    for value in (0.005, 0.05, 0.05, 2.0):
+        child.observe(value)
+
+    # Same name and labels returns the existing family, a conflicting one is refused
+    assert registry.counter("sends_total", "Messages sent", ["reason"]) is sends
+    try:
+        registry.gauge("sends_total", "Messages sent", ["reason"])
+        assert False, "conflicting registration accepted"
+    except ValueError:
+        pass
+
+    items.append(3)
+    text = registry.render()
+    print(text)
+    assert "# TYPE sends_total counter" in text
+    assert 'sends_total{reason="rate_limited"} 1' in text
+    assert 'sends_total{reason="bad \\"quote\\""} 2' in text
+    assert "queue_depth 3" in text
+    assert 'pending{kind="sl_hunt"} 3' in text
+    assert 'call_seconds_bucket{call="tick",le="0.01"} 1' in text
+    assert 'call_seconds_bucket{call="tick",le="0.1"} 3' in text
+    assert 'call_seconds_bucket{call="tick",le="1"} 3' in text
+    assert 'call_seconds_bucket{call="tick",le="+Inf"} 4' in text
+    assert 'call_seconds_count{call="tick"} 4' in text
+    assert 'call_seconds_sum{call="tick"} 2.105' in text
+    assert text.endswith("\n")
+
+
+def test_instrumented_clients_record():
+    """MT5 and database calls land in the process registry"""
+    print("\n" + "=" * 60)
+    print("TEST 2: MT5 / database instrumentation")
+    print("=" * 60)
+
+    from src.clients.mt5_client import MT5Client, MT5_CALL_SECONDS, MT5_CALL_FAILURES
+    from src.database import TradeDatabase, DB_OPERATION_SECONDS, DB_WRITE_LATENCY_SECONDS
+    from src.models import Trade
+
+    def count(metric, *labels):
+        return metric.labels(*labels).snapshot()[0]
+
+    ticks_before = sum(count(MT5_CALL_SECONDS, "tick"))
+    orders_before = sum(count(MT5_CALL_SECONDS, "place_order"))
+    client = MT5Client({"simulate_orders": True})
+    client.initialized = True
+    assert client.get_quote("XAUUSD") is not None
+    assert client.place_order("XAUUSD", "buy", 0.01, 2650.0, 2640.0, 2660.0) is not None
+    assert sum(count(MT5_CALL_SECONDS, "tick")) == ticks_before + 1
+    assert sum(count(MT5_CALL_SECONDS, "place_order")) == orders_before + 1
+    assert MT5_CALL_FAILURES.labels("place_order").get() == 0
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        db = TradeDatabase(os.path.join(work_dir, "metrics.db"))
+        writes_before = sum(count(DB_WRITE_LATENCY_SECONDS))
+        db.save_trade(Trade(
+            symbol="XAUUSD", entry=2650.0, sl=2640.0, tp=2660.0, lot_size=0.01,
+            direction="buy", strategy="LOGIC1", open_time="2025-01-01T00:00:00", trade_id=1
+        ))
+        db.get_trade_history()
+        db.close()
+    assert sum(count(DB_WRITE_LATENCY_SECONDS)) == writes_before + 1
+    assert sum(count(DB_OPERATION_SECONDS, "get_trade_history")) >= 1
+    assert sum(count(DB_OPERATION_SECONDS, "commit_batch")) >= 1
+    assert 'mt5_call_seconds_count{call="tick"}' in metrics.render()
+
+
+if __name__ == "__main__":
+    test_registry_renders_prometheus_text()
+    test_instrumented_clients_record()
+    print("\n[PASS] All metrics tests passed")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the indexed OpenTradeBook shared by the engine and managers
+"""
+import sys
+import os
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.models import Trade
+from src.core.open_trade_book import OpenTradeBook
+
+
+def make_trade(symbol="XAUUSD", trade_id=None, chain_id=None,
+               profit_chain_id=None, profit_level=0):
+    return Trade(
+        symbol=symbol, entry=2650.0, sl=2640.0, tp=2665.0, lot_size=0.01,
+        direction="buy", strategy="LOGIC1", open_time="2025-01-01T00:00:00",
+        trade_id=trade_id, chain_id=chain_id,
+        profit_chain_id=profit_chain_id, profit_level=profit_level
+    )
+
+
+def test_index_lookups():
+    """Trades are reachable through every index"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Index lookups")
+    print("=" * 60)
+
+    book = OpenTradeBook()
+    a = make_trade(trade_id=1, chain_id="C1")
+    b = make_trade(trade_id=2, profit_chain_id="P1", profit_level=0)
+    c = make_trade(symbol="EURUSD", trade_id=3, profit_chain_id="P1", profit_level=1)
+    for t in (a, b, c):
+        book.append(t)
+    book.append(a)  # idempotent
+
+    assert len(book) == 3
+    assert book.get_by_trade_id(2) is b
+    assert book.has_open_trade_id(3)
+    assert not book.has_open_trade_id(99)
+    assert book.for_symbol("XAUUSD") == [a, b]
+    assert book.for_chain("C1") == [a]
+    assert book.for_profit_chain("P1") == [b, c]
+    assert book.for_profit_level("P1", 1) == [c]
+    assert sorted(book.symbols()) == ["EURUSD", "XAUUSD"]
+
+
+def test_remove_reindex_and_purge():
+    """Removal, reindexing after mutation and purge of closed trades"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Remove, reindex and purge")
+    print("=" * 60)
+
+    # Simulation trades have no ticket - identity must still distinguish them
+    a = make_trade()
+    b = make_trade(profit_chain_id="P1")
+    book = OpenTradeBook([a, b])
+
+    book.remove(a)
+    assert a not in book and b in book
+    assert book.for_symbol("XAUUSD") == [b]
+
+    b.profit_chain_id = None
+    book.reindex(b)
+    assert book.for_profit_chain("P1") == []
+
+    b.status = "closed"
+    for trade in book:          # iterating a snapshot - safe to mutate
+        book.discard(trade)
+    assert len(book) == 0
+
+    c = make_trade(trade_id=7)
+    book.add(c)
+    c.status = "closed"
+    assert book.purge_closed() == 1
+    assert book.get_by_trade_id(7) is None
+    assert book.symbols() == []
+
+
+if __name__ == "__main__":
+    test_index_lookups()
+    test_remove_reindex_and_purge()
+    print("\n[PASS] All open trade book tests passed")
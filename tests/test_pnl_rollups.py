@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental hour/day PnL rollup store
+Uses a temporary database file
+"""
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.models import Trade
+from src.database import TradeDatabase
+from src.services.analytics_engine import AnalyticsEngine
+
+
+def closed_trade(close_time, pnl, strategy="LOGIC1", order_type="TP_TRAIL", trade_id=None):
+    return Trade(
+        symbol="XAUUSD", entry=2650.0, sl=2640.0, tp=2665.0, lot_size=0.01,
+        direction="buy", strategy=strategy, open_time=close_time, status="closed",
+        close_time=close_time, pnl=pnl, order_type=order_type, trade_id=trade_id
+    )
+
+
+def test_rollups_update_and_range_query():
+    """Closes accumulate into buckets that can be queried by range"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Rollup upserts and range queries")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = TradeDatabase(os.path.join(tmpdir, "test.db"))
+        db.record_pnl_rollup(closed_trade("2025-03-01T10:15:00", 10.0))
+        db.record_pnl_rollup(closed_trade("2025-03-01T10:45:00", -4.0))
+        db.record_pnl_rollup(closed_trade("2025-03-01T11:05:00", 6.0, strategy="LOGIC2"))
+        db.record_pnl_rollup(closed_trade("2025-03-02T09:00:00", 3.0, order_type="PROFIT_TRAIL"))
+
+        total = db.get_pnl_rollups("2025-03-01", "2025-03-03")[0]
+        print(f"  Total: {total}")
+        assert total["trades"] == 4 and total["wins"] == 3 and total["losses"] == 1
+        assert abs(total["pnl"] - 15.0) < 1e-9
+
+        hours = db.get_pnl_rollups("2025-03-01T00:00:00", "2025-03-02T00:00:00",
+                                   granularity="hour", group_by=["bucket_start"])
+        assert [(h["bucket_start"], h["pnl"]) for h in hours] == [
+            ("2025-03-01T10:00:00", 6.0), ("2025-03-01T11:00:00", 6.0)
+        ]
+
+        by_strategy = db.get_pnl_rollups("2025-03-01", "2025-03-03", group_by=["strategy"])
+        assert {r["strategy"]: r["trades"] for r in by_strategy} == {"LOGIC1": 3, "LOGIC2": 1}
+
+        curve = db.get_equity_curve("2025-03-01", "2025-03-03")
+        assert [round(p["cumulative_pnl"], 6) for p in curve] == [12.0, 15.0]
+
+        # Analytics reports read the same store (last 30 days)
+        today = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+        db.record_pnl_rollup(closed_trade(today, 8.0))
+        db.record_pnl_rollup(closed_trade(today, -2.0, strategy="LOGIC2"))
+        analytics = AnalyticsEngine(db)
+        report = analytics.get_performance_report()
+        assert report["total_trades"] == 2 and report["win_rate"] == 50.0
+        assert report["average_win"] == 8.0 and report["average_loss"] == -2.0
+        assert [p["cumulative_pnl"] for p in report["equity_curve"]] == [6.0]
+        assert analytics.get_strategy_performance() == {
+            "LOGIC1": {"trades": 1, "pnl": 8.0, "wins": 1},
+            "LOGIC2": {"trades": 1, "pnl": -2.0, "wins": 0}
+        }
+        db.close()
+
+
+def test_backfill_from_trades():
+    """An empty rollup table is rebuilt from closed trades on startup"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Backfill rollups from existing trades")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "test.db")
+        db = TradeDatabase(path)
+        db.save_trade(closed_trade("2025-03-01T10:15:00", 8.0, trade_id=1))
+        db.save_trade(closed_trade("2025-03-01T12:00:00", -2.0, trade_id=2))
+        db.close()
+
+        reopened = TradeDatabase(path)
+        rows = reopened.get_pnl_rollups("2025-03-01", "2025-03-02", group_by=["order_type"])
+        print(f"  Rows: {rows}")
+        assert rows[0]["trades"] == 2
+        assert abs(rows[0]["pnl"] - 6.0) < 1e-9
+        assert abs(rows[0]["gross_loss"] - 2.0) < 1e-9
+        reopened.close()
+
+
+if __name__ == "__main__":
+    test_rollups_update_and_range_query()
+    test_backfill_from_trades()
+    print("\n[PASS] All PnL rollup tests passed")
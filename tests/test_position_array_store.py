@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for the NumPy position store behind OpenTradeBook mark-to-market
+Cross-checks vectorized PnL against the per-trade formula
+"""
+import sys
+import os
+import math
+import random
+import threading
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.models import Trade
+from src.core.open_trade_book import OpenTradeBook
+
+SYMBOL_CONFIG = {
+    "XAUUSD": {"pip_size": 0.01, "pip_value_per_std_lot": 1.0},
+    "EURUSD": {"pip_size": 0.0001, "pip_value_per_std_lot": 10.0},
+    "USDJPY": {"pip_size": 0.01, "pip_value_per_std_lot": 9.0}
+}
+BASE_PRICES = {"XAUUSD": 2650.0, "EURUSD": 1.08, "USDJPY": 150.0}
+
+
+def scalar_pnl(trade, price):
+    """The engine's per-trade formula: pips x pip_value x lot"""
+    spec = SYMBOL_CONFIG[trade.symbol]
+    diff = price - trade.entry if trade.direction == "buy" else trade.entry - price
+    return diff / spec["pip_size"] * spec["pip_value_per_std_lot"] * trade.lot_size
+
+
+def make_trade(rng, symbol, profit_chain_id=None, profit_level=0):
+    base = BASE_PRICES[symbol]
+    return Trade(
+        symbol=symbol, entry=base * (1 + rng.uniform(-0.01, 0.01)), sl=0.0, tp=base * 2,
+        lot_size=rng.choice([0.01, 0.02, 0.05, 0.1]), direction=rng.choice(["buy", "sell"]),
+        strategy=rng.choice(["LOGIC1", "LOGIC2", "LOGIC3"]), open_time="2025-01-01T00:00:00",
+        profit_chain_id=profit_chain_id, profit_level=profit_level
+    )
+
+
+def test_vectorized_pnl_matches_per_trade():
+    """Totals, group sums and chain levels equal the per-trade calculation"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Vectorized mark-to-market vs per-trade PnL")
+    print("=" * 60)
+
+    rng = random.Random(7)
+    book = OpenTradeBook(symbol_config=SYMBOL_CONFIG)
+    trades = []
+    for i in range(500):  # grows past the initial capacity
+        symbol = rng.choice(list(BASE_PRICES))
+        chain = f"P{i % 5}" if i % 3 == 0 else None
+        trade = make_trade(rng, symbol, chain, rng.randint(0, 2) if chain else 0)
+        trades.append(trade)
+        book.add(trade)
+
+    prices = {s: p * (1 + rng.uniform(-0.005, 0.005)) for s, p in BASE_PRICES.items()}
+    mtm = book.mark_to_market(prices)
+    expected = {t_id: scalar_pnl(t, prices[t.symbol]) for t_id, t in enumerate(trades)}
+
+    assert mtm["positions"] == mtm["valued_positions"] == 500
+    assert math.isclose(mtm["unrealized_pnl"], sum(expected.values()), rel_tol=1e-9)
+    for symbol in BASE_PRICES:
+        want = sum(scalar_pnl(t, prices[t.symbol]) for t in trades if t.symbol == symbol)
+        assert math.isclose(mtm["by_symbol"][symbol], want, rel_tol=1e-9)
+    for strategy in ("LOGIC1", "LOGIC2", "LOGIC3"):
+        want = sum(scalar_pnl(t, prices[t.symbol]) for t in trades if t.strategy == strategy)
+        assert math.isclose(mtm["by_strategy"][strategy], want, rel_tol=1e-9)
+    assert sorted(mtm["by_chain"]) == ["P0", "P1", "P2", "P3", "P4"]
+
+    level_trades = book.for_profit_level("P1", 1)
+    level_pnl = book.profit_level_pnl("P1", 1, prices["XAUUSD"])
+    assert {id(t) for t, _ in level_pnl} == {id(t) for t in level_trades}
+    for trade, pnl in level_pnl:
+        assert math.isclose(pnl, scalar_pnl(trade, prices["XAUUSD"]), rel_tol=1e-9)
+    assert math.isclose(book.trade_pnl(trades[0], 2660.0), scalar_pnl(trades[0], 2660.0), rel_tol=1e-9)
+
+
+def test_store_follows_book_changes():
+    """Removal, reindex after entry/lot changes, slot reuse and unpriced symbols"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Store kept in sync with the book")
+    print("=" * 60)
+
+    rng = random.Random(11)
+    book = OpenTradeBook(symbol_config=SYMBOL_CONFIG)
+    a = make_trade(rng, "XAUUSD", "P1")
+    b = make_trade(rng, "EURUSD")
+    book.add(a)
+    book.add(b)
+
+    book.remove(a)
+    assert book.trade_pnl(a, 2660.0) is None
+    assert book.profit_level_pnl("P1", 0, 2660.0) == []
+    c = make_trade(rng, "XAUUSD")
+    book.add(c)  # reuses a's slot
+    assert len(book.positions) == 2
+
+    c.lot_size *= 2
+    c.entry = 2600.0
+    book.reindex(c)
+    assert math.isclose(book.trade_pnl(c, 2610.0), scalar_pnl(c, 2610.0), rel_tol=1e-9)
+
+    # EURUSD has no price - its trade is reported unpriced and left out of the total
+    mtm = book.mark_to_market({"XAUUSD": 2610.0})
+    assert mtm["valued_positions"] == 1
+    assert math.isclose(mtm["unrealized_pnl"], scalar_pnl(c, 2610.0), rel_tol=1e-9)
+    assert dict((id(t), p) for t, p in book.trade_pnls({"XAUUSD": 2610.0}))[id(b)] is None
+
+    # Symbols missing from symbol_config are never valued
+    d = make_trade(rng, "EURUSD")
+    d.symbol = "GBPUSD"
+    book.add(d)
+    assert book.trade_pnl(d, 1.27) is None
+
+    book.clear()
+    assert book.mark_to_market(BASE_PRICES)["unrealized_pnl"] == 0.0
+
+
+def test_valuation_from_another_thread():
+    """Valuation off the event loop (MT5 worker, Telegram) sees consistent rows while the book changes"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Valuation from another thread")
+    print("=" * 60)
+
+    rng = random.Random(3)
+    book = OpenTradeBook(symbol_config=SYMBOL_CONFIG)
+    stop = threading.Event()
+    errors = []
+    passes = []
+
+    def value():
+        while not stop.is_set():
+            try:
+                result = book.mark_to_market(BASE_PRICES)
+                # Every stored row is priced, so a torn read shows up as a mismatch
+                assert result["valued_positions"] == result["positions"]
+                assert math.isclose(sum(result["by_symbol"].values()), result["unrealized_pnl"], abs_tol=1e-6)
+                passes.append(result["positions"])
+            except Exception as e:
+                errors.append(e)
+                return
+
+    reader = threading.Thread(target=value)
+    reader.start()
+    try:
+        for _ in range(20):
+            trades = [make_trade(rng, rng.choice(list(BASE_PRICES))) for _ in range(200)]
+            for trade in trades:
+                book.add(trade)
+            for trade in trades[::2]:
+                book.discard(trade)
+            book.clear()
+    finally:
+        stop.set()
+        reader.join()
+
+    print(f"Valuation passes: {len(passes)}")
+    assert not errors, errors[0]
+    assert passes
+
+
+if __name__ == "__main__":
+    test_vectorized_pnl_matches_per_trade()
+    test_store_follows_book_changes()
+    test_valuation_from_another_thread()
+    print("\n[PASS] All position array store tests passed")
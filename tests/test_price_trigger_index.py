@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the sorted SL/TP price trigger index
+Cross-checks bisect results against a brute-force scan
+"""
+import sys
+import os
+import random
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.models import Trade
+from src.core.open_trade_book import OpenTradeBook
+
+
+def make_trade(direction, sl, tp, symbol="XAUUSD"):
+    return Trade(
+        symbol=symbol, entry=2650.0, sl=sl, tp=tp, lot_size=0.01,
+        direction=direction, strategy="LOGIC1", open_time="2025-01-01T00:00:00"
+    )
+
+
+def brute_force(trades, symbol, price):
+    hit = []
+    for t in trades:
+        if t.symbol != symbol:
+            continue
+        if t.direction == "buy" and (price <= t.sl or price >= t.tp):
+            hit.append(t)
+        elif t.direction == "sell" and (price >= t.sl or price <= t.tp):
+            hit.append(t)
+    return hit
+
+
+def test_triggered_matches_brute_force():
+    """Index returns exactly the trades a full scan would"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Trigger index vs brute force")
+    print("=" * 60)
+
+    rng = random.Random(42)
+    book = OpenTradeBook()
+    trades = []
+    for _ in range(500):
+        entry = 2650 + rng.uniform(-20, 20)
+        if rng.random() < 0.5:
+            t = make_trade("buy", entry - rng.uniform(1, 15), entry + rng.uniform(1, 15))
+        else:
+            t = make_trade("sell", entry + rng.uniform(1, 15), entry - rng.uniform(1, 15))
+        trades.append(t)
+        book.add(t)
+
+    for _ in range(200):
+        price = 2650 + rng.uniform(-40, 40)
+        got = {id(t) for t in book.triggered("XAUUSD", price)}
+        expected = {id(t) for t in brute_force(trades, "XAUUSD", price)}
+        assert got == expected
+    assert book.triggered("EURUSD", 1.0) == []
+
+
+def test_index_follows_updates():
+    """Closed trades and changed levels are reflected immediately"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Index consistency on remove and SL/TP change")
+    print("=" * 60)
+
+    book = OpenTradeBook()
+    buy = make_trade("buy", 2640.0, 2660.0)
+    sell = make_trade("sell", 2660.0, 2640.0)
+    book.add(buy)
+    book.add(sell)
+
+    assert book.triggered("XAUUSD", 2650.0) == []
+    assert book.triggered("XAUUSD", 2639.0) == [buy, sell]
+
+    # Trail the buy SL up - now hit at 2649
+    book.update_levels(buy, sl=2649.5)
+    assert book.triggered("XAUUSD", 2649.0) == [buy]
+
+    book.remove(buy)
+    assert book.triggered("XAUUSD", 2639.0) == [sell]
+    book.discard(sell)
+    assert len(book.triggers) == 0
+
+
+if __name__ == "__main__":
+    test_triggered_matches_brute_force()
+    test_index_follows_updates()
+    print("\n[PASS] All price trigger index tests passed")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared MT5Client quote cache
+Runs in simulation mode - no MT5 terminal required
+"""
+import sys
+import os
+import time
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.clients.mt5_client import MT5Client, Quote
+
+
+class DictConfig(dict):
+    """Minimal stand-in for Config (only .get() is used)"""
+    pass
+
+
+def make_client(ttl_ms=500, symbol_ttl_ms=None):
+    config = DictConfig({
+        "simulate_orders": True,
+        "symbol_mapping": {},
+        "quote_cache_config": {"ttl_ms": ttl_ms, "symbol_ttl_ms": symbol_ttl_ms or {}}
+    })
+    client = MT5Client(config)
+    client.initialized = True
+    return client
+
+
+def test_cache_hits_within_ttl():
+    """Repeated lookups inside the TTL are served from cache"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Quote cache hits within TTL")
+    print("=" * 60)
+
+    client = make_client(ttl_ms=10_000)
+    first = client.get_quote("XAUUSD")
+    assert isinstance(first, Quote)
+    assert first.bid <= first.mid <= first.ask
+
+    for _ in range(50):
+        assert client.get_quote("XAUUSD") is first
+    assert client.get_current_price("XAUUSD") == first.mid
+
+    stats = client.get_quote_stats()
+    print(f"  Stats: {stats}")
+    assert stats["misses"] == 1
+    assert stats["hits"] == 51
+    assert stats["cached_symbols"] == 1
+
+
+def test_ttl_expiry_and_invalidate():
+    """Expired or invalidated quotes are re-fetched"""
+    print("\n" + "=" * 60)
+    print("TEST 2: TTL expiry, per-symbol TTL and invalidation")
+    print("=" * 60)
+
+    client = make_client(ttl_ms=10_000, symbol_ttl_ms={"EURUSD": 0})
+    client.get_quote("XAUUSD")
+    client.invalidate_quotes("XAUUSD")
+    client.get_quote("XAUUSD")
+    assert client.get_quote_stats()["misses"] == 2
+
+    # EURUSD has a zero TTL - every lookup after a tick goes to the terminal
+    client.get_quote("EURUSD")
+    time.sleep(0.002)
+    client.get_quote("EURUSD")
+    stats = client.get_quote_stats()
+    print(f"  Stats: {stats}")
+    assert stats["misses"] == 4
+    assert stats["hits"] == 0
+
+
+if __name__ == "__main__":
+    test_cache_hits_within_ttl()
+    test_ttl_expiry_and_invalidate()
+    print("\n[PASS] All quote cache tests passed")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the lazy service container behind the app factory
+"""
+import sys
+import os
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.config import Config
+from src.core.service_container import ServiceContainer, create_services
+
+
+def test_lazy_construction_and_report():
+    """Factories run once on first access, own time excludes dependencies"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Lazy construction and startup report")
+    print("=" * 60)
+
+    built = []
+    services = ServiceContainer()
+    services.register("db", lambda c: built.append("db") or {"name": "db"})
+    services.register("engine", lambda c: {"db": c.db, "order": built.append("engine")})
+    services.register("a", lambda c: c.b)
+    services.register("b", lambda c: c.a)
+
+    assert built == []
+    assert services.report()["pending"] == ["db", "engine", "a", "b"]
+
+    engine = services.engine
+    assert built == ["db", "engine"]
+    assert services.engine is engine and engine["db"] is services.db
+    assert built == ["db", "engine"]
+    assert services.is_built("db") and not services.is_built("a")
+
+    try:
+        services.a
+        assert False, "circular dependency not detected"
+    except RuntimeError as e:
+        print(e)
+        assert "a -> b -> a" in str(e)
+    try:
+        services.missing
+        assert False, "unknown component resolved"
+    except AttributeError:
+        pass
+
+    services.import_seconds = 0.25
+    services.record_phase("initialize", 0.5)
+    report = services.report()
+    print(services.format_report())
+    assert list(report["components"]) == ["db", "engine"]
+    assert report["total_seconds"] >= 0.75
+    assert report["pending"] == ["a", "b"]
+
+
+def test_bot_wiring_builds_only_what_is_used():
+    """Nothing is constructed up front, the Telegram bot opens no database"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Bot wiring is lazy")
+    print("=" * 60)
+
+    config = Config()
+    services = create_services(config)
+    assert services.config is config
+    assert services.report()["components"] == {}
+
+    telegram_bot = services.telegram_bot
+    assert services.alert_processor is not None
+    assert not services.is_built("trading_engine")
+    assert not services.is_built("risk_manager")
+    assert telegram_bot._analytics_engine is None
+    assert set(services.report()["components"]) == {"telegram_bot", "alert_processor"}
+    telegram_bot.shutdown()
+
+
+if __name__ == "__main__":
+    test_lazy_construction_and_report()
+    test_bot_wiring_builds_only_what_is_used()
+    print("\n[PASS] All service container tests passed")
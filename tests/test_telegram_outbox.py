@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the non-blocking Telegram notification outbox
+Uses a fake delivery function - no network access required
+"""
+import sys
+import os
+import time
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.clients.telegram_outbox import TelegramOutbox
+
+
+def test_enqueue_does_not_block():
+    """Slow delivery must not slow down enqueue()"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Enqueue returns immediately")
+    print("=" * 60)
+
+    delivered = []
+
+    def slow_deliver(message):
+        time.sleep(0.2)
+        delivered.append(message)
+        return True, None, False
+
+    outbox = TelegramOutbox(slow_deliver, min_send_interval_seconds=0)
+    start = time.perf_counter()
+    for i in range(5):
+        assert outbox.enqueue(f"msg {i}")
+    elapsed = time.perf_counter() - start
+    print(f"  5 enqueues took {elapsed * 1000:.2f} ms")
+    assert elapsed < 0.1
+
+    assert outbox.flush(timeout=5)
+    outbox.stop()
+    assert delivered == [f"msg {i}" for i in range(5)]
+    assert outbox.get_stats()["sent"] == 5
+
+
+def test_retry_and_rate_limit():
+    """Transient failures and 429s are retried"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Retry with backoff and rate limit")
+    print("=" * 60)
+
+    attempts = []
+
+    def flaky_deliver(message):
+        attempts.append(message)
+        if len(attempts) == 1:
+            return False, 0.01, True   # 429 with retry_after
+        if len(attempts) == 2:
+            return False, None, True   # network error
+        return True, None, False
+
+    outbox = TelegramOutbox(flaky_deliver, retry_backoff_seconds=0.01,
+                            min_send_interval_seconds=0)
+    outbox.enqueue("hello")
+    assert outbox.flush(timeout=5)
+    outbox.stop()
+
+    stats = outbox.get_stats()
+    print(f"  Stats: {stats}")
+    assert len(attempts) == 3
+    assert stats["sent"] == 1
+    assert stats["retried"] == 2
+    assert stats["rate_limited"] == 1
+    assert stats["failed"] == 0
+
+
+def test_overflow_drops_oldest():
+    """A full queue drops the oldest message and counts it"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Bounded queue overflow accounting")
+    print("=" * 60)
+
+    delivered = []
+
+    def blocked_deliver(message):
+        delivered.append(message)
+        return True, None, False
+
+    outbox = TelegramOutbox(blocked_deliver, max_queue_size=3,
+                            min_send_interval_seconds=0)
+    # Fill the queue before the sender thread exists
+    outbox._thread = None
+    outbox.start = lambda: None
+    for i in range(5):
+        outbox.enqueue(f"msg {i}")
+
+    stats = outbox.get_stats()
+    print(f"  Stats: {stats}")
+    assert stats["dropped_overflow"] == 2
+    assert stats["queue_depth"] == 3
+    assert list(outbox.queue.queue) == ["msg 2", "msg 3", "msg 4"]
+
+
+if __name__ == "__main__":
+    test_enqueue_does_not_block()
+    test_retry_and_rate_limit()
+    test_overflow_drops_oldest()
+    print("\n[PASS] All Telegram outbox tests passed")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the event-driven tick pump
+Uses a scripted fake MT5 client - no terminal required
+"""
+import sys
+import os
+import asyncio
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.clients.mt5_client import Quote
+from src.services.tick_pump import TickPump
+
+
+class FakeMT5Client:
+    """Returns whatever price is currently set per symbol"""
+
+    def __init__(self):
+        self.prices = {}
+        self.calls = []
+
+    def get_quote(self, symbol, max_age_ms=None):
+        self.calls.append(symbol)
+        price = self.prices.get(symbol)
+        if price is None:
+            return None
+        return Quote(symbol, price, price + 0.1, price + 0.05, 0.0, 0.0)
+
+
+def test_publishes_only_changed_active_symbols():
+    """Only watched symbols are polled and only changes are published"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Publish on price change for active symbols")
+    print("=" * 60)
+
+    async def run():
+        client = FakeMT5Client()
+        client.prices = {"XAUUSD": 2650.0, "EURUSD": 1.085}
+        active = {"XAUUSD"}
+        pump = TickPump({"tick_pump_config": {"poll_interval_ms": 10}}, client, lambda: active)
+        pump.queue = asyncio.Queue()
+
+        assert pump.poll_once() == 1           # first observation
+        assert await pump.next_symbol() == "XAUUSD"
+        assert pump.poll_once() == 0           # unchanged price
+        client.prices["XAUUSD"] = 2651.0
+        assert pump.poll_once() == 1
+        assert client.calls.count("EURUSD") == 0
+
+        # Nothing watched - no terminal calls
+        active.clear()
+        before = len(client.calls)
+        assert pump.poll_once() == 0
+        assert len(client.calls) == before
+        return pump.get_stats()
+
+    stats = asyncio.run(run())
+    print(f"  Stats: {stats}")
+    assert stats["ticks_published"] == 2
+    assert stats["idle_cycles"] == 1
+
+
+def test_coalesces_pending_symbol():
+    """A symbol already queued is not queued twice"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Coalesce repeated changes for a queued symbol")
+    print("=" * 60)
+
+    async def run():
+        client = FakeMT5Client()
+        client.prices = {"XAUUSD": 2650.0}
+        pump = TickPump({}, client, lambda: {"XAUUSD"})
+        pump.queue = asyncio.Queue()
+
+        pump.poll_once()
+        client.prices["XAUUSD"] = 2650.5
+        pump.poll_once()
+        assert pump.queue.qsize() == 1
+        assert await pump.next_symbol() == "XAUUSD"
+
+        client.prices["XAUUSD"] = 2651.0
+        pump.poll_once()
+        assert pump.queue.qsize() == 1
+        return pump.get_stats()
+
+    stats = asyncio.run(run())
+    print(f"  Stats: {stats}")
+    assert stats["ticks_coalesced"] == 1
+    assert stats["ticks_published"] == 2
+
+
+if __name__ == "__main__":
+    test_publishes_only_changed_active_symbols()
+    test_coalesces_pending_symbol()
+    print("\n[PASS] All tick pump tests passed")
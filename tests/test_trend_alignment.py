@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for rule-driven, cached trend alignment in TimeframeTrendManager
+"""
+import sys
+import os
+import tempfile
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.managers.timeframe_trend_manager import TimeframeTrendManager
+
+
+def make_manager(tmp, logic_rules=None, entry_logics=None):
+    return TimeframeTrendManager(os.path.join(tmp, "trends.json"), debounce_ms=60_000,
+                                 logic_rules=logic_rules, entry_logics=entry_logics)
+
+
+def test_rules_match_previous_results():
+    """LOGIC1/2/3 results keep the previous shape and failure reasons"""
+    print("\n" + "=" * 60)
+    print("TEST 1: Rule table results")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = make_manager(tmp)
+
+        missing = manager.check_logic_alignment("XAUUSD", "LOGIC1")
+        assert missing["failure_reason"] == "Symbol XAUUSD not found in trends dictionary"
+
+        manager.update_trend("XAUUSD", "1h", "bull")
+        result = manager.check_logic_alignment("XAUUSD", "LOGIC1")
+        assert result["details"] == {"1h": "BULLISH", "15m": "NEUTRAL"}
+        assert result["failure_reason"] == "15M trend is NEUTRAL"
+
+        manager.update_trend("XAUUSD", "15m", "bear")
+        result = manager.check_logic_alignment("XAUUSD", "LOGIC2")
+        assert result["failure_reason"] == "Trends don't match: 1H=BULLISH != 15M=BEARISH"
+
+        manager.update_trend("XAUUSD", "1d", "bull")
+        result = manager.check_logic_alignment("XAUUSD", "LOGIC3")
+        assert result["aligned"] and result["direction"] == "BULLISH"
+        assert result["details"] == {"1d": "BULLISH", "1h": "BULLISH"}
+        assert result["failure_reason"] is None
+
+        unknown = manager.check_logic_alignment("XAUUSD", "LOGIC9")
+        assert unknown["failure_reason"] == "Unknown logic: LOGIC9"
+
+
+def test_cache_invalidated_per_symbol():
+    """Cached results are reused until that symbol's trends change"""
+    print("\n" + "=" * 60)
+    print("TEST 2: Per-symbol cache invalidation")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = make_manager(tmp, logic_rules={"LOGIC4": ["1d", "1h", "15m"]})
+        for tf in ["1d", "1h", "15m"]:
+            manager.update_trend("XAUUSD", tf, "buy")
+            manager.update_trend("EURUSD", tf, "sell")
+
+        gold = manager.check_logic_alignment("XAUUSD", "LOGIC4")
+        euro = manager.check_logic_alignment("EURUSD", "LOGIC1")
+        assert gold["aligned"] and gold["direction"] == "BULLISH"
+        assert manager.check_logic_alignment("XAUUSD", "LOGIC4") is gold
+
+        manager.set_manual_trend("XAUUSD", "15m", "BEARISH")
+        assert manager.check_logic_alignment("EURUSD", "LOGIC1") is euro
+        gold = manager.check_logic_alignment("XAUUSD", "LOGIC4")
+        assert not gold["aligned"]
+        assert gold["failure_reason"] == "Trends don't match: 1D=BULLISH != 15M=BEARISH"
+
+
+def test_entry_timeframe_selects_logic():
+    """Entry timeframes map to logics, including ones added through config"""
+    print("\n" + "=" * 60)
+    print("TEST 3: Entry timeframe to logic mapping")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = make_manager(tmp)
+        assert manager.logic_for_timeframe("5m") == "LOGIC1"
+        assert manager.logic_for_timeframe("1h") == "LOGIC3"
+        assert manager.logic_for_timeframe("1d") is None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = make_manager(tmp, logic_rules={"LOGIC4": ["1d", "1h", "15m"]},
+                               entry_logics={"15m": "LOGIC4", "1d": "LOGIC9"})
+        assert manager.logic_for_timeframe("15m") == "LOGIC4"
+        assert manager.logic_for_timeframe("1d") is None  # no rule for LOGIC9
+
+
+def test_result_computed_across_a_trend_change_is_not_cached():
+    """A trend change during a compute (Telegram thread) must not leave a stale result cached"""
+    print("\n" + "=" * 60)
+    print("TEST 4: Trend change during an alignment compute")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = make_manager(tmp)
+        for tf in ["1h", "15m"]:
+            manager.update_trend("XAUUSD", tf, "buy")
+
+        compute = manager._compute_alignment
+        calls = []
+
+        def interleaved(symbol, logic, timeframes):
+            result = compute(symbol, logic, timeframes)
+            if not calls:
+                # The other thread locks 15m bearish after the trends were read
+                manager.set_manual_trend("XAUUSD", "15m", "BEARISH")
+            calls.append(logic)
+            return result
+
+        manager._compute_alignment = interleaved
+        stale = manager.check_logic_alignment("XAUUSD", "LOGIC1")
+        assert stale["aligned"], "computed from the trends before the change"
+        assert ("XAUUSD", "LOGIC1") not in manager.alignment_cache
+
+        fresh = manager.check_logic_alignment("XAUUSD", "LOGIC1")
+        assert not fresh["aligned"] and len(calls) == 2
+        assert manager.check_logic_alignment("XAUUSD", "LOGIC1") is fresh
+
+
+if __name__ == "__main__":
+    test_rules_match_previous_results()
+    test_cache_invalidated_per_symbol()
+    test_entry_timeframe_selects_logic()
+    test_result_computed_across_a_trend_change_is_not_cached()
+    print("\n[PASS] All trend alignment tests passed")